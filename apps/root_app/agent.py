@@ -3,24 +3,35 @@
 루트 오케스트레이터 (학생용 스켈레톤)
 - 목표: 서브 에이전트(Day1/Day2/Day3)를 도구로 연결하고, 프롬프트/모델을 설정
 - 구현 없음: TODO만 보고 직접 채우세요.
+- 빠른 경로: before_model_callback에서 로컬 라우터(router.py)가 확신하는 질의는
+  LLM을 거치지 않고 해당 서브 에이전트 핸들러를 바로 호출 (ROOT_FAST_ROUTE=0이면 끔)
 """
 
 from __future__ import annotations
-from typing import Optional
+import os
+from typing import Any, Optional, Callable, Dict
 
+from google.genai import types
 from google.adk.agents import Agent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.models.lite_llm import LiteLlm
+from student.common.llm_cache import CachedLiteLlm
 
 # 서브 에이전트(도구) — 이미 각 day의 agent.py에서 정의되어 있다고 가정
 # (모듈 경로가 다르면 프로젝트 구조에 맞게 수정)
-from student.day1.agent import day1_web_agent
-from student.day2.agent import day2_rag_agent
-from student.day3.agent import day3_gov_agent
+from student.day1.agent import day1_web_agent, _handle as day1_handle
+from student.day2.agent import day2_rag_agent, _handle as day2_handle
+from student.day3.agent import day3_gov_agent, _handle as day3_handle
 from student.day3.pps_agent import day3_pps_agent
+from student.day3.impl.pps_tool import pps_search
+from student.common.writer import render_day1, render_day2, render_day3, render_enveloped
+from student.common.fs_utils import save_markdown
 
 # 프롬프트(설명/규칙)
 from .prompt import ORCHESTRATOR_DESC, ORCHESTRATOR_PROMPT
+from .router import route, DAY1, DAY2, DAY3_PPS, DAY3_GOV
 
 
 # ------------------------------------------------------------------------------
@@ -28,7 +39,7 @@ from .prompt import ORCHESTRATOR_DESC, ORCHESTRATOR_PROMPT
 #  - 경량 LLM을 선택하여 LiteLlm(model="...")로 초기화
 #  - 예: "openai/gpt-4o-mini"
 # ------------------------------------------------------------------------------
-MODEL = LiteLlm(model="openai/gpt-4o-mini")
+MODEL = CachedLiteLlm(model="openai/gpt-4o-mini", cache_site="root")   # 디스크 캐시 (student/common/llm_cache.py)
 
 
 # ------------------------------------------------------------------------------
@@ -40,6 +51,73 @@ MODEL = LiteLlm(model="openai/gpt-4o-mini")
 #   - tools: Day1/Day2/Day3를 AgentTool로 감싸 순서대로 등록
 #   - before/after 콜백은 필요 없음(기본 LLM-Tool 루프)
 # ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# 빠른 경로: 확실한 질의는 라우팅 LLM 호출 없이 서브 에이전트 핸들러로 바로 보냄
+# ------------------------------------------------------------------------------
+def _text_response(text: str) -> LlmResponse:
+    return LlmResponse(content=types.Content(parts=[types.Part(text=text)], role="model"))
+
+def _via_handler(kind: str, handle: Callable[[str], Dict[str, Any]],
+                 render: Callable[[str, Dict[str, Any]], str]) -> Callable[[CallbackContext, str], Optional[LlmResponse]]:
+    """
+    Day1/2/3 before_model_callback과 같은 순서(_handle → 렌더 → 저장 → envelope)를 직접 실행.
+    콜백은 예외를 "DayN 에러" 응답으로 바꿔 버리므로 쓰지 않음 → 실패는 예외로 올라와 LLM 라우팅으로 넘어감.
+    """
+    def run(callback_context: CallbackContext, query: str) -> Optional[LlmResponse]:
+        payload = handle(query)
+        if isinstance(payload, dict) and payload.get("error"):   # Day2 _handle은 예외 대신 error 필드로 알림
+            raise RuntimeError(payload["error"])
+        body_md = render(query, payload)
+        saved = save_markdown(query=query, route=kind, markdown=body_md)
+        if isinstance(saved, dict):
+            saved = saved.get("path") or saved.get("filepath") or saved.get("file") or ""
+        return _text_response(render_enveloped(kind=kind, query=query, payload=payload, saved_path=str(saved)))
+    return run
+
+def _pps(callback_context: CallbackContext, query: str) -> Optional[LlmResponse]:
+    text = pps_search(query)
+    if text.startswith("⚠️"):   # pps_search는 오류를 "⚠️ ..." 문자열로 돌려줌
+        raise RuntimeError(text.splitlines()[0])
+    return _text_response(text)
+
+FAST_HANDLERS: Dict[str, Callable[[CallbackContext, str], Optional[LlmResponse]]] = {
+    DAY1: _via_handler("day1", day1_handle, render_day1),
+    DAY2: _via_handler("day2", day2_handle, render_day2),
+    DAY3_GOV: _via_handler("day3", day3_handle, render_day3),
+    DAY3_PPS: _pps,
+}
+
+def _user_query(llm_request: LlmRequest) -> Optional[str]:
+    """마지막 콘텐츠가 사용자 텍스트일 때만 질의 반환 (도구 응답 뒤의 LLM 호출은 건드리지 않음)."""
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts:
+        return None
+    if any(getattr(p, "function_response", None) for p in last.parts):
+        return None
+    return (last.parts[0].text or "").strip() or None
+
+def before_model_callback(
+    callback_context: CallbackContext,
+    llm_request: LlmRequest,
+    **kwargs,
+) -> Optional[LlmResponse]:
+    """라우터 신뢰도가 높으면 서브 에이전트 결과를 바로 반환, 아니면 None → 기존 LLM 라우팅."""
+    if os.getenv("ROOT_FAST_ROUTE", "1").lower() in ("0", "false", "no", "n"):
+        return None
+    query = _user_query(llm_request)
+    if not query:
+        return None
+    r = route(query)
+    if not r.fast:
+        return None
+    try:
+        return FAST_HANDLERS[r.target](callback_context, query)
+    except Exception as e:
+        print(f"[WARN] 빠른 경로 실패 → LLM 라우팅: {r.target} ({type(e).__name__}: {e})")
+        return None
+
 root_agent = Agent(
     name="K_Surfer",  # <- 필요 시 수정(하이픈 금지!)
     model=MODEL,                   # <- TODO[ROOT-A-01]
@@ -53,4 +131,6 @@ root_agent = Agent(
         AgentTool(agent=day3_gov_agent),
         AgentTool(agent=day3_pps_agent),
     ],
+    before_model_callback=before_model_callback,
+    generate_content_config=types.GenerateContentConfig(temperature=0),  # 결정적 라우팅 → 응답 캐시 대상
 )
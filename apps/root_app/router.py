@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+루트 오케스트레이터 로컬 라우터 (LLM 호출 전 빠른 경로)
+- 목적: ORCHESTRATOR_PROMPT의 라우팅 규칙 대부분은 키워드/개체로 판별 가능 → 확실한 질의는 LLM 없이 서브 에이전트로 바로 보냄
+- 점수 = 규칙 점수 + 작은 로컬 분류기(나이브 베이즈) 로그 확률 → softmax로 대상별 신뢰도
+    · 규칙: prompt.py의 라우팅 기준/우선순위를 정규식으로 컴파일 (질의당 대상별 1회 search)
+      - 개체: 감독명(Day2 감독 인덱스, Aho-Corasick), 티커(대문자 1~5자/6자리 숫자), 나라장터 공고번호
+    · 분류기: ROUTE_EXAMPLES(대상별 예시 질의)의 한글 bigram/영단어로 학습, 모듈 로드 시 1회
+- 빠른 경로 조건: 1위 대상의 신뢰도 ≥ ROOT_ROUTER_THRESHOLD(기본 0.85) 이고 그 대상에 규칙이 1개 이상 걸리고
+  다른 대상에는 규칙이 걸리지 않음
+    (분류기만으로는 빠른 경로를 타지 않음, 입찰+지원사업 복합 질의처럼 규칙이 갈리면 신뢰도와 무관하게 LLM으로)
+- 통계: route() 호출마다 빠른 경로/LLM 여부와 지연을 기록 → router_stats()로 비율, p50/p95(ms)
+
+사용 예 (예시 질의로 라우팅 결과/통계 출력):
+python -m apps.root_app.router
+python -m apps.root_app.router "봉준호 감독 1위 횟수" "VFX 관련 공고 찾아줘"
+"""
+
+from __future__ import annotations
+import os, re, sys, math, time, threading
+from collections import Counter, deque
+from typing import List, Dict, Tuple, Optional, NamedTuple
+
+from student.day2.impl.lexical import tokenize
+from student.day2.impl.director_index import get_director_index
+
+DAY1, DAY2, DAY3_PPS, DAY3_GOV = "Day1WebAgent", "Day2RagAgent", "Day3PpsAgent", "Day3GovAgent"
+TARGETS = (DAY1, DAY2, DAY3_PPS, DAY3_GOV)
+
+DEFAULT_THRESHOLD = 0.85
+NB_WEIGHT = 0.5      # 분류기 로그 확률 가중치 (규칙 1개 ≈ 2~3점)
+NB_FLOOR = -6.0      # 로그 확률 하한 (처음 보는 질의에서 분류기가 한쪽으로 쏠리지 않게)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DIRECTOR_CSV = os.path.join(_PROJECT_ROOT, "data", "raw", "director_ranking.csv")
+
+def _kw(*words: str) -> "re.Pattern[str]":
+    return re.compile("|".join(re.escape(w) for w in words), re.I)
+
+# ---------- 규칙 (prompt.py 라우팅 기준과 같은 키워드) ----------
+_NETFLIX = _kw("넷플릭스", "netflix")
+_TOP = re.compile(r"\btop\s*\d*|상위|랭킹|랭크|순위|ranking", re.I)
+_OTT = _kw("netflix", "넷플릭스", "disney plus", "디즈니", "티빙", "tving", "왓챠", "watcha", "ott", "웨이브", "쿠팡플레이")
+_TREND = _kw("트렌드", "검색량", "관심도", "트렌딩", "trend")
+_POPULAR = _kw("인기")
+_RISK = _kw("리스크", "논란", "이슈", "스캔들", "사건", "문제", "위험", "scandal")
+_STOCK = _kw("주가", "주식", "실적", "티커", "종목", "시가총액", "stock")
+_WEB = _kw("최신", "뉴스", "동향", "웹 검색", "웹에서", "인터넷", "최근")
+_DIRECTOR = _kw("감독", "director", "1위", "rank1", "경력", "이력", "작품", "필모", "filmography")
+_DOCS = _kw("문서", "근거", "첨부", "자료", "인덱스", "로컬")
+_PPS = re.compile(r"입찰|조달|나라장터|g2b|용역|물품|공사|사전규격|낙찰|단가계약|\bpq\b", re.I)
+_BID_NO = re.compile(r"\b(?:R\d{2}[A-Z]{2}\d{6,}|20\d{2}\d{5,}(?:-\d{2,3})?)\b")
+_GOV = re.compile(r"지원사업|바우처|사업화|모집\s*공고|\brfp\b|기업마당|bizinfo|nipa|과기정통부|지원금|보조금|과제", re.I)
+_TICKER = re.compile(r"\b(?:[A-Z]{1,5}|\d{6})(?:\.[A-Z]{2,4})?\b")
+# 티커처럼 생겼지만 다른 범주의 약어
+_NOT_TICKER = {"TOP", "OTT", "VFX", "AI", "RFP", "PQ", "G2B", "NIPA", "CG", "VR", "AR", "XR", "IT", "TV", "KPOP", "K"}
+
+def _rules(query: str) -> Dict[str, List[Tuple[str, float]]]:
+    """대상별 (규칙 이름, 점수) 목록."""
+    hits: Dict[str, List[Tuple[str, float]]] = {t: [] for t in TARGETS}
+    netflix_top = bool(_NETFLIX.search(query) and _TOP.search(query))
+    if netflix_top:
+        hits[DAY2].append(("netflix_top", 3.0))
+    if _OTT.search(query) and (_TREND.search(query) or (_POPULAR.search(query) and not netflix_top)):
+        hits[DAY1].append(("ott_trend", 3.0))
+
+    director = get_director_index(DIRECTOR_CSV).match(query) if len(query) < 200 else None
+    if director:
+        hits[DAY2].append(("director+keyword" if _DIRECTOR.search(query) else "director", 3.0 if _DIRECTOR.search(query) else 2.0))
+    elif _DIRECTOR.search(query) and "감독" in query:
+        hits[DAY2].append(("director_keyword", 1.5))
+    if _DOCS.search(query):
+        hits[DAY2].append(("docs", 1.5))
+
+    if _RISK.search(query):
+        hits[DAY1].append(("risk", 2.0))
+    if _STOCK.search(query):
+        hits[DAY1].append(("stock", 2.5))
+    if any(t not in _NOT_TICKER for t in _TICKER.findall(query)) and not _BID_NO.search(query):
+        hits[DAY1].append(("ticker", 1.5))
+    if _WEB.search(query):
+        hits[DAY1].append(("web", 1.5))
+
+    if _PPS.search(query):
+        hits[DAY3_PPS].append(("pps", 2.5))
+    if _BID_NO.search(query):
+        hits[DAY3_PPS].append(("bid_no", 3.0))
+    if _GOV.search(query):
+        hits[DAY3_GOV].append(("gov", 2.5))
+    return hits
+
+# ---------- 로컬 분류기 (나이브 베이즈) ----------
+ROUTE_EXAMPLES: Dict[str, List[str]] = {
+    DAY1: [
+        "송강호 리스크", "배우 논란", "이슈 있는 배우", "배우 스캔들 정리", "넷플릭스 트렌드", "티빙 검색량", "OTT 관심도",
+        "디즈니 플러스 검색량 변화", "AAPL 주가", "삼성전자 실적", "005930 분석", "NVDA TSLA 비교", "최신 뉴스",
+        "웹에서 찾아줘", "최근 동향", "CJ ENM 주가 알려줘", "하이브 실적 발표", "영화 산업 최신 동향",
+    ],
+    DAY2: [
+        "넷플릭스 TOP 10", "넷플릭스 한국 영화 상위", "넷플릭스 랭킹", "미국 넷플릭스 영화 top3", "넷플릭스 인기 순위",
+        "봉준호 감독 1위 횟수", "감독 랭킹", "감독 경력", "감독 작품 이력", "최동훈 필모그래피", "문서 요약", "근거 찾기",
+        "첨부 자료 검색", "로컬 인덱스에서 찾아줘", "디지털의료제품법 허가 근거", "김한민 감독 대표작",
+    ],
+    DAY3_PPS: [
+        "VFX 용역 입찰 찾아줘", "나라장터 AI 교육 용역", "조달청 사전규격 VFX", "입찰공고 상세", "G2B 콘텐츠 제작 용역",
+        "영상 제작 물품 입찰", "방송 장비 조달 공고", "공사 입찰 마감일", "낙찰 결과 조회", "단가계약 공고",
+    ],
+    DAY3_GOV: [
+        "VFX 바우처 지원사업", "콘텐츠 사업화 모집공고", "기업마당 AI 지원", "NIPA 디지털콘텐츠 지원", "영상 기술 RFP",
+        "정부 지원금 공고", "과기정통부 과제 공모", "메타버스 보조금", "창업 지원사업 모집", "Bizinfo 영상 지원",
+    ],
+}
+
+class _NaiveBayes:
+    def __init__(self, examples: Dict[str, List[str]], alpha: float = 0.5):
+        self.alpha = alpha
+        self.counts = {t: Counter(tok for q in qs for tok in tokenize(q)) for t, qs in examples.items()}
+        self.totals = {t: sum(c.values()) for t, c in self.counts.items()}
+        self.vocab = len(set().union(*self.counts.values()))
+        n = sum(len(qs) for qs in examples.values())
+        self.prior = {t: math.log(len(qs) / n) for t, qs in examples.items()}
+
+    def log_proba(self, query: str) -> Dict[str, float]:
+        toks = [t for t in tokenize(query) if any(t in c for c in self.counts.values())]  # 처음 보는 토큰은 무시
+        ll = {t: self.prior[t] + sum(math.log((self.counts[t][tok] + self.alpha) / (self.totals[t] + self.alpha * self.vocab))
+                                     for tok in toks)
+              for t in self.counts}
+        m = max(ll.values())
+        z = m + math.log(sum(math.exp(v - m) for v in ll.values()))
+        return {t: max(NB_FLOOR, v - z) for t, v in ll.items()}
+
+_NB = _NaiveBayes(ROUTE_EXAMPLES)
+
+# ---------- 라우팅 ----------
+class Route(NamedTuple):
+    target: str                      # TARGETS 중 하나 (신뢰도 1위)
+    confidence: float                # softmax 확률
+    fast: bool                       # True면 LLM 없이 바로 서브 에이전트 호출
+    rules: Tuple[str, ...]           # 1위 대상에 걸린 규칙 이름
+    scores: Dict[str, float]         # 대상별 신뢰도
+    ms: float                        # 라우팅 지연
+
+def _threshold() -> float:
+    try:
+        return float(os.getenv("ROOT_ROUTER_THRESHOLD", DEFAULT_THRESHOLD))
+    except ValueError:
+        return DEFAULT_THRESHOLD
+
+_STATS_LOCK = threading.Lock()
+_STATS = {"total": 0, "fast": 0}
+_LATENCIES: "deque[float]" = deque(maxlen=10000)
+
+def route(query: str, threshold: Optional[float] = None) -> Route:
+    """질의 → Route. threshold 미지정 시 환경변수 ROOT_ROUTER_THRESHOLD."""
+    t0 = time.perf_counter()
+    q = (query or "").strip()
+    hits = _rules(q)
+    nb = _NB.log_proba(q)
+    logits = {t: sum(s for _, s in hits[t]) + NB_WEIGHT * nb[t] for t in TARGETS}
+    m = max(logits.values())
+    exp = {t: math.exp(v - m) for t, v in logits.items()}
+    z = sum(exp.values())
+    scores = {t: exp[t] / z for t in TARGETS}
+    target = max(TARGETS, key=lambda t: scores[t])  # 동점이면 TARGETS 순서
+    th = _threshold() if threshold is None else threshold
+    fast = (bool(q) and bool(hits[target]) and scores[target] >= th
+            and not any(hits[t] for t in TARGETS if t != target))
+    ms = (time.perf_counter() - t0) * 1000
+    with _STATS_LOCK:
+        _STATS["total"] += 1
+        _STATS["fast"] += int(fast)
+        _LATENCIES.append(ms)
+    return Route(target, scores[target], fast, tuple(name for name, _ in hits[target]), scores, ms)
+
+def _percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+def router_stats() -> Dict[str, float]:
+    """누적 라우팅 통계: total, fast(LLM 생략), llm, fast_ratio, p50_ms, p95_ms."""
+    with _STATS_LOCK:
+        total, fast, lat = _STATS["total"], _STATS["fast"], list(_LATENCIES)
+    return {
+        "total": total,
+        "fast": fast,
+        "llm": total - fast,
+        "fast_ratio": fast / total if total else 0.0,
+        "p50_ms": _percentile(lat, 50),
+        "p95_ms": _percentile(lat, 95),
+    }
+
+def reset_stats():
+    with _STATS_LOCK:
+        _STATS.update(total=0, fast=0)
+        _LATENCIES.clear()
+
+# prompt.py 예시 + 자주 들어오는 형태 (라우팅 리포트용)
+SAMPLE_QUERIES = [
+    "송강호 리스크", "배우 이정재 논란 정리해줘", "넷플릭스 트렌드", "티빙, 왓챠 검색량 비교", "OTT 관심도 변화",
+    "AAPL 주가", "삼성전자 실적", "005930 분석", "최근 영화 투자 뉴스", "웹에서 CGV 관련 동향 찾아줘",
+    "넷플릭스 TOP 10", "넷플릭스 한국 영화 상위 5개", "미국 넷플릭스 영화 top3", "넷플릭스 인기 순위",
+    "봉준호 감독 1위 횟수", "최동훈", "김한민 감독 경력", "감독 랭킹", "문서 요약해줘", "첨부 자료에서 근거 찾아줘",
+    "VFX 용역 입찰 찾아줘", "나라장터 AI 교육 용역", "조달청 사전규격 VFX", "입찰공고 20251012345-00 상세",
+    "G2B 콘텐츠 제작 용역", "VFX 바우처 지원사업", "콘텐츠 사업화 모집공고", "기업마당 AI 지원", "NIPA 디지털콘텐츠 지원",
+    "영상 기술 RFP", "VFX 관련 공고 찾아줘", "VFX 입찰이랑 바우처 둘 다 알려줘", "K-콘텐츠 지원사업 과제 입찰",
+    "봉준호 논란", "영화 추천해줘", "안녕하세요", "넷플릭스",
+]
+
+if __name__ == "__main__":
+    queries = sys.argv[1:] or SAMPLE_QUERIES
+    route("워밍업")  # 감독 인덱스 로드 시간은 통계에서 제외
+    reset_stats()
+    for q in queries:
+        r = route(q)
+        tag = "FAST" if r.fast else "LLM "
+        print(f"[{tag}] {r.confidence:.2f} {r.target:13s} {','.join(r.rules) or '-':24s} {r.ms:6.3f}ms  {q}")
+    st = router_stats()
+    print(f"[OK] {st['total']} queries: LLM 생략 {st['fast']} ({st['fast_ratio']:.0%}), "
+          f"p50={st['p50_ms']:.3f}ms p95={st['p95_ms']:.3f}ms")
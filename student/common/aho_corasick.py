@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+다중 키워드 매칭 오토마톤 (Aho-Corasick)
+- 키워드 집합으로 1회 빌드 → 텍스트를 한 번 훑으며 모든 매칭(겹치는 것 포함)을 (start, end, 키워드 번호)로 반환
+- 전이는 트라이의 goto 간선만 보관하고 질의 시 실패 링크를 따라감 → 메모리/빌드 시간이 노드 수에 비례
+  (키워드 수만 개 규모의 감독 이름 색인에서도 그대로)
+- ignore_case=True면 키워드는 소문자로 넣고, 훑을 때 입력 글자를 소문자로 바꿔 비교
+  (소문자가 한 글자인 경우만, 그래서 오프셋은 원문 위치 그대로 → 하이라이트/발췌에 바로 사용)
+
+사용 예:
+ac = KeywordAutomaton(["논란", "lawsuit", "sexual assault", "assault"])
+ac.findall("Sexual assault 논란")  # [(0, 14, 2), (7, 14, 3), (15, 17, 0)]
+"""
+
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+Match = Tuple[int, int, int]  # (start, end, pattern_id)
+
+class KeywordAutomaton:
+    def __init__(self, patterns: Sequence[str], ignore_case: bool = True):
+        self.patterns = [p.lower() if ignore_case else p for p in patterns]
+        self.ignore_case = ignore_case
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for pid, pat in enumerate(self.patterns):
+            if not pat:
+                continue
+            node = 0
+            for ch in pat:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = goto[node][ch] = len(goto)
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(pid)
+
+        # BFS로 실패 링크 (출력은 실패 링크 쪽 출력을 이어 붙여 둠)
+        fail = [0] * len(goto)
+        q = deque(goto[0].values())
+        while q:
+            node = q.popleft()
+            for ch, nxt in goto[node].items():
+                q.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if node else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+        self._lens = [len(p) for p in self.patterns]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _fold(self, text: str) -> str:
+        """ignore_case면 글자 단위 소문자화 (길이가 바뀌는 글자는 그대로 → 오프셋 유지)."""
+        if not self.ignore_case:
+            return text
+        low = text.lower()
+        if len(low) == len(text):
+            return low
+        return "".join(c if len(c) == 1 else ch for ch, c in ((ch, ch.lower()) for ch in text))
+
+    def iter(self, text: str) -> Iterator[Match]:
+        """(start, end, pattern_id) — 끝 위치 순, 겹치는 매칭 포함."""
+        goto, fail, out, lens = self._goto, self._fail, self._out, self._lens
+        node = 0
+        for i, ch in enumerate(self._fold(text)):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                yield i + 1 - lens[pid], i + 1, pid
+
+    def findall(self, text: str) -> List[Match]:
+        """iter()와 같은 결과를 리스트로 (제너레이터 오버헤드 없이)."""
+        goto, fail, out, lens = self._goto, self._fail, self._out, self._lens
+        res: List[Match] = []
+        node = 0
+        for i, ch in enumerate(self._fold(text)):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                for pid in out[node]:
+                    res.append((i + 1 - lens[pid], i + 1, pid))
+        return res
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+공용 HTTP 클라이언트 (Tavily / Naver DataLab / PPS 등 외부 서비스 호출을 한 곳으로)
+- 프로세스당 requests.Session 1개 (스레드 간 공유)
+    · 호스트별 연결 풀 + keep-alive → 같은 호스트로의 연속 호출은 TCP/TLS 핸드셰이크 없이 재사용
+    · Accept-Encoding: gzip, deflate (응답은 requests가 자동 해제)
+- 재시도: 연결 오류/타임아웃/429·5xx 응답에 대해 지수 백오프 + 지터 (Retry-After가 있으면 그 값 우선)
+    · 멱등 메서드(GET/HEAD/OPTIONS/PUT/DELETE)만 — POST 등은 연결 자체가 안 된 경우와 429만 재시도
+      (읽기 타임아웃/5xx는 서버가 이미 처리했을 수 있음 → 과금 호출이 중복되지 않게)
+    · 조회용 POST처럼 다시 보내도 되는 호출은 idempotent=True로 (호출마다)
+- 타임아웃: 호출마다 timeout 인자 (초 또는 (connect, read)), 없으면 환경변수 기본값
+- 통계: pool_stats() → 요청 수, 새로 연 연결 수, 재사용률, 현재 열려 있는(유휴) 연결 수, 재시도 수 (호스트별 포함)
+- 비동기: aget/apost (httpx.AsyncClient, 이벤트 루프별 1개 — 같은 재시도/타임아웃 규칙, 통계는 pool_stats()["async"])
+    · shared_loop(): 프로세스 공용 이벤트 루프(백그라운드 스레드 1개)
+    · run_sync(coro): 동기 코드에서 코루틴을 공용 루프에 올려 결과를 기다림 → 동시에 들어온 여러 질의가 루프/연결 풀을 공유
+- 환경변수:
+    HTTP_POOL_MAXSIZE (기본 16, 호스트당 최대 연결), HTTP_POOL_HOSTS (기본 16, 풀을 유지할 호스트 수)
+    HTTP_RETRIES (기본 2), HTTP_BACKOFF (기본 0.3초), HTTP_BACKOFF_MAX (기본 8초)
+    HTTP_CONNECT_TIMEOUT (기본 5초), HTTP_TIMEOUT (기본 20초, 읽기)
+
+사용 예:
+from student.common.http_client import post, get, pool_stats
+r = post("https://api.tavily.com/search", json=payload, headers=headers, timeout=20)
+r.raise_for_status()
+print(pool_stats())
+
+async def job(): return (await apost("https://api.tavily.com/search", json=payload, headers=headers)).json()
+data = run_sync(job())
+"""
+
+from __future__ import annotations
+import os, time, random, asyncio, threading, weakref
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+
+import httpx
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+Timeout = Union[float, Tuple[float, float], None]
+T = TypeVar("T")
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+def _retry_after(resp: Union[requests.Response, httpx.Response]) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+def _idempotent(method: str, idempotent: Optional[bool]) -> bool:
+    return method.upper() in IDEMPOTENT_METHODS if idempotent is None else idempotent
+
+def _not_sent(exc: BaseException) -> bool:
+    """요청이 서버에 닿기 전에 실패했는가 (연결 실패/연결 타임아웃/DNS) → 비멱등 요청도 다시 보내도 안전."""
+    if isinstance(exc, (requests.ConnectTimeout, httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    if isinstance(exc, requests.ConnectionError) and not isinstance(exc, requests.ReadTimeout):
+        reason = getattr(exc.args[0], "reason", None) if exc.args else None
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+    return False
+
+def _backoff_wait(attempt: int, retry_after: Optional[float], backoff: float, backoff_max: float) -> float:
+    wait = retry_after if retry_after is not None else random.uniform(0, min(backoff_max, backoff * (2 ** attempt)))  # full jitter
+    return min(wait, backoff_max)
+
+class _Config:
+    """HTTP_* 환경변수 기본값 (동기/비동기 클라이언트 공통)."""
+    def __init__(self, pool_maxsize: Optional[int] = None, pool_hosts: Optional[int] = None,
+                 retries: Optional[int] = None, backoff: Optional[float] = None, backoff_max: Optional[float] = None,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None):
+        self.retries = int(retries if retries is not None else _env_float("HTTP_RETRIES", 2))
+        self.backoff = backoff if backoff is not None else _env_float("HTTP_BACKOFF", 0.3)
+        self.backoff_max = backoff_max if backoff_max is not None else _env_float("HTTP_BACKOFF_MAX", 8.0)
+        self.timeout = (connect_timeout if connect_timeout is not None else _env_float("HTTP_CONNECT_TIMEOUT", 5.0),
+                        read_timeout if read_timeout is not None else _env_float("HTTP_TIMEOUT", 20.0))
+        self.pool_maxsize = int(pool_maxsize or _env_float("HTTP_POOL_MAXSIZE", 16))
+        self.pool_hosts = int(pool_hosts or _env_float("HTTP_POOL_HOSTS", 16))
+
+class HttpClient:
+    def __init__(self, pool_maxsize: Optional[int] = None, pool_hosts: Optional[int] = None,
+                 retries: Optional[int] = None, backoff: Optional[float] = None, backoff_max: Optional[float] = None,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None):
+        cfg = _Config(pool_maxsize, pool_hosts, retries, backoff, backoff_max, connect_timeout, read_timeout)
+        self.retries, self.backoff, self.backoff_max, self.timeout = cfg.retries, cfg.backoff, cfg.backoff_max, cfg.timeout
+        # 재시도는 아래 request()에서 직접 (urllib3 Retry는 끔) → 통계/지터/Retry-After 처리를 한 곳에서
+        self._adapter = HTTPAdapter(pool_connections=cfg.pool_hosts, pool_maxsize=cfg.pool_maxsize, max_retries=0,
+                                    pool_block=False)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        self._lock = threading.Lock()
+        self._retried: Dict[str, int] = {}
+        self._failed: Dict[str, int] = {}
+
+    def _sleep_for(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        return _backoff_wait(attempt, _retry_after(resp) if resp is not None else None, self.backoff, self.backoff_max)
+
+    def _count(self, table: Dict[str, int], host: str):
+        with self._lock:
+            table[host] = table.get(host, 0) + 1
+
+    def request(self, method: str, url: str, timeout: Timeout = None, retries: Optional[int] = None,
+                idempotent: Optional[bool] = None, **kwargs: Any) -> requests.Response:
+        """
+        requests.Session.request와 같은 인자. 재시도 후에도 실패하면 마지막 응답을 반환하거나 마지막 예외를 raise.
+        idempotent: None이면 메서드로 판단 (False면 연결 실패/429만 재시도).
+        """
+        host = urlsplit(url).hostname or ""
+        retries = self.retries if retries is None else retries
+        timeout = self.timeout if timeout is None else timeout
+        safe = _idempotent(method, idempotent)
+        for attempt in range(retries + 1):
+            resp: Optional[requests.Response] = None
+            try:
+                resp = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= retries or not (safe or _not_sent(e)):
+                    self._count(self._failed, host)
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUS or attempt >= retries or not (safe or resp.status_code == 429):
+                    return resp
+                resp.close()
+            self._count(self._retried, host)
+            time.sleep(self._sleep_for(attempt, resp))
+        raise AssertionError("unreachable")
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        hosts: Dict[str, Dict[str, Any]] = {}
+        pools = self._adapter.poolmanager.pools
+        with pools.lock:
+            items = list(pools._container.items())
+        for key, pool in items:
+            host = key.key_host
+            idle = sum(1 for c in list(pool.pool.queue) if c is not None) if pool.pool is not None else 0
+            h = hosts.setdefault(host, {"requests": 0, "connections": 0, "idle": 0})
+            h["requests"] += pool.num_requests
+            h["connections"] += pool.num_connections
+            h["idle"] += idle
+        with self._lock:
+            retried, failed = dict(self._retried), dict(self._failed)
+        for host, h in hosts.items():
+            h["reuse_rate"] = 1.0 - h["connections"] / h["requests"] if h["requests"] else 0.0
+            h["retries"] = retried.get(host, 0)
+            h["failures"] = failed.get(host, 0)
+        total_req = sum(h["requests"] for h in hosts.values())
+        total_conn = sum(h["connections"] for h in hosts.values())
+        return {
+            "requests": total_req,
+            "connections": total_conn,
+            "reuse_rate": 1.0 - total_conn / total_req if total_req else 0.0,
+            "open_connections": sum(h["idle"] for h in hosts.values()),
+            "retries": sum(retried.values()),
+            "failures": sum(failed.values()),
+            "hosts": hosts,
+        }
+
+    def close(self):
+        self.session.close()
+
+class AsyncHttpClient:
+    """httpx.AsyncClient 래퍼 — 생성한 이벤트 루프 안에서만 사용 (get_async_client()가 루프별로 1개씩 만듦)."""
+
+    def __init__(self, **kwargs: Any):
+        cfg = _Config(**kwargs)
+        self.retries, self.backoff, self.backoff_max = cfg.retries, cfg.backoff, cfg.backoff_max
+        self.timeout = self._httpx_timeout(cfg.timeout)
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=cfg.pool_maxsize * cfg.pool_hosts,
+                                max_keepalive_connections=cfg.pool_maxsize),
+            headers={"Accept-Encoding": "gzip, deflate"},
+            timeout=self.timeout,
+            follow_redirects=True,   # requests 기본 동작과 같게
+        )
+        self._requests: Dict[str, int] = {}
+        self._connects: Dict[str, int] = {}
+        self._retried: Dict[str, int] = {}
+        self._failed: Dict[str, int] = {}
+
+    @staticmethod
+    def _httpx_timeout(timeout: Timeout) -> httpx.Timeout:
+        if isinstance(timeout, tuple):
+            return httpx.Timeout(timeout[1], connect=timeout[0])
+        return httpx.Timeout(timeout)
+
+    @staticmethod
+    def _inc(table: Dict[str, int], host: str):
+        table[host] = table.get(host, 0) + 1   # 루프 스레드 안에서만 호출 → 락 불필요
+
+    async def request(self, method: str, url: str, timeout: Timeout = None, retries: Optional[int] = None,
+                      data: Any = None, idempotent: Optional[bool] = None, **kwargs: Any) -> httpx.Response:
+        """HttpClient.request의 비동기 버전 (requests 스타일 인자 params/json/data/headers 지원, 같은 재시도 규칙)."""
+        host = urlsplit(url).hostname or ""
+        retries = self.retries if retries is None else retries
+        safe = _idempotent(method, idempotent)
+        if isinstance(data, (str, bytes)):
+            kwargs["content"] = data   # requests의 data=문자열 ↔ httpx의 content=
+        elif data is not None:
+            kwargs["data"] = data
+        if timeout is not None:
+            kwargs["timeout"] = self._httpx_timeout(timeout)
+
+        async def trace(event: str, info: Dict[str, Any]):
+            if event == "connection.connect_tcp.complete":
+                self._inc(self._connects, host)
+
+        for attempt in range(retries + 1):
+            resp: Optional[httpx.Response] = None
+            self._inc(self._requests, host)
+            try:
+                resp = await self.client.request(method, url, extensions={"trace": trace}, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= retries or not (safe or _not_sent(e)):
+                    self._inc(self._failed, host)
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUS or attempt >= retries or not (safe or resp.status_code == 429):
+                    return resp
+                await resp.aclose()
+            self._inc(self._retried, host)
+            await asyncio.sleep(_backoff_wait(attempt, _retry_after(resp) if resp is not None else None,
+                                              self.backoff, self.backoff_max))
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, Any]:
+        idle: Dict[str, int] = {}
+        try:  # httpcore 내부 구조 — 버전에 따라 없을 수 있음
+            for conn in list(self.client._transport._pool.connections):
+                if conn.is_idle():
+                    h = conn._origin.host.decode("ascii", "ignore")
+                    idle[h] = idle.get(h, 0) + 1
+        except Exception:
+            pass
+        requests_, connects = dict(self._requests), dict(self._connects)
+        hosts = {
+            h: {"requests": n, "connections": connects.get(h, 0), "idle": idle.get(h, 0),
+                "reuse_rate": 1.0 - connects.get(h, 0) / n if n else 0.0,
+                "retries": self._retried.get(h, 0), "failures": self._failed.get(h, 0)}
+            for h, n in requests_.items()
+        }
+        total_req, total_conn = sum(requests_.values()), sum(connects.values())
+        return {
+            "requests": total_req,
+            "connections": total_conn,
+            "reuse_rate": 1.0 - total_conn / total_req if total_req else 0.0,
+            "open_connections": sum(idle.values()),
+            "retries": sum(self._retried.values()),
+            "failures": sum(self._failed.values()),
+            "hosts": hosts,
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
+
+# ---------- 프로세스 공용 클라이언트 ----------
+_CLIENT: Optional[HttpClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+def get_client() -> HttpClient:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = HttpClient()
+    return _CLIENT
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    return get_client().request(method, url, **kwargs)
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return get_client().get(url, **kwargs)
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return get_client().post(url, **kwargs)
+
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]" = weakref.WeakKeyDictionary()
+
+def get_async_client() -> AsyncHttpClient:
+    """현재 실행 중인 이벤트 루프의 비동기 클라이언트 (루프별 1개, 루프 안에서 호출)."""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = _ASYNC_CLIENTS[loop] = AsyncHttpClient()
+    return client
+
+async def arequest(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    return await get_async_client().request(method, url, **kwargs)
+
+async def aget(url: str, **kwargs: Any) -> httpx.Response:
+    return await get_async_client().request("GET", url, **kwargs)
+
+async def apost(url: str, **kwargs: Any) -> httpx.Response:
+    return await get_async_client().request("POST", url, **kwargs)
+
+# ---------- 공용 이벤트 루프 ----------
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+def shared_loop() -> asyncio.AbstractEventLoop:
+    """백그라운드 스레드에서 계속 도는 프로세스 공용 이벤트 루프."""
+    global _LOOP
+    if _LOOP is None:
+        with _CLIENT_LOCK:
+            if _LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="http-aio", daemon=True).start()
+                _LOOP = loop
+    return _LOOP
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """코루틴을 공용 루프에서 실행하고 결과를 기다림 (호출 스레드에 이미 다른 루프가 돌고 있어도 사용 가능)."""
+    loop = shared_loop()
+    if threading.current_thread().name == "http-aio":
+        raise RuntimeError("run_sync는 공용 루프 안에서 호출할 수 없습니다 (await를 쓰세요)")
+    fut = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return fut.result(timeout)
+    except BaseException:
+        fut.cancel()
+        raise
+
+def pool_stats() -> Dict[str, Any]:
+    """공용 클라이언트의 연결 풀 통계 (재사용률, 열린 연결 수, 재시도/실패 수, 호스트별) + 공용 루프의 비동기 클라이언트."""
+    out = get_client().stats()
+    aclient = _ASYNC_CLIENTS.get(_LOOP) if _LOOP is not None else None
+    if aclient is not None:
+        out["async"] = aclient.stats()
+    return out
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 응답 디스크 캐시 (SQLite, LiteLlm.generate_content_async 앞단)
+- 대상: 루트 오케스트레이터(root), Day1 기업 개요 요약(day1_summary), Day3PpsAgent(day3_pps)
+    · 각 호출 위치는 LiteLlm 대신 CachedLiteLlm(model=..., cache_site="...")을 씀 (ADK Agent에 그대로 넘김)
+- 키: sha256(모델 + 정규화한 메시지 + system_instruction + 도구 스키마 + 생성 설정)
+    · 문자열은 NFKC + 앞뒤 공백 제거 + 연속 공백 1칸
+    · function_call / function_response의 id는 뺌 (세션마다 새로 붙는 값이라 같은 대화도 키가 달라짐)
+    · http_options, labels 등 응답 내용과 무관한 설정은 키에서 제외
+- 저장: 오류/부분(partial) 응답이 아닌 최종 응답만, 원래 걸린 시간(latency_ms)과 함께
+    · 적중 시 저장된 응답을 그대로 돌려주고 function_call id만 지움 (ADK가 새 id를 붙임)
+    · 스트리밍 호출(stream=True)은 캐시하지 않음
+- 비결정적 설정 제외: temperature를 0으로 명시하지 않았거나(미지정이면 제공자 기본값 1.0으로 샘플링) candidate_count > 1이면
+  캐시를 거치지 않음(skipped)
+    · 그래서 캐시 대상 위치는 temperature=0을 명시함: 에이전트는 generate_content_config, complete_text는 temperature 인자
+    · 샘플링 결과를 재사용해도 되는 위치는 CachedLiteLlm(..., cache_sampled=True)
+- TTL은 호출 위치(site)별: 기본값은 TTLS, 환경변수 LLM_CACHE_TTL_<SITE>(초)로 덮어쓰기 (0이면 그 위치만 끔)
+- 용량: 본문은 zlib 압축 JSON, 합계가 LLM_CACHE_MAX_MB(기본 32MB)를 넘으면
+  만료 항목 → 오래 안 쓴 항목(atime) 순으로 한도의 90%까지 제거
+- 통계: stats() → site별 hits, misses, skipped, hit_rate, saved_ms(적중으로 아낀 원래 지연 합)
+    · 파일에도 항목별 적중 수를 남겨 stored_by_site로 프로세스를 넘어선 누적 적중/절약 시간도 보여줌
+- 설정: LLM_CACHE=0이면 끔, 경로는 LLM_CACHE_PATH (기본 data/cache/llm.sqlite)
+
+사용 예:
+MODEL = CachedLiteLlm(model="openai/gpt-4o-mini", cache_site="root")
+text = complete_text(_SUM, prompt, temperature=0)     # 동기 코드에서 한 번 호출 (캐시 포함)
+python -m student.common.llm_cache     # 통계
+python -m student.common.llm_cache --clear
+"""
+
+from __future__ import annotations
+import os, re, json, time, zlib, sqlite3, hashlib, argparse, threading, unicodedata
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from google.adk.models.lite_llm import LiteLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from .http_client import run_sync
+
+DEFAULT_CACHE_PATH = "data/cache/llm.sqlite"
+DEFAULT_MAX_MB = 32
+
+HOUR = 3600
+DAY = 24 * HOUR
+TTLS: Dict[str, float] = {
+    "root": 1 * DAY,           # 루트 라우팅 (transfer_to_agent 결정)
+    "day1_summary": 3 * DAY,   # 기업 개요 요약 (Tavily profile/extract TTL과 맞춤)
+    "day3_pps": 3 * HOUR,      # PPS 응답 (도구 결과가 메시지에 들어가므로 공고가 바뀌면 키도 바뀜)
+    "default": 1 * DAY,
+}
+
+_SPACES = re.compile(r"\s+")
+_CONFIG_EXCLUDE = {"http_options", "labels"}
+
+def ttl_for(site: str) -> float:
+    fallback = TTLS.get(site, TTLS["default"])
+    try:
+        return float(os.getenv(f"LLM_CACHE_TTL_{site.upper()}", fallback))
+    except ValueError:
+        return fallback
+
+def _normalize(value: Any, parent: str = "") -> Any:
+    if isinstance(value, str):
+        return _SPACES.sub(" ", unicodedata.normalize("NFKC", value)).strip()
+    if isinstance(value, dict):
+        drop_id = parent in ("function_call", "function_response")
+        return {k: _normalize(v, k) for k, v in value.items() if v is not None and not (drop_id and k == "id")}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, parent) for v in value]
+    return value
+
+def request_key(model: str, llm_request: LlmRequest) -> str:
+    config = llm_request.config.model_dump(mode="json", exclude_none=True, exclude=_CONFIG_EXCLUDE) \
+        if llm_request.config else {}
+    contents = [c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents or []]
+    body = json.dumps({"model": llm_request.model or model, "contents": _normalize(contents), "config": _normalize(config)},
+                      ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def is_deterministic(llm_request: LlmRequest) -> bool:
+    """temperature=0을 명시한 요청만 결정적으로 봄 (미지정은 제공자 기본값으로 샘플링)."""
+    cfg = llm_request.config
+    if cfg is None or cfg.temperature is None or cfg.temperature > 0:
+        return False
+    return not (cfg.candidate_count is not None and cfg.candidate_count > 1)
+
+class LlmCache:
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.evictions = 0
+        self._counts: Dict[str, Dict[str, float]] = {}   # site -> {"hits", "misses", "skipped", "saved_ms"}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, site TEXT NOT NULL, created REAL NOT NULL, expires REAL NOT NULL,"
+            " atime REAL NOT NULL, latency_ms REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0,"
+            " size INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_atime ON entries(atime)")
+
+    def _count(self, site: str, field: str, amount: float = 1):
+        c = self._counts.setdefault(site, {"hits": 0, "misses": 0, "skipped": 0, "saved_ms": 0.0})
+        c[field] += amount
+
+    def count_skipped(self, site: str):
+        with self._lock:
+            self._count(site, "skipped")
+
+    def get(self, key: str, site: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT expires, latency_ms, body FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or row[0] <= now:
+                self._count(site, "misses")
+                return None
+            self._db.execute("UPDATE entries SET atime = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._count(site, "hits")
+            self._count(site, "saved_ms", row[1])
+        return json.loads(zlib.decompress(row[2]))
+
+    def put(self, key: str, site: str, value: Any, latency_ms: float, ttl: Optional[float] = None):
+        ttl = ttl_for(site) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        body = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries(key, site, created, expires, atime, latency_ms, hits, size, body)"
+                " VALUES (?,?,?,?,?,?,0,?,?)",
+                (key, site, now, now + ttl, now, float(latency_ms), len(body), body),
+            )
+            self._shrink(now)
+
+    def _shrink(self, now: float):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        cur = self._db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        self.evictions += cur.rowcount
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= target:
+            return
+        victims, freed = [], 0
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY atime"):
+            victims.append((key,))
+            freed += size
+            if total - freed <= target:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("VACUUM")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            stored = self._db.execute(
+                "SELECT site, COUNT(*), SUM(hits), SUM(hits * latency_ms) FROM entries GROUP BY site").fetchall()
+            by_site = {k: dict(v) for k, v in self._counts.items()}
+        for c in by_site.values():
+            total = c["hits"] + c["misses"]
+            c["hit_rate"] = round(c["hits"] / total, 4) if total else 0.0
+            c["saved_ms"] = round(c["saved_ms"], 1)
+        hits = sum(c["hits"] for c in by_site.values())
+        misses = sum(c["misses"] for c in by_site.values())
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "saved_ms": round(sum(c["saved_ms"] for c in by_site.values()), 1),
+            "evictions": self.evictions,
+            "by_site": by_site,
+            # 파일에 남은 항목 기준 누적 (다른 프로세스의 적중 포함, 만료/제거된 항목은 빠짐)
+            "stored_by_site": {s: {"entries": n, "hits": int(h or 0), "saved_ms": round(ms or 0.0, 1)}
+                               for s, n, h, ms in stored},
+            "path": self.path,
+        }
+
+# ---------- 프로세스 공용 캐시 ----------
+_CACHES: Dict[str, LlmCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+def get_llm_cache() -> Optional[LlmCache]:
+    """LLM_CACHE=0이면 None. 경로별로 1개."""
+    if os.getenv("LLM_CACHE", "1").lower() in ("0", "false", "no", "n"):
+        return None
+    path = os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            try:
+                max_mb = float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB))
+            except ValueError:
+                max_mb = DEFAULT_MAX_MB
+            try:
+                cache = LlmCache(path, int(max_mb * 1024 * 1024))
+            except sqlite3.Error as e:
+                print(f"[WARN] LLM 캐시를 열 수 없음 → 캐시 없이 진행: {path} ({e})")
+                return None
+            _CACHES[path] = cache
+        return cache
+
+def llm_cache_stats() -> Dict[str, Any]:
+    cache = get_llm_cache()
+    return cache.stats() if cache else {"enabled": False}
+
+def _cacheable(resp: LlmResponse) -> bool:
+    return not resp.partial and not resp.error_code and resp.content is not None and bool(resp.content.parts)
+
+def _strip_call_ids(resp: LlmResponse) -> LlmResponse:
+    for part in resp.content.parts if resp.content and resp.content.parts else []:
+        if part.function_call is not None:
+            part.function_call.id = None
+    return resp
+
+# ---------- LiteLlm 래퍼 ----------
+class CachedLiteLlm(LiteLlm):
+    """LiteLlm + 디스크 캐시. cache_site는 TTL/통계 구분용 이름 (LiteLLM completion 인자로는 넘기지 않음)."""
+    cache_site: str = "default"
+    cache_sampled: bool = False
+
+    def __init__(self, model: str, cache_site: str = "default", cache_sampled: bool = False, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.cache_site = cache_site
+        self.cache_sampled = cache_sampled
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        cache = get_llm_cache()
+        if cache is None or stream or ttl_for(self.cache_site) <= 0:
+            async for resp in super().generate_content_async(llm_request, stream=stream):
+                yield resp
+            return
+        if not (self.cache_sampled or is_deterministic(llm_request)):
+            cache.count_skipped(self.cache_site)
+            async for resp in super().generate_content_async(llm_request, stream=stream):
+                yield resp
+            return
+
+        key = request_key(self.model, llm_request)   # 상위 클래스가 요청을 고치기 전에 계산
+        hit = cache.get(key, self.cache_site)
+        if hit is not None:
+            yield _strip_call_ids(LlmResponse.model_validate(hit))
+            return
+        t0 = time.perf_counter()
+        async for resp in super().generate_content_async(llm_request, stream=stream):
+            if _cacheable(resp):
+                cache.put(key, self.cache_site, resp.model_dump(mode="json", exclude_none=True),
+                          (time.perf_counter() - t0) * 1000)
+            yield resp
+
+async def acomplete_text(llm: LiteLlm, prompt: str, temperature: Optional[float] = None) -> str:
+    """프롬프트 1개 → 응답 텍스트 (사용자 메시지 1개짜리 요청). 텍스트가 없으면 "". temperature=0이어야 캐시 대상."""
+    config = types.GenerateContentConfig(temperature=temperature) if temperature is not None else None
+    req = LlmRequest(model=llm.model, contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+                     config=config)
+    texts = []
+    async for resp in llm.generate_content_async(req):
+        if resp.content and resp.content.parts:
+            texts.extend(p.text for p in resp.content.parts if p.text)
+    return "".join(texts)
+
+def complete_text(llm: LiteLlm, prompt: str, timeout: Optional[float] = None,
+                  temperature: Optional[float] = None) -> str:
+    """acomplete_text의 동기판 (공용 루프에서 실행 — 스레드 풀/동기 코드용)."""
+    return run_sync(acomplete_text(llm, prompt, temperature), timeout)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="LLM 응답 캐시 통계/비우기")
+    ap.add_argument("--clear", action="store_true")
+    args = ap.parse_args()
+    cache = get_llm_cache()
+    if cache is None:
+        print("[OK] LLM_CACHE=0 (캐시 꺼짐)")
+    else:
+        if args.clear:
+            cache.clear()
+        print(json.dumps(cache.stats(), ensure_ascii=False, indent=2))
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from dataclasses import dataclass, field
-from typing import List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 from pydantic import BaseModel, Field, HttpUrl
 
 # -------------------------
@@ -43,6 +43,14 @@ class Day2Plan:
     return_draft_when_enough: bool = True
     max_context: int = 1200
     embedding_model: str = "text-embedding-3-small"
+    # ANN 인덱스(ivf/ivfpq/hnsw) 질의 시 탐색 폭. None이면 인덱스 메타의 기본값 (flat이면 무시)
+    nprobe: Optional[int] = None
+    ef_search: Optional[int] = None
+    # 검색 방식: "dense"(FAISS만) | "hybrid"(FAISS + BM25 lexical.npz 융합)
+    retrieval: str = "dense"
+    fusion: str = "rrf"            # hybrid 융합: "rrf" | "weighted"(min-max 정규화 가중합)
+    lexical_weight: float = 0.5    # weighted: BM25 비중, rrf: 두 순위의 가중치 비(0.5면 동일)
+    rrf_k: int = 60
 
 # (선택) RAG Context 아이템도 dataclass를 쓸 경우 예시
 @dataclass
@@ -81,7 +89,7 @@ class GovNoticeItem:
 class GovNoticeItemModel(BaseModel):
     url: HttpUrl
     title: str = ""
-    source: Literal["nipa","bizinfo","web",""] = ""
+    source: str = ""               # fetchers 라벨 그대로 ("NIPA" | "BizInfo" | "웹" | "pps.data.go.kr")
     agency: str = ""
     announce_date: Optional[str] = ""
     close_date: Optional[str] = ""
@@ -95,6 +103,9 @@ class GovNoticesModel(BaseModel):
     type: Literal["gov_notices"] = "gov_notices"
     query: str
     items: List[GovNoticeItemModel] = []
+    # 소스별 수집 상태 {"nipa": {"status": "ok"|"timeout"|"error", "count", "elapsed_ms", "error"?}, ...}
+    sources: Dict[str, Dict[str, Any]] = {}
+    errors: List[str] = []         # 시간 초과/실패한 소스 ("pps: TimeoutError: 12s 초과")
     
     
 GovNoticeItem = GovNoticeItemModel
@@ -58,7 +58,11 @@ def render_day1(query: str, payload: Dict[str, Any]) -> str:
             if matched:
                 lines.append(f"  - 부정 키워드 매칭: {', '.join(matched[:10])}")
 
-            # 두 줄 발췌
+            # 두 줄 발췌 (매칭 오프셋으로 **키워드** 강조한 risk_excerpt 우선)
+            excerpt = (r.get("risk_excerpt") or "").strip()
+            if excerpt:
+                lines.append(f"  > {excerpt}")
+                continue
             raw = (r.get("content") or r.get("snippet") or "").strip().replace("\n"," ")
             if raw:
                 excerpt = raw[:280].rstrip()
@@ -96,6 +100,11 @@ def render_day1(query: str, payload: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+def _page_label(c: dict) -> str:
+    """근거의 페이지 표기 (span 청크가 기록한 meta.page, 없으면 빈칸)."""
+    page = c.get("page") or (c.get("meta") or {}).get("page")
+    return f"p.{page}" if page else ""
+
 def render_day2(query: str, payload: dict) -> str:
     """
     Day2 렌더러:
@@ -147,8 +156,8 @@ def render_day2(query: str, payload: dict) -> str:
         if contexts:
             lines.append("## 근거(Top-K)")
             lines.append("")
-            lines.append("| rank | score | path | chunk_id | excerpt |")
-            lines.append("|---:|---:|---|---:|---|")
+            lines.append("| rank | score | path | page | chunk_id | excerpt |")
+            lines.append("|---:|---:|---|---:|---:|---|")
             for i, c in enumerate(contexts[:5], 1):  # 상위 5개만
                 score = f"{float(c.get('score', 0.0)):.3f}"
                 path = str(c.get("path") or c.get("meta", {}).get("path") or "")
@@ -167,7 +176,7 @@ def render_day2(query: str, payload: dict) -> str:
                     or c.get("chunk_index")
                     or ""
                 )
-                lines.append(f"| {i} | {score} | {path} | {chunk_id} | {excerpt} |")
+                lines.append(f"| {i} | {score} | {path} | {_page_label(c)} | {chunk_id} | {excerpt} |")
             lines.append("")
         
         # 웹 검색 보강 결과
@@ -296,8 +305,8 @@ def render_day2(query: str, payload: dict) -> str:
     if contexts:
         lines.append("## 근거(Top-K)")
         lines.append("")
-        lines.append("| rank | score | path | chunk_id | excerpt |")
-        lines.append("|---:|---:|---|---:|---|")
+        lines.append("| rank | score | path | page | chunk_id | excerpt |")
+        lines.append("|---:|---:|---|---:|---:|---|")
         for i, c in enumerate(contexts, 1):
             score = f"{float(c.get('score', 0.0)):.3f}"
             path = str(c.get("path") or c.get("meta", {}).get("path") or "")
@@ -321,7 +330,7 @@ def render_day2(query: str, payload: dict) -> str:
                 or ""
             )
 
-            lines.append(f"| {i} | {score} | {path} | {chunk_id} | {excerpt} |")
+            lines.append(f"| {i} | {score} | {path} | {_page_label(c)} | {chunk_id} | {excerpt} |")
         lines.append("")
     
     # ── 웹 검색 보강 결과 표시
@@ -367,6 +376,10 @@ def render_day3(query: str, payload: Dict[str, Any]) -> str:
             lines.append(f"| {src} | {title} | {agency} | {close or '-'} | {budget or '-'} | {url} |")
     else:
         lines.append("관련 공고를 찾지 못했습니다.")
+    errors = payload.get("errors") or []
+    if errors:
+        lines.append("")
+        lines.append("*일부 출처는 시간 안에 응답하지 않았거나 실패해 제외됨: " + "; ".join(errors) + "*")
         
     has_atts = any(it.get("attachments") for it in items)
     if has_atts:
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+기업 개요(profile) 작업 지연 비교 (로컬 가짜 Tavily 서버)
+- 로컬 HTTP 서버가 Tavily /search, /extract를 흉내 냄 (요청마다 --search_ms / --extract_ms 지연)
+    · /search: include_raw_content=True면 시나리오에 따라 상위 결과에 raw_content를 붙임
+    · /extract: {"url": ...} 단건, {"urls": [...]} 배치 모두 지원 (배치도 1번의 지연)
+- 시나리오: raw2(상위 2개 모두 원문 있음) / raw1(1개만) / raw0(없음)
+- 비교 (요약기는 지연 없는 가짜 → 네트워크 왕복만 측정, 추출 캐시는 꺼서 콜드 상태로):
+    · serial : 검색 → URL별 extract_text 직렬 (기존 동기 경로)
+    · gather : 검색 → URL별 aextract_text 동시 (이전 비동기 경로)
+    · batched: 검색 원문 재사용 → 남은 URL만 aextract_texts 1회 (현재 경로)
+- 마지막으로 추출 캐시를 켜고 추적 파라미터/끝 '/'만 다른 URL로 다시 돌려 정규형 URL 캐시 적중 확인
+
+사용 예:
+python -m student.day1.bench_profile
+python -m student.day1.bench_profile --search_ms 600 --extract_ms 900 --rounds 5
+"""
+
+from __future__ import annotations
+import os, sys, json, time, tempfile, argparse, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ["TAVILY_CACHE"] = "0"   # 콜드 비교 (임포트 전에)
+
+from student.common.http_client import run_sync
+from student.day1.impl import tavily_client
+from student.day1.impl.web_search import (
+    search_company_profile, asearch_company_profile, aextract_and_summarize_profile, profile_raw_contents,
+    _profile_prompt,
+)
+
+BODY = "회사 소개 " * 400   # 500자 넘는 본문
+
+class _Fixture:
+    search_s = 0.4
+    extract_s = 0.6
+    requests: Dict[str, int] = {"search": 0, "extract": 0}
+    lock = threading.Lock()
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        kind = self.path.strip("/")
+        with _Fixture.lock:
+            _Fixture.requests[kind] = _Fixture.requests.get(kind, 0) + 1
+        if kind == "search":
+            time.sleep(_Fixture.search_s)
+            scenario = body.get("query", "").split()[0]          # "raw2 ...", "raw1 ...", "raw0 ..."
+            n_raw = int(scenario[-1]) if scenario[-1:].isdigit() else 0
+            results = []
+            for i in range(int(body.get("max_results") or 2)):
+                r = {"url": f"https://ko.wikipedia.org/wiki/{scenario}_{i}?utm_source=x", "title": f"{scenario} {i}",
+                     "content": "요약", "score": 0.9 - i * 0.1}
+                if body.get("include_raw_content") and i < n_raw:
+                    r["raw_content"] = BODY
+                results.append(r)
+            out: Dict[str, Any] = {"results": results}
+        else:
+            time.sleep(_Fixture.extract_s)
+            urls = body.get("urls") or [body.get("url")]
+            out = {"results": [{"url": u, "raw_content": BODY} for u in urls]}
+            if "url" in body:
+                out["content"] = BODY
+        data = json.dumps(out, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.wfile.flush()
+
+def _fake_summarizer(prompt: str) -> str:
+    return f"{prompt.count('[https://')}개 자료 요약"
+
+def _serial(query: str, key: str) -> str:
+    """기존 동기 경로: 검색 → URL별 추출 직렬."""
+    res = search_company_profile(query, key, topk=2)
+    urls = [tavily_client.extract_url(r["url"]) for r in res][:2]
+    texts = []
+    for u in urls:
+        t = tavily_client.extract_text(u, key)[:6000]
+        if len(t) > 500:
+            texts.append(f"[{u}]\n{t}")
+    return _fake_summarizer(_profile_prompt(texts)) if texts else ""
+
+async def _gather(query: str, key: str) -> str:
+    """이전 비동기 경로: 검색 → URL별 추출 동시."""
+    import asyncio
+    res = await asearch_company_profile(query, key, topk=2)
+    urls = [tavily_client.extract_url(r["url"]) for r in res][:2]
+    got = await asyncio.gather(*(tavily_client.aextract_text(u, key) for u in urls))
+    texts = [f"[{u}]\n{t[:6000]}" for u, t in zip(urls, got) if len(t[:6000]) > 500]
+    return _fake_summarizer(_profile_prompt(texts)) if texts else ""
+
+async def _batched(query: str, key: str) -> str:
+    """현재 경로 (Day1Agent._aprofile과 같음)."""
+    res = await asearch_company_profile(query, key, topk=2)
+    urls = [tavily_client.extract_url(r["url"]) for r in res][:2]
+    return await aextract_and_summarize_profile(urls, key, _fake_summarizer, raw_contents=profile_raw_contents(res))
+
+def main(argv: List[str] | None = None):
+    ap = argparse.ArgumentParser(description="기업 개요 작업 지연 비교 (가짜 Tavily)")
+    ap.add_argument("--search_ms", type=float, default=400)
+    ap.add_argument("--extract_ms", type=float, default=600)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args(argv)
+    _Fixture.search_s, _Fixture.extract_s = args.search_ms / 1000, args.extract_ms / 1000
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    tavily_client.TAVILY_BASE = f"http://127.0.0.1:{srv.server_address[1]}"
+    key = "bench-key"
+    print(f"[BENCH] search={args.search_ms:g}ms extract={args.extract_ms:g}ms rounds={args.rounds}")
+    try:
+        paths = {"serial": lambda q: _serial(q, key), "gather": lambda q: run_sync(_gather(q, key)),
+                 "batched": lambda q: run_sync(_batched(q, key))}
+        for scenario in ("raw2", "raw1", "raw0"):
+            line, outs = f"  {scenario}:", {}
+            for name, fn in paths.items():
+                _Fixture.requests = {"search": 0, "extract": 0}
+                t0 = time.perf_counter()
+                for i in range(args.rounds):
+                    outs[name] = fn(f"{scenario} 회사{i} 기업 개요")
+                dt = (time.perf_counter() - t0) / args.rounds
+                line += f"  {name} {dt * 1000:6.0f}ms (extract req {_Fixture.requests['extract'] / args.rounds:.0f})"
+            same = len(set(outs.values())) == 1
+            print(line + f"  same={same}")
+
+        # 정규형 URL 캐시: 같은 문서를 추적 파라미터/끝 '/'만 다르게 다시 추출
+        os.environ["TAVILY_CACHE"] = "1"
+        os.environ["TAVILY_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "tavily.sqlite")
+        urls = ["https://Example.com/a/", "https://example.com/b?x=1&y=2"]
+        run_sync(tavily_client.aextract_texts(urls, key))
+        _Fixture.requests = {"search": 0, "extract": 0}
+        t0 = time.perf_counter()
+        again = run_sync(tavily_client.aextract_texts(["https://example.com/a?utm_source=feed", "https://example.com:443/b/?y=2&x=1#top"], key))
+        print(f"  canonical cache: {(time.perf_counter() - t0) * 1000:.0f}ms, extract req {_Fixture.requests['extract']}, "
+              f"hits={sum(bool(t) for t in again.values())}/2")
+    finally:
+        srv.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+시세 조회 벤치마크 (가짜 yfinance 모듈)
+- 벤치마크 동안만 sys.modules["yfinance"]를 지연이 있는 가짜 모듈로 바꿈 (네트워크/yfinance 설치 불필요)
+    · Ticker(sym).fast_info: 심볼마다 왕복 --rtt_ms
+    · download(tickers, threads=N): 심볼마다 요청 1번을 N개씩 동시에 (yfinance 내부 스레드와 같은 방식)
+    · 모르는 심볼(OTT, AI 등)은 데이터 없음 + shared._ERRORS에 "possibly delisted" 메시지
+- 비교: 기존 get_quotes(심볼별 Ticker/fast_info 직렬) vs QuoteService(배치 + TTL 캐시 + 음수 캐시)
+  같은 질의 묶음을 --rounds번 반복 (1회차 = 콜드, 이후 = 캐시)
+- 출력: 방식별 총 시간/질의당 평균, 결과가 기존과 같은지(same), 캐시 통계
+
+사용 예:
+python -m student.day1.bench_quotes
+python -m student.day1.bench_quotes --rtt_ms 150 --rounds 5
+"""
+
+from __future__ import annotations
+import sys, time, types, argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+PRICES: Dict[str, tuple] = {
+    "NFLX": (1201.5, "USD"), "DIS": (112.3, "USD"), "WBD": (11.8, "USD"), "PARA": (11.2, "USD"),
+    "CMCSA": (37.9, "USD"), "SONY": (23.4, "USD"), "035420.KS": (214500.0, "KRW"), "035720.KS": (38650.0, "KRW"),
+    "253450.KQ": (61200.0, "KRW"), "9984.T": (8943.0, "JPY"),
+}
+
+# 질의 1건 = 질의에서 뽑힌 티커 목록 (티커처럼 보이는 일반 단어 포함)
+QUERIES: List[List[str]] = [
+    ["NFLX", "DIS", "WBD", "PARA"],
+    ["OTT", "NFLX", "AI"],
+    ["035420", "035720", "253450.KQ"],
+    ["SONY", "9984.T", "CMCSA", "DIS"],
+    ["AI", "OTT", "KPI"],
+    ["NFLX", "035420"],
+]
+
+def _fake_yfinance(rtt: float):
+    import pandas as pd
+    yf = types.ModuleType("yfinance")
+    yf.shared = types.SimpleNamespace(_ERRORS={})
+    calls = {"requests": 0}
+
+    def roundtrip():
+        calls["requests"] += 1
+        time.sleep(rtt)
+
+    class Ticker:
+        def __init__(self, sym: str):
+            self.sym = sym
+
+        @property
+        def fast_info(self):
+            roundtrip()
+            price, cur = PRICES.get(self.sym, (None, None))
+            return {"last_price": price, "currency": cur}
+
+    def download(tickers, period="5d", interval="1d", threads=True, **_):
+        syms = [tickers] if isinstance(tickers, str) else list(tickers)
+        yf.shared._ERRORS = {}
+        n = max(1, int(threads) if not isinstance(threads, bool) else (len(syms) if threads else 1))
+        with ThreadPoolExecutor(max_workers=n) as ex:
+            list(ex.map(lambda _: roundtrip(), syms))
+        idx = pd.date_range("2026-10-12", periods=5, freq="D")
+        cols = {}
+        for s in syms:
+            price = PRICES.get(s, (None,))[0]
+            if price is None:
+                yf.shared._ERRORS[s] = f"${s}: possibly delisted; no price data found (period={period})"
+            cols[("Close", s)] = [price * (1 - 0.01 * k) if price else float("nan") for k in range(4, -1, -1)]
+            cols[("Open", s)] = cols[("Close", s)]
+        df = pd.DataFrame(cols, index=idx)
+        df.columns = pd.MultiIndex.from_tuples(df.columns, names=["Price", "Ticker"])
+        return df
+
+    yf.Ticker, yf.download = Ticker, download
+    return yf, calls
+
+def _legacy_get_quotes(symbols: List[str]) -> List[Dict[str, Any]]:
+    """기존 get_quotes (심볼별 Ticker/fast_info 직렬)."""
+    from yfinance import Ticker  # type: ignore
+    from student.day1.impl.finance_client import _normalize_symbol
+    out: List[Dict[str, Any]] = []
+    for raw in symbols:
+        sym = _normalize_symbol(raw)
+        fi = Ticker(sym).fast_info
+        price, currency = fi.get("last_price"), fi.get("currency")
+        if price is None or currency is None:
+            out.append({"symbol": sym, "error": "No fast_info (price/currency missing)"})
+        else:
+            out.append({"symbol": sym, "price": float(price), "currency": currency})
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="시세 조회 벤치마크 (가짜 yfinance)")
+    ap.add_argument("--rtt_ms", type=float, default=120)
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--workers", type=int, default=8)
+    args = ap.parse_args()
+
+    from student.day1.impl.quote_service import QuoteService, YFinanceSource
+    yf, calls = _fake_yfinance(args.rtt_ms / 1000)
+    saved = sys.modules.get("yfinance")
+    sys.modules["yfinance"] = yf
+    try:
+        n_q = len(QUERIES) * args.rounds
+        print(f"[BENCH] queries={len(QUERIES)} x rounds={args.rounds}  rtt={args.rtt_ms:g}ms")
+
+        calls["requests"] = 0
+        t0 = time.perf_counter()
+        legacy = [_legacy_get_quotes(q) for _ in range(args.rounds) for q in QUERIES]
+        dt = time.perf_counter() - t0
+        print(f"  serial fast_info : {dt:6.2f}s  ({dt / n_q * 1000:6.1f} ms/query, requests={calls['requests']})")
+
+        svc = QuoteService(YFinanceSource(args.workers), max_workers=args.workers)
+        calls["requests"] = 0
+        res, per_round = [], []
+        for _ in range(args.rounds):
+            t0 = time.perf_counter()
+            res += [svc.get_quotes(q) for q in QUERIES]
+            per_round.append(time.perf_counter() - t0)
+        dt = sum(per_round)
+        # 가격은 배치 다운로드의 마지막 종가 → 기존 fast_info.last_price와 같은 값이어야 함
+        same = [[{k: r.get(k) for k in ("symbol", "price", "currency")} for r in q] for q in res] == \
+               [[{k: r.get(k) for k in ("symbol", "price", "currency")} for r in q] for q in legacy]
+        print(f"  quote service    : {dt:6.2f}s  ({dt / n_q * 1000:6.1f} ms/query, requests={calls['requests']}, same={same})")
+        print("    rounds: " + ", ".join(f"{x * 1000:.0f}ms" for x in per_round))
+        print(f"    stats: {svc.stats()}")
+    finally:
+        if saved is None:
+            sys.modules.pop("yfinance", None)
+        else:
+            sys.modules["yfinance"] = saved
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+트렌드 스코어링 벤치마크 (합성 검색량 행렬)
+- (days × topics) 합성 시계열: 토픽별 기준 수준 × 추세 × 잡음, 일부 결측(NaN)/전부 0/데이터 없는 토픽 포함
+- 비교:
+    · 기존 토픽별 루프(_split_windows + _safe_mean + _pct, iterrows 렌더) — 아래 _legacy_* 에 그대로 보관
+    · score_multisource(NumPy 엔진) + 새 렌더
+    · trend_engine.score_frame 창 설정 여러 개를 한 번에
+- 결과 비교: 점수 표(순서 포함)와 렌더된 마크다운이 기존과 같은지(same), 모멘텀 최대 오차
+
+사용 예:
+python -m student.day1.bench_trend
+python -m student.day1.bench_trend --topics 10000 --days 90 --windows 14/14,7/7,28/28
+"""
+
+from __future__ import annotations
+import sys, math, time, argparse
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from student.day1.impl import multi_score as ms
+from student.day1.impl.trend_engine import score_frame
+
+def _legacy_score(topics: List[str], naver_ts: pd.DataFrame, recent_days: int = 14, base_days: int = 14) -> pd.DataFrame:
+    """기존 score_multisource (토픽별 루프)."""
+    rows = []
+    for t in topics:
+        n_mom = None
+        if t in getattr(naver_ts, "columns", []):
+            nr, np_ = ms._split_windows(naver_ts[t], recent_days, base_days)
+            n_mom = ms._pct(ms._safe_mean(nr), ms._safe_mean(np_))
+        score = float(n_mom) if (n_mom is not None and math.isfinite(float(n_mom))) else 0.0
+        rows.append({
+            "topic": t,
+            "naver_mom": None if n_mom is None else round(float(n_mom), 2),
+            "naver_available": (n_mom is not None and math.isfinite(float(n_mom))),
+            "trend_score": round(score, 2),
+        })
+    return pd.DataFrame(rows).set_index("topic").sort_values("trend_score", ascending=False)
+
+def _legacy_render_rows(score_df: pd.DataFrame) -> List[str]:
+    """기존 render_multisource_markdown의 하이라이트/표 부분 (iterrows)."""
+    fd, lines = ms._fmt_delta, []
+    top_up = score_df.head(5)
+    top_down = score_df.tail(5).sort_values("trend_score")
+    lines.append("## 하이라이트")
+    for t, row in top_up.iterrows():
+        lines.append(f"- **{t} {fd(row.get('naver_mom'), bool(row.get('naver_available')))} 검색 변화** (네이버 {fd(row.get('naver_mom'), bool(row.get('naver_available')))})")
+    if len(score_df) > 7:
+        lines.append("")
+        for t, row in top_down.iterrows():
+            lines.append(f"- **{t} 언급/관심 하락** (네이버 {fd(row.get('naver_mom'), bool(row.get('naver_available')))})")
+    lines.append("")
+    lines.append("## 종합 순위(합성 스코어 기준)")
+    lines.append("| 순위 | 토픽 | 네이버 모멘텀 | 합성 스코어 |")
+    lines.append("|---:|---|---:|---:|")
+    for i, (t, row) in enumerate(score_df.iterrows(), 1):
+        lines.append(f"| {i} | {t} | {fd(row.get('naver_mom'), bool(row.get('naver_available')))} | {row.get('trend_score'):.1f} |")
+    return lines
+
+def _synthetic(topics: int, days: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    level = rng.lognormal(2.0, 1.0, topics)
+    trend = rng.normal(0.0, 0.01, topics)
+    t = np.arange(days)[:, None]
+    mat = level * np.exp(trend * t) * rng.uniform(0.8, 1.2, (days, topics))
+    mat[rng.random((days, topics)) < 0.02] = np.nan          # 날짜 결측
+    mat[:, rng.random(topics) < 0.01] = 0.0                   # 검색량 0인 토픽
+    mat[:, rng.random(topics) < 0.005] = np.nan               # 응답에 없던 토픽(전부 NaN)
+    idx = pd.date_range(end="2026-10-17", periods=days, freq="D")
+    return pd.DataFrame(np.round(mat, 5), index=idx, columns=[f"topic_{i:05d}" for i in range(topics)])
+
+def _best(fn, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="트렌드 스코어링 벤치마크 (기존 루프 vs NumPy 엔진)")
+    ap.add_argument("--topics", type=int, default=10000)
+    ap.add_argument("--days", type=int, default=90)
+    ap.add_argument("--windows", default="14/14,7/7,28/28")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    ts = _synthetic(args.topics, args.days, args.seed)
+    topics = list(ts.columns) + ["missing_topic"]            # 행렬에 없는 토픽도 섞음
+    windows = [tuple(int(x) for x in w.split("/")) for w in args.windows.split(",") if w.strip()]
+    print(f"[BENCH] topics={len(topics):,} days={args.days} windows={windows}")
+
+    t_old, old = _best(lambda: _legacy_score(topics, ts), 1)
+    t_new, new = _best(lambda: ms.score_multisource(topics, ts), args.repeat)
+    same = old.index.equals(new.index) and old.equals(new)
+    print(f"  score  legacy loop : {t_old * 1000:9.1f} ms")
+    print(f"  score  numpy engine: {t_new * 1000:9.1f} ms  (x{t_old / max(t_new, 1e-9):.0f}, same={same})")
+
+    r_old, lo = _best(lambda: _legacy_render_rows(old), 1)
+    r_new, md = _best(lambda: ms.render_multisource_markdown(new, "t", "q"), args.repeat)
+    tail = md.split("\n")[md.split("\n").index("## 하이라이트"):]
+    print(f"  render iterrows    : {r_old * 1000:9.1f} ms")
+    print(f"  render zip         : {r_new * 1000:9.1f} ms  (x{r_old / max(r_new, 1e-9):.0f}, same={tail == lo})")
+
+    t_multi, res = _best(lambda: score_frame(ts, topics, windows), args.repeat)
+    print(f"  engine {len(windows)} windows   : {t_multi * 1000:9.1f} ms  (+ z-score/순위)")
+    for w in windows:
+        ref = _legacy_score(topics, ts, *w)["naver_mom"].reindex(topics).to_numpy(dtype=float)
+        got = res[w].momentum
+        fin = np.isfinite(ref) & np.isfinite(got)
+        err = float(np.max(np.abs(ref[fin] - np.round(got[fin], 2)))) if fin.any() else 0.0
+        top = [topics[i] for i in np.argsort(res[w].rank)[:3]]
+        print(f"    {w[0]:>2}/{w[1]:<2}: max |Δmomentum| {err:.2g}, nan/inf 일치={bool((np.isfinite(ref) == np.isfinite(got)).all())}, top3={top}")
+
+if __name__ == "__main__":
+    main()
@@ -2,38 +2,49 @@
 """
 Day1 본체
 - 역할: 웹 검색 / 주가 / 기업개요(추출+요약)를 병렬로 수행하고 결과를 정규 스키마로 병합
+- 병렬 실행: 프로세스 공용 이벤트 루프(http_client.shared_loop) 위의 asyncio 작업
+    · HTTP 작업(web/risk/profile)은 공용 비동기 연결 풀 사용 → 동시에 들어온 여러 질의도 연결을 공유
+    · 동기 라이브러리 작업(yfinance 주가, DataLab+pandas 트렌드, 요약 LLM)은 루프의 스레드 풀에서
+    · 작업별 타임아웃(JOB_TIMEOUT_SCALE × request_timeout, 환경변수 DAY1_TIMEOUT_<작업>초로 덮어쓰기)
+      → 시간 안에 끝난 작업 결과만으로 응답, 초과한 작업은 errors에 기록
+- handle()은 기존과 같은 동기 인터페이스 (내부에서 ahandle()을 공용 루프에 올려 기다림)
 """
 
 from __future__ import annotations
 from dataclasses import asdict
-from typing import Optional, Dict, Any, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os, asyncio
+from typing import Optional, Dict, Any, List, Tuple, Awaitable
 
 from google.adk.models.lite_llm import LiteLlm
+from ...common.llm_cache import CachedLiteLlm, complete_text
 from ...common.schemas import Day1Plan
+from ...common.http_client import run_sync
 from .merge import merge_day1_payload
 # 외부 I/O
-from .tavily_client import search_tavily, extract_url
+from .tavily_client import asearch_tavily, extract_url
 from .finance_client import get_quotes
 from .web_search import (
     looks_like_ticker,
-    search_company_profile,
-    extract_and_summarize_profile,
-    search_risk_issues,     # 리스크 기능 추가
+    asearch_company_profile,
+    aextract_and_summarize_profile,
+    profile_raw_contents,
+    asearch_risk_issues,    # 리스크 기능 추가
 )
 from .multi_score import run_multisource_trend_report
 
 DEFAULT_WEB_TOPK = 6
-MAX_WORKERS = 4
 DEFAULT_TIMEOUT = 20
+# 작업별 타임아웃 = request_timeout × 배수 (profile은 검색→추출→요약, trend는 DataLab 여러 번 호출)
+JOB_TIMEOUT_SCALE = {"web": 1.0, "stock": 1.0, "risk": 1.0, "profile": 2.0, "trend": 2.0}
 
 # ------------------------------------------------------------------------------
 # TODO[DAY1-I-01] 요약용 경량 LLM 준비
 #  - 목적: 기업 개요 본문을 Extract 후 간결 요약
 #  - LiteLlm(model="openai/gpt-4o-mini") 형태로 _SUM에 할당
+#  - 같은 회사의 개요 프롬프트가 반복되므로 디스크 캐시 래퍼(CachedLiteLlm, site=day1_summary) 사용
 # ------------------------------------------------------------------------------
 # 정답 구현:
-_SUM: Optional[LiteLlm] = LiteLlm(model="openai/gpt-4o-mini")
+_SUM: Optional[LiteLlm] = CachedLiteLlm(model="openai/gpt-4o-mini", cache_site="day1_summary")
 
 
 def _summarize(text: str) -> str:
@@ -52,9 +63,8 @@ def _summarize(text: str) -> str:
     if _SUM is None:
         return ""
     try:
-        resp = _SUM.invoke(text)
-        # google.adk LiteLlm 응답 형태: resp.content.parts[0].text (동일 패턴 유지)
-        return getattr(resp.content.parts[0], "text", "") or ""
+        # LiteLlm에는 invoke가 없음 → 사용자 메시지 1개짜리 요청을 generate_content_async로 (캐시 경유)
+        return complete_text(_SUM, text, temperature=0)  # 0을 명시해야 캐시 대상
     except Exception:
         return ""
 
@@ -78,34 +88,65 @@ class Day1Agent:
         self.web_topk = web_topk
         self.request_timeout = request_timeout
 
+    def _timeout(self, kind: str) -> float:
+        try:
+            return float(os.environ[f"DAY1_TIMEOUT_{kind.upper()}"])
+        except (KeyError, ValueError):
+            return self.request_timeout * JOB_TIMEOUT_SCALE.get(kind, 1.0)
+
     def handle(self, query: str, plan: Day1Plan) -> Dict[str, Any]:
         """
-        병렬 파이프라인:
+        동기 진입점 (Day1 _handle 호환): ahandle()을 공용 이벤트 루프에서 실행해 결과를 반환.
+        """
+        deadline = max(self._timeout(k) for k in JOB_TIMEOUT_SCALE) + 5  # 작업별 타임아웃이 먼저 걸리도록 여유
+        return run_sync(self.ahandle(query, plan), timeout=deadline)
+
+    async def _aprofile(self, q: str) -> Tuple[str, List[str]]:
+        # 검색(원문 포함) → 상위 URL 정제 → 원문 없는 URL만 배치 추출 1회 → 요약
+        search_res = await asearch_company_profile(q, self.tavily_api_key, topk=2, timeout=self.request_timeout)
+        urls = [extract_url(r.get("url")) for r in (search_res or []) if r.get("url")]
+        urls = [u for u in urls if u][:2]
+        if not urls:
+            return "", []
+        summary = await aextract_and_summarize_profile(urls, self.tavily_api_key, summarizer=_summarize,
+                                                       raw_contents=profile_raw_contents(search_res))
+        return summary or "", urls
+
+    @staticmethod
+    def _trend(plan: Day1Plan) -> Tuple[str, List[Dict[str, Any]]]:
+        out = run_multisource_trend_report(
+            topics=plan.trend_topics,
+            days=getattr(plan, "trend_days", 90),
+            recent_days=getattr(plan, "trend_recent_days", 14),
+            base_days=getattr(plan, "trend_base_days", 14),
+        )
+        # score_df 는 pandas DF — 직렬화가 필요하면 records로
+        score_df = out.get("score_df")
+        scores = []
+        if score_df is not None and getattr(score_df, "empty", True) is False:
+            try:
+                scores = score_df.reset_index().to_dict(orient="records")
+            except Exception:
+                pass
+        return out.get("markdown") or "", scores
+
+    async def ahandle(self, query: str, plan: Day1Plan) -> Dict[str, Any]:
+        """
+        병렬 파이프라인 (asyncio):
           1) results 스켈레톤 만들기
              results = {"type":"web_results","query":query,"analysis":asdict(plan),"items":[],
                         "tickers":[], "errors":[], "company_profile":"", "profile_sources":[]}
-          2) ThreadPoolExecutor(max_workers=MAX_WORKERS)에서 작업 제출:
-             - plan.do_web: search_tavily(검색어, 키, top_k=self.web_topk, timeout=...)
-             - plan.do_stocks: get_quotes(plan.tickers)
+          2) 작업 구성 (조건은 기존과 동일):
+             - plan.do_web: asearch_tavily(검색어, 키, top_k=self.web_topk, timeout=...)
+             - plan.do_stocks: get_quotes(plan.tickers) (스레드)
              - (기업개요) looks_like_ticker(query) 또는 plan에 tickers가 있을 때:
-                 · search_company_profile(query, api_key, topk=2) → URL 상위 1~2개
-                 · extract_and_summarize_profile(urls, api_key, summarizer=_summarize)
-          3) as_completed로 결과 수집. 실패 시 results["errors"]에 '작업명:에러' 저장.
+                 · asearch_company_profile(query, api_key, topk=2) → URL 상위 1~2개
+                 · aextract_and_summarize_profile(urls, api_key, summarizer=_summarize, raw_contents=검색 원문)
+             - plan.do_risk: asearch_risk_issues(...)
+             - plan.do_trend: run_multisource_trend_report(...) (스레드)
+          3) 작업마다 타임아웃을 걸어 동시에 실행. 실패/초과 시 results["errors"]에 '작업명:에러' 저장.
           4) merge_day1_payload(results) 호출해 최종 표준 스키마 dict 반환.
         """
-        # ----------------------------------------------------------------------------
-        # TODO[DAY1-I-04] 구현 지침(권장 구조)
-        #  - results 초기화 (위 키 포함)
-        #  - futures 딕셔너리: future -> "web"/"stock"/"profile" 등 라벨링
-        #  - 병렬 제출 조건 체크(plan.do_web, plan.do_stocks, 기업개요 조건)
-        #  - 완료 수집:
-        #      kind == "web"    → results["items"] = data
-        #      kind == "stock"  → results["tickers"] = data
-        #      kind == "profile"→ results["company_profile"] = text; results["profile_sources"] = urls(옵션)
-        #  - 예외: results["errors"].append(f"{kind}: {type(e).__name__}: {e}")
-        #  - return merge_day1_payload(results)
-        # ----------------------------------------------------------------------------
-        # 정답 구현:
         results: Dict[str, Any] = {
             "type": "web_results",
             "query": query,
@@ -120,89 +161,61 @@ class Day1Agent:
             "trend_scores": [],
         }
 
-        futures = {}
-        def submit_profile_job(q: str):
-            # 검색 → 상위 URL 정제 → 추출/요약까지 한 번에 처리
-            def job() -> Tuple[str, List[str]]:
-                search_res = search_company_profile(q, self.tavily_api_key, topk=2, timeout=self.request_timeout)
-                urls = [extract_url(r.get("url")) for r in (search_res or []) if r.get("url")]
-                urls = [u for u in urls if u][:2]
-                if not urls:
-                    return "", []
-                summary = extract_and_summarize_profile(urls, self.tavily_api_key, summarizer=_summarize)
-                return summary or "", urls
-            return job
-
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
-            # 웹 검색
-            if plan.do_web:
-                q = " ".join(plan.web_keywords) if plan.web_keywords else query
-                futures[ex.submit(search_tavily, q, self.tavily_api_key, self.web_topk, self.request_timeout)] = "web"
-            # 주가
-            if plan.do_stocks and plan.tickers:
-                futures[ex.submit(get_quotes, plan.tickers, self.request_timeout)] = "stock"
-            # 기업개요: 질의가 티커처럼 보이거나, 계획에 티커가 있는 경우 시도
-            if looks_like_ticker(query) or (plan.tickers and len(plan.tickers) > 0) or ("기업" in query or "회사" in query or "profile" in query.lower()):
-                futures[ex.submit(submit_profile_job(query))] = "profile"
-
-            # 투자 리스크 모니터링
-            if getattr(plan, "do_risk", False):
-                futures[ex.submit(
-                    search_risk_issues,
-                    query, self.tavily_api_key,
-                    topk=getattr(plan, "risk_topk", 8),
-                    timeout=self.request_timeout,
-                    trust_only=getattr(plan, "risk_trust_only", True),
-                    time_range=getattr(plan, "risk_time_range", "y"),
-                    extra_keywords=getattr(plan, "risk_keywords", []) or []
-                )] = "risk"
-
-            # 신규: 트렌드
-            if getattr(plan, "do_trend", False) and getattr(plan, "trend_topics", []):
-                def _trend_job():
-                    out = run_multisource_trend_report(
-                        topics=plan.trend_topics,
-                        days=getattr(plan, "trend_days", 90),
-                        recent_days=getattr(plan, "trend_recent_days", 14),
-                        base_days=getattr(plan, "trend_base_days", 14),
-                    )
-                    # score_df 는 pandas DF — 직렬화가 필요하면 records로
-                    score_df = out.get("score_df")
-                    scores = []
-                    if score_df is not None and getattr(score_df, "empty", True) is False:
-                        try:
-                            scores = score_df.reset_index().to_dict(orient="records")
-                        except Exception:
-                            pass
-                    return out.get("markdown") or "", scores
-
-                futures[ex.submit(_trend_job)] = "trend"
-
-            for fut in as_completed(futures):
-                kind = futures[fut]
-                try:
-                    data = fut.result(timeout=self.request_timeout)
-                    if kind == "web":
-                        # search_tavily 표준 반환(list[dict]) 가정
-                        results["items"] = data or []
-                    elif kind == "stock":
-                        # get_quotes 표준 반환(list[dict]) 가정
-                        results["tickers"] = data or []
-                    elif kind == "profile":
-                        # (summary, urls)
-                        summary, urls = data if isinstance(data, tuple) else ("", [])
-                        if summary:
-                            results["company_profile"] = summary
-                        if urls:
-                            results["profile_sources"] = urls[:2]
-                    elif kind == "risk":
-                        results["risk_items"] = data or []
-                    elif kind == "trend":
-                        md, scores = data if isinstance(data, tuple) else ("", [])
-                        results["trend_markdown"] = md
-                        results["trend_scores"] = scores
-                except Exception as e:
-                    results["errors"].append(f"{kind}: {type(e).__name__}: {e}")
+        jobs: Dict[str, Awaitable[Any]] = {}
+        # 웹 검색
+        if plan.do_web:
+            q = " ".join(plan.web_keywords) if plan.web_keywords else query
+            jobs["web"] = asearch_tavily(q, self.tavily_api_key, self.web_topk, self.request_timeout)
+        # 주가
+        if plan.do_stocks and plan.tickers:
+            jobs["stock"] = asyncio.to_thread(get_quotes, plan.tickers, self.request_timeout)
+        # 기업개요: 질의가 티커처럼 보이거나, 계획에 티커가 있는 경우 시도
+        if looks_like_ticker(query) or (plan.tickers and len(plan.tickers) > 0) or ("기업" in query or "회사" in query or "profile" in query.lower()):
+            jobs["profile"] = self._aprofile(query)
+        # 투자 리스크 모니터링
+        if getattr(plan, "do_risk", False):
+            jobs["risk"] = asearch_risk_issues(
+                query, self.tavily_api_key,
+                topk=getattr(plan, "risk_topk", 8),
+                timeout=self.request_timeout,
+                trust_only=getattr(plan, "risk_trust_only", True),
+                time_range=getattr(plan, "risk_time_range", "y"),
+                extra_keywords=getattr(plan, "risk_keywords", []) or []
+            )
+        # 신규: 트렌드
+        if getattr(plan, "do_trend", False) and getattr(plan, "trend_topics", []):
+            jobs["trend"] = asyncio.to_thread(self._trend, plan)
+
+        async def run(kind: str, job: Awaitable[Any]) -> Any:
+            limit = self._timeout(kind)
+            try:
+                return await asyncio.wait_for(job, limit)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"{limit:g}s 초과") from None
+
+        done = await asyncio.gather(*(run(k, j) for k, j in jobs.items()), return_exceptions=True)
+        for kind, data in zip(jobs, done):
+            if isinstance(data, BaseException):
+                results["errors"].append(f"{kind}: {type(data).__name__}: {data}")
+            elif kind == "web":
+                # search_tavily 표준 반환(list[dict]) 가정
+                results["items"] = data or []
+            elif kind == "stock":
+                # get_quotes 표준 반환(list[dict]) 가정
+                results["tickers"] = data or []
+            elif kind == "profile":
+                # (summary, urls)
+                summary, urls = data if isinstance(data, tuple) else ("", [])
+                if summary:
+                    results["company_profile"] = summary
+                if urls:
+                    results["profile_sources"] = urls[:2]
+            elif kind == "risk":
+                results["risk_items"] = data or []
+            elif kind == "trend":
+                md, scores = data if isinstance(data, tuple) else ("", [])
+                results["trend_markdown"] = md
+                results["trend_scores"] = scores
 
         # 표준 스키마로 병합
         return merge_day1_payload(results)
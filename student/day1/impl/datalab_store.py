@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+네이버 DataLab 검색량 시계열 저장소 (SQLite, 토픽별 일/주/월 ratio)
+- 기존 fetch_naver_datalab: 트렌드 질의마다 토픽 전체의 90일 시계열을 처음부터 다시 받음
+- 여기서는 토픽별로 받은 구간(coverage)과 값(points)을 보관 → 빠진 날짜만 요청
+    · 같은 날 같은 토픽을 다시 물으면 요청 0번
+    · 다음 날에는 새 날짜 + 마지막 REFRESH_DAYS일(집계가 늦게 확정되는 구간)만 다시 받음
+    · 요청 구간이 보관 구간보다 앞으로 길어지면(예: 90일 → 180일) 그 토픽은 전체를 다시 받아 교체
+- DataLab ratio는 "요청 안에서 최대값 = 100"인 상대값 → 요청마다 배율이 다름
+  이어 붙일 때는 이미 가진 날짜와 겹치게(OVERLAP_DAYS) 받아 겹친 구간 합의 비로 새 값을 기존 배율에 맞춤
+  (토픽별 모멘텀 = 최근/이전 평균 비는 배율과 무관하므로 점수는 그대로)
+  겹친 구간이 모두 0이라 배율을 정할 수 없으면 merge()가 False → 호출 쪽에서 전체 구간을 다시 받음
+- 설정: NAVER_DATALAB_CACHE=0이면 끔, 경로는 NAVER_DATALAB_CACHE_PATH (기본 data/cache/naver_datalab.sqlite)
+
+사용 예:
+store = get_datalab_store()
+store.plan("넷플릭스", "date", start, end, today)   # None(요청 불필요) 또는 (요청 시작, 요청 끝, 교체 여부)
+store.series(["넷플릭스", "티빙"], "date", start, end)   # {"넷플릭스": pd.Series, ...}
+python -m student.day1.impl.datalab_store          # 보관 현황
+python -m student.day1.impl.datalab_store --clear
+"""
+
+from __future__ import annotations
+import os, json, sqlite3, argparse, threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_STORE_PATH = "data/cache/naver_datalab.sqlite"
+OVERLAP_DAYS = int(os.getenv("NAVER_DATALAB_OVERLAP_DAYS", "7"))
+REFRESH_DAYS = int(os.getenv("NAVER_DATALAB_REFRESH_DAYS", "2"))
+_UNIT_DAYS = {"date": 1, "week": 7, "month": 31}
+
+Plan = Tuple[date, date, bool]   # (요청 시작, 요청 끝, 기존 값 교체 여부)
+
+class DataLabStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            " topic TEXT NOT NULL, unit TEXT NOT NULL, period TEXT NOT NULL, ratio REAL NOT NULL,"
+            " PRIMARY KEY (topic, unit, period)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            " topic TEXT NOT NULL, unit TEXT NOT NULL, start TEXT NOT NULL, end TEXT NOT NULL, fetched_on TEXT NOT NULL,"
+            " PRIMARY KEY (topic, unit))"
+        )
+
+    def coverage(self, topic: str, unit: str) -> Optional[Tuple[date, date, date]]:
+        with self._lock:
+            row = self._db.execute("SELECT start, end, fetched_on FROM coverage WHERE topic = ? AND unit = ?",
+                                   (topic, unit)).fetchone()
+        return tuple(date.fromisoformat(x) for x in row) if row else None  # type: ignore[return-value]
+
+    def plan(self, topic: str, unit: str, start: date, end: date, today: date) -> Optional[Plan]:
+        """[start, end]를 채우려면 무엇을 요청해야 하는지. None이면 보관 값으로 충분."""
+        cov = self.coverage(topic, unit)
+        if cov is None or cov[0] > start:
+            return start, end, True
+        c_start, c_end, fetched_on = cov
+        # fetched_on 기준 마지막 REFRESH_DAYS일은 아직 확정 전 → 다음 날 다시 받음
+        stable_until = fetched_on - timedelta(days=REFRESH_DAYS * _UNIT_DAYS.get(unit, 1))
+        if c_end >= end and (fetched_on >= today or end <= stable_until):
+            return None
+        tail_from = min(c_end, stable_until) + timedelta(days=1)
+        req_start = max(c_start, tail_from - timedelta(days=OVERLAP_DAYS * _UNIT_DAYS.get(unit, 1)))
+        return req_start, max(end, c_end), False
+
+    def merge(self, topic: str, unit: str, rows: Dict[str, float], plan: Plan, today: date) -> bool:
+        """요청 결과(period → ratio)를 보관. 이어 붙이기인데 배율을 정할 수 없으면 False (보관 값 그대로)."""
+        req_start, req_end, replace = plan
+        with self._lock:
+            if replace:
+                new_start = req_start
+                self._db.execute("BEGIN")
+                self._db.execute("DELETE FROM points WHERE topic = ? AND unit = ?", (topic, unit))
+                scaled = rows
+            else:
+                stored = dict(self._db.execute(
+                    "SELECT period, ratio FROM points WHERE topic = ? AND unit = ? AND period >= ?",
+                    (topic, unit, req_start.isoformat())).fetchall())
+                c_start = self._db.execute("SELECT start FROM coverage WHERE topic = ? AND unit = ?",
+                                           (topic, unit)).fetchone()
+                common = [p for p in rows if p in stored]
+                old_sum, new_sum = sum(stored[p] for p in common), sum(rows[p] for p in common)
+                if not c_start or old_sum <= 0 or new_sum <= 0:
+                    return False
+                factor = old_sum / new_sum
+                new_start = date.fromisoformat(c_start[0])
+                scaled = {p: v * factor for p, v in rows.items()}
+                self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO points(topic, unit, period, ratio) VALUES (?,?,?,?)",
+                [(topic, unit, p, float(v)) for p, v in scaled.items()],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO coverage(topic, unit, start, end, fetched_on) VALUES (?,?,?,?,?)",
+                (topic, unit, new_start.isoformat(), req_end.isoformat(), today.isoformat()),
+            )
+            self._db.execute("COMMIT")
+        return True
+
+    def series(self, topics: List[str], unit: str, start: date, end: date) -> Dict[str, pd.Series]:
+        """토픽별 [start, end] 시계열 (index=Timestamp). 보관 값이 없는 토픽은 빠짐."""
+        if not topics:
+            return {}
+        marks = ",".join("?" * len(topics))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT topic, period, ratio FROM points WHERE unit = ? AND topic IN ({marks})"
+                " AND period >= ? AND period <= ? ORDER BY topic, period",
+                (unit, *topics, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        by_topic: Dict[str, Tuple[List[str], List[float]]] = {}
+        for topic, period, ratio in rows:
+            idx, vals = by_topic.setdefault(topic, ([], []))
+            idx.append(period)
+            vals.append(ratio)
+        return {t: pd.Series(v, index=pd.to_datetime(i), dtype=float) for t, (i, v) in by_topic.items()}
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM points")
+            self._db.execute("DELETE FROM coverage")
+            self._db.execute("VACUUM")
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            topics = self._db.execute("SELECT COUNT(*) FROM coverage").fetchone()[0]
+            points = self._db.execute("SELECT COUNT(*) FROM points").fetchone()[0]
+        return {"topics": topics, "points": points, "path": self.path}
+
+# ---------- 프로세스 공용 저장소 ----------
+_STORES: Dict[str, DataLabStore] = {}
+_STORES_LOCK = threading.Lock()
+
+def get_datalab_store() -> Optional[DataLabStore]:
+    """NAVER_DATALAB_CACHE=0이면 None. 경로별로 1개."""
+    if os.getenv("NAVER_DATALAB_CACHE", "1").lower() in ("0", "false", "no", "n"):
+        return None
+    path = os.getenv("NAVER_DATALAB_CACHE_PATH", DEFAULT_STORE_PATH)
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            try:
+                store = DataLabStore(path)
+            except sqlite3.Error as e:
+                print(f"[WARN] DataLab 저장소를 열 수 없음 → 저장소 없이 진행: {path} ({e})")
+                return None
+            _STORES[path] = store
+        return store
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="네이버 DataLab 시계열 저장소 현황/비우기")
+    ap.add_argument("--clear", action="store_true")
+    args = ap.parse_args()
+    store = get_datalab_store()
+    if store is None:
+        print("[OK] NAVER_DATALAB_CACHE=0 (저장소 꺼짐)")
+    else:
+        if args.clear:
+            store.clear()
+        print(json.dumps(store.stats(), ensure_ascii=False, indent=2))
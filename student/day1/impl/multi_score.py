@@ -2,14 +2,20 @@
 from __future__ import annotations
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-import os, math, json
+from datetime import date, datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+import os, math, json, time, threading
 import pandas as pd
 import requests
 
-# 디버그 메시지 수집
-_DEBUG: List[str] = []
-def _dbg(msg: str): _DEBUG.append(msg)
+from ...common import http_client
+from .datalab_store import get_datalab_store
+from .trend_engine import score_frame
+
+# 디버그 메시지 수집 (호출마다 넘겨받은 리스트에 — 여러 리포트가 스레드에서 동시에 돌아도 섞이지 않게)
+def _dbg(debug: Optional[List[str]], msg: str):
+    if debug is not None:
+        debug.append(msg)
 
 # ---- 공통 유틸 ----
 def _now_kr() -> datetime:
@@ -34,81 +40,134 @@ def _safe_mean(s: pd.Series) -> float:
     return float(s.mean()) if s is not None and len(s) > 0 else 0.0
 
 # ---- NAVER DataLab (검색어트렌드) ----
-def _naver_headers() -> Optional[Dict[str, str]]:
+def _naver_headers(debug: Optional[List[str]] = None) -> Optional[Dict[str, str]]:
     cid = os.getenv("NAVER_CLIENT_ID")
     csec = os.getenv("NAVER_CLIENT_SECRET")
     if not (cid and csec):
-        _dbg("NAVER 키 미발견(.env 미로딩 또는 환경변수 미설정)")
+        _dbg(debug, "NAVER 키 미발견(.env 미로딩 또는 환경변수 미설정)")
         return None
     return {"X-Naver-Client-Id": cid, "X-Naver-Client-Secret": csec, "Content-Type": "application/json"}
 
-def fetch_naver_datalab(topics: List[str], days: int = 90, time_unit: str = "date") -> pd.DataFrame:
+NAVER_DATALAB_URL = "https://openapi.naver.com/v1/datalab/search"
+NAVER_GROUP_SIZE = 5   # keywordGroups 최대 5개/요청
+
+class _RateLimiter:
+    """요청 시작 간격을 1/qps초 이상으로 (여러 스레드 공용)."""
+    def __init__(self, qps: float):
+        self.interval = 1.0 / qps if qps > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def _datalab_call(headers: Dict[str, str], group: List[str], start: date, end: date, time_unit: str,
+                  limiter: _RateLimiter, debug: Optional[List[str]] = None) -> Optional[Dict[str, Dict[str, float]]]:
+    """DataLab 1회 호출 → {토픽: {period: ratio}}. 실패하면 None (데이터가 없는 토픽은 빈 dict)."""
+    payload = {
+        "startDate": start.isoformat(),
+        "endDate": end.isoformat(),
+        "timeUnit": time_unit,     # 'date'|'week'|'month'
+        "keywordGroups": [{"groupName": t, "keywords": [t]} for t in group],
+        "device": "", "ages": [], "gender": ""
+    }
+    limiter.wait()
+    try:
+        # 조회용 POST(과금/부작용 없음) → 5xx/읽기 타임아웃도 재시도
+        r = http_client.post(NAVER_DATALAB_URL, headers=headers, data=json.dumps(payload), timeout=30, idempotent=True)
+    except requests.RequestException as e:
+        _dbg(debug, f"NAVER 요청 오류: {e.__class__.__name__}({e})")
+        return None
+
+    if r.status_code != 200:
+        _dbg(debug, f"NAVER 응답 실패: status={r.status_code} body={r.text[:200]}")
+        return None
+
+    out: Dict[str, Dict[str, float]] = {t: {} for t in group}
+    for item in r.json().get("results", []):
+        title = item.get("title")
+        if title in out:
+            out[title] = {str(d.get("period"))[:10]: float(d.get("ratio", 0.0)) for d in item.get("data", []) or []}
+    if not any(out.values()):
+        _dbg(debug, f"NAVER 결과 비어있음(그룹={group})")
+    return out
+
+def _datalab_fetch_all(headers: Dict[str, str], jobs: Dict[str, Tuple[date, date]], time_unit: str,
+                       limiter: _RateLimiter, debug: Optional[List[str]] = None
+                       ) -> Dict[str, Tuple[Tuple[date, date], Dict[str, float]]]:
+    """토픽별 요청 구간 → 같은 구간끼리 5개씩 묶어 동시 호출. 반환: 토픽 → (구간, rows) (실패한 그룹은 빠짐)."""
+    by_range: Dict[Tuple[date, date], List[str]] = {}
+    for t, rng in jobs.items():
+        by_range.setdefault(rng, []).append(t)
+    calls = [(rng, ts[i:i + NAVER_GROUP_SIZE]) for rng, ts in by_range.items()
+             for i in range(0, len(ts), NAVER_GROUP_SIZE)]
+    if not calls:
+        return {}
+    workers = max(1, min(len(calls), int(os.getenv("NAVER_DATALAB_CONCURRENCY", "3"))))
+    out: Dict[str, Tuple[Tuple[date, date], Dict[str, float]]] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="datalab") as ex:
+        futs = [(rng, ex.submit(_datalab_call, headers, group, rng[0], rng[1], time_unit, limiter, debug))
+                for rng, group in calls]
+        for rng, fut in futs:
+            for t, rows in (fut.result() or {}).items():
+                out[t] = (rng, rows)
+    return out
+
+def fetch_naver_datalab(topics: List[str], days: int = 90, time_unit: str = "date",
+                        debug: Optional[List[str]] = None) -> pd.DataFrame:
     """
     네이버 DataLab 검색량 시계열 수집.
-    - 제약: keywordGroups 최대 5개/요청 → 5개씩 나눠 호출 후 outer join 병합
+    - 토픽별 시계열은 datalab_store(SQLite)에 보관 → 빠진 날짜만 요청 (같은 날 같은 질의면 요청 0번)
+    - 제약: keywordGroups 최대 5개/요청 → 5개씩 묶어 동시 호출
+      (동시 호출 수 NAVER_DATALAB_CONCURRENCY 기본 3, 초당 요청 NAVER_DATALAB_QPS 기본 5)
+    - 토픽 행렬은 마지막에 한 번에 조립 (반복 outer join 없음)
     - 반환: index=datetime, columns=topics
+    - 값은 토픽별로 처음 받은 요청의 배율을 따름 (토픽 간 절대 비교 대신 토픽별 모멘텀에 사용)
+    - 보관소 사용 시 요청/재사용 토픽 수를 df.attrs["datalab_note"]에 (호출마다)
+    - debug 리스트를 넘기면 키 누락/요청 오류/빈 응답 메시지를 거기에 추가
     """
-    headers = _naver_headers()
+    headers = _naver_headers(debug)
     if headers is None:
         return pd.DataFrame(columns=topics)
 
     end = _now_kr().date()
     start = end - timedelta(days=days)
-    url = "https://openapi.naver.com/v1/datalab/search"
-
-    def _one_call(group: List[str]) -> pd.DataFrame:
-        payload = {
-            "startDate": _to_datestr(datetime.combine(start, datetime.min.time())),
-            "endDate": _to_datestr(datetime.combine(end, datetime.min.time())),
-            "timeUnit": time_unit,     # 'date'|'week'|'month'
-            "keywordGroups": [{"groupName": t, "keywords": [t]} for t in group],
-            "device": "", "ages": [], "gender": ""
-        }
-        try:
-            r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=30)
-        except requests.RequestException as e:
-            _dbg(f"NAVER 요청 오류: {e.__class__.__name__}({e})")
-            return pd.DataFrame()
-
-        if r.status_code != 200:
-            _dbg(f"NAVER 응답 실패: status={r.status_code} body={r.text[:200]}")
-            return pd.DataFrame()
-
-        data = r.json()
-        series_map: Dict[str, pd.Series] = {}
-        for item in data.get("results", []):
-            title = item.get("title")
-            rows = item.get("data", []) or []
-            if not rows:
-                continue
-            s = pd.Series({pd.to_datetime(d.get("period")).normalize(): float(d.get("ratio", 0.0)) for d in rows}).sort_index()
-            series_map[title] = s
-
-        if not series_map:
-            _dbg(f"NAVER 결과 비어있음(그룹={group})")
-            return pd.DataFrame()
-
-        df = pd.concat(series_map, axis=1, join="outer")
-        df.columns = list(series_map.keys())
-        df = df.sort_index()
-        return df
-
-    all_df = pd.DataFrame()
-    for i in range(0, len(topics), 5):
-        group = topics[i:i+5]
-        part = _one_call(group)
-        if part.empty:
-            continue
-        all_df = part if all_df.empty else all_df.join(part, how="outer")
-
-    if all_df.empty:
-        _dbg("NAVER 전체 결과가 비어있음(청크 호출 후)")
+    topics = list(dict.fromkeys(topics))
+    limiter = _RateLimiter(float(os.getenv("NAVER_DATALAB_QPS", "5")))
+    store = get_datalab_store()
+
+    if store is None:
+        got = _datalab_fetch_all(headers, {t: (start, end) for t in topics}, time_unit, limiter, debug)
+        series = {t: pd.Series(rows, dtype=float) for t, (_, rows) in got.items() if rows}
+        for s in series.values():
+            s.index = pd.to_datetime(s.index)
+    else:
+        plans = {t: store.plan(t, time_unit, start, end, end) for t in topics}
+        todo = {t: p for t, p in plans.items() if p is not None}
+        got = _datalab_fetch_all(headers, {t: p[:2] for t, p in todo.items()}, time_unit, limiter, debug)
+        # 이어 붙일 배율을 정할 수 없는 토픽은 전체 구간을 다시 받아 교체
+        redo = [t for t, (_, rows) in got.items() if not store.merge(t, time_unit, rows, todo[t], end)]
+        if redo:
+            full = (start, end, True)
+            for t, (_, rows) in _datalab_fetch_all(headers, {t: full[:2] for t in redo}, time_unit, limiter, debug).items():
+                store.merge(t, time_unit, rows, full, end)
+        note = f"NAVER DataLab: 토픽 {len(topics)}개 중 요청 {len(todo)}개 (보관 값 사용 {len(topics) - len(todo)}개)"
+        series = {t: s for t, s in store.series(topics, time_unit, start, end).items() if not s.empty}
+
+    if not series:
+        _dbg(debug, "NAVER 전체 결과가 비어있음(청크 호출 후)")
         return pd.DataFrame(columns=topics)
 
-    for t in topics:
-        if t not in all_df.columns:
-            all_df[t] = 0.0
-    return all_df.sort_index()
+    df = pd.DataFrame(series).sort_index()
+    df = df.reindex(columns=topics).fillna({t: 0.0 for t in topics if t not in series})
+    if store is not None:
+        df.attrs["datalab_note"] = note
+    return df
 
 # ---- 스코어링/렌더 ----
 @dataclass
@@ -126,23 +185,16 @@ def score_multisource(
     base_days: int = 14,
     weights: SourceWeights = SourceWeights(),
 ) -> pd.DataFrame:
-    rows = []
-    for t in topics:
-        n_mom = None
-        if t in getattr(naver_ts, "columns", []):
-            nr, np_ = _split_windows(naver_ts[t], recent_days, base_days)
-            n_mom = _pct(_safe_mean(nr), _safe_mean(np_))
-
-        # 네이버만 사용
-        score = float(n_mom) if (n_mom is not None and math.isfinite(float(n_mom))) else 0.0
-
-        rows.append({
-            "topic": t,
-            "naver_mom": None if n_mom is None else round(float(n_mom), 2),
-            "naver_available": (n_mom is not None and math.isfinite(float(n_mom))),
-            "trend_score": round(score, 2),
-        })
-    return pd.DataFrame(rows).set_index("topic").sort_values("trend_score", ascending=False)
+    # 토픽별 루프 대신 NumPy 엔진으로 한 번에 (결과/정렬은 기존과 같음)
+    res = score_frame(naver_ts, topics, [(recent_days, base_days)])[(recent_days, base_days)]
+    cols = set(getattr(naver_ts, "columns", []))
+    # 네이버만 사용
+    return pd.DataFrame({
+        "topic": topics,
+        "naver_mom": [round(float(m), 2) if t in cols else None for t, m in zip(topics, res.momentum.tolist())],
+        "naver_available": res.available.tolist(),
+        "trend_score": [round(x, 2) for x in res.score.tolist()],
+    }).set_index("topic").sort_values("trend_score", ascending=False)
 
 def _fmt_delta(v, available: bool) -> str:
     try:
@@ -153,38 +205,39 @@ def _fmt_delta(v, available: bool) -> str:
     except Exception:
         return "+0.0%"
 
-def render_multisource_markdown(score_df: pd.DataFrame, title: str, query_desc: str, notes: Optional[List[str]] = None) -> str:
+def render_multisource_markdown(score_df: pd.DataFrame, title: str, query_desc: str, notes: Optional[List[str]] = None,
+                                debug: Optional[List[str]] = None) -> str:
     ts = _now_kr().strftime("%Y-%m-%d %H:%M")
     lines = [f"# {title}", f"- 질의: {query_desc}", f"- 생성: {ts}"]
     for n in (notes or []): lines.append(f"- 참고: {n}")
-    for d in _DEBUG: lines.append(f"- 디버그: {d}")
+    for d in (debug or []): lines.append(f"- 디버그: {d}")
     lines.append("")
     if score_df.empty:
         lines.append("_데이터가 비어 있습니다._")
         return "\n".join(lines)
 
-    # 하이라이트 (상승 5 / 하락 5)
+    # 하이라이트 (상승 5 / 하락 5) — iterrows 대신 열 단위로 꺼내 zip
+    def _rows(df: pd.DataFrame):
+        avail = [bool(x) for x in df["naver_available"].tolist()]
+        return zip(df.index.tolist(), df["naver_mom"].tolist(), avail, df["trend_score"].tolist())
+
     top_up = score_df.head(5)
     top_down = score_df.tail(5).sort_values("trend_score")
     lines.append("## 하이라이트")
-    for t, row in top_up.iterrows():
-        lines.append(f"- **{t} {_fmt_delta(row.get('naver_mom'), bool(row.get('naver_available')))} 검색 변화** (네이버 {_fmt_delta(row.get('naver_mom'), bool(row.get('naver_available')))})")
+    for t, mom, ok, _ in _rows(top_up):
+        lines.append(f"- **{t} {_fmt_delta(mom, ok)} 검색 변화** (네이버 {_fmt_delta(mom, ok)})")
     if len(score_df) > 7:
         lines.append("")
-        for t, row in top_down.iterrows():
-            lines.append(f"- **{t} 언급/관심 하락** (네이버 {_fmt_delta(row.get('naver_mom'), bool(row.get('naver_available')))})")
+        for t, mom, ok, _ in _rows(top_down):
+            lines.append(f"- **{t} 언급/관심 하락** (네이버 {_fmt_delta(mom, ok)})")
 
     # 표 (네이버 단일 소스)
     lines.append("")
     lines.append("## 종합 순위(합성 스코어 기준)")
     lines.append("| 순위 | 토픽 | 네이버 모멘텀 | 합성 스코어 |")
     lines.append("|---:|---|---:|---:|")
-    for i, (t, row) in enumerate(score_df.iterrows(), 1):
-        lines.append(
-            f"| {i} | {t} | "
-            f"{_fmt_delta(row.get('naver_mom'), bool(row.get('naver_available')))} | "
-            f"{row.get('trend_score'):.1f} |"
-        )
+    for i, (t, mom, ok, score) in enumerate(_rows(score_df), 1):
+        lines.append(f"| {i} | {t} | {_fmt_delta(mom, ok)} | {score:.1f} |")
     return "\n".join(lines)
 
 def run_multisource_trend_report(
@@ -195,16 +248,19 @@ def run_multisource_trend_report(
     geo: str = "KR",  # 호환용 인자
     weights: SourceWeights = SourceWeights(),  # 호환용 인자
 ) -> Dict[str, Any]:
-    naver_ts  = fetch_naver_datalab(topics, days=days, time_unit="date")
+    debug: List[str] = []   # 이번 호출의 디버그 줄만
+    naver_ts  = fetch_naver_datalab(topics, days=days, time_unit="date", debug=debug)
     score_df = score_multisource(topics, naver_ts, recent_days, base_days, weights)
 
     notes = []
     if naver_ts.empty:  notes.append("네이버 DataLab 데이터 사용 불가(빈 응답/권한/쿼터/청크 실패)")
+    if naver_ts.attrs.get("datalab_note"): notes.append(naver_ts.attrs["datalab_note"])
 
     md = render_multisource_markdown(
         score_df,
         title="콘텐츠 트렌드 스코어링(멀티소스)",
         query_desc="네이버 검색량 기반 모멘텀",
         notes=notes or None,
+        debug=debug,
     )
-    return {"score_df": score_df, "markdown": md, "notes": notes, "debug": list(_DEBUG)}
+    return {"score_df": score_df, "markdown": md, "notes": notes, "debug": debug}
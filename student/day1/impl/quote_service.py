@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+시세 조회 서비스 (배치 다운로드 + 짧은 TTL 캐시 + 미지 심볼 음수 캐시)
+- 기존 get_quotes: 심볼마다 yfinance.Ticker를 만들고 fast_info를 직렬로 읽음 → 스튜디오 4곳 질의면 왕복 4번 이상
+  "OTT", "AI"처럼 티커처럼 보이는 대문자 단어도 매번 조회
+- 여기서는:
+    · 캐시에 없는 심볼만 모아 yfinance.download 1회로 가격 조회 (yfinance 내부 스레드로 동시 요청)
+    · 통화는 거래소 접미사로 알 수 있으면 바로(.KS → KRW 등), 아니면 fast_info.currency를 스레드 풀에서 가격 조회와 동시에
+      → 통화는 잘 바뀌지 않으므로 긴 TTL로 따로 캐시
+    · 가격 캐시 TTL: QUOTE_TTL (기본 60초)
+    · 데이터가 없는 심볼(상장폐지/존재하지 않음)은 음수 캐시: QUOTE_NEGATIVE_TTL (기본 6시간)
+      네트워크 오류 등 일시 실패는 캐시하지 않음 (다음 호출에서 다시 시도)
+- 반환 형식은 기존 get_quotes와 같음: {"symbol","price","currency"} 또는 {"symbol","error"}, 입력 순서 유지(중복 제거 없이)
+- 데이터 소스(QuoteSource)를 주입할 수 있어 벤치마크/오프라인 점검 가능 (student/day1/bench_quotes.py)
+
+사용 예:
+svc = get_quote_service()
+svc.get_quotes(["AAPL", "005930", "OTT"])   # 1회 배치 조회, 60초 안의 재호출은 캐시
+svc.stats()                                 # {"hits": .., "negative_hits": .., "misses": .., "batches": ..}
+"""
+
+from __future__ import annotations
+import os, re, time, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from .finance_client import _normalize_symbol
+
+QUOTE_TTL = float(os.getenv("QUOTE_TTL", "60"))
+NEGATIVE_TTL = float(os.getenv("QUOTE_NEGATIVE_TTL", str(6 * 3600)))
+CURRENCY_TTL = float(os.getenv("QUOTE_CURRENCY_TTL", str(24 * 3600)))
+MAX_WORKERS = int(os.getenv("QUOTE_MAX_WORKERS", "8"))
+
+# 거래소 접미사 → 통화 (접미사 없는 심볼은 fast_info로 확인)
+SUFFIX_CURRENCY: Dict[str, str] = {
+    "KS": "KRW", "KQ": "KRW", "T": "JPY", "HK": "HKD", "SS": "CNY", "SZ": "CNY", "TW": "TWD", "TWO": "TWD",
+    "L": "GBp", "PA": "EUR", "DE": "EUR", "F": "EUR", "AS": "EUR", "MI": "EUR", "MC": "EUR",
+    "TO": "CAD", "V": "CAD", "AX": "AUD", "SI": "SGD", "NS": "INR", "BO": "INR",
+}
+
+# yfinance가 "그런 심볼 없음"으로 보고하는 메시지 (그 밖의 오류는 일시 실패로 보고 캐시하지 않음)
+_UNKNOWN_RE = re.compile(r"delisted|no (price )?data found|not found|no timezone found|404", re.I)
+
+class QuoteSource(Protocol):
+    def fetch_prices(self, symbols: Sequence[str], timeout: float) -> Dict[str, Tuple[Optional[float], Optional[str]]]:
+        """심볼 → (가격, 오류 메시지). 가격이 None이면 오류 메시지로 미지/일시 실패를 구분."""
+        ...
+
+    def fetch_currency(self, symbol: str, timeout: float) -> Optional[str]:
+        ...
+
+class YFinanceSource:
+    """yfinance.download 1회(내부 스레드 동시 요청)로 가격, fast_info로 통화."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+
+    def fetch_prices(self, symbols: Sequence[str], timeout: float) -> Dict[str, Tuple[Optional[float], Optional[str]]]:
+        import yfinance as yf  # type: ignore
+        df = yf.download(list(symbols), period="5d", interval="1d", progress=False, auto_adjust=False,
+                         threads=min(self.max_workers, len(symbols)), timeout=timeout)
+        errors: Dict[str, str] = dict(getattr(getattr(yf, "shared", None), "_ERRORS", None) or {})
+        close = df["Close"] if df is not None and not df.empty and "Close" in df.columns.get_level_values(0) else None
+        if close is not None and not hasattr(close, "columns"):  # 단일 심볼 + 평탄한 컬럼(구버전)
+            close = close.to_frame(symbols[0])
+        out: Dict[str, Tuple[Optional[float], Optional[str]]] = {}
+        for sym in symbols:
+            col = close[sym].dropna() if close is not None and sym in close.columns else None
+            out[sym] = (float(col.iloc[-1]), None) if col is not None and len(col) else (None, errors.get(sym))
+        # 오류 메시지 없이 빠진 심볼: 배치에 성공한 심볼이 있으면 미지 심볼, 전부 비었으면 일시 실패로 간주
+        default = "No price data found" if any(p is not None for p, _ in out.values()) else "Empty download"
+        return {s: (p, None if p is not None else str(e or default)) for s, (p, e) in out.items()}
+
+    def fetch_currency(self, symbol: str, timeout: float) -> Optional[str]:
+        from yfinance import Ticker  # type: ignore
+        fi = getattr(Ticker(symbol), "fast_info", None)
+        return fi.get("currency") if isinstance(fi, dict) else getattr(fi, "currency", None)
+
+def _suffix_currency(sym: str) -> Optional[str]:
+    return SUFFIX_CURRENCY.get(sym.rsplit(".", 1)[1]) if "." in sym else None
+
+class QuoteService:
+    def __init__(self, source: Optional[QuoteSource] = None, ttl: float = QUOTE_TTL,
+                 negative_ttl: float = NEGATIVE_TTL, currency_ttl: float = CURRENCY_TTL,
+                 max_workers: int = MAX_WORKERS):
+        self.source = source or YFinanceSource(max_workers)
+        self.ttl, self.negative_ttl, self.currency_ttl = ttl, negative_ttl, currency_ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quotes")
+        self._lock = threading.Lock()
+        self._quotes: Dict[str, Tuple[float, Dict[str, Any]]] = {}   # sym → (만료 시각, 레코드)
+        self._currency: Dict[str, Tuple[float, str]] = {}
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "batches": 0, "currency_lookups": 0}
+
+    def _cached(self, sym: str, now: float) -> Optional[Dict[str, Any]]:
+        got = self._quotes.get(sym)
+        if got is None:
+            return None
+        if got[0] <= now:
+            self._quotes.pop(sym, None)
+            return None
+        self._stats["negative_hits" if "error" in got[1] else "hits"] += 1
+        return got[1]
+
+    def _currency_for(self, sym: str, timeout: float) -> Optional[str]:
+        cur = _suffix_currency(sym)
+        if cur:
+            return cur
+        with self._lock:
+            got = self._currency.get(sym)
+            if got and got[0] > time.time():
+                return got[1]
+            self._stats["currency_lookups"] += 1
+        cur = self.source.fetch_currency(sym, timeout)
+        if cur:
+            with self._lock:
+                self._currency[sym] = (time.time() + self.currency_ttl, cur)
+        return cur
+
+    def _fetch(self, symbols: List[str], timeout: float) -> Dict[str, Dict[str, Any]]:
+        """캐시에 없는 심볼들: 가격 배치 1회 + 통화 조회를 동시에."""
+        cur_futs = {s: self._pool.submit(self._currency_for, s, timeout) for s in symbols}
+        try:
+            prices = self.source.fetch_prices(symbols, timeout)
+        except Exception as e:
+            for f in cur_futs.values():
+                f.cancel()
+            if isinstance(e, ImportError):
+                raise
+            return {s: {"symbol": s, "error": f"{type(e).__name__}: {e}"} for s in symbols}
+
+        deadline = time.monotonic() + timeout
+        out: Dict[str, Dict[str, Any]] = {}
+        now = time.time()
+        fresh: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        for s in symbols:
+            price, err = prices.get(s, (None, "No price data found"))
+            if price is None:
+                rec = {"symbol": s, "error": err or "No price data found"}
+                if _UNKNOWN_RE.search(rec["error"]):
+                    fresh[s] = (now + self.negative_ttl, rec)
+                out[s] = rec
+                continue
+            try:
+                cur = cur_futs[s].result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception as e:
+                out[s] = {"symbol": s, "error": f"currency lookup failed: {type(e).__name__}: {e}"}
+                continue
+            if not cur:
+                out[s] = {"symbol": s, "error": "No fast_info (price/currency missing)"}
+                continue
+            out[s] = {"symbol": s, "price": price, "currency": cur}
+            fresh[s] = (now + self.ttl, out[s])
+        with self._lock:
+            self._quotes.update(fresh)
+        return out
+
+    def get_quotes(self, symbols: List[str], timeout: float = 20) -> List[Dict[str, Any]]:
+        syms = [_normalize_symbol(s) for s in symbols]
+        now = time.time()
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for s in dict.fromkeys(syms):
+                rec = self._cached(s, now)
+                if rec is not None:
+                    found[s] = rec
+            missing = [s for s in dict.fromkeys(syms) if s not in found]
+            if missing:
+                self._stats["misses"] += len(missing)
+                self._stats["batches"] += 1
+        if missing:
+            try:
+                found.update(self._fetch(missing, timeout))
+            except ImportError as e:
+                # yfinance 미설치: 기존과 같은 형식으로 전체 심볼에 오류 표기
+                found.update({s: {"symbol": s, "error": f"ImportError: {type(e).__name__}: {e}"} for s in missing})
+        return [dict(found[s]) for s in syms]
+
+    def clear(self):
+        with self._lock:
+            self._quotes.clear()
+            self._currency.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, cached=len(self._quotes))
+
+_service: Optional[QuoteService] = None
+_service_lock = threading.Lock()
+
+def get_quote_service() -> QuoteService:
+    """프로세스 공용 QuoteService (yfinance 소스)."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = QuoteService()
+    return _service
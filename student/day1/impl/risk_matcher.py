@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+리스크 키워드 매처 (부정 키워드 사전 → 키워드 집합당 1회 컴파일, 매칭 오프셋 반환)
+- 기존 _rank_risk: 기사마다 title+content+snippet을 소문자화한 뒤 키워드 ~90개를 `kw in text`로 하나씩 검사
+  (호출마다 _kwset도 새로 만듦) → 기사 수 × 키워드 수만큼 본문을 다시 훑음
+- 여기서는 키워드 집합을 1회 컴파일해 두고 모든 매칭을 (start, end) 오프셋과 함께 반환 (excerpt 하이라이트에 사용)
+    · 키워드가 적으면(기본 사전 ~90개) 소문자 본문 1개에 키워드별 str.find 반복 — C 수준 탐색이라 순수 파이썬 루프보다 빠름
+    · 키워드가 RISK_MATCHER_SCAN_MAX(기본 128)개를 넘으면 KeywordAutomaton(Aho-Corasick)으로 본문 1회 순회
+      → 비용이 키워드 수와 무관 (로스터별 추가 키워드가 수백 개여도 일정)
+    · 소문자화로 길이가 바뀌는 텍스트(예: 'İ')는 오프셋이 어긋나므로 항상 오토마톤 (대소문자 무시를 전이로 처리, 원문 오프셋)
+    · 같은 키워드 집합이면 프로세스 안에서 재사용 (get_risk_matcher, 스레드 안전)
+- 키워드 가중치(심각도): 형사/중대 사안 3, 분쟁/의혹 2, 그 밖 1 (RISK_WEIGHTS에 없는 추가 키워드는 1)
+  → risk_score = 매칭된 서로 다른 키워드 가중치 합 + 검색엔진 score
+- excerpt(): 매칭 위치를 중심으로 자른 발췌문에 **키워드** 강조
+
+사용 예:
+m = get_risk_matcher(["논란", "소송", "lawsuit"])
+hits = m.find("Director faces Lawsuit amid 논란")   # [RiskMatch(15, 22, 'lawsuit', 2), ...]
+m.excerpt("Director faces Lawsuit amid 논란", hits)  # 'Director faces **Lawsuit** amid **논란**'
+python -m student.day1.impl.risk_matcher --docs 2000 --extra 0,100,400   # 기존 `kw in text` 대비 마이크로벤치마크
+"""
+
+from __future__ import annotations
+import os, threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ...common.aho_corasick import KeywordAutomaton
+
+DEFAULT_WEIGHT = 1
+EXCERPT_CHARS = 280
+SCAN_MAX_KEYWORDS = int(os.getenv("RISK_MATCHER_SCAN_MAX", "128"))
+
+# 심각도 가중치 (키는 소문자)
+RISK_WEIGHTS: Dict[str, int] = {
+    **{k: 3 for k in (
+        "체포", "구속", "기소", "유죄", "징역", "송치", "횡령", "배임", "탈세", "분식회계", "뇌물",
+        "성폭력", "성추행", "성범죄", "마약", "음주운전", "사문서위조", "파산", "부도",
+        "arrest", "indicted", "embezzlement", "breach of trust", "tax evasion", "bribery",
+        "sexual assault", "narcotics", "dui", "bankruptcy", "insolvency",
+    )},
+    **{k: 2 for k in (
+        "논란", "의혹", "혐의", "수사", "소송", "고소", "고발", "사기", "비리", "부패", "성희롱", "#미투", "미투",
+        "학폭", "학교폭력", "폭행", "가정폭력", "도박", "표절", "하차", "제작 중단", "촬영 중단", "방영 중단",
+        "scandal", "allegation", "accusation", "investigation", "lawsuit", "legal dispute", "fraud",
+        "corruption", "harassment", "#metoo", "assault", "gambling", "plagiarism", "production halted",
+    )},
+}
+
+class RiskMatch(NamedTuple):
+    start: int
+    end: int
+    keyword: str   # 정규화된(소문자) 키워드
+    weight: int
+
+class RiskMatcher:
+    def __init__(self, keywords: Iterable[str], weights: Optional[Dict[str, int]] = None,
+                 scan_max: Optional[int] = None):
+        weights = RISK_WEIGHTS if weights is None else weights
+        self.keywords: List[str] = sorted({k.lower().strip() for k in keywords if isinstance(k, str) and k.strip()})
+        self.weights: List[int] = [int(weights.get(k, DEFAULT_WEIGHT)) for k in self.keywords]
+        self._ac = KeywordAutomaton(self.keywords)
+        self.engine = "scan" if len(self.keywords) <= (SCAN_MAX_KEYWORDS if scan_max is None else scan_max) else "automaton"
+
+    def _spans(self, text: str) -> List[Tuple[int, int, int]]:
+        if self.engine == "scan":
+            low = text.lower()
+            if len(low) == len(text):
+                res: List[Tuple[int, int, int]] = []
+                for pid, kw in enumerate(self.keywords):
+                    i = low.find(kw)
+                    while i >= 0:
+                        res.append((i, i + len(kw), pid))
+                        i = low.find(kw, i + 1)
+                res.sort(key=lambda x: (x[1], x[0]))
+                return res
+        return self._ac.findall(text)
+
+    def find(self, text: str) -> List[RiskMatch]:
+        """text 안의 모든 키워드 매칭 (겹치는 것 포함, 끝 위치 순)."""
+        kws, ws = self.keywords, self.weights
+        return [RiskMatch(s, e, kws[pid], ws[pid]) for s, e, pid in self._spans(text or "")]
+
+    def matched(self, text: str) -> List[str]:
+        """매칭된 서로 다른 키워드 (정렬) — 기존 `sorted({kw for kw in kws if kw in text})`와 같은 결과."""
+        kws = self.keywords
+        return sorted({kws[pid] for _, _, pid in self._spans(text or "")})
+
+    @staticmethod
+    def score(matches: Iterable[RiskMatch]) -> int:
+        """서로 다른 키워드의 가중치 합 (같은 키워드가 여러 번 나와도 1번만)."""
+        return sum({m.keyword: m.weight for m in matches}.values())
+
+    @staticmethod
+    def excerpt(text: str, matches: List[RiskMatch], width: int = EXCERPT_CHARS) -> str:
+        """가장 무거운(동률이면 가장 앞) 매칭을 중심으로 width자 안팎을 잘라 매칭 구간을 **강조**."""
+        text = text or ""
+        if not matches:
+            out = text[:width].rstrip()
+            return out + ("…" if len(text) > width else "")
+        head = min(matches, key=lambda m: (-m.weight, m.start))
+        lo = max(0, min(head.start - width // 3, len(text) - width))
+        hi = min(len(text), lo + width)
+        # 창 안의 매칭 구간을 병합 (겹치는 "sexual assault"/"assault" → 한 구간)
+        spans: List[Tuple[int, int]] = []
+        for m in sorted(matches):
+            if m.start < lo or m.end > hi:
+                continue
+            if spans and m.start <= spans[-1][1]:
+                spans[-1] = (spans[-1][0], max(spans[-1][1], m.end))
+            else:
+                spans.append((m.start, m.end))
+        parts: List[str] = ["…"] if lo > 0 else []
+        pos = lo
+        for s, e in spans:
+            parts += [text[pos:s], "**", text[s:e], "**"]
+            pos = e
+        parts.append(text[pos:hi])
+        if hi < len(text):
+            parts.append("…")
+        return "".join(parts).strip()
+
+_lock = threading.Lock()
+_MATCHERS: Dict[Tuple[str, ...], RiskMatcher] = {}
+
+def get_risk_matcher(keywords: Iterable[str]) -> RiskMatcher:
+    """키워드 집합별로 1회만 빌드해 재사용 (기본 가중치 RISK_WEIGHTS)."""
+    key = tuple(sorted({k.lower().strip() for k in keywords if isinstance(k, str) and k.strip()}))
+    m = _MATCHERS.get(key)
+    if m is None:
+        with _lock:
+            m = _MATCHERS.get(key)
+            if m is None:
+                m = _MATCHERS[key] = RiskMatcher(key)
+    return m
+
+if __name__ == "__main__":
+    import argparse, random, time
+    from .web_search import RISK_NEG_KO, RISK_NEG_EN
+
+    ap = argparse.ArgumentParser(description="리스크 키워드 매칭 마이크로벤치마크 (kw in text vs scan vs 오토마톤)")
+    ap.add_argument("--docs", type=int, default=2000)
+    ap.add_argument("--chars", type=int, default=1600, help="기사 1건 평균 길이")
+    ap.add_argument("--extra", default="0,100,400", help="기본 사전에 더할 합성 키워드 수 (쉼표 구분)")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    base = [*RISK_NEG_KO, *RISK_NEG_EN]
+    filler = ("배우 감독 신작 개봉 흥행 관객 제작사 투자 배급 시즌 공개 인터뷰 촬영 현장 "
+              "the film studio release box office season premiere interview director cast streaming").split()
+
+    def article() -> Tuple[str, str, str]:
+        words: List[str] = []
+        while sum(len(w) + 1 for w in words) < args.chars:
+            words.append(rnd.choice(base).title() if rnd.random() < 0.01 else rnd.choice(filler))
+        body = " ".join(words)
+        return body[:60], body, body[:200]
+
+    def synthetic_keywords(n: int) -> List[str]:
+        syll = [chr(0xAC00 + rnd.randrange(11172)) for _ in range(400)]
+        return ["".join(rnd.choice(syll) for _ in range(rnd.randint(2, 3))) if i % 2 else
+                "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rnd.randint(5, 10)))
+                for i in range(n)]
+
+    docs = [" ".join(article()) for _ in range(args.docs)]
+    print(f"[BENCH] docs={len(docs)} chars={sum(map(len, docs)):,}")
+    for n in [int(x) for x in args.extra.split(",") if x.strip()]:
+        keywords = base + synthetic_keywords(n)
+        t0 = time.perf_counter()
+        res_naive = []
+        for d in docs:  # 기존 _rank_risk: 호출마다 _kwset 재생성 + 키워드별 `in`
+            kws = {k.lower().strip() for k in keywords}
+            text = d.lower()
+            res_naive.append(sorted({kw for kw in kws if kw in text}))
+        t_naive = time.perf_counter() - t0
+        line = f"  keywords={len(set(keywords)):4d}  kw in text {t_naive:6.3f}s"
+        for engine, scan_max in (("scan", 10 ** 9), ("automaton", 0)):
+            t0 = time.perf_counter()
+            m = RiskMatcher(keywords, scan_max=scan_max)
+            build = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            res = [m.matched(d) for d in docs]
+            dt = time.perf_counter() - t0
+            line += f" | {engine} {dt:6.3f}s (build {build * 1000:.0f}ms, same={res == res_naive})"
+        print(line + f"  → auto: {RiskMatcher(keywords).engine}")
+    m = get_risk_matcher(base)
+    doc = next(d for d in docs if m.find(d))
+    print("  excerpt:", m.excerpt(doc, m.find(doc), width=160))
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Tavily 응답 디스크 캐시 (SQLite, search_tavily / extract_text 앞단)
+- 키: sha256(엔드포인트 + 정규화한 요청 payload) — API 키는 포함하지 않음
+    · 문자열은 NFKC + 앞뒤 공백 제거 + 연속 공백 1칸, 도메인 목록은 정렬
+- TTL은 호출 위치(kind)별: 리스크 뉴스는 시간 단위, 기업 개요는 일 단위, 공고는 시간 단위
+    · kind별 기본값은 TTLS, 환경변수 TAVILY_TTL_<KIND>(초)로 덮어쓰기 (예: TAVILY_TTL_RISK=3600)
+    · 만료된 항목은 조회 시 미스로 취급하고 다음 저장/정리 때 삭제
+- 용량: 본문은 zlib 압축 JSON, 합계가 TAVILY_CACHE_MAX_MB(기본 64MB)를 넘으면
+  만료 항목 → 오래 안 쓴 항목(atime) 순으로 한도의 90%까지 제거
+- 통계: stats() → 전체/kind별 hits, misses, hit_rate + entries, bytes, evictions
+- 설정: TAVILY_CACHE=0이면 끔, 경로는 TAVILY_CACHE_PATH (기본 data/cache/tavily.sqlite)
+- 여러 스레드/프로세스에서 같은 파일을 써도 됨 (WAL, 연결 1개 + 락)
+
+사용 예 (통계 확인 / 비우기):
+python -m student.day1.impl.tavily_cache
+python -m student.day1.impl.tavily_cache --clear
+"""
+
+from __future__ import annotations
+import os, re, json, time, zlib, sqlite3, hashlib, argparse, threading, unicodedata
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = "data/cache/tavily.sqlite"
+DEFAULT_MAX_MB = 64
+
+HOUR = 3600
+DAY = 24 * HOUR
+TTLS: Dict[str, float] = {
+    "web": 1 * HOUR,        # Day1 일반 웹 검색 (최신 뉴스/동향)
+    "risk": 6 * HOUR,       # 배우/기업 리스크(부정 이슈) 검색
+    "profile": 3 * DAY,     # 기업 개요 검색
+    "extract": 7 * DAY,     # URL 본문 추출
+    "notice": 3 * HOUR,     # Day3 공고 검색 (NIPA/Bizinfo/웹)
+}
+
+_SPACES = re.compile(r"\s+")
+
+def ttl_for(kind: str) -> float:
+    try:
+        return float(os.getenv(f"TAVILY_TTL_{kind.upper()}", TTLS.get(kind, TTLS["web"])))
+    except ValueError:
+        return TTLS.get(kind, TTLS["web"])
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return _SPACES.sub(" ", unicodedata.normalize("NFKC", value)).strip()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        items = [_normalize(v) for v in value]
+        return sorted(items, key=str) if all(isinstance(v, str) for v in items) else items
+    return value
+
+def cache_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    body = json.dumps({"endpoint": endpoint, "payload": _normalize(payload)},
+                      ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+class TavilyCache:
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.evictions = 0
+        self._counts: Dict[str, Dict[str, int]] = {}   # kind -> {"hits", "misses"}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, kind TEXT NOT NULL, created REAL NOT NULL, expires REAL NOT NULL,"
+            " atime REAL NOT NULL, size INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_atime ON entries(atime)")
+
+    def _count(self, kind: str, field: str):
+        c = self._counts.setdefault(kind, {"hits": 0, "misses": 0})
+        c[field] += 1
+
+    def get(self, key: str, kind: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT expires, body FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or row[0] <= now:
+                self._count(kind, "misses")
+                return None
+            self._db.execute("UPDATE entries SET atime = ? WHERE key = ?", (now, key))
+            self._count(kind, "hits")
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(self, key: str, kind: str, value: Any, ttl: Optional[float] = None):
+        ttl = ttl_for(kind) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        body = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries(key, kind, created, expires, atime, size, body) VALUES (?,?,?,?,?,?,?)",
+                (key, kind, now, now + ttl, now, len(body), body),
+            )
+            self._shrink(now)
+
+    def _shrink(self, now: float):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        cur = self._db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        self.evictions += cur.rowcount
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= target:
+            return
+        victims, freed = [], 0
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY atime"):
+            victims.append((key,))
+            freed += size
+            if total - freed <= target:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("VACUUM")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            by_kind = {k: dict(v) for k, v in self._counts.items()}
+        for c in by_kind.values():
+            total = c["hits"] + c["misses"]
+            c["hit_rate"] = round(c["hits"] / total, 4) if total else 0.0
+        hits = sum(c["hits"] for c in by_kind.values())
+        misses = sum(c["misses"] for c in by_kind.values())
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "evictions": self.evictions,
+            "by_kind": by_kind,
+            "path": self.path,
+        }
+
+# ---------- 프로세스 공용 캐시 ----------
+_CACHES: Dict[str, TavilyCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+def get_cache() -> Optional[TavilyCache]:
+    """TAVILY_CACHE=0이면 None. 경로별로 1개 (테스트 등에서 TAVILY_CACHE_PATH를 바꾸면 새 캐시)."""
+    if os.getenv("TAVILY_CACHE", "1").lower() in ("0", "false", "no", "n"):
+        return None
+    path = os.getenv("TAVILY_CACHE_PATH", DEFAULT_CACHE_PATH)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            try:
+                max_mb = float(os.getenv("TAVILY_CACHE_MAX_MB", DEFAULT_MAX_MB))
+            except ValueError:
+                max_mb = DEFAULT_MAX_MB
+            try:
+                cache = TavilyCache(path, int(max_mb * 1024 * 1024))
+            except sqlite3.Error as e:
+                print(f"[WARN] Tavily 캐시를 열 수 없음 → 캐시 없이 진행: {path} ({e})")
+                return None
+            _CACHES[path] = cache
+        return cache
+
+def cache_stats() -> Dict[str, Any]:
+    cache = get_cache()
+    return cache.stats() if cache else {"enabled": False}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Tavily 응답 캐시 통계/비우기")
+    ap.add_argument("--clear", action="store_true")
+    args = ap.parse_args()
+    cache = get_cache()
+    if cache is None:
+        print("[OK] TAVILY_CACHE=0 (캐시 꺼짐)")
+    else:
+        if args.clear:
+            cache.clear()
+        print(json.dumps(cache.stats(), ensure_ascii=False, indent=2))
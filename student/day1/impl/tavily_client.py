@@ -1,13 +1,35 @@
 # -*- coding: utf-8 -*-
-import os, requests
-from typing import List, Dict, Any, Optional
+import os, asyncio
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
+from ...common import http_client
+from .tavily_cache import get_cache, cache_key
+
 TAVILY_BASE = "https://api.tavily.com"
 
 def _headers(api_key: str) -> dict:
     return {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
 
+def _search_payload(query: str, top_k: int, include_domains: Optional[List[str]], exclude_domains: Optional[List[str]],
+                    search_depth: str, include_answer: bool, include_images: bool, include_raw_content: bool,
+                    extra: Dict[str, Any]) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "query": query,
+        "search_depth": search_depth,
+        "max_results": top_k,
+        "top_k": top_k,
+        "include_answer": include_answer,
+        "include_images": include_images,
+        "include_raw_content": include_raw_content,
+    }
+    if include_domains:
+        payload["include_domains"] = include_domains
+    if exclude_domains:
+        payload["exclude_domains"] = exclude_domains
+    payload.update({k: v for k, v in extra.items() if v is not None})
+    return payload
+
 def search_tavily(
     query: str,
     api_key: Optional[str],
@@ -19,30 +41,63 @@ def search_tavily(
     include_answer: bool = False,
     include_images: bool = False,
     include_raw_content: bool = False,
+    cache_kind: str = "web",
     **kwargs: Any,
 ) -> List[Dict[str, Any]]:
+    """Tavily /search. 같은 요청은 cache_kind별 TTL 동안 디스크 캐시에서 반환 (tavily_cache.TTLS)."""
     if not api_key:
         raise RuntimeError("TAVILY_API_KEY is required for web search")
+    payload = _search_payload(query, top_k, include_domains, exclude_domains, search_depth,
+                              include_answer, include_images, include_raw_content, kwargs)
 
-    payload: Dict[str, Any] = {
-        "query": query,
-        "search_depth": search_depth,
-        "max_results": top_k,
-        "top_k": top_k,
-        "include_answer": include_answer,
-        "include_images": include_images,
-        "include_raw_content": include_raw_content,
-    }
-    if include_domains:
-        payload["include_domains"] = include_domains
-    if exclude_domains:
-        payload["exclude_domains"] = exclude_domains
-    payload.update({k: v for k, v in kwargs.items() if v is not None})
+    cache = get_cache()
+    key = cache_key("search", payload) if cache else ""
+    if cache:
+        hit = cache.get(key, cache_kind)
+        if hit is not None:
+            return hit
+
+    r = http_client.post(f"{TAVILY_BASE}/search", headers=_headers(api_key), json=payload, timeout=timeout)
+    r.raise_for_status()
+    results = r.json().get("results", []) or []
+    if cache:
+        cache.put(key, cache_kind, results)
+    return results
+
+async def asearch_tavily(
+    query: str,
+    api_key: Optional[str],
+    top_k: int = 6,
+    timeout: int = 20,
+    include_domains: Optional[List[str]] = None,
+    exclude_domains: Optional[List[str]] = None,
+    search_depth: str = "basic",
+    include_answer: bool = False,
+    include_images: bool = False,
+    include_raw_content: bool = False,
+    cache_kind: str = "web",
+    **kwargs: Any,
+) -> List[Dict[str, Any]]:
+    """search_tavily의 비동기 버전 (같은 payload/캐시, 공용 비동기 연결 풀 사용)."""
+    if not api_key:
+        raise RuntimeError("TAVILY_API_KEY is required for web search")
+    payload = _search_payload(query, top_k, include_domains, exclude_domains, search_depth,
+                              include_answer, include_images, include_raw_content, kwargs)
+
+    # SQLite 캐시 조회/기록은 블로킹(쓰기 잠금·퇴출) → 공용 이벤트 루프를 막지 않도록 스레드에서
+    cache = get_cache()
+    key = cache_key("search", payload) if cache else ""
+    if cache:
+        hit = await asyncio.to_thread(cache.get, key, cache_kind)
+        if hit is not None:
+            return hit
 
-    r = requests.post(f"{TAVILY_BASE}/search", headers=_headers(api_key), json=payload, timeout=timeout)
+    r = await http_client.apost(f"{TAVILY_BASE}/search", headers=_headers(api_key), json=payload, timeout=timeout)
     r.raise_for_status()
-    data = r.json()
-    return data.get("results", []) or []
+    results = r.json().get("results", []) or []
+    if cache:
+        await asyncio.to_thread(cache.put, key, cache_kind, results)
+    return results
 
 def extract_url(url: str) -> str:
     """URL을 정리(normalize)해서 반환 (추적 파라미터/fragment 제거)"""
@@ -64,25 +119,159 @@ def extract_text(url: str, api_key: Optional[str], timeout: int = 20) -> str:
     주어진 URL에서 본문 텍스트를 추출해 반환.
     - Tavily의 /extract 엔드포인트를 사용 (서비스 정책/응답 스키마 변화 가능성 있어 방어적 처리)
     - 실패하면 빈 문자열 반환
+    - 성공한(비어 있지 않은) 결과만 캐시 (kind="extract", 기본 7일)
     """
     if not api_key:
         raise RuntimeError("TAVILY_API_KEY is required for extract")
+    payload = {"url": url}
+    cache = get_cache()
+    key = _extract_key(url) if cache else ""
+    if cache:
+        hit = cache.get(key, "extract")
+        if hit is not None:
+            return hit
+    text = _extract_uncached(payload, api_key, timeout)
+    if cache and text:
+        cache.put(key, "extract", text)
+    return text
+
+async def aextract_text(url: str, api_key: Optional[str], timeout: int = 20) -> str:
+    """extract_text의 비동기 버전."""
+    if not api_key:
+        raise RuntimeError("TAVILY_API_KEY is required for extract")
+    payload = {"url": url}
+    cache = get_cache()
+    key = _extract_key(url) if cache else ""
+    if cache:
+        hit = await asyncio.to_thread(cache.get, key, "extract")
+        if hit is not None:
+            return hit
+    try:
+        r = await http_client.apost(f"{TAVILY_BASE}/extract", headers=_headers(api_key), json=payload, timeout=timeout)
+        r.raise_for_status()
+        text = _extract_content(r.json())
+    except Exception:
+        text = ""
+    if cache and text:
+        await asyncio.to_thread(cache.put, key, "extract", text)
+    return text
+
+def _extract_uncached(payload: Dict[str, Any], api_key: str, timeout: int) -> str:
     try:
-        payload = {"url": url}
-        r = requests.post(f"{TAVILY_BASE}/extract", headers=_headers(api_key), json=payload, timeout=timeout)
+        r = http_client.post(f"{TAVILY_BASE}/extract", headers=_headers(api_key), json=payload, timeout=timeout)
         r.raise_for_status()
-        data = r.json()
-        # 다양한 응답 스키마를 방어적으로 지원
-        # 1) {"content": "..."}  2) {"result":"..."}  3) {"results":[{"content":"..."}]}
-        if isinstance(data, dict):
-            if "content" in data and isinstance(data["content"], str):
-                return data["content"]
-            if "result" in data and isinstance(data["result"], str):
-                return data["result"]
-            if "results" in data and isinstance(data["results"], list) and data["results"]:
-                first = data["results"][0]
-                if isinstance(first, dict) and isinstance(first.get("content"), str):
-                    return first["content"]
+        return _extract_content(r.json())
     except Exception:
-        pass
+        return ""
+
+def _extract_content(data: Any) -> str:
+    # 다양한 응답 스키마를 방어적으로 지원
+    # 1) {"content": "..."}  2) {"result":"..."}  3) {"results":[{"content":"..."}]}
+    if isinstance(data, dict):
+        if "content" in data and isinstance(data["content"], str):
+            return data["content"]
+        if "result" in data and isinstance(data["result"], str):
+            return data["result"]
+        if "results" in data and isinstance(data["results"], list) and data["results"]:
+            first = data["results"][0]
+            if isinstance(first, dict) and isinstance(first.get("content"), str):
+                return first["content"]
     return ""
+
+# ---------- 여러 URL 한 번에 (프로필 파이프라인) ----------
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def canonical_url(url: str) -> str:
+    """
+    추출 캐시 키용 정규형: extract_url(추적 파라미터/fragment 제거) + 스킴/호스트 소문자,
+    기본 포트 제거, 경로 끝 '/' 제거, 쿼리 파라미터 정렬
+    """
+    url = extract_url(url)
+    try:
+        parts = urlsplit(url)
+        scheme, host = parts.scheme.lower(), (parts.hostname or "").lower()
+        netloc = host if parts.port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{parts.port}"
+        path = parts.path.rstrip("/") or "/"
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((scheme, netloc, path, query, ""))
+    except Exception:
+        return url
+
+def _extract_key(url: str) -> str:
+    return cache_key("extract", {"url": canonical_url(url)})
+
+def remember_extracts(pages: Dict[str, str]):
+    """이미 가진 본문(예: 검색 결과의 raw_content)을 추출 캐시에 넣어 다음 추출을 건너뛰게."""
+    cache = get_cache()
+    if not cache:
+        return
+    for url, text in pages.items():
+        if url and text:
+            cache.put(_extract_key(url), "extract", text)
+
+def _cached_extracts(urls: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    """(캐시에 있던 것, 요청해야 할 URL — 정규형 기준 중복 제거)."""
+    cache = get_cache()
+    found: Dict[str, str] = {}
+    missing: Dict[str, str] = {}
+    for u in urls:
+        hit = cache.get(_extract_key(u), "extract") if cache else None
+        if hit:
+            found[u] = hit
+        else:
+            missing.setdefault(canonical_url(u), u)
+    return found, list(missing.values())
+
+def _batch_content(data: Any, urls: List[str]) -> Dict[str, str]:
+    """/extract {"urls": [...]} 응답 → {요청 URL: 본문}. 응답 url은 정규형으로 맞춰 봄."""
+    by_canon = {canonical_url(u): u for u in urls}
+    out: Dict[str, str] = {}
+    for item in (data.get("results") or []) if isinstance(data, dict) else []:
+        if not isinstance(item, dict):
+            continue
+        text = item.get("raw_content") or item.get("content") or ""
+        u = by_canon.get(canonical_url(str(item.get("url") or "")))
+        if u and isinstance(text, str) and text:
+            out[u] = text
+    return out
+
+def _finish_extracts(urls: List[str], found: Dict[str, str], fetched: Dict[str, str]) -> Dict[str, str]:
+    remember_extracts(fetched)
+    by_canon = {canonical_url(u): t for u, t in {**found, **fetched}.items()}
+    return {u: by_canon.get(canonical_url(u), "") for u in urls}
+
+def extract_texts(urls: List[str], api_key: Optional[str], timeout: int = 20) -> Dict[str, str]:
+    """
+    여러 URL 본문을 한 번에: 캐시(정규형 URL 기준)에 있으면 건너뛰고, 나머지는 /extract 1회({"urls": [...]}).
+    배치 호출이 실패하면 URL별 extract_text로 대신함. 반환: {입력 URL: 본문(실패 시 "")}
+    """
+    if not api_key:
+        raise RuntimeError("TAVILY_API_KEY is required for extract")
+    found, missing = _cached_extracts(urls)
+    fetched: Dict[str, str] = {}
+    if missing:
+        try:
+            r = http_client.post(f"{TAVILY_BASE}/extract", headers=_headers(api_key), json={"urls": missing},
+                                 timeout=timeout)
+            r.raise_for_status()
+            fetched = _batch_content(r.json(), missing)
+        except Exception:
+            fetched = {u: t for u in missing if (t := _extract_uncached({"url": u}, api_key, timeout))}
+    return _finish_extracts(urls, found, fetched)
+
+async def aextract_texts(urls: List[str], api_key: Optional[str], timeout: int = 20) -> Dict[str, str]:
+    """extract_texts의 비동기 버전 (배치 실패 시 URL별 aextract_text를 동시에, 캐시 조회/기록은 스레드에서)."""
+    if not api_key:
+        raise RuntimeError("TAVILY_API_KEY is required for extract")
+    found, missing = await asyncio.to_thread(_cached_extracts, urls)
+    fetched: Dict[str, str] = {}
+    if missing:
+        try:
+            r = await http_client.apost(f"{TAVILY_BASE}/extract", headers=_headers(api_key), json={"urls": missing},
+                                        timeout=timeout)
+            r.raise_for_status()
+            fetched = _batch_content(r.json(), missing)
+        except Exception:
+            got = await asyncio.gather(*(aextract_text(u, api_key, timeout) for u in missing), return_exceptions=True)
+            fetched = {u: t for u, t in zip(missing, got) if isinstance(t, str) and t}
+    return await asyncio.to_thread(_finish_extracts, urls, found, fetched)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+트렌드 스코어링 엔진 (NumPy, 날짜 × 토픽 행렬 한 번에)
+- 기존 score_multisource: 토픽마다 Series를 iloc으로 잘라 평균을 하나씩 계산 → 토픽 수천 개면 파이썬 루프가 병목
+- 여기서는 정렬된 (days × topics) 행렬에서 창(window)마다 행 구간 하나를 잘라 열 방향으로 한 번에:
+    · 최근/기준 구간 평균 (NaN 제외, 구간이 비면 0.0 / 값이 전부 NaN이면 NaN — 기존 _safe_mean과 같음)
+    · 모멘텀 = (최근 - 기준) / 기준 × 100 (기준 0이면 최근 > 0일 때 inf, 아니면 0 — 기존 _pct와 같음)
+    · 점수 = 유한한 모멘텀, 아니면 0 / z-score(유효 토픽끼리) / 순위(점수 내림차순, 동점은 입력 순서)
+- 창 설정 여러 개를 한 번에: score_matrix(values, [(14, 14), (7, 7), (28, 28)])
+- 구간 자르기 규칙은 기존 _split_windows와 같음 (최근 = 마지막 recent행, 기준 = 그 앞 base행, 모자라면 앞쪽 전부)
+
+사용 예:
+res = score_frame(naver_ts, topics, windows=[(14, 14), (7, 7)])
+res[(14, 14)].to_frame()   # topic별 recent_mean, base_mean, momentum, available, score, zscore, rank
+python -m student.day1.bench_trend --topics 10000   # 기존 루프 대비 벤치마크
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+Window = Tuple[int, int]   # (recent_days, base_days)
+
+@dataclass
+class TrendScores:
+    topics: List[str]
+    window: Window
+    recent_mean: np.ndarray
+    base_mean: np.ndarray
+    momentum: np.ndarray     # 행렬에 없는 토픽은 NaN
+    available: np.ndarray    # 모멘텀이 유한한가
+    score: np.ndarray        # 유한한 모멘텀, 아니면 0
+    zscore: np.ndarray       # 유효 토픽끼리의 z-score (그 밖 NaN)
+    rank: np.ndarray         # 1 = 가장 높은 점수
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "recent_mean": self.recent_mean, "base_mean": self.base_mean, "momentum": self.momentum,
+            "available": self.available, "score": self.score, "zscore": self.zscore, "rank": self.rank,
+        }, index=pd.Index(self.topics, name="topic"))
+
+def _window_rows(n: int, recent: int, base: int) -> Tuple[slice, slice]:
+    """기존 _split_windows의 iloc 규칙을 행 구간으로."""
+    if n == 0:
+        return slice(0, 0), slice(0, 0)
+    rec = slice(max(0, n - recent) if recent > 0 else 0, n)
+    if recent <= 0:
+        prev = slice(0, 0)
+    elif n >= recent + base:
+        prev = slice(n - recent - base, n - recent)
+    else:
+        prev = slice(0, max(0, n - recent))
+    return rec, prev
+
+def _nanmean_rows(block: np.ndarray) -> np.ndarray:
+    """열별 NaN 제외 평균. 구간이 비면 0.0, 값이 전부 NaN이면 NaN."""
+    if block.shape[0] == 0:
+        return np.zeros(block.shape[1])
+    valid = ~np.isnan(block)
+    cnt = valid.sum(axis=0)
+    total = np.where(valid, block, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(cnt > 0, total / np.maximum(cnt, 1), np.nan)
+
+def _momentum(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = (a - b) / b * 100.0
+    return np.where(b == 0, np.where(a > 0, np.inf, 0.0), pct)
+
+def _window_stats(values: np.ndarray, windows: Iterable[Window]):
+    n = values.shape[0]
+    for recent, base in windows:
+        rec, prev = _window_rows(n, int(recent), int(base))
+        a, b = _nanmean_rows(values[rec]), _nanmean_rows(values[prev])
+        yield (recent, base), a, b, _momentum(a, b)
+
+def score_matrix(values: np.ndarray, windows: Iterable[Window] = ((14, 14),),
+                 topics: Sequence[str] | None = None) -> Dict[Window, TrendScores]:
+    """values: (days × topics) float 행렬 (결측 NaN, 마지막 행이 최신). 창마다 TrendScores."""
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2:
+        raise ValueError(f"values는 (days × topics) 2차원이어야 함: shape={values.shape}")
+    names = list(topics) if topics is not None else [str(i) for i in range(values.shape[1])]
+    if len(names) != values.shape[1]:
+        raise ValueError(f"topics 수({len(names)})와 열 수({values.shape[1]})가 다름")
+    return {w: _finish(names, w, a, b, mom) for w, a, b, mom in _window_stats(values, windows)}
+
+def _finish(topics: List[str], window: Window, a: np.ndarray, b: np.ndarray, mom: np.ndarray) -> TrendScores:
+    available = np.isfinite(mom)
+    score = np.where(available, mom, 0.0)
+    z = np.full(len(topics), np.nan)
+    if available.any():
+        v = mom[available]
+        sd = v.std()
+        z[available] = (v - v.mean()) / sd if sd > 0 else 0.0
+    order = np.argsort(-score, kind="stable")
+    rank = np.empty(len(topics), dtype=np.int64)
+    rank[order] = np.arange(1, len(topics) + 1)
+    return TrendScores(topics, window, a, b, mom, available, score, z, rank)
+
+def score_frame(ts: pd.DataFrame, topics: Sequence[str], windows: Iterable[Window] = ((14, 14),)) -> Dict[Window, TrendScores]:
+    """날짜 index DataFrame → 토픽 순서대로 점수. ts에 없는 토픽은 모멘텀 NaN / 점수 0 / 비가용."""
+    topics = list(topics)
+    cols = set(getattr(ts, "columns", []))
+    present = [t for t in dict.fromkeys(topics) if t in cols]
+    mat = ts[present].to_numpy(dtype=float) if present else np.empty((len(ts) if ts is not None else 0, 0))
+    pos = {t: i for i, t in enumerate(present)}
+    idx = np.array([pos.get(t, -1) for t in topics], dtype=np.int64)
+    have = idx >= 0
+    out: Dict[Window, TrendScores] = {}
+    for w, a, b, mom in _window_stats(mat, windows):
+        spread = []
+        for arr in (a, b, mom):
+            full = np.full(len(topics), np.nan)
+            full[have] = arr[idx[have]]
+            spread.append(full)
+        out[w] = _finish(topics, w, *spread)
+    return out
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 from typing import List, Dict, Any, Tuple, Callable, Set
-import re, os
-from .tavily_client import search_tavily, extract_url, extract_text
+import re, os, asyncio
+from .tavily_client import (search_tavily, extract_url, asearch_tavily, extract_texts, aextract_texts,
+                            remember_extracts)
+from .risk_matcher import get_risk_matcher
 
 # (기존) -------------------------
 PROFILE_DOMAINS = [
@@ -11,13 +13,15 @@ PROFILE_DOMAINS = [
     "companiesmarketcap.com", "marketscreener.com",
     "alphasquare.co.kr",
 ]
+PROFILE_MIN_CHARS = 500   # 이보다 짧은 본문은 요약 근거로 쓰지 않음
 
 def looks_like_ticker(q: str) -> bool:
     return bool(re.search(r"\b([A-Z]{1,5}(?:\.[A-Z]{2,4})?|\d{6}(?:\.[A-Z]{2,4})?)\b", q))
 
-def search_company_profile(query: str, api_key: str, topk: int = 6, timeout: int = 20) -> List[Dict[str, Any]]:
-    q = f"{query} company profile overview 기업 개요 회사 소개 무엇을 하는 회사"
-    results = search_tavily(q, api_key, top_k=topk, timeout=timeout, include_raw_content=True)
+def _profile_query(query: str) -> str:
+    return f"{query} company profile overview 기업 개요 회사 소개 무엇을 하는 회사"
+
+def _rank_profile(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     def score(r: Dict[str, Any]) -> Tuple[int, float]:
         dom = (r.get("source") or r.get("url") or "").lower()
         prio = 0
@@ -28,31 +32,88 @@ def search_company_profile(query: str, api_key: str, topk: int = 6, timeout: int
         return (-prio, -float(r.get("score", 0.0)))
     return sorted(results, key=score)
 
+def search_company_profile(query: str, api_key: str, topk: int = 6, timeout: int = 20) -> List[Dict[str, Any]]:
+    results = search_tavily(_profile_query(query), api_key, top_k=topk, timeout=timeout, include_raw_content=True,
+                            cache_kind="profile")
+    return _rank_profile(results)
+
+async def asearch_company_profile(query: str, api_key: str, topk: int = 6, timeout: int = 20) -> List[Dict[str, Any]]:
+    results = await asearch_tavily(_profile_query(query), api_key, top_k=topk, timeout=timeout,
+                                   include_raw_content=True, cache_kind="profile")
+    return _rank_profile(results)
+
+def profile_raw_contents(results: List[Dict[str, Any]]) -> Dict[str, str]:
+    """검색 결과(include_raw_content=True)의 원문 → {정리된 URL: 본문}. 이 URL들은 따로 추출하지 않음."""
+    out: Dict[str, str] = {}
+    for r in results or []:
+        url, raw = extract_url(r.get("url") or ""), r.get("raw_content")
+        if url and isinstance(raw, str) and len(raw) > PROFILE_MIN_CHARS:
+            out.setdefault(url, raw)
+    return out
+
+def _profile_texts(urls: List[str], pages: Dict[str, str], max_chars: int) -> List[str]:
+    texts = []
+    for u in urls:
+        t = (pages.get(u) or "")[:max_chars]
+        if len(t) > PROFILE_MIN_CHARS:
+            texts.append(f"[{u}]\n{t}")
+    return texts
+
 def extract_and_summarize_profile(
     urls: List[str],
     api_key: str,
     summarizer: Callable[[str], str],
-    max_chars: int = 6000
+    max_chars: int = 6000,
+    raw_contents: Dict[str, str] | None = None,
 ) -> str:
-    texts: List[str] = []
-    for u in urls[:2]:
-        try:
-            clean = extract_url(u)
-            t = extract_text(clean, api_key)[:max_chars]
-            if len(t) > 500:
-                texts.append(f"[{clean}]\n{t}")
-        except Exception:
-            continue
+    """
+    상위 2개 URL 본문 → 요약.
+    - raw_contents(검색 결과 원문)에 있는 URL은 그대로 사용 (추출 캐시에도 넣음)
+    - 나머지는 extract_texts 1회(배치), 최근 추출한 URL(정규형 기준)은 캐시에서
+    """
+    clean = [extract_url(u) for u in urls[:2]]
+    raw = {u: t for u, t in (raw_contents or {}).items() if u in clean}
+    remember_extracts(raw)
+    need = [u for u in clean if u not in raw]
+    try:
+        pages = {**(extract_texts(need, api_key) if need else {}), **raw}
+    except Exception:
+        pages = raw
+    texts = _profile_texts(clean, pages, max_chars)
     if not texts:
         return ""
+    return summarizer(_profile_prompt(texts))
+
+async def aextract_and_summarize_profile(
+    urls: List[str],
+    api_key: str,
+    summarizer: Callable[[str], str],
+    max_chars: int = 6000,
+    raw_contents: Dict[str, str] | None = None,
+) -> str:
+    """extract_and_summarize_profile의 비동기 버전: 남은 URL은 배치 추출 1회, 요약(동기 LLM 호출)·캐시 기록은 스레드에서."""
+    clean = [extract_url(u) for u in urls[:2]]
+    raw = {u: t for u, t in (raw_contents or {}).items() if u in clean}
+    if raw:
+        await asyncio.to_thread(remember_extracts, raw)  # SQLite 캐시 기록은 루프 밖에서
+    need = [u for u in clean if u not in raw]
+    try:
+        pages = {**(await aextract_texts(need, api_key) if need else {}), **raw}
+    except Exception:
+        pages = raw
+    texts = _profile_texts(clean, pages, max_chars)
+    if not texts:
+        return ""
+    return await asyncio.to_thread(summarizer, _profile_prompt(texts))
+
+def _profile_prompt(texts: List[str]) -> str:
     joined = "\n\n---\n\n".join(texts)
-    prompt = (
+    return (
         "다음 자료를 근거로 '기업 개요'를 한국어 5~7줄로 요약하세요.\n"
         "- 핵심 사업/제품, 수익원, 주요 시장/고객, 차별점, 최근 이슈(있으면)\n"
         "- 과도한 재무 디테일은 피하고, 문장당 20~30자 이내로 간결하게.\n\n"
         f"{joined}\n"
     )
-    return summarizer(prompt)
 
 # (신규) -------------------------
 # 1) 부정 키워드 사전 (KO/EN)
@@ -126,32 +187,56 @@ def search_risk_issues(
     raw = search_tavily(
         q, api_key, top_k=max(12, topk * 2), timeout=timeout,
         include_domains=include_domains, search_depth="advanced",
-        time_range=time_range, include_raw_content=False
+        time_range=time_range, include_raw_content=False, cache_kind="risk",
+    )
+    return _rank_risk(raw, extra_keywords, topk)
+
+async def asearch_risk_issues(
+    entity: str,
+    api_key: str,
+    topk: int = 8,
+    timeout: int = 20,
+    trust_only: bool = True,
+    time_range: str = "y",
+    extra_keywords: List[str] | None = None,
+) -> List[Dict[str, Any]]:
+    """search_risk_issues의 비동기 버전."""
+    q = build_risk_query(entity, extra=extra_keywords or [])
+    include_domains = TRUSTED_NEWS_DOMAINS if trust_only else None
+    raw = await asearch_tavily(
+        q, api_key, top_k=max(12, topk * 2), timeout=timeout,
+        include_domains=include_domains, search_depth="advanced",
+        time_range=time_range, include_raw_content=False, cache_kind="risk",
     )
+    return _rank_risk(raw, extra_keywords, topk)
 
-    # 키워드 매칭/정규화/중복 제거
-    kws = _kwset(extra_keywords or [])
+def _rank_risk(raw: List[Dict[str, Any]], extra_keywords: List[str] | None, topk: int) -> List[Dict[str, Any]]:
+    # 키워드 매칭(오토마톤 1회 순회, 오프셋 포함)/정규화/중복 제거
+    matcher = get_risk_matcher(_kwset(extra_keywords or []))
     seen: Set[str] = set()
     out: List[Dict[str, Any]] = []
     for r in raw or []:
         url = extract_url(r.get("url") or r.get("source") or "")
         if not url or url in seen:
             continue
-        text = " ".join([
-            str(r.get("title") or ""),
-            str(r.get("content") or ""),
-            str(r.get("snippet") or "")
-        ]).lower()
-        matched = sorted({kw for kw in kws if kw in text})
-        if not matched:
+        title = str(r.get("title") or "")
+        content = str(r.get("content") or "")
+        snippet = str(r.get("snippet") or "")
+        matches = matcher.find(" ".join([title, content, snippet]))
+        if not matches:
             # 부정 키워드가 본문/타이틀에 전혀 없으면 제외 (정밀도 ↑)
             continue
         score_base = float(r.get("score", 0.0) or 0.0)
-        risk_score = len(matched) + score_base  # 간단 가중치
+        risk_score = matcher.score(matches) + score_base  # 심각도 가중치 합
+        # 발췌는 본문(없으면 snippet) 기준 → 결합 텍스트 오프셋을 해당 필드 기준으로 옮김
+        body, off = (content, len(title) + 1) if content.strip() else (snippet, len(title) + len(content) + 2)
+        local = [m._replace(start=m.start - off, end=m.end - off) for m in matches
+                 if m.start >= off and m.end <= off + len(body)]
         item = dict(r)
         item["url"] = url
         item["risk_score"] = float(f"{risk_score:.4f}")
-        item["matched_keywords"] = matched
+        item["matched_keywords"] = sorted({m.keyword for m in matches})
+        item["risk_excerpt"] = matcher.excerpt(body.replace("\n", " "), local)
         seen.add(url)
         out.append(item)
 
@@ -20,6 +20,8 @@ from google.adk.models.llm_request import LlmRequest
 from google.adk.models.llm_response import LlmResponse
 
 from .impl.rag import Day2Agent
+from .impl.netflix_top import NETFLIX_TOP_FILENAME, get_top_index
+from .impl.director_index import get_director_index, index_for_map
 from ..common.writer import render_day2, render_enveloped
 from ..common.schemas import Day2Plan      
 from ..common.fs_utils import save_markdown
@@ -60,31 +62,6 @@ def _normalize_category(name: str) -> str:
         return "Movies"
     return name.strip().capitalize()
 
-def _load_docs_jsonl(docs_path: str) -> List[Dict[str, Any]]:
-    """docs.jsonl 파일 로드"""
-    docs = []
-    if not os.path.exists(docs_path):
-        return docs
-    with open(docs_path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            try:
-                docs.append(json.loads(line))
-            except Exception:
-                pass
-    return docs
-
-def _available_values(docs: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
-    """인덱스에서 사용 가능한 country와 category 목록 추출"""
-    countries = set()
-    categories = set()
-    for doc in docs:
-        meta = doc.get("meta", {}) or {}
-        if meta.get("country"):
-            countries.add(meta["country"])
-        if meta.get("category"):
-            categories.add(meta["category"])
-    return sorted(countries), sorted(categories)
-
 def _parse_from_query(query: str, known_countries: List[str], known_categories: List[str]) -> Tuple[Optional[str], Optional[str], Optional[int]]:
     """질의에서 country, category, top_n 추출"""
     if not query:
@@ -127,49 +104,6 @@ def _parse_from_query(query: str, known_countries: List[str], known_categories:
     
     return cand_country, cand_category, cand_topn
 
-def _pick_top_netflix(docs: List[Dict[str, Any]], country: Optional[str], category: Optional[str], top_n: Optional[int]) -> List[Dict[str, Any]]:
-    """넷플릭스 TOP 리스트 추출 (rank 기반, 중복 제거 및 순위 정렬)"""
-    want_c = _normalize_country(country) if country else None
-    want_cat = _normalize_category(category) if category else None
-    
-    rows = []
-    seen = set()  # 중복 제거용: (rank, title) 튜플 저장
-    
-    for doc in docs:
-        meta = doc.get("meta", {}) or {}
-        title = (doc.get("text") or "").strip()
-        rank = meta.get("rank")
-        if not title or rank is None:
-            continue
-        if want_c and meta.get("country") != want_c:
-            continue
-        if want_cat and (meta.get("category") or "").capitalize() != want_cat:
-            continue
-        
-        # 중복 체크: 같은 rank와 title 조합이 이미 있으면 스킵
-        rank_int = int(rank)
-        key = (rank_int, title.lower())  # 대소문자 무시하고 비교
-        if key in seen:
-            continue
-        seen.add(key)
-        
-        rows.append({
-            "rank": rank_int,
-            "title": title,
-            "country": meta.get("country"),
-            "category": meta.get("category"),
-            "weeks_in_top": meta.get("weeks_in_top"),
-        })
-    
-    # rank 순으로 정렬 (1위부터 순서대로)
-    rows.sort(key=lambda x: x["rank"])
-    
-    # top_n 제한 적용
-    if top_n:
-        rows = [x for x in rows if x["rank"] <= top_n]
-    
-    return rows
-
 def _is_netflix_query(query: str) -> bool:
     """넷플릭스 TOP 리스트 요청인지 판단"""
     q_lower = query.lower()
@@ -177,78 +111,14 @@ def _is_netflix_query(query: str) -> bool:
     return any(kw in q_lower for kw in netflix_keywords)
 
 def _load_director_csv(csv_path: str) -> Dict[str, int]:
-    """감독 랭킹 CSV 파일 로드 (감독명 -> rank1_count 매핑)"""
-    director_map = {}
-    if not os.path.exists(csv_path):
-        return director_map
-    
-    try:
-        with open(csv_path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
-            if not lines:
-                return director_map
-            
-            # 첫 번째 줄은 헤더 (예: ",director,rank1_count")
-            # 각 줄의 형식: "숫자,감독명,rank1_count"
-            for line_num, line in enumerate(lines[1:], start=2):  # 헤더 제외
-                line = line.strip().strip('"')
-                if not line:
-                    continue
-                
-                # 빈 컬럼 제거 (시작 부분의 쉼표)
-                if line.startswith(","):
-                    line = line[1:]
-                
-                # 쉼표로 분리
-                parts = [p.strip().strip('"') for p in line.split(",")]
-                
-                # 최소 3개 컬럼 필요: 인덱스, 감독명, rank1_count
-                if len(parts) >= 3:
-                    # parts[0]은 인덱스, parts[1]은 감독명, parts[2]는 rank1_count
-                    director = parts[1] if len(parts) > 1 else None
-                    rank1_count_str = parts[2] if len(parts) > 2 else None
-                    
-                    if director and rank1_count_str:
-                        try:
-                            # 숫자만 추출 (쉼표 등 제거)
-                            rank1_count = int(rank1_count_str.replace(",", "").strip())
-                            director_map[director] = rank1_count
-                        except ValueError:
-                            # 숫자 변환 실패 시 스킵
-                            pass
-    except Exception as e:
-        print(f"[WARN] 감독 CSV 로드 실패: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return director_map
+    """감독 랭킹 CSV (감독명 -> rank1_count). 프로세스에 상주하며 파일이 바뀔 때만 다시 읽는다."""
+    return get_director_index(csv_path).counts
 
 def _find_director_in_query(query: str, director_map: Dict[str, int]) -> Optional[Tuple[str, int]]:
-    """질의에서 감독 이름 찾기"""
+    """질의에서 감독 이름 찾기 (긴 이름 우선 정확 매칭 → 없으면 오타 허용 매칭)"""
     if not director_map:
         return None
-    
-    query_lower = query.lower().strip()
-    
-    # 모든 감독 이름을 길이순으로 정렬 (긴 이름 우선 매칭)
-    sorted_directors = sorted(director_map.keys(), key=len, reverse=True)
-    
-    # 1. 정확한 매칭 시도 (대소문자 무시)
-    for director in sorted_directors:
-        if director.lower() == query_lower:
-            return (director, director_map[director])
-    
-    # 2. 부분 매칭 시도 (감독 이름이 질의에 포함되어 있는지)
-    for director in sorted_directors:
-        director_lower = director.lower()
-        # 질의에 감독 이름이 포함되어 있는지 확인
-        if director_lower in query_lower:
-            return (director, director_map[director])
-        # 부분 매칭 (예: "봉준호" -> "봉준호 감독")
-        if query_lower in director_lower and len(query_lower) >= 2:
-            return (director, director_map[director])
-    
-    return None
+    return index_for_map(director_map).find(query)
 
 def _is_director_query(query: str) -> bool:
     """감독 조회 요청인지 판단"""
@@ -270,9 +140,9 @@ def _is_simple_ranking_query(query: str) -> bool:
 
 def _handle_director_query(query: str, csv_path: str) -> Dict[str, Any]:
     """감독 조회 처리"""
-    director_map = _load_director_csv(csv_path)
+    director_index = get_director_index(csv_path)
     
-    if not director_map:
+    if not len(director_index):
         return {
             "type": "director_query",
             "query": query,
@@ -280,16 +150,17 @@ def _handle_director_query(query: str, csv_path: str) -> Dict[str, Any]:
             "error": "감독 랭킹 데이터를 로드할 수 없습니다.",
         }
     
-    director_info = _find_director_in_query(query, director_map)
+    match = director_index.match(query)
     
-    if director_info:
-        director_name, rank1_count = director_info
+    if match:
+        director_name, rank1_count = match.name, match.rank1_count
         return {
             "type": "director_query",
             "query": query,
             "found": True,
             "director": director_name,
             "rank1_count": rank1_count,
+            "match": match.kind,  # exact | contains | partial | fuzzy
             "message": f"{director_name} 감독은 {rank1_count}번 1위를 했습니다.",
         }
     else:
@@ -299,20 +170,20 @@ def _handle_director_query(query: str, csv_path: str) -> Dict[str, Any]:
             "query": query,
             "found": False,
             "error": "질의에서 감독을 찾을 수 없습니다.",
-            "available_directors": list(director_map.keys())[:10],  # 처음 10개만 힌트로 제공
+            "available_directors": director_index.names[:10],  # 처음 10개만 힌트로 제공
         }
 
+def _netflix_index_exists(index_dir: str) -> bool:
+    return any(os.path.exists(os.path.join(index_dir, name)) for name in (NETFLIX_TOP_FILENAME, "docs.jsonl", "docs.bin"))
+
 def _handle_netflix_top(query: str, index_dir: str) -> Dict[str, Any]:
-    """넷플릭스 TOP 리스트 처리"""
+    """넷플릭스 TOP 리스트 처리 (빌드 시 만든 netflix_top.json을 상주시켜 (country, category) 조회)"""
     try:
-        docs_path = os.path.join(index_dir, "docs.jsonl")
-        
-        if not os.path.exists(docs_path):
+        if not _netflix_index_exists(index_dir):
             # 넷플릭스 인덱스가 없으면 netflix_multi 시도
             netflix_multi_dir = os.path.join(os.path.dirname(index_dir), "netflix_multi")
-            netflix_multi_path = os.path.join(netflix_multi_dir, "docs.jsonl")
-            if os.path.exists(netflix_multi_path):
-                docs_path = netflix_multi_path
+            if _netflix_index_exists(netflix_multi_dir):
+                index_dir = netflix_multi_dir
             else:
                 return {
                     "type": "netflix_top",
@@ -321,9 +192,9 @@ def _handle_netflix_top(query: str, index_dir: str) -> Dict[str, Any]:
                     "error": f"넷플릭스 인덱스를 찾을 수 없습니다: {index_dir} 또는 {netflix_multi_dir}",
                 }
         
-        docs = _load_docs_jsonl(docs_path)
+        top_index = get_top_index(index_dir)
         
-        if not docs:
+        if not len(top_index):
             return {
                 "type": "netflix_top",
                 "query": query,
@@ -331,14 +202,15 @@ def _handle_netflix_top(query: str, index_dir: str) -> Dict[str, Any]:
                 "error": "인덱스에 데이터가 없습니다.",
             }
         
-        # 사용 가능한 값들 확인
-        known_countries, known_categories = _available_values(docs)
+        # 사용 가능한 값들 (빌드 시 미리 계산)
+        known_countries, known_categories = top_index.countries, top_index.categories
         
         # 질의에서 파라미터 추출
         country, category, top_n = _parse_from_query(query, known_countries, known_categories)
         
-        # TOP 리스트 추출
-        items = _pick_top_netflix(docs, country, category, top_n)
+        # TOP 리스트 추출 (rank 정렬·중복 제거는 빌드 시 완료)
+        items = top_index.top(_normalize_country(country) if country else None,
+                              _normalize_category(category) if category else None, top_n)
         
         return {
             "type": "netflix_top",
@@ -366,6 +238,8 @@ def _handle_with_web_fallback(query: str) -> Dict[str, Any]:
     try:
         plan = Day2Plan()
         plan.index_dir = index_dir
+        plan.retrieval = os.getenv("DAY2_RETRIEVAL", plan.retrieval)  # "dense" | "hybrid"
+        plan.fusion = os.getenv("DAY2_FUSION", plan.fusion)
         agent = Day2Agent(plan_defaults=plan)
         rag_payload: Dict[str, Any] = agent.handle(query, plan)
     except Exception as e:
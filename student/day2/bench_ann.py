@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Day2 ANN 인덱스 벤치마크 (flat vs ivf / ivfpq / hnsw)
+- 정답: 같은 벡터로 만든 flat(전수 탐색) 인덱스의 top-k
+- 출력: 인덱스 종류·질의 파라미터(nprobe/efSearch)별 recall@k, 질의 1건 지연(평균/p95), 빌드 시간, 직렬화 크기
+- 데이터: 기본은 군집형 합성 벡터(L2 정규화, 코퍼스 규모 흉내), --index_dir 지정 시 기존 flat 인덱스의 실제 벡터 사용
+
+사용 예:
+python -m student.day2.bench_ann --n 100000 --dim 256
+python -m student.day2.bench_ann --index_dir indices/day2 --k 5
+"""
+
+from __future__ import annotations
+import os, sys, time, argparse
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import faiss
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from student.day2.impl.store import make_index_spec, search_params, _new_index
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return (x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-12)).astype("float32")
+
+def _synthetic(n: int, dim: int, n_queries: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(8, n // 500), dim)).astype("float32")
+    xb = centers[rng.integers(0, len(centers), n)] + 0.6 * rng.standard_normal((n, dim)).astype("float32")
+    xq = xb[rng.integers(0, n, n_queries)] + 0.3 * rng.standard_normal((n_queries, dim)).astype("float32")
+    return _normalize(xb), _normalize(xq)
+
+def _from_index(index_dir: str, n_queries: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    index = faiss.read_index(os.path.join(index_dir, "faiss.index"))
+    xb = index.reconstruct_n(0, index.ntotal).astype("float32")
+    rng = np.random.default_rng(seed)
+    xq = xb[rng.integers(0, len(xb), n_queries)] + 0.05 * rng.standard_normal((n_queries, xb.shape[1])).astype("float32")
+    return xb, _normalize(xq)
+
+def _recall(I: np.ndarray, gt: np.ndarray, k: int) -> float:
+    hits = sum(len(set(a[:k]) & set(b[:k]) - {-1}) for a, b in zip(I, gt))
+    return hits / float(gt.shape[0] * k)
+
+def _latency(index: faiss.Index, xq: np.ndarray, k: int, params) -> Tuple[np.ndarray, float, float]:
+    """질의를 1건씩 보내 실제 에이전트 호출 패턴(질의당 search 1회)의 지연을 측정."""
+    out = np.empty((len(xq), k), dtype="int64")
+    lat: List[float] = []
+    for i in range(len(xq)):
+        t0 = time.perf_counter()
+        _, I = index.search(xq[i:i + 1], k, params=params)
+        lat.append(time.perf_counter() - t0)
+        out[i] = I[0]
+    lat_ms = np.asarray(lat) * 1000
+    return out, float(lat_ms.mean()), float(np.percentile(lat_ms, 95))
+
+def main():
+    ap = argparse.ArgumentParser(description="FaissStore ANN 인덱스 recall/지연/메모리 벤치마크")
+    ap.add_argument("--n", type=int, default=100_000, help="합성 벡터 수")
+    ap.add_argument("--dim", type=int, default=256, help="합성 벡터 차원 (실제 text-embedding-3-small=1536)")
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--index_dir", default=None, help="기존 flat 인덱스 벡터로 측정")
+    ap.add_argument("--types", default="ivf,ivfpq,hnsw")
+    ap.add_argument("--nprobes", default="1,4,16,64")
+    ap.add_argument("--ef_searches", default="16,64,256")
+    args = ap.parse_args()
+
+    xb, xq = _from_index(args.index_dir, args.queries) if args.index_dir else _synthetic(args.n, args.dim, args.queries)
+    n, dim = xb.shape
+    k = min(args.k, n)
+    print(f"[BENCH] N={n:,} dim={dim} queries={len(xq)} k={k} threads={faiss.omp_get_max_threads()}")
+    print(f"  {'spec':22s} {'param':>12s} {'recall@k':>9s} {'mean ms':>8s} {'p95 ms':>8s} {'build s':>8s} {'size MB':>8s}")
+
+    def row(spec, param, rec, mean, p95, build_s, size):
+        print(f"  {spec:22s} {param:>12s} {rec:9.4f} {mean:8.3f} {p95:8.3f} {build_s:8.2f} {size / 1e6:8.1f}")
+
+    t0 = time.perf_counter()
+    flat = _new_index(dim, "Flat")
+    flat.add(xb)
+    flat_build = time.perf_counter() - t0
+    gt, mean, p95 = _latency(flat, xq, k, None)
+    row("Flat", "-", 1.0, mean, p95, flat_build, len(faiss.serialize_index(flat)))
+
+    for t in [x.strip() for x in args.types.split(",") if x.strip()]:
+        spec = make_index_spec(t, n=n, dim=dim)
+        t0 = time.perf_counter()
+        index = _new_index(dim, spec)
+        if not index.is_trained:
+            index.train(xb)
+        index.add(xb)
+        build_s = time.perf_counter() - t0
+        size = len(faiss.serialize_index(index))
+        if t == "hnsw":
+            sweep = [("efSearch", int(v)) for v in args.ef_searches.split(",")]
+        else:
+            sweep = [("nprobe", int(v)) for v in args.nprobes.split(",")]
+        for name, v in sweep:
+            params = search_params(index, nprobe=v) if name == "nprobe" else search_params(index, ef_search=v)
+            I, mean, p95 = _latency(index, xq, k, params)
+            row(spec, f"{name}={v}", _recall(I, gt, k), mean, p95, build_s, size)
+
+if __name__ == "__main__":
+    main()
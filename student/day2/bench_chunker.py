@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Day2 청크 분할 벤치마크 (기존 chunk_text vs 토큰·페이지 보존 span 청크)
+- 같은 페이지 텍스트(data/raw PDF에서 1회 추출)로 두 청크 방식을 비교
+- 출력: 청크 수, 분할 시간, 최대 메모리(tracemalloc), 토큰 수 분포(평균/최대), 페이지를 넘는 청크 비율, 문장 중간에서 끝나는 청크 비율
+- span 방식은 위치 계산(spans)과 문자열 생성(materialize) 시간을 나눠 표시
+
+사용 예:
+python -m student.day2.bench_chunker --paths data/raw
+DAY2_TOKENIZER=approx python -m student.day2.bench_chunker --paths data/raw
+"""
+
+from __future__ import annotations
+import re, sys, time, bisect, argparse, tracemalloc
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from student.day2.impl.chunker import PagedText, chunk_spans, span_items, get_token_counter
+from student.day2.impl.stream_ingest import iter_pages
+
+_SENT_TAIL = re.compile(r"[.!?。！？…][\"'”’)\]]*$")
+
+def _measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn()
+    wall = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, wall, peak
+
+def _load_pages(paths: List[str], workers: int | None) -> List[Tuple[str, List[str]]]:
+    from student.day2.impl.ingest import list_source_files
+    docs: dict = {}
+    for path, _page, text in iter_pages(list_source_files(paths), workers=workers):
+        docs.setdefault(path, []).append(text)
+    return list(docs.items())
+
+def _row(name, n, wall, peak, toks, crossing, mid):
+    avg = sum(toks) / max(1, len(toks))
+    print(f"  {name:18s} chunks={n:5d}  time={wall * 1000:8.1f}ms  peak={peak / 1e6:7.2f}MB  "
+          f"tokens avg={avg:6.1f} max={max(toks or [0]):5d}  cross-page={crossing:6.1%}  mid-sentence={mid:6.1%}")
+
+def main():
+    ap = argparse.ArgumentParser(description="chunk_text vs span 청크 비교")
+    ap.add_argument("--paths", nargs="+", default=["data/raw"])
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--max_tokens", type=int, default=400)
+    ap.add_argument("--overlap_tokens", type=int, default=50)
+    args = ap.parse_args()
+
+    from student.day2.impl.ingest import chunk_text, clean_text
+
+    t0 = time.perf_counter()
+    docs = _load_pages(args.paths, args.workers)
+    counter = get_token_counter()
+    n_pages = sum(len(p) for _, p in docs)
+    print(f"[BENCH] files={len(docs)} pages={n_pages} extract={time.perf_counter() - t0:.1f}s tokenizer={counter.name}")
+
+    # 1) 기존: 파일 전체 문자열 → 1200/200 문자 창
+    def old():
+        out = []
+        for _path, pages in docs:
+            full = clean_text("\n".join(pages))
+            out.append((pages, full, chunk_text(full)))
+        return out
+    old_out, wall, peak = _measure(old)
+    toks, crossing, mid, n = [], 0, 0, 0
+    for pages, full, chunks in old_out:
+        # 페이지 경계 위치(정제 후 근사: 원문 페이지 길이 누적)
+        bounds, pos = [], 0
+        for p in pages[:-1]:
+            pos += len(p) + 1
+            bounds.append(pos)
+        start = 0
+        for ch in chunks:
+            s = full.find(ch, start)
+            start = s + 1 if s >= 0 else start
+            e = s + len(ch)
+            crossing += bisect.bisect_right(bounds, s) != bisect.bisect_right(bounds, max(s, e - 1))
+            mid += not _SENT_TAIL.search(ch.rstrip())
+            toks.append(counter.count(ch))
+            n += 1
+    _row("chunk_text", n, wall, peak, toks, crossing / max(1, n), mid / max(1, n))
+
+    # 2) span: 위치만 계산 → 필요할 때 문자열 생성
+    def spans_only():
+        out = []
+        for path, pages in docs:
+            doc = PagedText(pages)
+            out.append((path, doc, chunk_spans(doc, args.max_tokens, args.overlap_tokens, counter=counter)))
+        return out
+    span_out, wall_s, peak_s = _measure(spans_only)
+    items, wall_m, peak_m = _measure(lambda: [it for path, doc, sp in span_out for it in span_items(path, doc, sp)])
+    toks = [it["meta"]["tokens"] for it in items]
+    mid = sum(not _SENT_TAIL.search(it["text"]) for it in items)
+    crossing = sum(doc.page_of(s.start) != doc.page_of(s.end - 1) for _p, doc, sp in span_out for s in sp)
+    _row("span (positions)", len(items), wall_s, peak_s, toks, crossing / max(1, len(items)), mid / max(1, len(items)))
+    print(f"  {'span (materialize)':18s} time={wall_m * 1000:8.1f}ms  peak={peak_m / 1e6:7.2f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Day2 임베딩 벤치마크 (로컬 스텁 엔드포인트)
+- 로컬 HTTP 스텁(/v1/embeddings)을 띄우고 OPENAI_BASE_URL을 그쪽으로 돌려 실제 API 비용 없이 측정
+- 비교: 텍스트당 1요청(기존 방식) vs 배치 요청(Embeddings.encode)
+- 출력: 요청 수, 벽시계 시간, 두 결과 벡터의 일치 여부
+- 디스크 캐시(임시 디렉토리): 콜드/웜 인코딩과 1건 추가 시 요청 수
+- '__bad__'가 포함된 텍스트는 스텁이 400을 돌려줌 → 부분 배치 재시도 동작 확인용(--bad)
+
+사용 예:
+python -m student.day2.bench_embeddings --n 108 --latency_ms 30
+python -m student.day2.bench_embeddings --docs_jsonl indices/day2/docs.jsonl
+"""
+
+from __future__ import annotations
+import os, sys, json, time, base64, hashlib, argparse, tempfile, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+STUB_DIM = 256
+
+class _StubState:
+    requests = 0
+    inputs = 0
+    latency_s = 0.0
+
+def _stub_vector(text: str, dim: int = STUB_DIM) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(dim).astype("float32")
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):  # 조용히
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        inputs = body.get("input")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        _StubState.requests += 1
+        _StubState.inputs += len(inputs or [])
+        time.sleep(_StubState.latency_s)  # 왕복 지연 흉내
+
+        if any("__bad__" in t for t in inputs or []):
+            out = json.dumps({"error": {"message": "bad input", "type": "invalid_request_error"}}).encode()
+            self.send_response(400)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+            return
+
+        b64 = body.get("encoding_format") == "base64"
+        data = []
+        for i, t in enumerate(inputs or []):
+            vec = _stub_vector(t)
+            emb = base64.b64encode(vec.tobytes()).decode() if b64 else vec.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": emb})
+        data.reverse()  # 순서 복원 로직 검증을 위해 일부러 역순 응답
+        out = json.dumps({
+            "object": "list", "data": data, "model": body.get("model", "stub"),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+def start_stub(latency_ms: float = 30.0) -> ThreadingHTTPServer:
+    _StubState.latency_s = latency_ms / 1000.0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+def _load_texts(args) -> List[str]:
+    if args.docs_jsonl:
+        with open(args.docs_jsonl, "r", encoding="utf-8") as f:
+            return [json.loads(ln)["text"] for ln in f if ln.strip()]
+    rng = np.random.default_rng(0)
+    words = ["인공지능", "의료기기", "가이드라인", "OTT", "규제", "허가", "심사", "콘텐츠", "플랫폼", "데이터"]
+    return [" ".join(rng.choice(words, size=args.words)) + f" #{i}" for i in range(args.n)]
+
+def main():
+    ap = argparse.ArgumentParser(description="Embeddings 배치 벤치마크 (로컬 스텁)")
+    ap.add_argument("--n", type=int, default=108, help="합성 텍스트 개수")
+    ap.add_argument("--words", type=int, default=200, help="합성 텍스트당 단어 수")
+    ap.add_argument("--docs_jsonl", default=None, help="실제 docs.jsonl에서 텍스트 사용")
+    ap.add_argument("--batch_size", type=int, default=128)
+    ap.add_argument("--latency_ms", type=float, default=30.0, help="스텁 요청당 지연(ms)")
+    ap.add_argument("--bad", action="store_true", help="불량 입력 1개를 섞어 부분 재시도 확인")
+    args = ap.parse_args()
+
+    srv = start_stub(args.latency_ms)
+    os.environ.pop("AZURE_OPENAI_ENDPOINT", None)
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{srv.server_address[1]}/v1"
+
+    from student.day2.impl.embeddings import Embeddings
+    from student.day2.impl.embed_cache import EmbeddingCache
+
+    texts = _load_texts(args)
+    print(f"[BENCH] texts={len(texts)}, batch_size={args.batch_size}, latency={args.latency_ms}ms")
+
+    # 1) 기존 방식: 텍스트당 1요청
+    emb = Embeddings(batch_size=args.batch_size, cache=False)
+    _StubState.requests = 0
+    t0 = time.perf_counter()
+    legacy = np.vstack([emb._embed_once(t) for t in texts])
+    legacy_s = time.perf_counter() - t0
+    legacy_req = _StubState.requests
+
+    # 2) 배치 방식
+    _StubState.requests = 0
+    t0 = time.perf_counter()
+    batched = emb.encode(texts)
+    batched_s = time.perf_counter() - t0
+    batched_req = _StubState.requests
+
+    same = bool(np.allclose(legacy, batched, atol=1e-5))
+    print(f"  per-text : requests={legacy_req:5d}  wall={legacy_s:7.3f}s")
+    print(f"  batched  : requests={batched_req:5d}  wall={batched_s:7.3f}s  (x{legacy_s / max(batched_s, 1e-9):.1f})")
+    print(f"  vectors identical: {same}")
+
+    # 3) 디스크 캐시: 콜드 → 웜 → 1건 추가
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, batch in (("cache cold", texts), ("cache warm", texts), ("cache +1", texts + ["새 문서 청크"])):
+            cached = Embeddings(batch_size=args.batch_size, cache=EmbeddingCache(emb.provider, emb.model, cache_dir=tmp))
+            _StubState.requests, _StubState.inputs = 0, 0
+            t0 = time.perf_counter()
+            out = cached.encode(batch)
+            wall = time.perf_counter() - t0
+            ok = bool(np.allclose(out[:len(texts)], batched, atol=1e-5))
+            print(f"  {label:10s}: requests={_StubState.requests:5d}  embedded={_StubState.inputs:5d}  "
+                  f"wall={wall:7.3f}s  same={ok}  {cached.cache_stats()['hit_rate']:.0%} hit")
+
+    if args.bad:
+        bad_texts = list(texts)
+        bad_texts[len(bad_texts) // 2] = "__bad__"
+        _StubState.requests = 0
+        try:
+            emb.encode(bad_texts)
+        except Exception as e:
+            print(f"  bad input: requests={_StubState.requests} (원배치 1 + 이분 분할), error={type(e).__name__}")
+
+    srv.shutdown()
+
+if __name__ == "__main__":
+    main()
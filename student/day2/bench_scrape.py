@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+넷플릭스 TOP 10 수집 벤치마크 (로컬 HTML 픽스처 서버)
+- 로컬 HTTP 서버가 Tudum TOP 10 페이지를 흉내 냄
+    · 나라/카테고리 드롭다운([data-uia=top10-*-select] + role=listbox/option), 선택 시 /api/top10을 fetch해서 표만 다시 그림
+    · 이미지(--images개)/웹폰트 요청마다 --asset_ms 지연 → networkidle 대기와 리소스 차단 효과가 드러나게
+    · 페이지 로드 --page_ms, API --api_ms 지연
+- 비교: 기존 load_netflix_top10(쌍마다 브라우저 실행 + networkidle) 직렬 vs netflix_scraper.scrape_top10(concurrency별)
+- 출력: 방식별 벽시계 시간, pairs/s, 직렬 결과와 같은지(same)
+
+사용 예:
+python -m student.day2.bench_scrape --concurrency 1,2,4,8
+python -m student.day2.bench_scrape --countries "South Korea,Japan" --categories "Movies,Shows" --skip_serial
+"""
+
+from __future__ import annotations
+import sys, json, time, hashlib, argparse, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import product
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+FIXTURE_COUNTRIES = ["Global", "South Korea", "United States", "France", "Türkiye", "Japan"]
+FIXTURE_CATEGORIES = ["Movies", "Shows"]
+
+class _Fixture:
+    page_s = 0.3
+    api_s = 0.1
+    asset_s = 0.4
+    images = 24
+
+_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Top 10</title>
+<style>
+@font-face { font-family: Fx; src: url(/asset/font.woff2); }
+body { font-family: Fx, sans-serif; }
+.sel { display: inline-block; border: 1px solid #999; padding: 4px 12px; margin: 4px; cursor: pointer; }
+[role=listbox] { position: absolute; background: #fff; border: 1px solid #999; list-style: none; padding: 0; }
+[role=option] { padding: 4px 12px; cursor: pointer; }
+img { width: 40px; height: 60px; }
+</style></head>
+<body><main>
+<div class="sel" data-uia="top10-country-select">Global</div>
+<div class="sel" data-uia="top10-category-select">Movies</div>
+<ul role="listbox" id="lb" hidden></ul>
+<table><tbody id="rows"></tbody></table>
+<div>%(imgs)s</div>
+</main>
+<script>
+const OPTIONS = {country: %(countries)s, category: %(categories)s};
+const state = {country: "Global", category: "Movies"};
+const lb = document.getElementById("lb");
+async function load() {
+  const q = new URLSearchParams(state);
+  const rows = await (await fetch("/api/top10?" + q)).json();
+  document.getElementById("rows").innerHTML =
+    rows.map(r => `<tr><td>${r[0]}</td><td>${r[1]}</td><td>${r[2]}</td></tr>`).join("");
+}
+for (const key of ["country", "category"]) {
+  const box = document.querySelector(`[data-uia=top10-${key}-select]`);
+  box.addEventListener("click", () => {
+    lb.innerHTML = OPTIONS[key].map(o => `<li role="option">${o}</li>`).join("");
+    const r = box.getBoundingClientRect();
+    lb.style.left = r.left + "px"; lb.style.top = (r.bottom + window.scrollY) + "px";
+    lb.hidden = false;
+    lb.onclick = e => {
+      const opt = e.target.closest("[role=option]");
+      if (!opt) return;
+      lb.hidden = true;
+      box.textContent = opt.textContent;
+      state[key] = opt.textContent;
+      load();
+    };
+  });
+}
+load();
+</script></body></html>
+"""
+
+def _rows(country: str, category: str):
+    out = []
+    for rank in range(1, 11):
+        h = int(hashlib.sha1(f"{country}/{category}/{rank}".encode()).hexdigest()[:6], 16)
+        out.append([rank, f"{country} {category} Title {h % 1000:03d}", 1 + h % 9])
+    return out
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: bytes, ctype: str):
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        u = urlparse(self.path)
+        if u.path.startswith("/tudum/top10"):
+            time.sleep(_Fixture.page_s)
+            imgs = "".join(f'<img src="/asset/poster_{i}.png">' for i in range(_Fixture.images))
+            html = _PAGE % {"imgs": imgs, "countries": json.dumps(FIXTURE_COUNTRIES, ensure_ascii=False),
+                            "categories": json.dumps(FIXTURE_CATEGORIES)}
+            self._send(html.encode("utf-8"), "text/html; charset=utf-8")
+        elif u.path == "/api/top10":
+            q = parse_qs(u.query)
+            time.sleep(_Fixture.api_s)
+            rows = _rows(q.get("country", ["Global"])[0], q.get("category", ["Movies"])[0])
+            self._send(json.dumps(rows, ensure_ascii=False).encode("utf-8"), "application/json")
+        elif u.path.startswith("/asset/"):
+            time.sleep(_Fixture.asset_s)
+            self._send(b"\0" * 2048, "font/woff2" if u.path.endswith(".woff2") else "image/png")
+        else:
+            self.send_error(404)
+
+def start_fixture(page_ms: float = 300, api_ms: float = 100, asset_ms: float = 400, images: int = 24) -> ThreadingHTTPServer:
+    _Fixture.page_s, _Fixture.api_s, _Fixture.asset_s, _Fixture.images = page_ms / 1000, api_ms / 1000, asset_ms / 1000, images
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+def main():
+    ap = argparse.ArgumentParser(description="load_netflix_top10(직렬) vs scrape_top10(동시) 수집 벤치마크")
+    ap.add_argument("--countries", default="South Korea,United States,France,Turkiye,Japan")
+    ap.add_argument("--categories", default="Movies,Shows")
+    ap.add_argument("--concurrency", default="1,2,4,8")
+    ap.add_argument("--page_ms", type=float, default=300)
+    ap.add_argument("--api_ms", type=float, default=100, help="load_netflix_top10은 선택 후 200ms만 기다리므로 그보다 작게")
+    ap.add_argument("--asset_ms", type=float, default=400)
+    ap.add_argument("--images", type=int, default=24)
+    ap.add_argument("--skip_serial", action="store_true")
+    args = ap.parse_args()
+
+    from student.day2.impl.ingest import load_netflix_top10
+    from student.day2.impl.netflix_scraper import scrape_top10
+
+    srv = start_fixture(args.page_ms, args.api_ms, args.asset_ms, args.images)
+    url = f"http://127.0.0.1:{srv.server_address[1]}/tudum/top10/"
+    pairs = list(product([c.strip() for c in args.countries.split(",") if c.strip()],
+                         [c.strip() for c in args.categories.split(",") if c.strip()]))
+    print(f"[BENCH] pairs={len(pairs)} page={args.page_ms:.0f}ms api={args.api_ms:.0f}ms "
+          f"assets={args.images}+1 × {args.asset_ms:.0f}ms  url={url}")
+
+    def row(name, wall, same):
+        print(f"  {name:28s} time={wall:7.2f}s  {len(pairs) / wall:6.2f} pairs/s  same={same}")
+
+    serial = None
+    if not args.skip_serial:
+        t0 = time.perf_counter()
+        serial = {(c, cat): load_netflix_top10(c, cat, url=url) for c, cat in pairs}
+        row("serial (browser per pair)", time.perf_counter() - t0, "-")
+
+    for n in [int(x) for x in args.concurrency.split(",") if x.strip()]:
+        t0 = time.perf_counter()
+        got = {(c, cat): items for c, cat, items in scrape_top10(pairs, concurrency=n, url=url)}
+        wall = time.perf_counter() - t0
+        same = "-" if serial is None else got == serial
+        row(f"pool concurrency={n}", wall, same)
+    srv.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,31 @@
 # -*- coding: utf-8 -*-
 """
 Day2 인덱싱 엔트리포인트
-- 목표: 코퍼스 생성 → 임베딩 → FAISS 저장 + docs.jsonl 저장
+- 목표: 코퍼스 생성 → 임베딩 → FAISS 저장 + docs.jsonl/docs.bin(mmap 문서 저장소) 저장
 - 지원:
-  1) 일반 경로 색인 (--paths ...)
+  1) 일반 경로 색인 (--paths ...) — 스트리밍 파이프라인(stream_ingest), --workers로 추출 프로세스 수 지정
   2) 단일 넷플릭스 국가/카테고리 (--netflix_country, --netflix_category)
   3) 복수 넷플릭스 국가/카테고리 (--netflix_countries, --netflix_categories) → 하나의 인덱스에 통합
+     브라우저 1개에서 나라별 컨텍스트를 --scrape_concurrency개까지 동시에 수집(netflix_scraper)
+     한 나라라도 수집에 실패하면 인덱스를 쓰지 않고 실패(종료 코드 ≠ 0)
+     --allow_partial이면 그대로 저장하고 빠진 나라를 index_meta.json의 scrape_failed_countries에 기록
+- 증분 모드(--incremental, 일반 경로 전용): manifest.json(경로 → 내용 해시 → faiss id 구간)을 두고
+  새/변경 파일만 읽기·청크·임베딩, 삭제/변경 파일의 청크는 IndexIDMap.remove_ids로 제거
+- 인덱스 종류: --index_type flat|ivf|ivfpq|hnsw (+ --nlist/--pq_m/--hnsw_m, 질의 기본값 --nprobe/--ef_search)
+  선택한 구성은 index_meta.json에 기록되고 질의 시 Day2Plan.nprobe/ef_search로 덮어쓸 수 있음
 """
 
-import os, argparse
-from typing import List
+import os, json, time, hashlib, argparse
+from typing import List, Dict, Any
 from itertools import product
 
-from ..impl.ingest import build_corpus, save_docs_jsonl, build_corpus_netflix
+import numpy as np
+
+from ..impl.ingest import build_corpus_netflix, list_source_files, load_document, chunk_document
+from ..impl.stream_ingest import stream_embedded_batches, PipelineStats
 from ..impl.embeddings import Embeddings
-from ..impl.store import FaissStore  # 제공됨
+from ..impl.store import FaissStore, INDEX_TYPES, make_index_spec  # 제공됨
+from ..impl.netflix_top import write_top_index
 
 def _attach_embed_model(corpus: List[dict], model: str | None) -> List[dict]:
     """각 item.meta에 embedding_model을 주입(추후 스모크에서 자동 판별/검증 용이)."""
@@ -27,39 +38,197 @@ def _attach_embed_model(corpus: List[dict], model: str | None) -> List[dict]:
         out.append({**it, "meta": meta})
     return out
 
-def build_index(paths: List[str], index_dir: str, model: str | None = None, batch_size: int = 128):
-    # 1) 코퍼스 생성
-    corpus = build_corpus(paths)
-    if not corpus:
-        raise ValueError("build_index: 주어진 경로들에서 문서를 찾지 못했습니다.")
+def _report_cache(emb: Embeddings):
+    """임베딩 캐시 적중 현황 출력 (증분 재빌드 시 새 청크만 API 호출했는지 확인용)."""
+    st = emb.cache_stats()
+    if st:
+        print(f"[EmbedCache] hits={st['hits']} misses={st['misses']} hit_rate={st['hit_rate']:.1%} "
+              f"entries={st['entries']} requests={emb.request_count}")
 
-    corpus = _attach_embed_model(corpus, model)
+def _new_store(vecs, index_path: str, docs_path: str, index_type: str = "flat",
+               index_params: dict | None = None, id_map: bool = False) -> FaissStore:
+    """index_type/index_params(nlist, pq_m, hnsw_m, nprobe, ef_search)로 빈 FaissStore 생성."""
+    params = {k: v for k, v in (index_params or {}).items() if v is not None}
+    n, dim = int(vecs.shape[0]), int(vecs.shape[1])
+    spec = make_index_spec(index_type, n=n, dim=dim, nlist=params.get("nlist"),
+                           pq_m=params.get("pq_m"), hnsw_m=params.get("hnsw_m", 32))
+    store = FaissStore(dim=dim, index_path=index_path, docs_path=docs_path, index_spec=spec, id_map=id_map)
+    store.meta.update({"index_type": index_type, **params})
+    return store
 
-    # 2) 텍스트 추출
-    texts = [item["text"] for item in corpus]
-    if not texts:
-        raise ValueError("build_index: 코퍼스에 text 필드가 비어있습니다.")
+def build_index(paths: List[str], index_dir: str, model: str | None = None, batch_size: int = 128,
+                index_type: str = "flat", index_params: dict | None = None, workers: int | None = None):
+    """
+    스트리밍 빌드: PDF 페이지 병렬 추출 → 청크 → batch_size 단위 임베딩 → 바로 인덱스에 추가.
+    IVF/PQ는 학습에 전체 벡터가 필요하므로 벡터만 모아 두었다가 마지막에 학습+추가.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    index_path = os.path.join(index_dir, "faiss.index")
+    docs_path = os.path.join(index_dir, "docs.jsonl")
 
-    # 3) 임베딩 생성
     emb = Embeddings(model=model, batch_size=batch_size)
-    vecs = emb.encode(texts)
-    if vecs is None or getattr(vecs, "shape", None) is None or vecs.shape[0] != len(texts):
-        raise RuntimeError("build_index: 임베딩 결과가 유효하지 않습니다.")
+    stats = PipelineStats()
+    store: FaissStore | None = None
+    needs_all = index_type in ("ivf", "ivfpq")
+    held_vecs: List[np.ndarray] = []
+    held_items: List[dict] = []
+
+    for items, vecs in stream_embedded_batches(paths, emb, batch_size=batch_size, workers=workers, stats=stats):
+        if vecs is None or getattr(vecs, "shape", None) is None or vecs.shape[0] != len(items):
+            raise RuntimeError("build_index: 임베딩 결과가 유효하지 않습니다.")
+        items = _attach_embed_model(items, model)
+        if needs_all:
+            held_vecs.append(vecs)
+            held_items.extend(items)
+            continue
+        if store is None:
+            store = _new_store(vecs, index_path, docs_path, index_type, index_params)
+        store.add(vecs, items)
+
+    if held_vecs:
+        all_vecs = np.vstack(held_vecs)
+        store = _new_store(all_vecs, index_path, docs_path, index_type, index_params)
+        store.add(all_vecs, held_items)
+    if store is None:
+        raise ValueError("build_index: 주어진 경로들에서 문서를 찾지 못했습니다.")
+    _report_cache(emb)
+    print(stats.report())
+
+    store.meta.update({"embedding_model": emb.model, "provider": emb.provider})
+    store.save()  # faiss.index + docs.jsonl + docs.bin + lexical.npz + index_meta.json
+    print(f"[OK] Index saved → {index_dir} (N={store.index.ntotal})")
+
+# ---------- 증분 빌드 ----------
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _load_manifest(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            m = json.load(f)
+        return m if m.get("version") == MANIFEST_VERSION else {}
+    except Exception as e:
+        print(f"[WARN] manifest 읽기 실패 → 전체 재빌드: {e}")
+        return {}
+
+def _save_manifest(path: str, manifest: Dict[str, Any]):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
 
-    # 4) 경로 준비
+def build_index_incremental(paths: List[str], index_dir: str, model: str | None = None, batch_size: int = 128,
+                            index_type: str = "flat", index_params: dict | None = None):
+    """
+    manifest.json 기준 증분 빌드:
+      - (size, mtime)이 같으면 해시 계산도 생략, 다르면 sha256 비교
+      - 새/변경 파일만 로드·청크·임베딩 → add_with_ids, 삭제/변경 파일의 기존 id 구간은 remove_ids
+      - 임베딩 모델/인덱스 종류가 manifest와 다르거나 기존 인덱스가 IDMap이 아니면 전체 재빌드
+    """
+    t0 = time.perf_counter()
     os.makedirs(index_dir, exist_ok=True)
     index_path = os.path.join(index_dir, "faiss.index")
     docs_path = os.path.join(index_dir, "docs.jsonl")
+    manifest_path = os.path.join(index_dir, MANIFEST_FILENAME)
+    model_name = (model or "text-embedding-3-small").strip().strip('`"')
 
-    # 5) 저장
-    store = FaissStore(dim=vecs.shape[1], index_path=index_path, docs_path=docs_path)
-    store.add(vecs, corpus)
+    manifest = _load_manifest(manifest_path)
+    store: FaissStore | None = None
+    if manifest and os.path.exists(index_path):
+        if manifest.get("embedding_model") != model_name or manifest.get("index_type") != index_type:
+            print("[INFO] 임베딩 모델/인덱스 종류 변경 → 전체 재빌드")
+        else:
+            store = FaissStore.load(index_path, docs_path)
+            if store.ids is None:
+                print("[INFO] 기존 인덱스가 IDMap이 아님 → 전체 재빌드")
+                store = None
+    if store is None:
+        manifest = {}
+    old: Dict[str, Dict[str, Any]] = manifest.get("sources", {})
+
+    # 1) 변경 감지
+    sources: Dict[str, Dict[str, Any]] = {}
+    changed: List[Dict[str, Any]] = []
+    for fp in list_source_files(paths):
+        st = os.stat(fp)
+        ent = old.get(fp)
+        if ent and ent["size"] == st.st_size and ent["mtime_ns"] == st.st_mtime_ns:
+            sources[fp] = ent
+            continue
+        digest = _file_sha256(fp)
+        if ent and ent["sha256"] == digest:
+            sources[fp] = {**ent, "size": st.st_size, "mtime_ns": st.st_mtime_ns}  # touch만 된 경우
+            continue
+        changed.append({"path": fp, "sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+    stale = [fp for fp in old if fp not in sources]  # 삭제 + 변경(기존 청크 제거 대상)
+
+    if not changed and not stale:
+        if sources != old:
+            _save_manifest(manifest_path, {**manifest, "sources": sources})
+        print(f"[OK] 변경 없음 → {index_dir} (files={len(sources)}, {time.perf_counter() - t0:.2f}s)")
+        return
+
+    # 2) 새/변경 파일만 로드 + 청크
+    per_file: List[List[dict]] = []
+    for c in changed:
+        d = load_document(c["path"])
+        per_file.append(_attach_embed_model(chunk_document(d, model), model) if d else [])
+    texts = [it["text"] for items in per_file for it in items]
+
+    # 3) 임베딩 (디스크 캐시가 켜져 있으면 변경 파일의 그대로인 청크도 재사용)
+    vecs = None
+    emb = None
+    if texts:
+        emb = Embeddings(model=model, batch_size=batch_size)
+        vecs = emb.encode(texts)
+        if vecs.shape[0] != len(texts):
+            raise RuntimeError("build_index_incremental: 임베딩 결과가 유효하지 않습니다.")
+        _report_cache(emb)
+
+    if store is None:
+        if vecs is None:
+            raise ValueError("build_index_incremental: 주어진 경로들에서 문서를 찾지 못했습니다.")
+        store = _new_store(vecs, index_path, docs_path, index_type, index_params, id_map=True)
+
+    # 4) 삭제/변경 파일의 기존 청크 제거
+    removed = 0
+    if stale:
+        drop = [i for fp in stale for i in range(old[fp]["id_start"], old[fp]["id_end"])]
+        removed = store.remove_ids(drop)
+
+    # 5) 추가 (파일별 연속 id 구간 기록). IVF/PQ 첫 빌드는 파일 단위가 아니라 새 벡터 전체로 학습
+    if vecs is not None:
+        store.train(vecs)
+    pos = 0
+    for c, items in zip(changed, per_file):
+        start = store.next_id
+        if items:
+            store.add(vecs[pos:pos + len(items)], items)
+            pos += len(items)
+        sources[c["path"]] = {"sha256": c["sha256"], "size": c["size"], "mtime_ns": c["mtime_ns"],
+                              "id_start": start, "id_end": store.next_id}
+
+    # 6) 저장: 인덱스/문서 먼저, manifest는 마지막 (중간 실패 시 다음 실행이 다시 반영)
+    if emb is not None:
+        store.meta.update({"embedding_model": emb.model, "provider": emb.provider})
     store.save()
-    save_docs_jsonl(corpus, docs_path)
-    print(f"[OK] Index saved → {index_dir} (N={len(corpus)})")
+    _save_manifest(manifest_path, {"version": MANIFEST_VERSION, "embedding_model": model_name,
+                                   "index_type": index_type, "sources": sources})
+    print(f"[OK] Incremental index saved → {index_dir} (files: +{len(changed)} / -{len(stale)} stale, "
+          f"chunks: +{len(texts)} / -{removed}, N={store.index.ntotal}, {time.perf_counter() - t0:.2f}s)")
 
 def build_index_from_netflix(country: str, category: str, index_dir: str,
-                             model: str | None = None, batch_size: int = 128):
+                             model: str | None = None, batch_size: int = 128,
+                             index_type: str = "flat", index_params: dict | None = None):
     corpus = build_corpus_netflix(country, category)
     if not corpus:
         raise ValueError("build_index_from_netflix: 수집된 문서가 없습니다.")
@@ -69,23 +238,46 @@ def build_index_from_netflix(country: str, category: str, index_dir: str,
 
     emb = Embeddings(model=model, batch_size=batch_size)
     vecs = emb.encode(texts)
+    _report_cache(emb)
 
     os.makedirs(index_dir, exist_ok=True)
     index_path = os.path.join(index_dir, "faiss.index")
     docs_path  = os.path.join(index_dir, "docs.jsonl")
 
-    store = FaissStore(dim=vecs.shape[1], index_path=index_path, docs_path=docs_path)
+    store = _new_store(vecs, index_path, docs_path, index_type, index_params)
     store.add(vecs, corpus)
-    store.save()
-    save_docs_jsonl(corpus, docs_path)
+    store.meta.update({"embedding_model": emb.model, "provider": emb.provider})
+    store.save()  # faiss.index + docs.jsonl + docs.bin + lexical.npz + index_meta.json
+    write_top_index(corpus, index_dir)  # (country, category) → rank 정렬 TOP 목록
     print(f"[OK] Netflix index saved → {index_dir} (N={len(corpus)})")
 
 def build_index_from_netflix_bulk(countries: List[str], categories: List[str], index_dir: str,
-                                  model: str | None = None, batch_size: int = 128):
-    """여러 나라×카테고리를 수집해 하나의 인덱스에 저장."""
+                                  model: str | None = None, batch_size: int = 128,
+                                  index_type: str = "flat", index_params: dict | None = None,
+                                  scrape_concurrency: int | None = None, allow_partial: bool = False):
+    """
+    여러 나라×카테고리를 동시에 수집해 하나의 인덱스에 저장 (코퍼스 순서는 countries×categories 순).
+    수집에 실패한 나라가 있으면 RuntimeError (아무것도 쓰지 않음), allow_partial이면 index_meta.json에 기록하고 저장.
+    """
+    from ..impl.netflix_scraper import scrape_top10
+
+    pairs = list(product(countries, categories))
+    raw: Dict[tuple, List[dict]] = {}
+    failed: List[str] = []
+    t0 = time.perf_counter()
+    for country, category, items in scrape_top10(pairs, concurrency=scrape_concurrency, failed=failed):
+        raw[(country, category)] = items
+        print(f"[Scrape] {time.perf_counter() - t0:6.2f}s {country} / {category}: {len(items)} rows")
+    failed = sorted(set(failed))
+    if failed and not allow_partial:
+        raise RuntimeError(f"Netflix 수집 실패 나라: {', '.join(failed)} → 인덱스를 쓰지 않음 "
+                           f"(빠진 채로 저장하려면 --allow_partial)")
+    if failed:
+        print(f"[WARN] 수집 실패 나라를 빼고 저장: {', '.join(failed)}")
+
     all_corpus: List[dict] = []
-    for country, category in product(countries, categories):
-        cor = build_corpus_netflix(country, category)
+    for country, category in pairs:
+        cor = build_corpus_netflix(country, category, raw.get((country, category), []))
         if not cor:
             print(f"[WARN] 빈 코퍼스: {country} / {category}")
             continue
@@ -99,15 +291,20 @@ def build_index_from_netflix_bulk(countries: List[str], categories: List[str], i
 
     emb = Embeddings(model=model, batch_size=batch_size)
     vecs = emb.encode(texts)
+    _report_cache(emb)
 
     os.makedirs(index_dir, exist_ok=True)
     index_path = os.path.join(index_dir, "faiss.index")
     docs_path  = os.path.join(index_dir, "docs.jsonl")
 
-    store = FaissStore(dim=vecs.shape[1], index_path=index_path, docs_path=docs_path)
+    store = _new_store(vecs, index_path, docs_path, index_type, index_params)
     store.add(vecs, all_corpus)
-    store.save()
-    save_docs_jsonl(all_corpus, docs_path)
+    store.meta.update({"embedding_model": emb.model, "provider": emb.provider})
+    if failed:
+        store.meta["scrape_failed_countries"] = failed
+    store.save()  # faiss.index + docs.jsonl + docs.bin + lexical.npz + index_meta.json
+    top = write_top_index(all_corpus, index_dir)  # (country, category) → rank 정렬 TOP 목록
+    print(f"[OK] Netflix TOP lookup → {len(top.lists)} lists (countries={top.countries}, categories={top.categories})")
     print(f"[OK] Bulk index saved → {index_dir} (N={len(all_corpus)})")
 
 if __name__ == "__main__":
@@ -116,6 +313,8 @@ if __name__ == "__main__":
     ap.add_argument("--index_dir", required=True)
     ap.add_argument("--model", default=None)
     ap.add_argument("--batch_size", type=int, default=128)
+    ap.add_argument("--incremental", action="store_true", help="manifest 기준 변경분만 반영 (--paths 전용)")
+    ap.add_argument("--workers", type=int, default=None, help="PDF 추출 프로세스 수 (기본: CPU 수, 1이면 단일 프로세스)")
 
     # 단일
     ap.add_argument("--netflix_country", default=None)
@@ -123,14 +322,29 @@ if __name__ == "__main__":
     # 복수(콤마)
     ap.add_argument("--netflix_countries", default=None, help='예: "South Korea,United States,France,Turkiye,Japan"')
     ap.add_argument("--netflix_categories",  default=None, help='예: "Movies,Shows"')
+    ap.add_argument("--scrape_concurrency", type=int, default=None, help="동시 수집 나라 수 (기본: NETFLIX_SCRAPE_CONCURRENCY 또는 4)")
+    ap.add_argument("--allow_partial", action="store_true", help="수집 실패 나라가 있어도 저장 (index_meta.json에 기록)")
+    # 인덱스 구성
+    ap.add_argument("--index_type", choices=INDEX_TYPES, default="flat")
+    ap.add_argument("--nlist", type=int, default=None, help="IVF 클러스터 수 (기본: 4·sqrt(N))")
+    ap.add_argument("--pq_m", type=int, default=None, help="IVF-PQ 서브양자화기 수 (dim의 약수)")
+    ap.add_argument("--hnsw_m", type=int, default=None, help="HNSW 이웃 수 (기본 32)")
+    ap.add_argument("--nprobe", type=int, default=None, help="IVF 질의 기본 nprobe (기록만, 기본 16)")
+    ap.add_argument("--ef_search", type=int, default=None, help="HNSW 질의 기본 efSearch (기록만, 기본 64)")
 
     args = ap.parse_args()
     os.makedirs(args.index_dir, exist_ok=True)
+    index_opts = dict(index_type=args.index_type, index_params={
+        "nlist": args.nlist, "pq_m": args.pq_m, "hnsw_m": args.hnsw_m,
+        "nprobe": args.nprobe, "ef_search": args.ef_search,
+    })
 
     if args.netflix_countries and args.netflix_categories:
         countries = [c.strip() for c in args.netflix_countries.split(",") if c.strip()]
         categories = [c.strip() for c in args.netflix_categories.split(",") if c.strip()]
-        build_index_from_netflix_bulk(countries, categories, args.index_dir, args.model, args.batch_size)
+        build_index_from_netflix_bulk(countries, categories, args.index_dir, args.model, args.batch_size,
+                                      scrape_concurrency=args.scrape_concurrency, allow_partial=args.allow_partial,
+                                      **index_opts)
 
     elif args.netflix_country and args.netflix_category:
         build_index_from_netflix(
@@ -139,10 +353,14 @@ if __name__ == "__main__":
             index_dir=args.index_dir,
             model=args.model,
             batch_size=args.batch_size,
+            **index_opts,
         )
 
+    elif args.paths and args.incremental:
+        build_index_incremental(args.paths, args.index_dir, args.model, args.batch_size, **index_opts)
+
     elif args.paths:
-        build_index(args.paths, args.index_dir, args.model, args.batch_size)
+        build_index(args.paths, args.index_dir, args.model, args.batch_size, workers=args.workers, **index_opts)
 
     else:
         raise SystemExit("사용법: --paths ... | --netflix_country + --netflix_category | --netflix_countries + --netflix_categories")
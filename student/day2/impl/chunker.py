@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+토큰 기준 · 페이지 보존 청크 분할 (span 방식)
+- 입력: 페이지 텍스트 목록 → PagedText 하나의 불변 버퍼("\\n".join) + 페이지 시작 오프셋
+- 출력: Span(start, end, page, tokens) 목록 — 문자열을 자르지 않고 위치만 계산
+  청크 텍스트는 기록할 때(materialize)만 text[start:end]로 만든다
+- 규칙:
+    · 청크는 페이지를 넘지 않음 → meta.page로 정확한 인용 가능
+    · 문장 경계(., ?, !, 。, 빈 줄)에서만 자르고, 한 문장이 max_tokens보다 길면 공백/줄바꿈 근처에서 강제 분할
+    · 다음 청크는 직전 청크 끝 문장들(합계 overlap_tokens 이하)을 겹쳐서 시작
+    · min_tokens보다 작은 페이지 끝 조각은 같은 페이지의 직전 청크에 붙임 (합쳐도 max_tokens 이하일 때만)
+- 토큰 수: 임베딩 모델의 tiktoken 인코딩(cl100k_base 등), 불러올 수 없으면 정규식 근사(한글 1음절≈1토큰, 영문 ≈4자/토큰)
+  DAY2_TOKENIZER=approx 로 근사 강제 가능
+"""
+
+from __future__ import annotations
+import os, re, bisect
+from typing import List, Dict, Any, NamedTuple, Optional, Iterator
+
+DEFAULT_MAX_TOKENS = 400
+DEFAULT_OVERLAP_TOKENS = 50
+DEFAULT_MIN_TOKENS = 40
+
+# 문장 끝: 종결부호(+닫는 따옴표/괄호) 뒤 공백, 또는 빈 줄
+_SENT_END = re.compile(r"[.!?。！？…][\"'”’)\]]*\s+|\n\s*\n")
+# 근사 토큰: 한글 음절 1개 / 영문 최대 4자 / 숫자 최대 3자 / 그 외 기호 1개
+_APPROX_TOKEN = re.compile(r"[가-힣]|[A-Za-z]{1,4}|\d{1,3}|[^\sA-Za-z\d가-힣]")
+
+class Span(NamedTuple):
+    start: int
+    end: int
+    page: int
+    tokens: int
+
+class PagedText:
+    """페이지 목록을 하나의 불변 문자열로 잇고 페이지 경계 오프셋을 보관."""
+
+    def __init__(self, pages: List[str], first_page: int = 1):
+        self.text = "\n".join(pages)
+        self.first_page = first_page
+        self.starts: List[int] = []
+        pos = 0
+        for p in pages:
+            self.starts.append(pos)
+            pos += len(p) + 1
+        self.ends = [s + len(p) for s, p in zip(self.starts, pages)]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def page_of(self, offset: int) -> int:
+        return self.first_page + max(0, bisect.bisect_right(self.starts, offset) - 1)
+
+    def slice(self, span: Span) -> str:
+        return self.text[span.start:span.end]
+
+# ---------- 토큰 카운터 ----------
+class TokenCounter:
+    """count(text, start, end): text[start:end]의 토큰 수. 근사 모드는 복사 없이 정규식 pos/endpos로 센다."""
+
+    def __init__(self, model: Optional[str] = None):
+        self.name = "approx"
+        self._enc = None
+        if os.getenv("DAY2_TOKENIZER", "auto").lower() != "approx":
+            try:
+                import tiktoken
+                try:
+                    self._enc = tiktoken.encoding_for_model(model or "text-embedding-3-small")
+                except KeyError:
+                    self._enc = tiktoken.get_encoding("cl100k_base")
+                self.name = self._enc.name
+            except Exception:
+                self._enc = None  # 미설치/오프라인 → 근사
+
+    def count(self, text: str, start: int = 0, end: Optional[int] = None) -> int:
+        end = len(text) if end is None else end
+        if end <= start:
+            return 0
+        if self._enc is not None:
+            return len(self._enc.encode_ordinary(text[start:end]))
+        return sum(1 for _ in _APPROX_TOKEN.finditer(text, start, end))
+
+    def cut(self, text: str, start: int, end: int, max_tokens: int) -> int:
+        """[start, end)에서 max_tokens 안에 들어가는 가장 먼 위치(가능하면 공백 직후)."""
+        n = 0
+        pos = end
+        for m in _APPROX_TOKEN.finditer(text, start, end):
+            n += 1
+            if n > max_tokens:
+                pos = m.start()
+                break
+        if self._enc is not None:
+            # 실제 토큰이 근사보다 많으면(근사로는 전부 들어가도) 줄여 나감
+            while pos > start + 1 and self.count(text, start, pos) > max_tokens:
+                pos = start + (pos - start) * 9 // 10
+        ws = max(text.rfind(" ", start, pos), text.rfind("\n", start, pos))
+        return ws + 1 if ws > start + (pos - start) // 2 else pos
+
+_COUNTERS: Dict[str, TokenCounter] = {}
+
+def get_token_counter(model: Optional[str] = None) -> TokenCounter:
+    key = model or ""
+    if key not in _COUNTERS:
+        _COUNTERS[key] = TokenCounter(model)
+    return _COUNTERS[key]
+
+# ---------- 분할 ----------
+def _rstrip_pos(text: str, start: int, end: int) -> int:
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+def _sentences(text: str, start: int, end: int) -> Iterator[tuple]:
+    """[start, end) 안의 문장 (시작, 끝) — 끝의 공백은 제외."""
+    pos = start
+    for m in _SENT_END.finditer(text, start, end):
+        if m.end() > pos:
+            yield pos, _rstrip_pos(text, pos, m.end())
+            pos = m.end()
+    if pos < end:
+        yield pos, _rstrip_pos(text, pos, end)
+
+def chunk_spans(doc: PagedText, max_tokens: int = DEFAULT_MAX_TOKENS, overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+                min_tokens: int = DEFAULT_MIN_TOKENS, counter: Optional[TokenCounter] = None) -> List[Span]:
+    counter = counter or get_token_counter()
+    text = doc.text
+    spans: List[Span] = []
+    for pi, (ps, pe) in enumerate(zip(doc.starts, doc.ends)):
+        page = doc.first_page + pi
+        # 1) 문장 단위 (start, end, tokens). 긴 문장은 max_tokens 이하로 강제 분할
+        sents: List[tuple] = []
+        for s, e in _sentences(text, ps, pe):
+            while s < e:
+                t = counter.count(text, s, e)
+                if t <= max_tokens:
+                    sents.append((s, e, t))  # e는 공백을 뺀 위치 → s < e면 내용이 있음
+                    break
+                cut = counter.cut(text, s, e, max_tokens)
+                sents.append((s, cut, counter.count(text, s, cut)))
+                s = cut
+        if not sents:
+            continue
+        # 2) 문장 묶기 (+ 겹침)
+        page_spans: List[Span] = []
+        i = 0
+        while i < len(sents):
+            j, total = i, 0
+            while j < len(sents) and (j == i or total + sents[j][2] <= max_tokens):
+                total += sents[j][2]
+                j += 1
+            page_spans.append(Span(sents[i][0], sents[j - 1][1], page, total))
+            if j >= len(sents):
+                break
+            # 겹침: 직전 청크 끝에서 overlap_tokens 이하만큼 문장을 되돌림 (진행은 최소 1문장 보장)
+            k, back = j, 0
+            while k - 1 > i and back + sents[k - 1][2] <= overlap_tokens:
+                k -= 1
+                back += sents[k][2]
+            i = k
+        # 3) 페이지 끝 자투리는 직전 청크에 합침 (합친 결과가 max_tokens 이하일 때만, 아니면 자투리 그대로)
+        if len(page_spans) >= 2 and page_spans[-1].tokens < min_tokens:
+            last, prev = page_spans[-1], page_spans[-2]
+            merged = counter.count(text, prev.start, last.end)
+            if merged <= max_tokens:
+                page_spans[-2:] = [Span(prev.start, last.end, page, merged)]
+        spans.extend(page_spans)
+    return spans
+
+def span_items(path: str, doc: PagedText, spans: List[Span], first_chunk: int = 0) -> Iterator[Dict[str, Any]]:
+    """span → 코퍼스 아이템. 여기서 처음으로 청크 문자열을 만든다."""
+    for n, sp in enumerate(spans, first_chunk):
+        yield {
+            "id": f"{path}::chunk_{n:04d}",
+            "text": doc.slice(sp),
+            "meta": {"path": path, "chunk": n, "page": sp.page, "tokens": sp.tokens},
+        }
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+감독 조회 인덱스 (data/raw/director_ranking.csv → 프로세스 상주)
+- 로드: CSV를 1회 파싱해 보관, 파일 mtime/size가 바뀌면 다시 로드 (get_director_index)
+- 정확 매칭 (기존 _find_director_in_query와 같은 우선순위):
+    1) 질의 전체 == 감독명 (대소문자 무시) → dict 조회
+    2) 질의 안의 감독명 전부를 Aho-Corasick 오토마톤으로 한 번에 찾고(find_all)
+       질의가 감독명의 일부인 경우(2자 이상)는 이름 bigram 색인으로 후보만 확인
+       → 둘을 합쳐 가장 긴 이름(동률이면 CSV 순서) 선택
+- 오타 허용 (정확 매칭 실패 시): 질의의 연속 토큰 1~3개 창을 공백/기호 없이 이어 붙여 조회
+    · 한글 키(예: "봉준 호" → "봉준호")와 로마자 키(예: "Bong Joon-ho" → 봉준호)를 각각 symmetric-delete 색인으로
+      - 로마자 키: 한글 이름을 국어의 로마자 표기법으로 바꾼 뒤 흔한 표기 변형(oo/u, k/g, p/b, r/l, ch/j, ee/i 등)을 접음
+    · 한글 창은 한글 키로만, 영문 창은 로마자 키로만 비교
+    · 후보는 실제 편집 거리로 검증 (한글 1, 로마자 1 — 10자 이상이면 2)
+      - 한글은 글자 수가 같고 바뀐 한 글자가 자모 하나만 다를 때만 인정 ("봉존호" → 봉준호, "김진형주" ✗)
+- 감독 수가 수만 명으로 늘어도 질의 비용은 질의 길이에만 비례 (이름 목록 선형 스캔 없음)
+"""
+
+from __future__ import annotations
+import os, re, threading
+from typing import List, Dict, Tuple, Optional, NamedTuple
+
+from ...common.aho_corasick import KeywordAutomaton
+
+class DirectorMatch(NamedTuple):
+    name: str
+    rank1_count: int
+    kind: str          # "exact" | "contains" | "partial" | "fuzzy"
+    distance: int = 0
+
+# ---------- CSV ----------
+def read_director_csv(csv_path: str) -> Dict[str, int]:
+    """감독 랭킹 CSV 파일 로드 (감독명 -> rank1_count 매핑)"""
+    director_map: Dict[str, int] = {}
+    if not os.path.exists(csv_path):
+        return director_map
+    try:
+        with open(csv_path, "r", encoding="utf-8", errors="ignore") as f:
+            lines = f.readlines()
+        # 첫 번째 줄은 헤더 (예: ",director,rank1_count"), 각 줄의 형식: "숫자,감독명,rank1_count"
+        for line in lines[1:]:
+            line = line.strip().strip('"')
+            if not line:
+                continue
+            if line.startswith(","):
+                line = line[1:]
+            parts = [p.strip().strip('"') for p in line.split(",")]
+            if len(parts) >= 3 and parts[1] and parts[2]:
+                try:
+                    director_map[parts[1]] = int(parts[2].replace(",", "").strip())
+                except ValueError:
+                    pass
+    except Exception as e:
+        print(f"[WARN] 감독 CSV 로드 실패: {e}")
+    return director_map
+
+# ---------- 로마자 키 ----------
+_CHO = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+_JUNG = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we", "wi", "yu",
+         "eu", "ui", "i"]
+_JONG = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l", "p", "l", "m", "p", "p", "t", "t", "ng",
+         "t", "t", "k", "t", "p", "t"]
+# 흔한 영문 표기 변형을 한쪽으로 접기 (순서 중요: 긴 것부터)
+_FOLDS = [("oo", "u"), ("ee", "i"), ("eo", "o"), ("ae", "e"), ("oe", "o"), ("ou", "u"), ("ch", "j"), ("sh", "s"),
+          ("ph", "p"), ("k", "g"), ("p", "b"), ("t", "d"), ("r", "l"), ("w", ""), ("y", ""), ("h", "")]
+_NON_KEY = re.compile(r"[^0-9a-z가-힣]+")
+
+def romanize(text: str) -> str:
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588] + _JUNG[(code % 588) // 28] + _JONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+def _key(text: str) -> str:
+    return _NON_KEY.sub("", (text or "").lower())
+
+def _roman_key(text: str) -> str:
+    s = _key(romanize(_key(text)))
+    s = re.sub(r"[가-힣]", "", s)
+    for a, b in _FOLDS:
+        s = s.replace(a, b)
+    return s
+
+_MIN_LEN = (3, 6)  # (한글 키, 로마자 키) 오타 매칭 최소 길이 — "감독" 같은 짧은 창 제외
+_HANGUL = re.compile(r"[가-힣]")
+
+def _max_dist(kind: int, key: str) -> int:
+    return 2 if kind == 1 and len(key) >= 10 else 1
+
+def _deletes(key: str, d: int) -> set:
+    out, frontier = {key}, {key}
+    for _ in range(d):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        out |= frontier
+    return out
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+def _jamo(ch: str) -> Tuple[int, int, int]:
+    code = ord(ch) - 0xAC00
+    return (code // 588, (code % 588) // 28, code % 28) if 0 <= code < 11172 else (-1, -1, ord(ch))
+
+def _hangul_close(a: str, b: str) -> bool:
+    """같은 길이, 다른 글자 1개, 그 글자의 초/중/종성 중 하나만 다름."""
+    if len(a) != len(b):
+        return False
+    diff = [(x, y) for x, y in zip(a, b) if x != y]
+    if len(diff) != 1:
+        return len(diff) == 0
+    return sum(p != q for p, q in zip(_jamo(diff[0][0]), _jamo(diff[0][1]))) == 1
+
+class DirectorIndex:
+    def __init__(self, counts: Dict[str, int]):
+        self.counts = counts                       # 감독명 → rank1_count (CSV 순서)
+        self.names: List[str] = list(counts)
+        self._lower = [n.lower() for n in self.names]
+        self._exact: Dict[str, int] = {}
+        for i, n in enumerate(self._lower):
+            self._exact.setdefault(n, i)
+        self._ac = KeywordAutomaton(self._lower, ignore_case=False)
+        self._bigrams: Dict[str, List[int]] = {}
+        for i, n in enumerate(self._lower):
+            for bg in {n[j:j + 2] for j in range(len(n) - 1)}:
+                self._bigrams.setdefault(bg, []).append(i)
+        # 오타 허용: (한글 키 / 로마자 키)의 삭제 변형 → 이름 번호
+        self._keys = [(_key(n), _roman_key(n)) for n in self.names]
+        self._typo: Tuple[Dict[str, List[int]], Dict[str, List[int]]] = ({}, {})
+        for i, keys in enumerate(self._keys):
+            for t, k in enumerate(keys):
+                if len(k) >= 2:
+                    for dk in _deletes(k, _max_dist(t, k)):
+                        self._typo[t].setdefault(dk, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _result(self, i: int, kind: str, distance: int = 0) -> DirectorMatch:
+        return DirectorMatch(self.names[i], self.counts[self.names[i]], kind, distance)
+
+    def find_all(self, query: str) -> List[Tuple[int, int, str]]:
+        """질의에 들어 있는 모든 감독명 (start, end, 이름) — Aho-Corasick 1회 순회."""
+        return [(s, e, self.names[pid]) for s, e, pid in self._ac.iter((query or "").lower())]
+
+    def _partial(self, q: str) -> List[int]:
+        """q가 이름의 일부인 이름들 (bigram 교집합 후보 → 실제 포함 확인)."""
+        if len(q) < 2:
+            return []
+        cand: Optional[set] = None
+        for bg in {q[j:j + 2] for j in range(len(q) - 1)}:
+            ids = self._bigrams.get(bg)
+            if not ids:
+                return []
+            cand = set(ids) if cand is None else cand & set(ids)
+            if not cand:
+                return []
+        return [i for i in cand or () if q in self._lower[i]]
+
+    def _fuzzy(self, query: str) -> Optional[DirectorMatch]:
+        toks = [t for t in re.split(r"\s+", query) if t]
+        best = None  # (거리, -창 길이, 이름 순서)
+        for a in range(len(toks)):
+            for b in range(a + 1, min(a + 3, len(toks)) + 1):
+                window = "".join(toks[a:b])
+                t = 0 if _HANGUL.search(window) else 1
+                k = _key(window) if t == 0 else _roman_key(window)
+                if len(k) < _MIN_LEN[t]:
+                    continue
+                seen = set()
+                for dk in _deletes(k, _max_dist(t, k)):
+                    for i in self._typo[t].get(dk, ()):
+                        if i in seen:
+                            continue
+                        seen.add(i)
+                        limit = _max_dist(t, self._keys[i][t])
+                        dist = _edit_distance(k, self._keys[i][t], limit)
+                        if dist <= limit and (t == 1 or _hangul_close(k, self._keys[i][t])):
+                            cand = (dist, -len(k), i)
+                            if best is None or cand < best:
+                                best = cand
+        return self._result(best[2], "fuzzy", best[0]) if best else None
+
+    def match(self, query: str, fuzzy: bool = True) -> Optional[DirectorMatch]:
+        q = (query or "").lower().strip()
+        if not self.names:
+            return None
+        i = self._exact.get(q)
+        if i is not None:
+            return self._result(i, "exact")
+        # 가장 긴 이름 우선, 동률이면 CSV 순서 (기존 길이순 정렬 스캔과 같은 결과)
+        cands = {pid: "contains" for _, _, pid in self._ac.iter(q)}
+        for pid in self._partial(q):
+            cands.setdefault(pid, "partial")
+        if cands:
+            i = min(cands, key=lambda p: (-len(self.names[p]), p))
+            return self._result(i, cands[i])
+        return self._fuzzy(q) if fuzzy else None
+
+    def find(self, query: str, fuzzy: bool = True) -> Optional[Tuple[str, int]]:
+        m = self.match(query, fuzzy=fuzzy)
+        return (m.name, m.rank1_count) if m else None
+
+# ---------- 프로세스 상주 레지스트리 ----------
+_REGISTRY: Dict[str, Tuple[Optional[Tuple[int, int]], DirectorIndex]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+def get_director_index(csv_path: str) -> DirectorIndex:
+    """csv_path의 감독 인덱스 (최초 1회 로드 후 상주, mtime/size가 바뀌면 재로드)."""
+    key = os.path.abspath(csv_path)
+    st = os.stat(csv_path) if os.path.exists(csv_path) else None
+    sig = (st.st_mtime_ns, st.st_size) if st else None
+    with _REGISTRY_LOCK:
+        hit = _REGISTRY.get(key)
+        if hit and hit[0] == sig:
+            return hit[1]
+        idx = DirectorIndex(read_director_csv(csv_path))
+        _REGISTRY[key] = (sig, idx)
+        return idx
+
+def index_for_map(director_map: Dict[str, int]) -> DirectorIndex:
+    """상주 인덱스의 counts dict면 그 인덱스를, 아니면(직접 만든 dict) 새로 만들어 반환."""
+    with _REGISTRY_LOCK:
+        for _, idx in _REGISTRY.values():
+            if idx.counts is director_map:
+                return idx
+    return DirectorIndex(director_map)
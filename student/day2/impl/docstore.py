@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+메모리 매핑 문서 저장소 (docs.bin)
+- docs.jsonl을 줄마다 dict로 파싱해 리스트에 올리는 대신, 열(column) 단위 바이너리로 저장하고 mmap으로 연다
+- 검색 결과로 뽑힌 행(top_k)만 디코딩 → 인덱스 크기와 무관하게 로드 시간/RSS가 거의 일정
+- 레이아웃 (리틀엔디언):
+    header  : magic(8s) n(u64) id_base(u64) text_base(u64) meta_base(u64) src_size(u64) src_mtime_ns(u64) src_sha1(20s)
+    offsets : uint64[3, n+1]  (id / text / meta 각 블롭 안에서의 시작 오프셋, 마지막 칸 = 끝)
+    blobs   : ids(utf-8) | texts(utf-8) | metas(행별 compact JSON, utf-8)
+- docs.jsonl → docs.bin 변환기 포함 (같은 폴더에 생성, 기존 docs.jsonl은 다른 도구 호환용으로 유지)
+- 신선도: 변환 당시 docs.jsonl의 크기 / mtime_ns / SHA-1을 헤더에 기록
+    · 크기가 다르면 낡음 → jsonl로 폴백, 크기와 mtime이 같으면 신선 (해시 계산 없음)
+    · 크기는 같고 mtime만 다르면(같은 크기로 고친 경우 또는 git checkout 등) 해시로 판정
+      → 확인 결과는 프로세스 안에서만 기억 (docs.bin은 git에 커밋되므로 읽기만 하고 고치지 않음)
+    · 이전 형식(D2DOCS01, 크기만 기록)은 낡은 것으로 보고 jsonl로 (다시 변환하면 새 형식)
+
+사용 예:
+python -m student.day2.impl.docstore --index_dir indices/day2 indices/netflix_multi
+"""
+
+from __future__ import annotations
+import os, json, mmap, struct, hashlib, argparse, time
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+import numpy as np
+
+DOCSTORE_FILENAME = "docs.bin"
+MAGIC = b"D2DOCS02"
+_MAGIC_V1 = b"D2DOCS01"
+_HEADER = struct.Struct("<8sQQQQQQ20s")
+_HEADER_V1 = struct.Struct("<8sQQQQQ")
+
+Fingerprint = Tuple[int, int, bytes]   # (size, mtime_ns, sha1)
+
+def _sha1(path: str) -> bytes:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.digest()
+
+def source_fingerprint(path: Optional[str]) -> Fingerprint:
+    """원본 파일 지문 (size, mtime_ns, sha1). 파일이 없으면 0으로 채움."""
+    if not path or not os.path.exists(path):
+        return 0, 0, b"\0" * 20
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns, _sha1(path)
+
+def write_docstore(items: Iterable[Dict[str, Any]], out_path: str, src_path: Optional[str] = None) -> int:
+    """items(id/text/meta dict)를 docs.bin 형식으로 원자적으로 기록 (src_path = 원본 docs.jsonl). 반환: 행 수."""
+    src = source_fingerprint(src_path)
+    ids: List[bytes] = []
+    texts: List[bytes] = []
+    metas: List[bytes] = []
+    for it in items:
+        ids.append(str(it.get("id", "")).encode("utf-8"))
+        texts.append(str(it.get("text", "")).encode("utf-8"))
+        metas.append(json.dumps(it.get("meta", {}) or {}, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    n = len(ids)
+
+    offsets = np.zeros((3, n + 1), dtype="<u8")
+    for row, col in enumerate((ids, texts, metas)):
+        if n:
+            offsets[row, 1:] = np.cumsum([len(b) for b in col], dtype="<u8")
+    id_base = _HEADER.size + offsets.nbytes
+    text_base = id_base + int(offsets[0, -1])
+    meta_base = text_base + int(offsets[1, -1])
+
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, n, id_base, text_base, meta_base, *src))
+        f.write(offsets.tobytes())
+        for col in (ids, texts, metas):
+            f.write(b"".join(col))
+    os.replace(tmp, out_path)
+    return n
+
+class MmapDocStore:
+    """docs.bin 읽기 전용 뷰. 리스트처럼 인덱싱하면 그 행만 dict로 디코딩한다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        if size < _HEADER_V1.size:
+            self._f.close()
+            raise ValueError(f"docs.bin이 너무 작습니다: {path}")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = {MAGIC: _HEADER, _MAGIC_V1: _HEADER_V1}.get(bytes(self._mm[:8]))
+        if header is None or size < header.size:
+            self.close()
+            raise ValueError(f"docs.bin 형식이 아닙니다: {path}")
+        _, n, id_base, text_base, meta_base, src_size, *_ = header.unpack_from(self._mm, 0)
+        self._n = int(n)
+        self.src_size = int(src_size)
+        self._bases = (int(id_base), int(text_base), int(meta_base))
+        # 오프셋 테이블은 복사 없이 mmap 위에 그대로 올림
+        self._off = np.frombuffer(self._mm, dtype="<u8", count=3 * (self._n + 1), offset=header.size).reshape(3, self._n + 1)
+
+    def close(self):
+        try:
+            self._off = None  # type: ignore[assignment]
+            self._mm.close()
+        except Exception:
+            pass
+        self._f.close()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _field(self, col: int, i: int) -> str:
+        start, end = int(self._off[col, i]), int(self._off[col, i + 1])
+        base = self._bases[col]
+        return self._mm[base + start: base + end].decode("utf-8")
+
+    def get_id(self, i: int) -> str:
+        return self._field(0, self._norm(i))
+
+    def get_text(self, i: int) -> str:
+        return self._field(1, self._norm(i))
+
+    def get_meta(self, i: int) -> Dict[str, Any]:
+        return json.loads(self._field(2, self._norm(i)))
+
+    def _norm(self, i: int) -> int:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return i
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        i = self._norm(int(i))
+        return {"id": self._field(0, i), "text": self._field(1, i), "meta": json.loads(self._field(2, i))}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._n):
+            yield self[i]
+
+DocSeq = Union[List[Dict[str, Any]], MmapDocStore]
+
+def read_docs_jsonl(docs_path: str) -> List[Dict[str, Any]]:
+    docs: List[Dict[str, Any]] = []
+    with open(docs_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                docs.append(json.loads(line))
+            except Exception:
+                pass
+    return docs
+
+def _read_src_fingerprint(bin_path: str) -> Optional[Fingerprint]:
+    """docs.bin 헤더의 원본 지문 (현재 형식이 아니면 None)."""
+    try:
+        with open(bin_path, "rb") as f:
+            head = f.read(_HEADER.size)
+        magic, *_, src_size, src_mtime_ns, src_sha1 = _HEADER.unpack(head)
+        return (int(src_size), int(src_mtime_ns), src_sha1) if magic == MAGIC else None
+    except Exception:
+        return None
+
+# 해시로 내용이 같다고 확인한 (docs.jsonl 경로, size, mtime_ns) → 기록된 sha1 (같은 프로세스에서 재해시 방지)
+_HASH_OK: Dict[Tuple[str, int, int], bytes] = {}
+
+def source_unchanged(src_path: str, src: Fingerprint) -> bool:
+    """
+    src_path가 기록해 둔 지문 src와 같은 내용인지: 크기가 다르면 False, 크기·mtime이 같으면 True (해시 없음),
+    mtime만 다르면 SHA-1로 판정 (같으면 프로세스 안에서 기억해 다시 해시하지 않음). netflix_top.json도 같은 규칙.
+    """
+    st = os.stat(src_path)
+    if st.st_size != src[0]:
+        return False
+    if st.st_mtime_ns == src[1]:
+        return True
+    key = (os.path.abspath(src_path), st.st_size, st.st_mtime_ns)
+    if _HASH_OK.get(key) == src[2]:
+        return True
+    if _sha1(src_path) != src[2]:
+        return False
+    _HASH_OK[key] = src[2]
+    return True
+
+def docstore_is_fresh(index_dir: str) -> bool:
+    """docs.bin이 있고 현재 docs.jsonl이 변환 당시와 같으면 True (jsonl이 없으면 bin만으로 충분)."""
+    bin_path = os.path.join(index_dir, DOCSTORE_FILENAME)
+    jsonl_path = os.path.join(index_dir, "docs.jsonl")
+    if not os.path.exists(bin_path):
+        return False
+    src = _read_src_fingerprint(bin_path)
+    if src is None:
+        return False
+    if not os.path.exists(jsonl_path):
+        return True
+    return source_unchanged(jsonl_path, src)
+
+def open_docs(index_dir: str) -> DocSeq:
+    """index_dir의 문서 시퀀스: docs.bin(mmap, 지연 디코딩) 우선, 없거나 낡았으면 docs.jsonl 파싱."""
+    if docstore_is_fresh(index_dir):
+        return MmapDocStore(os.path.join(index_dir, DOCSTORE_FILENAME))
+    jsonl_path = os.path.join(index_dir, "docs.jsonl")
+    return read_docs_jsonl(jsonl_path) if os.path.exists(jsonl_path) else []
+
+def convert_jsonl(index_dir: str) -> str:
+    """index_dir/docs.jsonl → index_dir/docs.bin 변환 (제자리 마이그레이션)."""
+    src = os.path.join(index_dir, "docs.jsonl")
+    dst = os.path.join(index_dir, DOCSTORE_FILENAME)
+    n = write_docstore(read_docs_jsonl(src), dst, src_path=src)
+    print(f"[OK] {src} → {dst} (N={n}, {os.path.getsize(src):,}B → {os.path.getsize(dst):,}B)")
+    return dst
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="docs.jsonl → docs.bin(mmap 문서 저장소) 변환")
+    ap.add_argument("--index_dir", nargs="+", required=True)
+    args = ap.parse_args()
+    for d in args.index_dir:
+        convert_jsonl(d)
+        # 로드 비용 비교 (전체 파싱 vs mmap 오픈 + top-5 디코딩)
+        t0 = time.perf_counter()
+        full = read_docs_jsonl(os.path.join(d, "docs.jsonl"))
+        t_jsonl = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        ds = MmapDocStore(os.path.join(d, DOCSTORE_FILENAME))
+        _ = [ds[i] for i in range(min(5, len(ds)))]
+        t_bin = time.perf_counter() - t0
+        assert len(ds) == len(full) and (not full or ds[0] == full[0] and ds[-1] == full[-1])
+        print(f"     load: jsonl={t_jsonl * 1000:.2f}ms  docs.bin(open+top5)={t_bin * 1000:.2f}ms")
+        ds.close()
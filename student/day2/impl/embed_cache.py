@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+임베딩 디스크 캐시 (content-addressed)
+- 키: (provider, model, dim, sha256(text))
+- 저장 구조 (네임스페이스 = provider+model 별 디렉토리):
+    meta.json     : {"provider","model","dim","capacity","clock"}
+    vectors.f32   : float32 행렬(capacity × dim), np.memmap으로 접근
+    index.npy     : 구조체 배열 [(key: 32B digest, row: int64, atime: int64)]
+- LRU 퇴출: max_entries 또는 max_bytes 초과 시 atime(논리 시계)이 오래된 행부터 제거, 빈 행은 재사용
+- hits/misses 카운터 제공 (stats())
+- 여러 프로세스 공유 (build_index ↔ 질의 서버가 같은 디렉토리 사용):
+    · 로드/조회/삽입/기록은 .lock 파일 잠금(fcntl.flock, Windows는 msvcrt.locking) 안에서
+    · meta.json의 gen이 마지막으로 본 값과 다르면 다른 프로세스가 기록한 것 → 디스크 상태를 다시 읽은 뒤 행 배정
+    · put_many는 잠금 안에서 바로 기록 (행 배정이 다른 프로세스에 즉시 보이도록), vectors.f32는 줄이지 않음
+"""
+
+from __future__ import annotations
+import os, json, atexit, hashlib, threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Set, Tuple
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_CACHE_DIR = "indices/_embed_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+
+# key는 uint8[32]로 저장 ('S32'는 끝의 \x00 바이트를 잘라버려 digest가 깨짐)
+_INDEX_DTYPE = np.dtype([("key", "u1", (32,)), ("row", "<i8"), ("atime", "<i8")])
+
+def text_digest(text: str) -> bytes:
+    return hashlib.sha256((text or "").encode("utf-8")).digest()
+
+def _lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # 약 10초 재시도 후 OSError → 계속 대기
+            return
+        except OSError:
+            continue
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _namespace(provider: str, model: str) -> str:
+    h = hashlib.sha1(f"{provider}|{model}".encode("utf-8")).hexdigest()[:12]
+    safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in model)[:40]
+    return f"{safe}__{h}"
+
+class EmbeddingCache:
+    def __init__(self, provider: str, model: str, cache_dir: str | None = None,
+                 max_entries: int | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.provider = provider
+        self.model = model
+        self.root = os.path.join(cache_dir or os.getenv("DAY2_EMBED_CACHE_DIR", DEFAULT_CACHE_DIR),
+                                 _namespace(provider, model))
+        self.max_entries = max_entries
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._dim: Optional[int] = None
+        self._capacity = 0
+        self._clock = 0
+        self._gen: Optional[str] = None           # 마지막으로 읽거나 쓴 meta.json의 gen
+        self._rows: Dict[bytes, List[int]] = {}   # digest -> [row, atime]
+        self._touched: Set[bytes] = set()         # 아직 기록하지 않은 LRU 시각 갱신
+        self._free: List[int] = []
+        self._next_row = 0
+        self._mm: Optional[np.memmap] = None
+        self._dirty = False
+        with self._locked():
+            self._load()
+        atexit.register(self.flush)  # 조회만 한 경우의 LRU 시각도 종료 시 반영
+
+    # ---------- 경로 ----------
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.root, "meta.json")
+
+    @property
+    def _vec_path(self) -> str:
+        return os.path.join(self.root, "vectors.f32")
+
+    @property
+    def _idx_path(self) -> str:
+        return os.path.join(self.root, "index.npy")
+
+    @property
+    def _lock_path(self) -> str:
+        return os.path.join(self.root, ".lock")
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ---------- 잠금/로드/저장 ----------
+    @contextmanager
+    def _locked(self):
+        """스레드 잠금 + 디렉토리 파일 잠금 (같은 캐시를 여는 다른 프로세스와 직렬화)."""
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(self._lock_path, "a+b") as f:
+                _lock_file(f)
+                try:
+                    yield
+                finally:
+                    _unlock_file(f)
+
+    def _load(self):
+        """
+        (잠금 안에서) meta.json의 gen이 마지막으로 본 값과 다르면 디스크 상태를 다시 읽음.
+        이 프로세스가 아직 기록하지 않은 LRU 시각 갱신(_touched)은 새 상태에 다시 반영.
+        """
+        try:
+            if not os.path.exists(self._meta_path):
+                self._clear()
+                return
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if self._gen is not None and meta.get("gen") == self._gen:
+                return
+            dim, cap = int(meta["dim"]), int(meta["capacity"])
+            idx = np.load(self._idx_path) if os.path.exists(self._idx_path) else np.zeros(0, dtype=_INDEX_DTYPE)
+            if not os.path.exists(self._vec_path) or os.path.getsize(self._vec_path) < cap * dim * 4:
+                raise ValueError("vectors.f32 크기가 meta와 다름")
+        except Exception as e:
+            print(f"[WARN] 임베딩 캐시 손상 → 초기화: {self.root} ({e})")
+            self._reset_files()
+            return
+        self._dim, self._capacity, self._gen = dim, cap, meta.get("gen")
+        self._clock = max(self._clock, int(meta.get("clock", 0)))
+        self._rows = {k.tobytes(): [int(row), int(atime)] for k, row, atime in zip(idx["key"], idx["row"], idx["atime"])}
+        for d in self._touched:
+            ent = self._rows.get(d)
+            if ent is not None:
+                self._clock += 1
+                ent[1] = self._clock
+        used = {row for row, _ in self._rows.values()}
+        self._next_row = (max(used) + 1) if used else 0
+        self._free = [r for r in range(self._next_row) if r not in used]
+        self._mm = np.memmap(self._vec_path, dtype="float32", mode="r+", shape=(cap, dim)) if cap else None
+
+    def _clear(self):
+        self._dim, self._capacity, self._gen = None, 0, None
+        self._rows, self._free, self._next_row, self._mm = {}, [], 0, None
+        self._touched = set()
+
+    def _reset_files(self):
+        for p in (self._meta_path, self._vec_path, self._idx_path):
+            if os.path.exists(p):
+                os.remove(p)
+        self._clock = 0
+        self._clear()
+
+    def _write(self):
+        """(잠금 안에서) 인덱스/메타를 원자적으로 기록하고 새 gen을 남김 (벡터는 memmap이 직접 반영)."""
+        if self._mm is not None:
+            self._mm.flush()
+        arr = np.zeros(len(self._rows), dtype=_INDEX_DTYPE)
+        if self._rows:
+            arr["key"] = np.frombuffer(b"".join(self._rows.keys()), dtype="u1").reshape(-1, 32)
+            vals = np.asarray(list(self._rows.values()), dtype="<i8")
+            arr["row"], arr["atime"] = vals[:, 0], vals[:, 1]
+        tmp = self._idx_path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, self._idx_path)
+        self._gen = os.urandom(8).hex()
+        meta = {"provider": self.provider, "model": self.model, "dim": self._dim,
+                "capacity": self._capacity, "clock": self._clock, "gen": self._gen}
+        tmp = self._meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp, self._meta_path)
+        self._dirty = False
+        self._touched.clear()
+
+    def flush(self):
+        """조회로 바뀐 LRU 시각을 기록 (삽입은 put_many가 바로 기록)."""
+        if not self._dirty:
+            return
+        with self._locked():
+            if not self._dirty:
+                return
+            self._load()
+            if self._dim is not None:
+                self._write()
+
+    # ---------- 용량 ----------
+    def _limit(self) -> int:
+        by_bytes = self.max_bytes // (self._dim * 4) if self._dim else 0
+        if self.max_entries:
+            return min(self.max_entries, by_bytes) if by_bytes else self.max_entries
+        return max(1, by_bytes)
+
+    def _ensure_capacity(self, rows_needed: int):
+        if rows_needed <= self._capacity:
+            return
+        row_bytes = self._dim * 4
+        new_size = max(rows_needed, self._capacity * 2, 256) * row_bytes
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm = None
+        with open(self._vec_path, "ab") as f:
+            size = f.seek(0, os.SEEK_END)
+            if new_size > size:  # 다른 프로세스가 매핑 중일 수 있으므로 줄이지 않음
+                f.truncate(new_size)
+        self._capacity = max(new_size, size) // row_bytes
+        self._mm = np.memmap(self._vec_path, dtype="float32", mode="r+", shape=(self._capacity, self._dim))
+
+    def _evict(self, n: int):
+        if n <= 0:
+            return
+        victims = sorted(self._rows.items(), key=lambda kv: kv[1][1])[:n]
+        for k, (row, _) in victims:
+            del self._rows[k]
+            self._free.append(row)
+        self.evictions += len(victims)
+
+    # ---------- 조회/삽입 ----------
+    def get_many(self, digests: List[bytes], dim: Optional[int] = None) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        digests 목록 조회 → ({입력위치: 벡터}, 미스 입력위치 목록).
+        dim이 주어졌는데 캐시 차원과 다르면 전부 미스로 취급.
+        """
+        found: Dict[int, np.ndarray] = {}
+        missing: List[int] = []
+        with self._locked():
+            self._load()  # 다른 프로세스가 행을 퇴출/재사용했으면 그 상태로 조회
+            usable = self._mm is not None and (dim is None or dim == self._dim)
+            for i, d in enumerate(digests):
+                ent = self._rows.get(d) if usable else None
+                if ent is None:
+                    missing.append(i)
+                    continue
+                self._clock += 1
+                ent[1] = self._clock
+                self._touched.add(d)
+                found[i] = np.array(self._mm[ent[0]])
+            self.hits += len(found)
+            self.misses += len(missing)
+            if found:
+                self._dirty = True
+        return found, missing
+
+    def put_many(self, digests: List[bytes], vecs: np.ndarray):
+        if len(digests) == 0:
+            return
+        vecs = np.asarray(vecs, dtype="float32")
+        with self._locked():
+            self._load()  # 다른 프로세스가 그사이 배정한 행을 반영한 뒤 배정
+            if self._dim is None:
+                self._dim = int(vecs.shape[1])
+            elif vecs.shape[1] != self._dim:
+                # 차원이 바뀌면 기존 키는 모두 무효 (키에 dim 포함)
+                self._reset_files()
+                self._dim = int(vecs.shape[1])
+            new = [(d, v) for d, v in zip(digests, vecs) if d not in self._rows]
+            limit = self._limit()
+            new = new[-limit:]  # 한 번에 한도보다 많이 들어오면 최근 것만
+            self._evict(len(self._rows) + len(new) - limit)
+            n_fresh = max(0, len(new) - len(self._free))
+            self._ensure_capacity(self._next_row + n_fresh)
+            for d, v in new:
+                row = self._free.pop() if self._free else self._next_row
+                if row == self._next_row:
+                    self._next_row += 1
+                self._mm[row] = v
+                self._clock += 1
+                self._rows[d] = [row, self._clock]
+            self._write()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._rows),
+            "dim": self._dim,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "path": self.root,
+        }
@@ -1,30 +1,53 @@
 # -*- coding: utf-8 -*-
 """
 OpenAI 임베딩 래퍼
-- 배치 인코딩, 재시도(backoff), L2 정규화
+- 배치 인코딩(요청 1회당 여러 텍스트), 재시도(backoff), L2 정규화
+- 배치는 batch_size(개수)와 max_batch_tokens(추정 토큰 예산)를 모두 넘지 않도록 분할
+- 배치 실패 시 반으로 쪼개 재시도 → 불량 입력 하나 때문에 배치 전체를 다시 보내지 않음
+- 디스크 캐시(embed_cache) 우선 조회 → 미스만 API 호출 (DAY2_EMBED_CACHE=0이면 끔)
 - 퍼블릭 OpenAI / Azure OpenAI / 커스텀 base_url 자동 감지
 """
 
-import os, time
-from typing import List
+import os, time, threading
+from typing import List, Dict
 import numpy as np
 from dotenv import load_dotenv
 
 from openai import OpenAI
+from .embed_cache import EmbeddingCache, text_digest
 try:
     from openai import AzureOpenAI
 except Exception:
     AzureOpenAI = None
 
 DEFAULT_DIM = 1536  # text-embedding-3-* 기본 차원
+DEFAULT_MAX_BATCH_TOKENS = 200_000  # OpenAI 요청당 한도(300k)보다 보수적으로
+MAX_INPUTS_PER_REQUEST = 2048       # OpenAI embeddings input 배열 최대 길이
+
+# 재시도해도 소용없는(입력 자체가 문제인) 상태 코드 → 즉시 배치 분할
+_BAD_INPUT_STATUS = {400, 413, 422}
+
+def _approx_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 보수적 토큰 추정 (한글 1자 ≈ 1토큰 이상이므로 글자 수 그대로 사용)."""
+    return max(1, len(text or ""))
+
+def _l2_normalize(mat: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (스택된 행렬에 한 번에 적용)."""
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms += 1e-12
+    return (mat / norms).astype("float32", copy=False)
 
 class Embeddings:
-    def __init__(self, model: str | None = None, batch_size: int = 128, max_retries: int = 4):
+    def __init__(self, model: str | None = None, batch_size: int = 128, max_retries: int = 4,
+                 max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+                 cache: EmbeddingCache | bool | None = None):
         load_dotenv()
         # 모델명 방어적 정리 (공백/따옴표/백틱 제거)
         self.model = (model or "text-embedding-3-small").strip().strip('`"')
-        self.batch_size = int(batch_size)
-        self.max_retries = int(max_retries)
+        self.batch_size = max(1, min(int(batch_size), MAX_INPUTS_PER_REQUEST))
+        self.max_retries = max(1, int(max_retries))
+        self.max_batch_tokens = int(max_batch_tokens)
+        self.request_count = 0  # embeddings.create 호출 횟수 (벤치마크/진단용)
 
         api_key = os.getenv("OPENAI_API_KEY")
         azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -51,31 +74,119 @@ class Embeddings:
             self.client = OpenAI(api_key=api_key, base_url=base_url) if base_url else OpenAI(api_key=api_key)
             self.provider = f"openai{f'(base_url={base_url})' if base_url else ''}"
 
-        print(f"[Embeddings] provider={self.provider}, model={self.model}, batch_size={self.batch_size}")
+        # 캐시: None → 환경변수 기본값(켜짐), False → 끔, 인스턴스 → 그대로 사용
+        if cache is None:
+            cache = os.getenv("DAY2_EMBED_CACHE", "1").lower() not in ("0", "false", "no", "n")
+        if cache is True:
+            cache = EmbeddingCache(self.provider, self.model)
+        self.cache: EmbeddingCache | None = cache if isinstance(cache, EmbeddingCache) else None
 
-    def _embed_once(self, text: str) -> np.ndarray:
+        print(f"[Embeddings] provider={self.provider}, model={self.model}, "
+              f"batch_size={self.batch_size}, max_batch_tokens={self.max_batch_tokens}, "
+              f"cache={'off' if self.cache is None else 'on'}")
+
+    # ---------- 단일 요청 ----------
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """texts 전체를 embeddings.create 1회로 보내고 (N, dim) 원본 벡터를 입력 순서대로 반환."""
+        self.request_count += 1
         try:
-            resp = self.client.embeddings.create(model=self.model, input=text)
+            resp = self.client.embeddings.create(model=self.model, input=list(texts))
         except Exception as e:
-            raise RuntimeError(f"Embeddings API 호출 실패 (provider={self.provider}, model={self.model}): {e}")
-        vec = np.array(resp.data[0].embedding, dtype="float32")
-        norm = np.linalg.norm(vec) + 1e-12
-        return vec / norm
+            err = RuntimeError(f"Embeddings API 호출 실패 (provider={self.provider}, model={self.model}, n={len(texts)}): {e}")
+            err.status_code = getattr(e, "status_code", None)  # 분할 판단용
+            raise err from e
+        data = sorted(resp.data, key=lambda d: d.index)  # 응답 순서는 보장되지 않으므로 index로 정렬
+        if len(data) != len(texts):
+            raise RuntimeError(f"Embeddings 응답 개수 불일치 (요청={len(texts)}, 응답={len(data)})")
+        return np.asarray([d.embedding for d in data], dtype="float32")
+
+    def _embed_once(self, text: str) -> np.ndarray:
+        return _l2_normalize(self._embed_batch([text]))[0]
+
+    # ---------- 배치 계획/재시도 ----------
+    def _plan_batches(self, texts: List[str]) -> List[List[int]]:
+        """입력 순서를 유지하면서 개수/토큰 예산 안에서 배치를 나눈다(인덱스 목록)."""
+        batches: List[List[int]] = []
+        cur: List[int] = []
+        cur_tokens = 0
+        for i, t in enumerate(texts):
+            tok = _approx_tokens(t)
+            if cur and (len(cur) >= self.batch_size or cur_tokens + tok > self.max_batch_tokens):
+                batches.append(cur)
+                cur, cur_tokens = [], 0
+            cur.append(i)
+            cur_tokens += tok
+        if cur:
+            batches.append(cur)
+        return batches
+
+    def _encode_with_retry(self, texts: List[str]) -> np.ndarray:
+        """
+        배치 1개 인코딩:
+          - 일시 오류(네트워크/429/5xx)는 지수 backoff로 같은 배치를 재시도, 소진 시 예외 전파
+          - 입력 오류(400/413/422)는 배치를 반으로 나눠 재귀 처리
+            → 문제 입력이 포함된 절반만 다시 보내고, 나머지는 정상 처리
+          - 단일 입력까지 쪼갰는데도 실패하면 예외 전파
+        """
+        last_err: Exception | None = None
+        bad_input = False
+        for attempt in range(self.max_retries):
+            try:
+                return self._embed_batch(texts)
+            except Exception as e:
+                last_err = e
+                if getattr(e, "status_code", None) in _BAD_INPUT_STATUS:
+                    bad_input = True
+                    break
+                if attempt < self.max_retries - 1:
+                    time.sleep(0.5 * (2 ** attempt))  # 0.5s,1s,2s,...
+        if not bad_input or len(texts) == 1:
+            raise last_err
+        mid = len(texts) // 2
+        return np.vstack([self._encode_with_retry(texts[:mid]), self._encode_with_retry(texts[mid:])])
 
     def encode(self, texts: List[str]) -> np.ndarray:
         if not texts:
             return np.zeros((0, DEFAULT_DIM), dtype="float32")
+        if self.cache is None:
+            return self._encode_uncached(texts)
+
+        digests = [text_digest(t) for t in texts]
+        found, missing = self.cache.get_many(digests)
+        if missing:
+            # 같은 텍스트가 여러 번 나와도 API에는 한 번만
+            first: dict[bytes, int] = {}
+            for i in missing:
+                first.setdefault(digests[i], i)
+            vecs = self._encode_uncached([texts[i] for i in first.values()])
+            self.cache.put_many(list(first.keys()), vecs)
+            self.cache.flush()
+            fresh = dict(zip(first.keys(), vecs))
+            for i in missing:
+                found[i] = fresh[digests[i]]
+        return np.vstack([found[i] for i in range(len(texts))])
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        parts: list[np.ndarray] = []
+        for idxs in self._plan_batches(texts):
+            parts.append(self._encode_with_retry([texts[i] for i in idxs]))
+        # 배치는 입력 순서대로 이어 붙이므로 vstack 결과가 곧 원래 순서
+        return _l2_normalize(np.vstack(parts))
+
+
+# ---------- 프로세스 상주 인스턴스 ----------
+# 쿼리마다 dotenv 로드/클라이언트 생성을 반복하지 않도록 모델별로 1개만 유지
+_SHARED: Dict[str, "Embeddings"] = {}
+_SHARED_LOCK = threading.Lock()
 
-        out: list[np.ndarray] = []
-        for start in range(0, len(texts), self.batch_size):
-            batch = texts[start:start + self.batch_size]
-            for each in batch:
-                for attempt in range(self.max_retries):
-                    try:
-                        out.append(self._embed_once(each))
-                        break
-                    except Exception:
-                        time.sleep(0.5 * (2 ** attempt))  # 0.5s,1s,2s,4s
-                        if attempt == self.max_retries - 1:
-                            raise
-        return np.vstack(out) if out else np.zeros((0, DEFAULT_DIM), dtype="float32")
+def get_embeddings(model: str | None = None) -> Embeddings:
+    key = (model or "text-embedding-3-small").strip().strip('`"')
+    with _SHARED_LOCK:
+        emb = _SHARED.get(key)
+        if emb is None:
+            emb = Embeddings(model=key)
+            _SHARED[key] = emb
+        return emb
@@ -6,6 +6,7 @@
 import re, json
 from typing import List, Dict, Any
 from pathlib import Path
+from .chunker import PagedText, chunk_spans, span_items, get_token_counter
 from playwright.sync_api import sync_playwright, expect
 
 TOP10_URL = "https://www.netflix.com/tudum/top10/"
@@ -23,19 +24,24 @@ def _normalize_country(name: str) -> str:
     key = (name or "").strip().lower()
     return COUNTRY_ALIASES.get(key, name)
 
-def load_netflix_top10(country: str, category: str, headless: bool = True) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
+def _netflix_category(category: str) -> str:
+    cat_raw = (category or "").strip().lower()
+    return "Shows" if cat_raw.startswith("show") else "Movies"  # shows/movies 어떤 식으로 와도 처리
+
+def _texts_to_items(country: str, cat_text: str, texts: List[str]) -> List[Dict[str, Any]]:
+    return [{"path": f"netflix://{country}/{cat_text}/item_{i:02d}", "text": t} for i, t in enumerate(texts)]
 
+def load_netflix_top10(country: str, category: str, headless: bool = True, url: str = TOP10_URL) -> List[Dict[str, Any]]:
+    """(country, category) 1쌍을 브라우저를 새로 띄워 수집. 여러 쌍은 netflix_scraper.scrape_top10 사용."""
     # ✅ 입력 정규화
     country = _normalize_country(country)
-    cat_raw = (category or "").strip().lower()
-    cat_text = "Shows" if cat_raw.startswith("show") else "Movies"  # shows/movies 어떤 식으로 와도 처리
+    cat_text = _netflix_category(category)
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=headless)
         ctx = browser.new_context(viewport={"width": 1400, "height": 900})
         page = ctx.new_page()
-        page.goto(TOP10_URL, wait_until="domcontentloaded")
+        page.goto(url, wait_until="domcontentloaded")
         page.wait_for_load_state("networkidle")
 
         # 오버레이/포커스 해제
@@ -110,11 +116,7 @@ def load_netflix_top10(country: str, category: str, headless: bool = True) -> Li
             whole = page.locator("main").inner_text() if page.locator("main").count() else page.locator("body").inner_text()
             texts = [t.strip() for t in re.split(r"\n{2,}", whole) if len(t.strip()) > 10][:50]
 
-        for i, t in enumerate(texts):
-            items.append({
-                "path": f"netflix://{country}/{cat_text}/item_{i:02d}",
-                "text": t,
-            })
+        items = _texts_to_items(country, cat_text, texts)
 
         browser.close()
     return items
@@ -123,16 +125,19 @@ def read_text_file(path: str) -> str:
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
         return f.read()
 
-def read_pdf_file(path: str) -> str:
+def read_pdf_pages(path: str) -> List[str]:
     """
-    pypdf 로 PDF 모든 페이지 텍스트 추출
+    pypdf 로 PDF 페이지별 텍스트 추출 (페이지 번호 보존용)
     """
     from pypdf import PdfReader
     reader = PdfReader(path)
-    texts = []
-    for page in reader.pages:
-        texts.append(page.extract_text() or "")
-    return "\n".join(texts)
+    return [page.extract_text() or "" for page in reader.pages]
+
+def read_pdf_file(path: str) -> str:
+    """
+    pypdf 로 PDF 모든 페이지 텍스트 추출
+    """
+    return "\n".join(read_pdf_pages(path))
 
 def clean_text(s: str) -> str:
     s = s or ""
@@ -157,7 +162,8 @@ def chunk_text(text: str, chunk_size: int = 1200, chunk_overlap: int = 200) -> L
         start += step
     return chunks
 
-def load_documents(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
+def list_source_files(paths_or_dir: List[str]) -> List[str]:
+    """경로/폴더 목록 → 색인 대상 파일 목록 (txt/md/pdf)."""
     files: List[str] = []
     for p in paths_or_dir:
         pp = Path(p)
@@ -166,22 +172,32 @@ def load_documents(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
                 files.extend([str(x) for x in pp.rglob(ext)])
         else:
             files.append(str(pp))
+    return files
+
+def load_document(fp: str) -> Dict[str, Any] | None:
+    """파일 1개 읽기+정제 → {"path","text","pages"} (지원하지 않는 확장자면 None). txt/md는 1페이지."""
+    ext = fp.lower().split(".")[-1]
+    if ext in ("txt", "md"):
+        pages = [read_text_file(fp)]
+    elif ext == "pdf":
+        pages = read_pdf_pages(fp)
+    else:
+        return None
+    pages = [clean_text(p) for p in pages]
+    return {"path": fp, "text": "\n".join(pages), "pages": pages}
 
+def load_documents(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     docs: List[Dict[str, Any]] = []
-    for fp in files:
-        ext = fp.lower().split(".")[-1]
-        if ext in ("txt", "md"):
-            raw = read_text_file(fp)
-        elif ext == "pdf":
-            raw = read_pdf_file(fp)
-        else:
-            continue
-        txt = clean_text(raw)
-        docs.append({"path": fp, "text": txt})
+    for fp in list_source_files(paths_or_dir):
+        d = load_document(fp)
+        if d is not None:
+            docs.append(d)
     return docs
 
-def build_corpus_netflix(country: str, category: str) -> List[Dict[str, Any]]:
-    raw_docs = load_netflix_top10(country, category)
+def build_corpus_netflix(country: str, category: str, raw_docs: List[Dict[str, Any]] | None = None) -> List[Dict[str, Any]]:
+    """raw_docs(이미 수집한 load_netflix_top10 형식 결과)가 없으면 직접 수집."""
+    if raw_docs is None:
+        raw_docs = load_netflix_top10(country, category)
     normalized_category = category.capitalize()
     corpus: List[Dict[str, Any]] = []
 
@@ -229,12 +245,18 @@ def build_corpus(paths_or_dir: List[str]) -> List[Dict[str, Any]]:
     docs = load_documents(paths_or_dir)
     corpus: List[Dict[str, Any]] = []
     for d in docs:
-        chunks = chunk_text(d["text"])
-        for i, ch in enumerate(chunks):
-            cid = f"{d['path']}::chunk_{i:04d}"
-            corpus.append({"id": cid, "text": ch, "meta": {"path": d["path"], "chunk": i}})
+        corpus.extend(chunk_document(d))
     return corpus
 
+def chunk_document(d: Dict[str, Any], model: str | None = None) -> List[Dict[str, Any]]:
+    """
+    {"path","text"[,"pages"]} 문서 1개 → 코퍼스 아이템 목록.
+    토큰 기준·페이지 보존 span 청크(chunker), meta.page에 페이지 번호. id는 경로+청크번호라 재빌드해도 안정적.
+    """
+    doc = PagedText(d.get("pages") or [d["text"]])
+    spans = chunk_spans(doc, counter=get_token_counter(model))
+    return list(span_items(d["path"], doc, spans))
+
 def save_docs_jsonl(items: List[Dict[str, Any]], out_path: str):
     with open(out_path, "w", encoding="utf-8") as f:
         for it in items:
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Day2 어휘(lexical) 검색: BM25 역색인 (lexical.npz, faiss.index 옆에 저장)
+- 토큰화: NFKC + 소문자화 후
+    · 한글 연속 구간 → 문자 bigram (띄어쓰기가 빠진 "식약처는2025년5월7일자로"도 "식약","약처"로 매칭, 1글자 구간은 unigram)
+    · 영문/숫자 연속 구간 → 단어 그대로 (앞 16자까지만; 사전 폭을 줄이기 위해)
+- 색인: 용어(사전순) → 문서 행 번호 postings (행 번호 오름차순)
+    · 압축: 행 번호는 문서 수에 맞춰 uint16/uint32, BM25 가중치(impact)는 미리 계산해 uint8로 양자화(scale 1개)
+    · 용어 사전은 utf-8 바이트로 정렬된 고정폭 배열 → 로드 시 dict를 만들지 않고 searchsorted로 조회
+- 질의: 용어별 postings를 최대 impact 큰 순으로 누적(TAAT)
+    · 조기 종료(MaxScore): 남은 용어들의 최대 impact 합이 현재 k번째 점수보다 작으면
+      새 문서가 top-k에 들어올 수 없으므로, 이후 용어는 기존 후보에만 더함
+- 융합: rrf_fuse(Reciprocal Rank Fusion) / weighted_fuse(min-max 정규화 후 가중합)
+
+사용 예 (기존 인덱스 폴더에 lexical.npz 생성 + 질의 지연 측정):
+python -m student.day2.impl.lexical --index_dir indices/day2 indices/netflix_multi --query "디지털의료제품법 허가"
+"""
+
+from __future__ import annotations
+import os, re, math, time, argparse, unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Tuple, Optional
+
+import numpy as np
+
+LEXICAL_FILENAME = "lexical.npz"
+LEXICAL_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+_MAX_WORD = 16
+
+_TOKEN = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """한글 구간은 문자 bigram, 영문/숫자 구간은 단어."""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    out: List[str] = []
+    for m in _TOKEN.finditer(text):
+        tok = m.group()
+        if "가" <= tok[0] <= "힣":
+            if len(tok) == 1:
+                out.append(tok)
+            else:
+                out.extend(tok[i:i + 2] for i in range(len(tok) - 1))
+        else:
+            out.append(tok[:_MAX_WORD])
+    return out
+
+class LexicalIndex:
+    """BM25 impact 색인. search()는 (행 번호, 점수) 목록을 점수 내림차순으로 반환."""
+
+    def __init__(self, terms: np.ndarray, offsets: np.ndarray, doc_ids: np.ndarray, impacts: np.ndarray,
+                 scale: float, n_docs: int):
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.impacts = impacts
+        self.scale = float(scale)
+        self.n_docs = int(n_docs)
+        # 용어별 최대 impact (MaxScore 상한) — postings 구간별 최대값
+        if len(impacts):
+            starts = offsets[:-1][offsets[:-1] < offsets[1:]]
+            self._max = np.zeros(len(terms), dtype="uint8")
+            self._max[offsets[:-1] < offsets[1:]] = np.maximum.reduceat(impacts, starts)
+        else:
+            self._max = np.zeros(len(terms), dtype="uint8")
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    # ---------- Build ----------
+    @classmethod
+    def build(cls, texts: Iterable[str], k1: float = BM25_K1, b: float = BM25_B) -> "LexicalIndex":
+        tfs: List[Counter] = [Counter(tokenize(t)) for t in texts]
+        n = len(tfs)
+        lens = np.array([sum(tf.values()) for tf in tfs], dtype="float64")
+        avgdl = float(lens.mean()) if n and lens.sum() else 1.0
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for row, tf in enumerate(tfs):
+            for term, c in tf.items():
+                postings.setdefault(term, []).append((row, c))
+
+        terms = sorted(postings, key=lambda t: t.encode("utf-8"))
+        offsets = np.zeros(len(terms) + 1, dtype="int64")
+        doc_ids = np.empty(sum(len(p) for p in postings.values()), dtype="uint16" if n < 1 << 16 else "uint32")
+        weights = np.empty(len(doc_ids), dtype="float64")
+        pos = 0
+        for ti, term in enumerate(terms):
+            plist = postings[term]
+            rows = np.fromiter((r for r, _ in plist), dtype="int64", count=len(plist))
+            tf = np.fromiter((c for _, c in plist), dtype="float64", count=len(plist))
+            idf = math.log(1.0 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            norm = k1 * (1.0 - b + b * lens[rows] / avgdl)
+            doc_ids[pos:pos + len(plist)] = rows
+            weights[pos:pos + len(plist)] = idf * tf * (k1 + 1.0) / (tf + norm)
+            pos += len(plist)
+            offsets[ti + 1] = pos
+
+        scale = float(weights.max() / 255.0) if len(weights) and weights.max() > 0 else 1.0
+        impacts = np.clip(np.rint(weights / scale), 1, 255).astype("uint8") if len(weights) else np.zeros(0, "uint8")
+        return cls(np.array([t.encode("utf-8") for t in terms], dtype=bytes), offsets, doc_ids, impacts, scale, n)
+
+    # ---------- I/O ----------
+    def save(self, path: str):
+        tmp = path + ".tmp.npz"  # np.savez는 확장자가 없으면 .npz를 붙이므로 미리 붙여 둠
+        np.savez(tmp, version=LEXICAL_VERSION, terms=self.terms, offsets=self.offsets, doc_ids=self.doc_ids,
+                 impacts=self.impacts, scale=self.scale, n_docs=self.n_docs)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        with np.load(path) as z:
+            if int(z["version"]) != LEXICAL_VERSION:
+                raise ValueError(f"lexical.npz 버전이 다릅니다: {path}")
+            return cls(z["terms"], z["offsets"], z["doc_ids"], z["impacts"], float(z["scale"]), int(z["n_docs"]))
+
+    # ---------- Search ----------
+    def _lookup(self, terms: List[str]) -> List[int]:
+        if not len(self.terms) or not terms:
+            return []
+        q = np.array([t.encode("utf-8") for t in terms], dtype=bytes)
+        pos = np.minimum(np.searchsorted(self.terms, q), len(self.terms) - 1)
+        return [int(p) for p, t in zip(pos, q) if self.terms[p] == t]
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        tids = sorted(set(self._lookup(tokenize(query))), key=lambda t: -int(self._max[t]))
+        if not tids or top_k <= 0:
+            return []
+        acc = np.zeros(self.n_docs, dtype="int32")
+        # rest[i] = i번째 이후 용어들의 최대 impact 합 (상한)
+        rest = np.cumsum([int(self._max[t]) for t in tids][::-1])[::-1]
+        cand: Optional[np.ndarray] = None
+        for i, t in enumerate(tids):
+            s, e = int(self.offsets[t]), int(self.offsets[t + 1])
+            docs, imps = self.doc_ids[s:e], self.impacts[s:e]
+            if cand is None and i > 0:
+                hit = np.flatnonzero(acc)
+                if len(hit) >= top_k:
+                    kth = np.partition(acc[hit], len(hit) - top_k)[len(hit) - top_k]
+                    if rest[i] < kth:
+                        cand = hit[acc[hit] + rest[i] >= kth]  # 남은 용어로 top-k에 닿을 수 있는 후보만
+            if cand is not None:
+                m = np.isin(docs, cand, assume_unique=True)
+                docs, imps = docs[m], imps[m]
+            acc[docs] += imps
+        hit = np.flatnonzero(acc)
+        hit = hit[np.lexsort((hit, -acc[hit]))[:top_k]]  # 동점은 행 번호 순
+        return [(int(r), float(acc[r]) * self.scale) for r in hit]
+
+def build_lexical(docs: Iterable[Dict[str, Any]], path: str) -> LexicalIndex:
+    """docs(id/text/meta) 순서대로 행 번호를 매겨 lexical.npz 기록."""
+    lex = LexicalIndex.build(d.get("text", "") for d in docs)
+    lex.save(path)
+    return lex
+
+# ---------- 융합 ----------
+def rrf_fuse(rankings: List[List[int]], k: int = RRF_K, weights: Optional[List[float]] = None) -> List[Tuple[int, float]]:
+    """순위 목록들(행 번호, 좋은 순) → (행 번호, RRF 점수) 내림차순."""
+    weights = weights or [1.0] * len(rankings)
+    score: Dict[int, float] = {}
+    for ranking, w in zip(rankings, weights):
+        for rank, row in enumerate(ranking):
+            score[row] = score.get(row, 0.0) + w / (k + rank + 1)
+    return sorted(score.items(), key=lambda kv: (-kv[1], kv[0]))
+
+def weighted_fuse(dense: List[Tuple[int, float]], lexical: List[Tuple[int, float]],
+                  lexical_weight: float = 0.5) -> List[Tuple[int, float]]:
+    """(행 번호, 점수) 목록 둘을 각각 min-max 정규화 후 가중합 (한쪽에만 있으면 다른 쪽은 0)."""
+    def _norm(pairs):
+        if not pairs:
+            return {}
+        vals = [s for _, s in pairs]
+        lo, hi = min(vals), max(vals)
+        return {r: (s - lo) / (hi - lo) if hi > lo else 1.0 for r, s in pairs}
+    d, l = _norm(dense), _norm(lexical)
+    score = {r: (1.0 - lexical_weight) * d.get(r, 0.0) + lexical_weight * l.get(r, 0.0) for r in {*d, *l}}
+    return sorted(score.items(), key=lambda kv: (-kv[1], kv[0]))
+
+if __name__ == "__main__":
+    from .docstore import open_docs
+    ap = argparse.ArgumentParser(description="docs → lexical.npz(BM25 역색인) 생성 및 질의 지연 측정")
+    ap.add_argument("--index_dir", nargs="+", required=True)
+    ap.add_argument("--query", default="디지털의료제품법 허가")
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--repeat", type=int, default=1000)
+    args = ap.parse_args()
+    for d in args.index_dir:
+        t0 = time.perf_counter()
+        docs = open_docs(d)
+        path = os.path.join(d, LEXICAL_FILENAME)
+        lex = build_lexical(docs, path)
+        build_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        lex = LexicalIndex.load(path)
+        load_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            hits = lex.search(args.query, args.k)
+        q_ms = (time.perf_counter() - t0) * 1000 / args.repeat
+        print(f"[OK] {path} N={len(lex)} terms={len(lex.terms):,} postings={len(lex.doc_ids):,} "
+              f"size={os.path.getsize(path):,}B build={build_s:.2f}s load={load_ms:.2f}ms query={q_ms:.3f}ms")
+        for row, score in hits:
+            print(f"     {score:7.3f}  {docs[row]['id']}")
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+넷플릭스 TOP 10 동시 수집기 (브라우저 1개 + 컨텍스트 N개)
+- 기존 load_netflix_top10은 (country, category)마다 Chromium을 새로 띄우고 networkidle까지 기다림
+- 여기서는:
+    · 브라우저는 1번만 띄우고, 나라별로 컨텍스트(탭)를 열어 최대 concurrency개 동시 진행
+    · 한 나라 페이지를 한 번 로드한 뒤 카테고리 드롭다운만 바꿔 가며 수집 (페이지 재로드 없음)
+      드롭다운이 이미 원하는 값이면 클릭하지 않음, 바꾼 뒤에는 표 내용이 바뀔 때까지만 대기
+    · 이미지/폰트/미디어 요청은 차단 (표 텍스트만 필요)
+    · 결과는 끝나는 순서대로 (country, category, items)로 내보냄 — items 형식은 load_netflix_top10과 동일
+- 한 나라에서 실패하면 그 나라의 남은 카테고리는 빈 목록 + [WARN] (다른 나라 수집은 계속)
+    · failed 리스트를 넘기면 실패한 나라를 거기에 추가 → 호출 쪽이 부분 결과를 알아채고 중단/기록 (build_index)
+- 동시 수집 수: 인자 concurrency 또는 환경변수 NETFLIX_SCRAPE_CONCURRENCY (기본 4)
+
+사용 예:
+python -m student.day2.impl.netflix_scraper --countries "South Korea,Japan" --categories "Movies,Shows"
+"""
+
+from __future__ import annotations
+import os, re, time, queue, asyncio, argparse, threading
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, AsyncIterator, Optional
+
+from playwright.async_api import async_playwright, Browser, Page, Route
+
+from .ingest import TOP10_URL, _normalize_country, _netflix_category, _texts_to_items
+
+DEFAULT_CONCURRENCY = 4
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+COUNTRY_SELECT = '[data-uia="top10-country-select"]'
+CATEGORY_SELECT = '[data-uia="top10-category-select"]'
+
+Result = Tuple[str, str, List[Dict[str, Any]]]  # (country, category, items)
+
+# load_netflix_top10의 3단계 추출(표 → 카드 → 본문 문단)과 같은 규칙을 페이지 안에서 한 번에 실행
+_EXTRACT_JS = """
+() => {
+  const clean = s => (s || "").trim();
+  let texts = [...document.querySelectorAll("table tr")].map(r => clean(r.innerText)).filter(Boolean);
+  if (!texts.length) {
+    texts = [...document.querySelectorAll('[data-uia*="top10-card"], [data-uia*="Top10Card"], section[data-guid*="top10-card"]')]
+      .map(e => clean(e.innerText)).filter(Boolean);
+  }
+  if (!texts.length) {
+    const root = document.querySelector("main") || document.body;
+    texts = root.innerText.split(/\\n{2,}/).map(clean).filter(t => t.length > 10).slice(0, 50);
+  }
+  return texts;
+}
+"""
+
+_TABLE_CHANGED_JS = "prev => { const t = document.querySelector('table'); return !!t && t.innerText !== prev; }"
+_TABLE_TEXT_JS = "() => { const t = document.querySelector('table'); return t ? t.innerText : ''; }"
+
+def _concurrency(value: Optional[int]) -> int:
+    return max(1, int(value or os.getenv("NETFLIX_SCRAPE_CONCURRENCY", DEFAULT_CONCURRENCY)))
+
+async def _block_heavy(route: Route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _select(page: Page, uia_select: str, option_text: str, timeout_ms: int) -> bool:
+    """드롭다운에서 option_text 선택. 이미 선택돼 있으면 False (아무것도 하지 않음)."""
+    box = page.locator(uia_select).first
+    await box.wait_for(state="visible", timeout=timeout_ms)
+    if (await box.inner_text()).strip().lower() == option_text.lower():
+        return False
+    await box.scroll_into_view_if_needed()
+    await box.click()
+
+    listbox = page.get_by_role("listbox")
+    await listbox.first.wait_for(state="visible", timeout=timeout_ms)
+    opt = listbox.get_by_role("option", name=re.compile(rf"^{re.escape(option_text)}$", re.I))
+    if await opt.count() == 0:
+        opt = page.locator(
+            f"//li[normalize-space()='{option_text}'] | //div[@role='option' and normalize-space()='{option_text}']"
+        )
+    await opt.first.click(timeout=timeout_ms, force=True)
+
+    # 드롭다운 닫힘 보장
+    try:
+        await page.keyboard.press("Enter")
+        await page.keyboard.press("Escape")
+    except Exception:
+        pass
+    return True
+
+async def _select_and_wait(page: Page, uia_select: str, option_text: str, timeout_ms: int, settle_ms: int):
+    prev = await page.evaluate(_TABLE_TEXT_JS)
+    if await _select(page, uia_select, option_text, timeout_ms):
+        try:
+            await page.wait_for_function(_TABLE_CHANGED_JS, arg=prev, timeout=settle_ms)
+        except Exception:
+            pass  # 내용이 같은 목록이거나 표가 없는 레이아웃 → 추출 단계의 폴백 규칙에 맡김
+
+async def _scrape_country(browser: Browser, country: str, categories: List[str], sem: asyncio.Semaphore,
+                          out: "asyncio.Queue[Result]", url: str, block_resources: bool,
+                          timeout_ms: int, settle_ms: int, failed: Optional[List[str]] = None):
+    async with sem:
+        country_n = _normalize_country(country)
+        ctx = await browser.new_context(viewport={"width": 1400, "height": 900})
+        done = 0
+        try:
+            if block_resources:
+                await ctx.route("**/*", _block_heavy)
+            page = await ctx.new_page()
+            await page.goto(url, wait_until="domcontentloaded")
+            # 오버레이/포커스 해제
+            try:
+                await page.keyboard.press("Escape")
+                await page.mouse.click(10, 10)
+            except Exception:
+                pass
+            # 첫 표가 그려질 때까지만 대기 (networkidle 대신) → 초기 로드가 선택 결과를 덮어쓰지 않게
+            try:
+                await page.wait_for_selector("table tr", timeout=settle_ms)
+            except Exception:
+                pass
+            await _select_and_wait(page, COUNTRY_SELECT, country_n, timeout_ms, settle_ms)
+            for category in categories:
+                cat_text = _netflix_category(category)
+                await _select_and_wait(page, CATEGORY_SELECT, cat_text, timeout_ms, settle_ms)
+                texts = await page.evaluate(_EXTRACT_JS)
+                await out.put((country, category, _texts_to_items(country_n, cat_text, texts)))
+                done += 1
+        except Exception as e:
+            print(f"[WARN] Netflix 수집 실패: {country} ({type(e).__name__}: {e})")
+            if failed is not None:
+                failed.append(country)
+            for category in categories[done:]:
+                await out.put((country, category, []))
+        finally:
+            await ctx.close()
+
+async def iter_top10(pairs: Iterable[Tuple[str, str]], concurrency: Optional[int] = None, headless: bool = True,
+                     block_resources: bool = True, url: str = TOP10_URL, timeout_ms: int = 15000,
+                     settle_ms: int = 5000, failed: Optional[List[str]] = None) -> AsyncIterator[Result]:
+    """(country, category) 쌍들을 동시에 수집해 끝나는 순서대로 yield. 실패한 나라는 failed에 추가 (빈 목록으로 yield)."""
+    by_country: Dict[str, List[str]] = {}
+    for country, category in pairs:
+        by_country.setdefault(country, []).append(category)
+    total = sum(len(v) for v in by_country.values())
+    if not total:
+        return
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        out: "asyncio.Queue[Result]" = asyncio.Queue()
+        sem = asyncio.Semaphore(_concurrency(concurrency))
+        tasks = [asyncio.create_task(_scrape_country(browser, c, cats, sem, out, url, block_resources,
+                                                     timeout_ms, settle_ms, failed))
+                 for c, cats in by_country.items()]
+        try:
+            for _ in range(total):
+                yield await out.get()
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await browser.close()
+
+_DONE = object()
+
+def scrape_top10(pairs: Iterable[Tuple[str, str]], **kwargs) -> Iterator[Result]:
+    """iter_top10의 동기 버전: 이벤트 루프를 별도 스레드에서 돌리고 결과를 끝나는 순서대로 yield."""
+    q: "queue.Queue[Any]" = queue.Queue()
+    pairs = list(pairs)
+
+    def run():
+        async def consume():
+            async for res in iter_top10(pairs, **kwargs):
+                q.put(res)
+        try:
+            asyncio.run(consume())
+        except BaseException as e:  # 호출 쪽에서 다시 raise
+            q.put(e)
+        finally:
+            q.put(_DONE)
+
+    th = threading.Thread(target=run, name="netflix-scraper", daemon=True)
+    th.start()
+    while True:
+        got = q.get()
+        if got is _DONE:
+            break
+        if isinstance(got, BaseException):
+            raise got
+        yield got
+    th.join()
+
+if __name__ == "__main__":
+    from itertools import product
+    ap = argparse.ArgumentParser(description="넷플릭스 TOP 10 동시 수집")
+    ap.add_argument("--countries", default="South Korea,United States,France,Turkiye,Japan")
+    ap.add_argument("--categories", default="Movies,Shows")
+    ap.add_argument("--concurrency", type=int, default=None)
+    ap.add_argument("--url", default=TOP10_URL)
+    ap.add_argument("--headed", action="store_true")
+    args = ap.parse_args()
+    pairs = list(product([c.strip() for c in args.countries.split(",") if c.strip()],
+                         [c.strip() for c in args.categories.split(",") if c.strip()]))
+    t0 = time.perf_counter()
+    failed: List[str] = []
+    for country, category, items in scrape_top10(pairs, concurrency=args.concurrency, headless=not args.headed,
+                                                 url=args.url, failed=failed):
+        print(f"[{time.perf_counter() - t0:6.2f}s] {country} / {category}: {len(items)} rows")
+    if failed:
+        raise SystemExit(f"[FAIL] 수집 실패 나라: {', '.join(failed)}")
+    print(f"[OK] {len(pairs)} pairs in {time.perf_counter() - t0:.2f}s")
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+넷플릭스 TOP 10 조회 인덱스 (netflix_top.json, faiss.index 옆에 저장)
+- build_index_from_netflix(_bulk)가 빌드 시점에 (country, category) → rank 오름차순 [rank, title, weeks_in_top] 배열로 기록
+  · 정규화/중복 제거 규칙은 기존 질의 시 스캔과 동일: title 공백 제거, (rank, title 소문자) 첫 항목만 유지
+    (목록별로 제거해 두고, 여러 목록을 합칠 때 한 번 더 제거)
+  · 사용 가능한 country/category 목록도 함께 기록 → 질의마다 docs를 훑어 계산하지 않음
+- 질의: (country, category)가 모두 주어지면 사전 조회 + top_n까지 슬라이스, 하나라도 없으면 해당 목록들을 합쳐 rank 정렬
+- 프로세스 상주: index_dir별로 1회 로드, 파일(mtime/size)이 바뀌면 다시 로드
+- 기록 당시 docs.jsonl의 크기 / mtime_ns / SHA-1을 함께 저장 → docs.bin과 같은 규칙(docstore.source_unchanged)으로 비교해
+  달라졌거나 지문이 없는 이전 파일이면 docs에서 메모리로 다시 만듦 (파일은 쓰지 않음)
+
+사용 예 (기존 인덱스 폴더에 netflix_top.json 생성):
+python -m student.day2.impl.netflix_top --index_dir indices/netflix_multi
+"""
+
+from __future__ import annotations
+import os, json, bisect, argparse, threading, time
+from typing import List, Dict, Any, Iterable, Tuple, Optional
+
+from .docstore import Fingerprint, open_docs, source_fingerprint, source_unchanged
+
+NETFLIX_TOP_FILENAME = "netflix_top.json"
+NETFLIX_TOP_VERSION = 1
+
+Row = Tuple[int, str, Any]  # (rank, title, weeks_in_top)
+
+class NetflixTopIndex:
+    def __init__(self, lists: List[Dict[str, Any]], src: Optional[Fingerprint] = None):
+        """lists: [{"country", "category", "rows": [[rank, title, weeks_in_top], ...]}] (빌드 순서 유지), src: docs.jsonl 지문."""
+        self.lists = lists
+        self.src = src
+        self.countries = sorted({l["country"] for l in lists if l["country"]})
+        self.categories = sorted({l["category"] for l in lists if l["category"]})
+        self._by_key = {(l["country"], (l["category"] or "").capitalize()): l for l in lists}
+        self._ranks = {id(l): [r[0] for r in l["rows"]] for l in lists}
+
+    def __len__(self) -> int:
+        return sum(len(l["rows"]) for l in self.lists)
+
+    @staticmethod
+    def _items(l: Dict[str, Any], rows: Iterable[Row]) -> List[Dict[str, Any]]:
+        return [{"rank": r, "title": t, "country": l["country"], "category": l["category"], "weeks_in_top": w}
+                for r, t, w in rows]
+
+    def _upto(self, l: Dict[str, Any], top_n: Optional[int]) -> List[Row]:
+        if not top_n:
+            return l["rows"]
+        return l["rows"][:bisect.bisect_right(self._ranks[id(l)], top_n)]
+
+    def top(self, country: Optional[str], category: Optional[str], top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """country/category는 정규화된 값(예: 'South Korea', 'Movies'). None이면 해당 조건 없음."""
+        if country and category:
+            l = self._by_key.get((country, category))
+            return self._items(l, self._upto(l, top_n)) if l else []
+        out: List[Dict[str, Any]] = []
+        seen = set()
+        for l in self.lists:
+            if country and l["country"] != country:
+                continue
+            if category and (l["category"] or "").capitalize() != category:
+                continue
+            for r, t, w in self._upto(l, top_n):
+                key = (r, t.lower())
+                if key not in seen:
+                    seen.add(key)
+                    out.extend(self._items(l, [(r, t, w)]))
+        out.sort(key=lambda x: x["rank"])  # 안정 정렬 → 같은 rank는 빌드 순서
+        return out
+
+    # ---------- Build / I/O ----------
+    @classmethod
+    def build(cls, docs: Iterable[Dict[str, Any]], src: Optional[Fingerprint] = None) -> "NetflixTopIndex":
+        lists: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for doc in docs:
+            meta = doc.get("meta", {}) or {}
+            title = (doc.get("text") or "").strip()
+            rank = meta.get("rank")
+            if not title or rank is None:
+                continue
+            ck = (meta.get("country"), meta.get("category"))
+            l = lists.setdefault(ck, {"country": ck[0], "category": ck[1], "rows": [], "seen": set()})
+            key = (int(rank), title.lower())
+            if key in l["seen"]:
+                continue
+            l["seen"].add(key)
+            l["rows"].append((int(rank), title, meta.get("weeks_in_top")))
+        for l in lists.values():
+            del l["seen"]
+            l["rows"].sort(key=lambda r: r[0])
+        return cls(list(lists.values()), src)
+
+    def save(self, path: str):
+        data = {
+            "version": NETFLIX_TOP_VERSION,
+            "src_size": self.src[0] if self.src else 0,
+            "src_mtime_ns": self.src[1] if self.src else 0,
+            "src_sha1": self.src[2].hex() if self.src else "",
+            "countries": self.countries,
+            "categories": self.categories,
+            "lists": [{**l, "rows": [list(r) for r in l["rows"]]} for l in self.lists],
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "NetflixTopIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != NETFLIX_TOP_VERSION:
+            raise ValueError(f"netflix_top.json 버전이 다릅니다: {path}")
+        lists = [{**l, "rows": [tuple(r) for r in l["rows"]]} for l in data.get("lists", [])]
+        src = None
+        if data.get("src_sha1"):  # 크기만 기록한 이전 파일은 지문 없음 → 낡은 것으로
+            src = (int(data["src_size"]), int(data.get("src_mtime_ns", 0)), bytes.fromhex(data["src_sha1"]))
+        return cls(lists, src)
+
+def write_top_index(docs: Iterable[Dict[str, Any]], index_dir: str) -> NetflixTopIndex:
+    """index_dir/netflix_top.json 기록 (docs.jsonl을 먼저 저장한 뒤 호출해야 지문이 맞음)."""
+    idx = NetflixTopIndex.build(docs, source_fingerprint(os.path.join(index_dir, "docs.jsonl")))
+    idx.save(os.path.join(index_dir, NETFLIX_TOP_FILENAME))
+    return idx
+
+# ---------- 프로세스 상주 레지스트리 ----------
+_REGISTRY: Dict[str, Tuple[Tuple, NetflixTopIndex]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+def _sig(index_dir: str) -> Tuple:
+    sig = []
+    for name in (NETFLIX_TOP_FILENAME, "docs.jsonl", "docs.bin"):
+        p = os.path.join(index_dir, name)
+        st = os.stat(p) if os.path.exists(p) else None
+        sig.append((st.st_mtime_ns, st.st_size) if st else None)
+    return tuple(sig)
+
+def _load(index_dir: str) -> NetflixTopIndex:
+    path = os.path.join(index_dir, NETFLIX_TOP_FILENAME)
+    docs_path = os.path.join(index_dir, "docs.jsonl")
+    if os.path.exists(path):
+        idx = NetflixTopIndex.load(path)
+        if not os.path.exists(docs_path) or (idx.src is not None and source_unchanged(docs_path, idx.src)):
+            return idx
+        print(f"[WARN] {path}가 docs.jsonl보다 낡았습니다 → docs에서 다시 만듦")
+    return NetflixTopIndex.build(open_docs(index_dir))
+
+def get_top_index(index_dir: str) -> NetflixTopIndex:
+    """index_dir의 TOP 10 조회 인덱스 (최초 1회 로드 후 상주, 파일 변경 시 재로드)."""
+    key = os.path.abspath(index_dir)
+    sig = _sig(index_dir)
+    with _REGISTRY_LOCK:
+        hit = _REGISTRY.get(key)
+        if hit and hit[0] == sig:
+            return hit[1]
+        idx = _load(index_dir)
+        _REGISTRY[key] = (sig, idx)
+        return idx
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="docs → netflix_top.json(TOP 10 조회 인덱스) 생성")
+    ap.add_argument("--index_dir", nargs="+", required=True)
+    args = ap.parse_args()
+    for d in args.index_dir:
+        idx = write_top_index(open_docs(d), d)
+        t0 = time.perf_counter()
+        for _ in range(1000):
+            get_top_index(d).top(idx.countries[0] if idx.countries else None, "Movies", 5)
+        print(f"[OK] {os.path.join(d, NETFLIX_TOP_FILENAME)} lists={len(idx.lists)} rows={len(idx)} "
+              f"countries={idx.countries} categories={idx.categories} "
+              f"lookup={(time.perf_counter() - t0) * 1000 / 1000:.3f}ms")
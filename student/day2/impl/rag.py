@@ -5,30 +5,22 @@ from typing import Dict, Any, List
 import numpy as np
 
 from student.common.schemas import Day2Plan
-from .embeddings import Embeddings
-from .store import FaissStore
+from .embeddings import Embeddings, get_embeddings
+from .store import FaissStore, get_store
 
-def _idx_paths(index_dir: str):
-    return (
-        os.path.join(index_dir, "faiss.index"),
-        os.path.join(index_dir, "docs.jsonl"),
-    )
-
-def _load_store(plan: Day2Plan, emb: Embeddings) -> FaissStore:
-    index_path, docs_path = _idx_paths(plan.index_dir)
-    if not (os.path.exists(index_path) and os.path.exists(docs_path)):
-        raise FileNotFoundError(f"FAISS 인덱스가 없습니다. 먼저 ingest를 실행하세요: {plan.index_dir}")
-    store = FaissStore.load(index_path, docs_path)
-    # 차원 체크
-    test_dim = emb.encode(["__dim_check__"]).shape[1]
-    if store.dim != test_dim:
-        raise ValueError(f"임베딩 차원이 인덱스와 다릅니다. (index={store.dim}, embedder={test_dim})")
+def _load_store(plan: Day2Plan) -> FaissStore:
+    """상주 레지스트리에서 인덱스를 가져온다 (파일이 바뀌었을 때만 재로드)."""
+    store = get_store(plan.index_dir)
+    # 모델 체크: 빌드 시 기록한 메타와 비교 (유료 임베딩 호출로 차원을 탐지하지 않음)
+    built_with = store.meta.get("embedding_model")
+    if built_with and plan.embedding_model and built_with != plan.embedding_model:
+        raise ValueError(f"임베딩 모델이 인덱스와 다릅니다. (index={built_with}, plan={plan.embedding_model})")
     return store
 
 def _gate(contexts: List[Dict[str, Any]], plan: Day2Plan) -> Dict[str, Any]:
     if not contexts:
         return {"status":"insufficient","top_score":0.0,"mean_topk":0.0}
-    top_score = float(contexts[0]["score"])
+    top_score = float(max(c["score"] for c in contexts))  # hybrid는 융합 순위라 첫 항목이 최고 코사인이 아닐 수 있음
     mean_topk = float(np.mean([c["score"] for c in contexts[:plan.top_k]]))
     if top_score >= plan.min_score and mean_topk >= plan.min_mean_topk:
         return {"status":"enough","top_score":top_score,"mean_topk":mean_topk}
@@ -52,11 +44,21 @@ class Day2Agent:
 
     def handle(self, query: str, plan: Day2Plan = None) -> Dict[str, Any]:
         plan = plan or self.plan_defaults
-        emb = Embeddings(model=plan.embedding_model)
+        emb = get_embeddings(plan.embedding_model)
 
-        store = _load_store(plan, emb)
+        store = _load_store(plan)
         qv = emb.encode([query])[0]
-        contexts = store.search(qv, top_k=plan.top_k)
+        # 차원 체크: 어차피 필요한 질의 임베딩으로 확인
+        if qv.shape[0] != store.dim:
+            raise ValueError(f"임베딩 차원이 인덱스와 다릅니다. (index={store.dim}, embedder={qv.shape[0]})")
+        if plan.retrieval == "hybrid":
+            contexts = store.search_hybrid(qv, query, top_k=plan.top_k, fusion=plan.fusion,
+                                           lexical_weight=plan.lexical_weight, rrf_k=plan.rrf_k,
+                                           nprobe=plan.nprobe, ef_search=plan.ef_search)
+        elif plan.retrieval == "dense":
+            contexts = store.search(qv, top_k=plan.top_k, nprobe=plan.nprobe, ef_search=plan.ef_search)
+        else:
+            raise ValueError(f"지원하지 않는 retrieval: {plan.retrieval} (가능: dense, hybrid)")
 
         gate = _gate(contexts, plan)
         payload: Dict[str, Any] = {
@@ -1,29 +1,210 @@
 # -*- coding: utf-8 -*-
-import os, json
-from typing import List, Dict, Any, Tuple
+import os, json, math, threading
+from typing import List, Dict, Any, Tuple, Optional
 import numpy as np
 import faiss
 
+from .docstore import DOCSTORE_FILENAME, MmapDocStore, DocSeq, write_docstore, read_docs_jsonl, docstore_is_fresh
+from .lexical import LEXICAL_FILENAME, RRF_K, LexicalIndex, build_lexical, rrf_fuse, weighted_fuse
+
+META_FILENAME = "index_meta.json"  # faiss.index 옆에 두는 메타(차원/임베딩 모델/인덱스 구성 등)
+IDS_FILENAME = "ids.npy"           # IndexIDMap 사용 시 docs 행 순서대로의 faiss id (오름차순)
+
+# ---------- 인덱스 종류 ----------
+# flat  : 전수 탐색(정확), 소규모 기본값
+# ivf   : IVF-Flat  (nlist개 클러스터 중 nprobe개만 탐색)
+# ivfpq : IVF-PQ    (벡터를 pq_m개 서브코드로 압축 → 메모리 절감, 근사 점수)
+# hnsw  : HNSW-Flat (그래프 탐색, 학습 불필요, efSearch로 정확도/속도 조절)
+INDEX_TYPES = ("flat", "ivf", "ivfpq", "hnsw")
+DEFAULT_NPROBE = 16
+DEFAULT_EF_SEARCH = 64
+
+def _default_nlist(n: int) -> int:
+    # 경험칙 4·sqrt(N), 단 클러스터당 학습 포인트 39개 이상 확보
+    return max(1, min(int(4 * math.sqrt(max(n, 1))), max(1, n // 39)))
+
+def _default_pq_m(dim: int) -> int:
+    # 서브벡터 차원 8~16 정도가 되도록, dim을 나누어떨어지게
+    for m in (64, 48, 32, 24, 16, 12, 8, 4, 2):
+        if dim % m == 0 and dim // m >= 8:
+            return m
+    return 1
+
+def make_index_spec(index_type: str = "flat", n: int = 0, dim: int = 0, nlist: Optional[int] = None,
+                    pq_m: Optional[int] = None, hnsw_m: int = 32) -> str:
+    """index_type + 규모(n, dim) → faiss.index_factory 문자열 (예: 'IVF256,PQ48x8')."""
+    t = (index_type or "flat").lower()
+    if t == "flat":
+        return "Flat"
+    if t == "hnsw":
+        return f"HNSW{int(hnsw_m)}"
+    nl = int(nlist or _default_nlist(n))
+    if t == "ivf":
+        return f"IVF{nl},Flat"
+    if t == "ivfpq":
+        m = int(pq_m or _default_pq_m(dim))
+        if dim % m:
+            raise ValueError(f"pq_m({m})은 dim({dim})의 약수여야 합니다.")
+        nbits = min(8, max(4, int(math.log2(max(n // 39, 1)))))  # 코드북(2^nbits)당 학습 포인트 39개 이상
+        return f"IVF{nl},PQ{m}x{nbits}"
+    raise ValueError(f"지원하지 않는 index_type: {index_type} (가능: {', '.join(INDEX_TYPES)})")
+
+def _new_index(dim: int, spec: str) -> faiss.Index:
+    if spec == "Flat":
+        return faiss.IndexFlatIP(dim)  # 코사인=내적 (임베딩 정규화 가정)
+    return faiss.index_factory(dim, spec, faiss.METRIC_INNER_PRODUCT)
+
+def _atomic_replace(path: str, write):
+    """path.tmp에 write(tmp)로 기록한 뒤 os.replace → 읽는 쪽이 반쯤 쓰인 파일을 보지 않음."""
+    tmp = path + ".tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+def _new_id_index(dim: int, spec: str) -> faiss.Index:
+    """명시적 id를 쓰는 인덱스. IVF는 자체 id 저장(add_with_ids/remove_ids)을 그대로 쓰고,
+    나머지는 IndexIDMap2로 감싼다 (IVF를 IDMap으로 감싸면 remove_ids 후 내부 번호가 어긋남)."""
+    index = _new_index(dim, spec)
+    if faiss.try_extract_index_ivf(index) is not None:
+        return index
+    return faiss.IndexIDMap2(index)
+
+def _base_index(index: faiss.Index) -> faiss.Index:
+    idx = faiss.downcast_index(index)
+    while isinstance(idx, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        idx = faiss.downcast_index(idx.index)
+    return idx
+
+def search_params(index: faiss.Index, nprobe: Optional[int] = None,
+                  ef_search: Optional[int] = None) -> Optional[faiss.SearchParameters]:
+    """
+    질의별 탐색 파라미터 (인덱스 객체를 건드리지 않음 → 상주 스토어를 여러 스레드가 공유해도 안전).
+    flat이거나 값이 없으면 None.
+    """
+    if nprobe and faiss.try_extract_index_ivf(index) is not None:
+        return faiss.SearchParametersIVF(nprobe=int(nprobe))
+    if ef_search and isinstance(_base_index(index), faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=int(ef_search))
+    return None
+
 class FaissStore:
-    def __init__(self, dim: int, index_path: str, docs_path: str):
+    def __init__(self, dim: int, index_path: str, docs_path: str, index_spec: str = "Flat",
+                 id_map: bool = False):
+        """
+        id_map=True → 명시적 id로 추가/삭제 (증분 빌드용, IVF는 자체 id / 그 외는 IndexIDMap2).
+        이때 search 결과 id는 docs 행 번호가 아니므로 self.ids(행별 faiss id)로 역매핑한다.
+        """
         self.dim = dim
         self.index_path = index_path
         self.docs_path = docs_path
-        self.index = faiss.IndexFlatIP(dim)  # 코사인=내적 (임베딩 정규화 가정)
-        self.docs: List[Dict[str, Any]] = []
+        self.index_spec = index_spec
+        self.index = _new_id_index(dim, index_spec) if id_map else _new_index(dim, index_spec)
+        self.ids: Optional[np.ndarray] = np.zeros(0, dtype="int64") if id_map else None
+        self.docs: DocSeq = []  # 빌드 중엔 list, load() 후엔 docs.bin mmap 뷰(지연 디코딩)
+        self.meta: Dict[str, Any] = {}  # 예: {"embedding_model": ..., "provider": ..., "nprobe": ...}
+        self._lexical: Optional[LexicalIndex] = None  # hybrid 검색 시 처음 필요할 때 로드
+        self._lock = threading.Lock()
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(os.path.dirname(self.index_path), META_FILENAME)
+
+    @property
+    def docstore_path(self) -> str:
+        return os.path.join(os.path.dirname(self.index_path), DOCSTORE_FILENAME)
+
+    @property
+    def ids_path(self) -> str:
+        return os.path.join(os.path.dirname(self.index_path), IDS_FILENAME)
+
+    @property
+    def lexical_path(self) -> str:
+        return os.path.join(os.path.dirname(self.index_path), LEXICAL_FILENAME)
+
+    @property
+    def next_id(self) -> int:
+        return int(self.ids[-1]) + 1 if self.ids is not None and len(self.ids) else 0
 
     # ---------- Build ----------
-    def add(self, embeddings: np.ndarray, items: List[Dict[str, Any]]):
+    def add(self, embeddings: np.ndarray, items: List[Dict[str, Any]]) -> np.ndarray:
+        """벡터+문서 추가. 반환: 부여된 faiss id (id_map이 아니면 행 번호)."""
         assert embeddings.shape[1] == self.dim
-        self.index.add(embeddings.astype("float32"))
+        embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+        self.train(embeddings)
+        if self.ids is not None:
+            new_ids = np.arange(self.next_id, self.next_id + len(embeddings), dtype="int64")
+            self.index.add_with_ids(embeddings, new_ids)
+            self.ids = np.concatenate([self.ids, new_ids])
+        else:
+            new_ids = np.arange(self.index.ntotal, self.index.ntotal + len(embeddings), dtype="int64")
+            self.index.add(embeddings)
+        if not isinstance(self.docs, list):
+            self.docs = list(self.docs)  # mmap 뷰는 읽기 전용 → 추가 시 list로 풀어서
         self.docs.extend(items)
+        self._lexical = None
+        return new_ids
+
+    def train(self, embeddings: np.ndarray):
+        """IVF/PQ: 아직 학습 전이면 주어진 벡터로 클러스터/코드북 학습 (여러 번 add할 땐 먼저 전체로 호출)."""
+        if self.index.is_trained:
+            return
+        embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+        print(f"[FaissStore] train {self.index_spec} on {len(embeddings)} vectors")
+        self.index.train(embeddings)
+
+    def remove_ids(self, ids) -> int:
+        """faiss id 목록 삭제 (id_map 전용). 반환: 삭제된 개수."""
+        if self.ids is None:
+            raise RuntimeError("remove_ids는 id_map=True로 만든 인덱스에서만 가능합니다.")
+        ids = np.asarray(list(ids), dtype="int64")
+        keep = ~np.isin(self.ids, ids)
+        if keep.all():
+            return 0
+        try:
+            self.index.remove_ids(ids)
+        except RuntimeError:
+            # HNSW 등 삭제 미지원 → 남은 벡터를 꺼내 같은 구성으로 다시 적재
+            kept_ids = self.ids[keep]
+            vecs = self.index.reconstruct_batch(kept_ids) if len(kept_ids) else np.zeros((0, self.dim), "float32")
+            index = _new_id_index(self.dim, self.index_spec)
+            if not index.is_trained and len(vecs):
+                index.train(vecs)
+            if len(vecs):
+                index.add_with_ids(vecs, kept_ids)
+            self.index = index
+        if not isinstance(self.docs, list):
+            self.docs = list(self.docs)
+        self.docs = [d for d, k in zip(self.docs, keep) if k]
+        self._lexical = None
+        removed = int((~keep).sum())
+        self.ids = self.ids[keep]
+        return removed
 
     def save(self):
+        """모든 파일을 tmp에 쓰고 os.replace (파일 단위 원자적 교체)."""
         os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
-        faiss.write_index(self.index, self.index_path)
-        with open(self.docs_path, "w", encoding="utf-8") as f:
-            for it in self.docs:
-                f.write(json.dumps(it, ensure_ascii=False) + "\n")
+        _atomic_replace(self.index_path, lambda tmp: faiss.write_index(self.index, tmp))
+        if self.ids is not None:
+            def _write_ids(tmp):
+                with open(tmp, "wb") as f:
+                    np.save(f, self.ids)
+            _atomic_replace(self.ids_path, _write_ids)
+        elif os.path.exists(self.ids_path):
+            os.remove(self.ids_path)
+
+        def _write_jsonl(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                for it in self.docs:
+                    f.write(json.dumps(it, ensure_ascii=False) + "\n")
+        _atomic_replace(self.docs_path, _write_jsonl)
+        write_docstore(self.docs, self.docstore_path, src_path=self.docs_path)
+        self._lexical = build_lexical(self.docs, self.lexical_path)
+
+        meta = {**self.meta, "dim": self.dim, "count": int(self.index.ntotal), "index_spec": self.index_spec,
+                "id_map": self.ids is not None}
+        def _write_meta(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+        _atomic_replace(self.meta_path, _write_meta)
 
     # ---------- Load ----------
     @classmethod
@@ -32,26 +213,165 @@ class FaissStore:
         dim = index.d
         store = cls(dim, index_path, docs_path)
         store.index = index
-        store.docs = []
-        with open(docs_path, "r", encoding="utf-8") as f:
-            for line in f:
-                store.docs.append(json.loads(line))
+        index_dir = os.path.dirname(index_path)
+        docs: DocSeq | None = None
+        if docstore_is_fresh(index_dir):
+            docs = MmapDocStore(store.docstore_path)
+            if len(docs) != index.ntotal:
+                print(f"[WARN] docs.bin 행 수({len(docs)}) ≠ 인덱스({index.ntotal}) → docs.jsonl 사용")
+                docs.close()
+                docs = None
+        store.docs = docs if docs is not None else read_docs_jsonl(docs_path)
+        if os.path.exists(store.meta_path):
+            with open(store.meta_path, "r", encoding="utf-8") as f:
+                store.meta = json.load(f)
+        store.index_spec = store.meta.get("index_spec", "Flat")
+        if os.path.exists(store.ids_path):
+            store.ids = np.load(store.ids_path)
         return store
 
+    def close(self):
+        """docs.bin mmap/파일 핸들 해제 (list면 할 일 없음)."""
+        if isinstance(self.docs, MmapDocStore):
+            self.docs.close()
+            self.docs = []
+
     # ---------- Search ----------
-    def search(self, query_vec: np.ndarray, top_k: int = 5) -> List[Dict[str, Any]]:
+    def _dense(self, query_vec: np.ndarray, top_k: int, nprobe: Optional[int] = None,
+               ef_search: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(docs 행 번호, 내적 점수) 목록."""
         if query_vec.ndim == 1:
             query_vec = query_vec[None, :]
-        D, I = self.index.search(query_vec.astype("float32"), top_k)
+        params = search_params(self.index,
+                               nprobe or self.meta.get("nprobe") or DEFAULT_NPROBE,
+                               ef_search or self.meta.get("ef_search") or DEFAULT_EF_SEARCH)
+        D, I = self.index.search(query_vec.astype("float32"), top_k, params=params)
         out = []
-        for rank, (score, idx) in enumerate(zip(D[0], I[0])):
+        for score, idx in zip(D[0], I[0]):
             if idx == -1:
                 continue
-            doc = self.docs[idx]
-            out.append({
-                "doc_id": doc["id"],
-                "chunk": doc["text"],
-                "score": float(score),  # 내적값(정규화 가정 → 코사인)
-                "meta": doc.get("meta", {})
-            })
+            row = int(np.searchsorted(self.ids, idx)) if self.ids is not None else int(idx)
+            out.append((row, float(score)))
         return out
+
+    def _item(self, row: int, score: float, **extra) -> Dict[str, Any]:
+        doc = self.docs[row]
+        return {
+            "doc_id": doc["id"],
+            "chunk": doc["text"],
+            "score": float(score),  # 내적값(정규화 가정 → 코사인)
+            "meta": doc.get("meta", {}),
+            **extra,
+        }
+
+    def search(self, query_vec: np.ndarray, top_k: int = 5, nprobe: Optional[int] = None,
+               ef_search: Optional[int] = None) -> List[Dict[str, Any]]:
+        """nprobe/ef_search가 None이면 빌드 시 기록한 기본값(meta) 사용."""
+        return [self._item(row, score) for row, score in self._dense(query_vec, top_k, nprobe, ef_search)]
+
+    def lexical(self) -> LexicalIndex:
+        """BM25 색인: lexical.npz가 docs와 행 수가 맞으면 로드, 없거나 낡았으면 메모리에서 빌드 (파일은 쓰지 않음)."""
+        with self._lock:
+            if self._lexical is None:
+                lex = None
+                if os.path.exists(self.lexical_path):
+                    lex = LexicalIndex.load(self.lexical_path)
+                    if len(lex) != len(self.docs):
+                        print(f"[WARN] lexical.npz 행 수({len(lex)}) ≠ docs({len(self.docs)}) → 메모리에서 재생성")
+                        lex = None
+                self._lexical = lex or LexicalIndex.build(d["text"] for d in self.docs)
+            return self._lexical
+
+    def search_lexical(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """BM25만으로 검색 (score = BM25 점수)."""
+        return [self._item(row, score) for row, score in self.lexical().search(query, top_k)]
+
+    def _cosine(self, query_vec: np.ndarray, row: int) -> float:
+        """dense 후보 밖의 행 점수: 저장된 벡터를 복원해 내적 (복원 불가면 0.0)."""
+        fid = int(self.ids[row]) if self.ids is not None else row
+        try:
+            return float(np.dot(self.index.reconstruct(fid), query_vec.ravel()))
+        except RuntimeError:
+            ivf = faiss.try_extract_index_ivf(self.index)
+            if ivf is None:
+                return 0.0
+        with self._lock:
+            if ivf.direct_map.type == faiss.DirectMap.NoMap:
+                ivf.set_direct_map_type(faiss.DirectMap.Hashtable)  # IVF 복원용 id→위치 맵 (최초 1회)
+        try:
+            return float(np.dot(self.index.reconstruct(fid), query_vec.ravel()))
+        except RuntimeError:
+            return 0.0
+
+    def search_hybrid(self, query_vec: np.ndarray, query: str, top_k: int = 5, fusion: str = "rrf",
+                      lexical_weight: float = 0.5, rrf_k: int = RRF_K, candidates: Optional[int] = None,
+                      nprobe: Optional[int] = None, ef_search: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        dense top-N과 BM25 top-N(N=candidates, 기본 max(4·top_k, 20))을 융합해 top_k 반환.
+        score는 게이팅 호환을 위해 항상 코사인(내적), 융합 점수는 fused_score / BM25 점수는 lexical_score.
+        """
+        pool = candidates or max(4 * top_k, 20)
+        dense = self._dense(query_vec, pool, nprobe, ef_search)
+        lex = self.lexical().search(query, pool)
+        if fusion == "rrf":
+            w = min(max(lexical_weight, 0.0), 1.0)
+            fused = rrf_fuse([[r for r, _ in dense], [r for r, _ in lex]], k=rrf_k, weights=[2 * (1 - w), 2 * w])
+        elif fusion == "weighted":
+            fused = weighted_fuse(dense, lex, lexical_weight)
+        else:
+            raise ValueError(f"지원하지 않는 fusion: {fusion} (가능: rrf, weighted)")
+        dense_s, lex_s = dict(dense), dict(lex)
+        out = []
+        for row, fs in fused[:top_k]:
+            score = dense_s[row] if row in dense_s else self._cosine(query_vec, row)
+            out.append(self._item(row, score, fused_score=float(fs), lexical_score=float(lex_s.get(row, 0.0))))
+        return out
+
+
+# ---------- 프로세스 상주 레지스트리 ----------
+# index_dir별로 로드된 FaissStore를 보관하고, 파일(mtime/size)이 바뀌면 다시 로드
+_REGISTRY: Dict[str, Tuple[Tuple, FaissStore]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+def _file_sig(*paths: str) -> Tuple:
+    sig = []
+    index_dir = os.path.dirname(paths[0])
+    extra = (META_FILENAME, DOCSTORE_FILENAME, IDS_FILENAME, LEXICAL_FILENAME)
+    for p in (*paths, *(os.path.join(index_dir, name) for name in extra)):
+        if os.path.exists(p):
+            st = os.stat(p)
+            sig.append((st.st_mtime_ns, st.st_size))
+        else:
+            sig.append(None)
+    return tuple(sig)
+
+def get_store(index_dir: str) -> FaissStore:
+    """index_dir의 FaissStore를 반환 (최초 1회 로드 후 상주, 파일 변경 시 재로드)."""
+    index_path = os.path.join(index_dir, "faiss.index")
+    docs_path = os.path.join(index_dir, "docs.jsonl")
+    has_docs = os.path.exists(docs_path) or os.path.exists(os.path.join(index_dir, DOCSTORE_FILENAME))
+    if not (os.path.exists(index_path) and has_docs):
+        raise FileNotFoundError(f"FAISS 인덱스가 없습니다. 먼저 ingest를 실행하세요: {index_dir}")
+    key = os.path.abspath(index_dir)
+    sig = _file_sig(index_path, docs_path)
+    with _REGISTRY_LOCK:
+        hit = _REGISTRY.get(key)
+        if hit and hit[0] == sig:
+            return hit[1]
+        store = FaissStore.load(index_path, docs_path)
+        _REGISTRY[key] = (sig, store)
+        if hit:
+            hit[1].close()  # 이전 버전의 docs.bin mmap/fd를 GC까지 남기지 않음
+        return store
+
+def clear_store_cache(index_dir: Optional[str] = None):
+    """레지스트리 비우기 (index_dir 지정 시 해당 항목만)."""
+    with _REGISTRY_LOCK:
+        if index_dir is None:
+            dropped = list(_REGISTRY.values())
+            _REGISTRY.clear()
+        else:
+            hit = _REGISTRY.pop(os.path.abspath(index_dir), None)
+            dropped = [hit] if hit else []
+        for _, store in dropped:
+            store.close()
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+스트리밍 인덱싱 파이프라인 (PDF 병렬 추출 → 청크 → 임베딩)
+- 1단계 추출: 프로세스 풀이 (파일, 페이지 구간) 단위로 PDF 텍스트 추출. 동시에 떠 있는 구간 수는 max_inflight로 제한
+- 2단계 청크: 정제된 페이지 텍스트를 순서대로 받아 바로 청크 생성 (파일 전체 텍스트를 메모리에 만들지 않음)
+  토큰 기준·페이지 보존 span 청크(chunker) → 청크가 페이지를 넘지 않으므로 페이지 단위로 바로 확정
+- 3단계 임베딩: 청크를 batch_size씩 묶어 bounded queue로 넘김 → 추출/청크(생산 스레드)와 API 호출이 겹쳐 진행
+- 최대 메모리 ≈ 진행 중 페이지 구간 + queue_size × batch_size 청크 → 코퍼스 크기와 무관
+- 단계별 처리량(pages/s, chunks/s, embeddings/s)은 PipelineStats로 집계
+- 이 모듈은 playwright 등 무거운 의존성을 import하지 않음 (워커 프로세스가 가볍게 뜨도록)
+
+사용 예 (추출+청크만, 직렬 load_document + chunk_document와 비교):
+python -m student.day2.impl.stream_ingest --paths data/raw --workers 4 --compare
+"""
+
+from __future__ import annotations
+import os, re, time, queue, argparse, threading
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import List, Dict, Any, Iterator, Iterable, Tuple, Optional
+
+import numpy as np
+
+from .chunker import (PagedText, chunk_spans, span_items, get_token_counter,
+                      DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS)
+
+DEFAULT_PAGES_PER_TASK = 8
+
+# ---------- 1단계: 추출 (워커 프로세스에서 실행되므로 모듈 최상위 함수) ----------
+def _clean(s: str) -> str:
+    # ingest.clean_text와 같은 규칙 (ingest는 playwright를 import하므로 워커에서 쓰지 않음)
+    s = s or ""
+    s = re.sub(r"\r", "\n", s)
+    s = re.sub(r"[ \t]+", " ", s)
+    s = re.sub(r"\n{3,}", "\n\n", s)
+    return s.strip()
+
+@lru_cache(maxsize=1)
+def _reader(path: str):
+    # 같은 프로세스가 같은 파일의 다음 구간을 받으면 xref 파싱을 다시 하지 않도록 직전 1개만 보관
+    from pypdf import PdfReader
+    return PdfReader(path)
+
+def _ext(path: str) -> str:
+    # ingest.load_document와 같은 확장자 판정 (txt/md/pdf만 지원)
+    return path.lower().split(".")[-1]
+
+def _extract(path: str, start: int, end: int) -> List[str]:
+    """path의 [start, end) 페이지를 정제된 텍스트 목록으로. txt/md는 파일 전체가 1페이지."""
+    ext = _ext(path)
+    if ext == "pdf":
+        reader = _reader(path)
+        return [_clean(reader.pages[i].extract_text() or "") for i in range(start, end)]
+    if ext in ("txt", "md"):
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return [_clean(f.read())]
+    raise ValueError(f"지원하지 않는 확장자: {path}")
+
+def _page_count(path: str) -> Optional[int]:
+    """페이지 수 (지원하지 않는 확장자면 None → 건너뜀)."""
+    ext = _ext(path)
+    if ext == "pdf":
+        return len(_reader(path).pages)
+    if ext in ("txt", "md"):
+        return 1
+    return None
+
+class PipelineStats:
+    """단계별 개수/시간. *_s는 파이프라인 시작부터 해당 단계가 끝날 때까지(추출/청크) 또는 누적 호출 시간(임베딩)."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.files = 0
+        self.pages = 0
+        self.chunks = 0
+        self.embeddings = 0
+        self.extract_s = 0.0
+        self.chunk_s = 0.0
+        self.embed_s = 0.0
+        self.total_s = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        rate = lambda n, s: round(n / s, 1) if s > 0 else 0.0
+        return {
+            "files": self.files, "pages": self.pages, "chunks": self.chunks, "embeddings": self.embeddings,
+            "pages_per_s": rate(self.pages, self.extract_s),
+            "chunks_per_s": rate(self.chunks, self.chunk_s),
+            "embeddings_per_s": rate(self.embeddings, self.embed_s),
+            "total_s": round(self.total_s, 3),
+        }
+
+    def report(self) -> str:
+        d = self.as_dict()
+        return (f"[Pipeline] files={d['files']} pages={d['pages']} chunks={d['chunks']} embeddings={d['embeddings']} | "
+                f"{d['pages_per_s']} pages/s, {d['chunks_per_s']} chunks/s, {d['embeddings_per_s']} embeddings/s "
+                f"| total {d['total_s']}s")
+
+def iter_pages(files: Iterable[str], workers: Optional[int] = None, pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+               max_inflight: Optional[int] = None, stats: Optional[PipelineStats] = None) -> Iterator[Tuple[str, int, str]]:
+    """
+    (path, page_no(1부터), 정제 텍스트)를 파일·페이지 순서대로 yield.
+    workers<=1이면 풀 없이 현재 프로세스에서 추출.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else int(workers)
+    max_inflight = max_inflight or max(2, workers * 2)
+
+    def tasks() -> Iterator[Tuple[str, int, int]]:
+        for fp in files:
+            n = _page_count(fp)
+            if n is None:
+                print(f"[WARN] 지원하지 않는 확장자라 건너뜀: {fp}")
+                continue
+            if stats:
+                stats.files += 1
+            for s in range(0, n, pages_per_task):
+                yield fp, s, min(n, s + pages_per_task)
+
+    def emit(task: Tuple[str, int, int], pages: List[str]):
+        fp, s, _ = task
+        for i, text in enumerate(pages):
+            if stats:
+                stats.pages += 1
+            yield fp, s + i + 1, text
+
+    if workers <= 1:
+        for task in tasks():
+            yield from emit(task, _extract(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            inflight: deque[Tuple[Tuple[str, int, int], Future]] = deque()
+            for task in tasks():
+                inflight.append((task, ex.submit(_extract, *task)))
+                if len(inflight) >= max_inflight:
+                    t, fut = inflight.popleft()
+                    yield from emit(t, fut.result())
+            while inflight:
+                t, fut = inflight.popleft()
+                yield from emit(t, fut.result())
+    if stats:
+        stats.extract_s = time.perf_counter() - stats.t0
+
+# ---------- 2단계: 스트리밍 청크 ----------
+def stream_corpus(paths_or_dir: List[str], max_tokens: int = DEFAULT_MAX_TOKENS,
+                  overlap_tokens: int = DEFAULT_OVERLAP_TOKENS, workers: Optional[int] = None,
+                  stats: Optional[PipelineStats] = None, model: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    chunk_document와 같은 아이템({"id","text","meta":{"path","chunk","page","tokens"}})을 파일 전체 로드 없이 yield.
+    span 청크는 페이지를 넘지 않으므로 페이지가 도착하는 즉시 잘라 내보낼 수 있다.
+    """
+    from .ingest import list_source_files  # 메인 프로세스에서만 필요
+    counter = get_token_counter(model)
+    cur_path: Optional[str] = None
+    n_chunk = 0
+    for path, page, text in iter_pages(list_source_files(paths_or_dir), workers=workers, stats=stats):
+        if path != cur_path:
+            cur_path, n_chunk = path, 0
+        doc = PagedText([text], first_page=page)
+        spans = chunk_spans(doc, max_tokens, overlap_tokens, counter=counter)
+        for it in span_items(path, doc, spans, first_chunk=n_chunk):
+            if stats:
+                stats.chunks += 1
+            yield it
+        n_chunk += len(spans)
+    if stats:
+        stats.chunk_s = time.perf_counter() - stats.t0
+
+# ---------- 3단계: 임베딩 ----------
+_DONE = object()
+
+def stream_embedded_batches(paths_or_dir: List[str], emb, batch_size: int = 128, queue_size: int = 4,
+                            workers: Optional[int] = None, stats: Optional[PipelineStats] = None,
+                            max_tokens: int = DEFAULT_MAX_TOKENS,
+                            overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> Iterator[Tuple[List[Dict[str, Any]], np.ndarray]]:
+    """
+    (아이템 batch, 임베딩 행렬)을 순서대로 yield.
+    생산 스레드가 추출+청크를 돌려 batch를 queue에 넣고(최대 queue_size개 대기), 호출 쪽은 임베딩만 수행.
+    """
+    stats = stats or PipelineStats()
+    q: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+
+    def produce():
+        try:
+            batch: List[Dict[str, Any]] = []
+            for it in stream_corpus(paths_or_dir, max_tokens, overlap_tokens, workers=workers, stats=stats,
+                                    model=getattr(emb, "model", None)):
+                batch.append(it)
+                if len(batch) >= batch_size:
+                    q.put(batch)
+                    batch = []
+                if stop.is_set():
+                    return
+            if batch:
+                q.put(batch)
+        except BaseException as e:  # 소비 쪽에서 다시 raise
+            q.put(e)
+        finally:
+            q.put(_DONE)
+
+    th = threading.Thread(target=produce, name="day2-ingest-producer", daemon=True)
+    th.start()
+    try:
+        while True:
+            got = q.get()
+            if got is _DONE:
+                break
+            if isinstance(got, BaseException):
+                raise got
+            t0 = time.perf_counter()
+            vecs = emb.encode([it["text"] for it in got])
+            stats.embed_s += time.perf_counter() - t0
+            stats.embeddings += len(got)
+            yield got, vecs
+    finally:
+        stop.set()
+        while th.is_alive():  # 생산 스레드가 put에서 막히지 않도록 비움
+            try:
+                q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        stats.total_s = time.perf_counter() - stats.t0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="스트리밍 추출+청크 처리량 측정 (임베딩 제외)")
+    ap.add_argument("--paths", nargs="+", required=True)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--compare", action="store_true", help="직렬 load_document + chunk_document와 시간/청크 비교")
+    args = ap.parse_args()
+
+    st = PipelineStats()
+    streamed = [it["text"] for it in stream_corpus(args.paths, workers=args.workers, stats=st)]
+    st.total_s = time.perf_counter() - st.t0
+    print(st.report())
+
+    if args.compare:
+        from .ingest import list_source_files, load_document, chunk_document
+        t0 = time.perf_counter()
+        serial: List[str] = []
+        for fp in list_source_files(args.paths):
+            d = load_document(fp)
+            if d:
+                serial.extend(it["text"] for it in chunk_document(d))
+        serial_s = time.perf_counter() - t0
+        print(f"[Serial]   chunks={len(serial)} total {serial_s:.3f}s  (x{serial_s / max(st.total_s, 1e-9):.2f} vs stream)"
+              f"  same_chunks={serial == streamed}")
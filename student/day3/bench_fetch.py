@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Day3 수집 단계 지연 비교 (로컬 가짜 Tavily + PPS 서버)
+- 로컬 HTTP 서버 하나가 Tavily /search와 PPS 목록 API를 흉내 냄
+    · /search: include_domains(nipa.kr / bizinfo.go.kr / 없음=웹)에 따라 --nipa_ms / --bizinfo_ms / --web_ms 지연
+    · PPS 목록: 페이지마다 --pps_ms 지연 (1페이지만 결과, 2페이지는 빈 목록 → 기존 페이지네이션 그대로 종료)
+- 비교 (Tavily 캐시는 꺼서 콜드 상태로):
+    · serial : fetch_nipa → fetch_bizinfo → fetch_web → pps_fetch_bids 직렬 (기존 find_notices)
+    · concurrent: afind_notices (네 소스 동시, 소스별 마감 시간)
+- 마지막으로 PPS 마감 시간을 PPS 지연보다 짧게 잡아 부분 결과(payload["errors"], sources) 확인
+
+사용 예:
+python -m student.day3.bench_fetch
+python -m student.day3.bench_fetch --pps_ms 1500 --web_ms 900 --rounds 5
+"""
+
+from __future__ import annotations
+import os, sys, json, time, argparse, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlsplit, parse_qs
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ["TAVILY_CACHE"] = "0"   # 콜드 비교 (임포트 전에)
+os.environ.setdefault("PPS_SERVICE_KEY", "bench-key")
+os.environ.setdefault("TAVILY_API_KEY", "bench-key")
+
+from student.day1.impl import tavily_client
+from student.day3.impl import fetchers, pps_api, pipeline
+from student.day3.impl.normalize import normalize_all
+from student.day3.impl.rank import rank_items
+
+class _Fixture:
+    delays: Dict[str, float] = {"nipa": 0.4, "bizinfo": 0.5, "web": 0.6, "pps": 0.8}
+
+def _search_results(kind: str, n: int) -> List[Dict[str, Any]]:
+    host = {"nipa": "www.nipa.kr", "bizinfo": "www.bizinfo.go.kr", "web": "example.com"}[kind]
+    return [{"url": f"https://{host}/notice/{i}", "title": f"{kind} 영상 공고 {i}", "content": "영상 콘텐츠 지원 사업 모집",
+             "score": 0.9 - i * 0.1} for i in range(n)]
+
+def _pps_items() -> List[Dict[str, Any]]:
+    return [{"bidNtceNm": f"영상 콘텐츠 제작 용역 {i}", "dminsttNm": "한국콘텐츠진흥원", "bidNtceDt": "2026-10-10 10:00:00",
+             "bidClseDt": "2026-10-30 18:00:00", "presmptPrce": "150000000", "bidNtceNo": f"R26BK{i:07d}", "bidNtceOrd": "000"}
+            for i in range(3)]
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, out: Dict[str, Any]):
+        data = json.dumps(out, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.wfile.flush()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        domains = body.get("include_domains") or []
+        kind = "nipa" if "nipa.kr" in domains else "bizinfo" if "bizinfo.go.kr" in domains else "web"
+        time.sleep(_Fixture.delays[kind])
+        self._send({"results": _search_results(kind, int(body.get("max_results") or 2))})
+
+    def do_GET(self):
+        time.sleep(_Fixture.delays["pps"])
+        page = int(parse_qs(urlsplit(self.path).query).get("pageNo", ["1"])[0])
+        items = _pps_items() if page == 1 else []
+        self._send({"response": {"header": {"resultCode": "00"}, "body": {"items": items}}})
+
+def _serial(query: str) -> Dict[str, Any]:
+    """기존 find_notices: 세 Tavily 소스 직렬 → PPS 직렬."""
+    raw = fetchers.fetch_nipa(query) + fetchers.fetch_bizinfo(query) + fetchers.fetch_web(query)
+    raw += pipeline._pps_as_raw(query)
+    norm = pipeline._merge_and_dedup(normalize_all(raw))
+    return {"items": rank_items(norm, query)}
+
+def main(argv: List[str] | None = None):
+    ap = argparse.ArgumentParser(description="Day3 수집 단계 지연 비교 (가짜 Tavily + PPS)")
+    for name, ms in (("nipa", 400), ("bizinfo", 500), ("web", 600), ("pps", 800)):
+        ap.add_argument(f"--{name}_ms", type=float, default=ms)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args(argv)
+    _Fixture.delays = {k: getattr(args, f"{k}_ms") / 1000 for k in _Fixture.delays}
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    tavily_client.TAVILY_BASE = base
+    pps_api.PPS_BASE = base + "/pps"
+    query = "영상 콘텐츠"
+    print("[BENCH] " + " ".join(f"{k}={v * 1000:g}ms" for k, v in _Fixture.delays.items()) + f" rounds={args.rounds}")
+    try:
+        timings: Dict[str, float] = {}
+        outs: Dict[str, List[str]] = {}
+        for name, fn in (("serial", lambda: _serial(query)), ("concurrent", lambda: pipeline.find_notices(query))):
+            t0 = time.perf_counter()
+            for _ in range(args.rounds):
+                res = fn()
+            timings[name] = (time.perf_counter() - t0) / args.rounds
+            outs[name] = [str(it["url"]) for it in res["items"]]
+        same = sorted(outs["serial"]) == sorted(outs["concurrent"])
+        print(f"  serial     : {timings['serial'] * 1000:6.0f}ms  (items {len(outs['serial'])})")
+        print(f"  concurrent : {timings['concurrent'] * 1000:6.0f}ms  (items {len(outs['concurrent'])}, same={same}, "
+              f"x{timings['serial'] / max(timings['concurrent'], 1e-9):.1f})")
+
+        # PPS 마감 시간을 지연보다 짧게 → 나머지 소스만으로 결과 + 초과 기록
+        os.environ["DAY3_TIMEOUT_PPS"] = str(_Fixture.delays["pps"] / 2)
+        t0 = time.perf_counter()
+        res = pipeline.find_notices(query)
+        print(f"  pps deadline {_Fixture.delays['pps'] / 2 * 1000:g}ms: {(time.perf_counter() - t0) * 1000:.0f}ms, "
+              f"items {len(res['items'])}, errors={res['errors']}")
+        print("    sources: " + ", ".join(f"{k}={v['status']}({v['count']}, {v['elapsed_ms']:.0f}ms)" for k, v in res["sources"].items()))
+    finally:
+        os.environ.pop("DAY3_TIMEOUT_PPS", None)
+        srv.shutdown()
+
+if __name__ == "__main__":
+    main()
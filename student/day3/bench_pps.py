@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+PPS 입찰공고 수집 벤치마크 (로컬 가짜 PPS 목록 API)
+- 로컬 HTTP 서버가 BidPublicInfoService 목록 오퍼레이션 2개를 흉내 냄 (요청마다 --rtt_ms 지연)
+    · 합성 공고 --bids건 (공고명/발주기관은 고정 어휘에서 뽑음), pageNo/numOfRows로 자르고 totalCount를 돌려줌
+    · 검색형(getBidPblancListInfoServcPPSSrch)만 bidNtceNm/dminsttNm(공고명/수요기관명 부분 일치) 서버 필터 지원
+    · --srch_broken: 검색형이 오류 코드를 돌려주는 데이터셋 (일반형으로 넘어가야 함)
+- 비교 (같은 키워드 묶음):
+    · legacy  : 기존 pps_fetch_bids (오퍼레이션마다 1..page_max 페이지 직렬, 매번 오퍼레이션 탐색) — _legacy_fetch에 보관
+    · parallel: 새 pps_fetch_bids, PPS_SERVER_FILTER=0 (totalCount 기준 페이지 동시 수집 + 오퍼레이션 기억)
+    · server  : 새 pps_fetch_bids, 서버측 공고명/기관명 필터 (키워드 단어마다 질의 2개)
+- 출력: 키워드당 평균 시간, 요청 수, 찾은 공고 수, legacy와 같은지(parallel) / 첫 항목까지 걸린 시간(aiter_bids)
+  (legacy/parallel은 앞쪽 page_max×rows행 안에서만 찾음, server는 일치 공고만 받으므로 같은 상한에서 더 많이 찾음)
+
+사용 예:
+python -m student.day3.bench_pps
+python -m student.day3.bench_pps --bids 3000 --rtt_ms 250 --srch_broken
+"""
+
+from __future__ import annotations
+import os, sys, json, time, random, argparse, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, parse_qs
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("PPS_SERVICE_KEY", "bench-key")
+
+from student.common.http_client import run_sync
+from student.day3.impl import pps_api
+
+WORDS = ["영상", "콘텐츠", "VFX", "AI", "교육", "시스템", "유지보수", "구축", "홍보", "제작", "용역", "물품", "공사", "플랫폼"]
+AGENCIES = ["한국콘텐츠진흥원", "정보통신산업진흥원", "조달청", "서울특별시", "한국전력공사", "영화진흥위원회"]
+KEYWORDS = ["VFX 용역", "영상 제작", "AI 교육", "플랫폼 구축", "홍보", "콘텐츠"]   # 콘텐츠: 공고명+기관명 일치
+SRCH_OP = "getBidPblancListInfoServcPPSSrch"
+
+class _Fixture:
+    rtt = 0.15
+    srch_broken = False
+    bids: List[Dict[str, Any]] = []
+    requests = 0
+    lock = threading.Lock()
+
+def _synthetic(n: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [{"bidNtceNo": f"R26BK{i:08d}", "bidNtceOrd": "000",
+             "bidNtceNm": " ".join(rng.sample(WORDS, 3)), "dminsttNm": rng.choice(AGENCIES),
+             "bidNtceDt": "2026-10-10 10:00:00", "bidClseDt": "2026-10-30 18:00:00",
+             "presmptPrce": str(rng.randrange(10, 500) * 1_000_000)} for i in range(n)]
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with _Fixture.lock:
+            _Fixture.requests += 1
+        time.sleep(_Fixture.rtt)
+        url = urlsplit(self.path)
+        op = url.path.rstrip("/").rsplit("/", 1)[-1]
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if op == SRCH_OP and _Fixture.srch_broken:
+            out: Dict[str, Any] = {"response": {"header": {"resultCode": "12", "resultMsg": "NO_OPENAPI_SERVICE_ERROR"}}}
+        else:
+            rows = _Fixture.bids
+            if op == SRCH_OP:
+                for field in ("bidNtceNm", "dminsttNm"):
+                    if q.get(field):
+                        rows = [b for b in rows if q[field] in b[field]]
+            page, n = int(q.get("pageNo", 1)), int(q.get("numOfRows", 10))
+            out = {"response": {"header": {"resultCode": "00"},
+                                "body": {"items": rows[(page - 1) * n: page * n], "totalCount": len(rows)}}}
+        data = json.dumps(out, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # 스트림을 일찍 끊으면(첫 항목만 받고 종료) 남은 요청이 취소됨
+
+def _legacy_fetch(keyword: Optional[str] = None, page_max: int = 3, rows: int = 50) -> List[Dict[str, Any]]:
+    """기존 pps_fetch_bids (오퍼레이션마다 페이지 직렬, 클라이언트 필터)."""
+    params0 = pps_api._req_params(keyword=keyword, page=1, rows=rows)
+    all_items: List[Dict[str, Any]] = []
+    last_error = None
+    for op in pps_api.OPS_CANDIDATES:
+        try:
+            for page in range(1, page_max + 1):
+                items = pps_api._extract_items(pps_api._call_op(op, dict(params0, pageNo=str(page))))
+                if not items:
+                    break
+                all_items.extend(items)
+            if all_items:
+                break
+        except Exception as e:
+            last_error = e
+            continue
+    if not all_items and last_error:
+        raise last_error
+    if keyword and keyword.strip():
+        all_items = [it for it in all_items if pps_api._keyword_match(it, keyword)]
+    return all_items
+
+async def _first_item_ms(keyword: str, page_max: int, rows: int) -> float:
+    t0 = time.perf_counter()
+    async for _ in pps_api.aiter_bids(keyword, page_max, rows):
+        return (time.perf_counter() - t0) * 1000
+    return float("nan")
+
+def _run(fn, page_max: int, rows: int):
+    with _Fixture.lock:
+        _Fixture.requests = 0
+    t0 = time.perf_counter()
+    found = {k: fn(k, page_max, rows) for k in KEYWORDS}
+    return (time.perf_counter() - t0) / len(KEYWORDS), _Fixture.requests / len(KEYWORDS), found
+
+def main(argv: List[str] | None = None):
+    ap = argparse.ArgumentParser(description="PPS 입찰공고 수집 벤치마크 (가짜 목록 API)")
+    ap.add_argument("--bids", type=int, default=1200)
+    ap.add_argument("--rtt_ms", type=float, default=150)
+    ap.add_argument("--page_max", type=int, default=6)
+    ap.add_argument("--rows", type=int, default=50)
+    ap.add_argument("--srch_broken", action="store_true")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    _Fixture.rtt, _Fixture.srch_broken = args.rtt_ms / 1000, args.srch_broken
+    _Fixture.bids = _synthetic(args.bids, args.seed)
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    pps_api.PPS_BASE = f"http://127.0.0.1:{srv.server_address[1]}/pps"
+    print(f"[BENCH] bids={args.bids} rtt={args.rtt_ms:g}ms page_max={args.page_max} rows={args.rows} "
+          f"srch_broken={args.srch_broken} concurrency={pps_api.PPS_CONCURRENCY}")
+    try:
+        truth = sum(sum(pps_api._keyword_match(b, k) for b in _Fixture.bids) for k in KEYWORDS)
+        print(f"  (키워드별 일치 공고 합계 {truth}, 페이지 상한 {args.page_max}×{args.rows}행)")
+        dt, req, legacy = _run(_legacy_fetch, args.page_max, args.rows)
+        print(f"  legacy   : {dt * 1000:6.0f} ms/keyword  requests {req:4.1f}  found {sum(map(len, legacy.values()))}")
+
+        os.environ["PPS_SERVER_FILTER"] = "0"
+        pps_api._WORKING_OPS.clear()
+        dt, req, par = _run(pps_api.pps_fetch_bids, args.page_max, args.rows)
+        same = all({pps_api._bid_key(i) for i in par[k]} == {pps_api._bid_key(i) for i in legacy[k]} for k in KEYWORDS)
+        print(f"  parallel : {dt * 1000:6.0f} ms/keyword  requests {req:4.1f}  found {sum(map(len, par.values()))}  same={same}")
+
+        os.environ["PPS_SERVER_FILTER"] = "1"
+        pps_api._WORKING_OPS.clear()
+        dt, req, srv_found = _run(pps_api.pps_fetch_bids, args.page_max, args.rows)
+        ok = all(pps_api._keyword_match(i, k) for k in KEYWORDS for i in srv_found[k])
+        print(f"  server   : {dt * 1000:6.0f} ms/keyword  requests {req:4.1f}  found {sum(map(len, srv_found.values()))}  "
+              f"all match={ok}  (op={pps_api._WORKING_OPS.get(pps_api.PPS_BASE)})")
+
+        first = run_sync(_first_item_ms(KEYWORDS[0], args.page_max, args.rows))
+        print(f"  stream   : first item after {first:.0f} ms ('{KEYWORDS[0]}')")
+    finally:
+        os.environ.pop("PPS_SERVER_FILTER", None)
+        srv.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+PPS 로컬 미러 벤치마크 (합성 공고 + 로컬 가짜 PPS 목록 API)
+- 합성 공고 --bids건을 최근 --days일에 고르게 (공고명: 고정 어휘 + 합성 단어 4개, 빈도는 지프 분포)
+- 1) 초기 적재: PpsMirror.sync(fetch=메모리 목록) — 파싱 + FTS 색인 포함 건/s, DB 크기
+- 2) 증분 동기화: 로컬 HTTP 서버가 일반형 목록 오퍼레이션을 흉내 냄 (inqryBgnDt~inqryEndDt로 자름, 요청마다 --rtt_ms)
+    · 새 공고 --new건 + 워터마크 근처 공고 --changed건 정정(추정가격 변경)
+    · incremental: mirror.sync() — 실제 pps_api 경로로 워터마크-OVERLAP 이후만
+    · full       : 최근 --days일 전체를 다시 받는 경우의 요청 수 (numOfRows=SYNC_ROWS) — 네트워크 하한만 추정
+- 3) 질의: 같은 조건을 mirror.search vs 메모리 목록 파이썬 스캔 (기존 pps_search가 받은 뒤 하던 필터, 다운로드 제외)
+    · 흔한 단어(색인 최신순 훑기)와 드문 단어(FTS 후보 정렬) 모두, 질의마다 p50 / p95 ms, 결과 같은지(same)
+
+사용 예:
+python -m student.day3.bench_pps_mirror
+python -m student.day3.bench_pps_mirror --bids 1000000 --rounds 20
+"""
+
+from __future__ import annotations
+import os, sys, json, math, time, bisect, itertools, random, argparse, tempfile, threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, parse_qs
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("PPS_SERVICE_KEY", "bench-key")
+
+from student.day3.impl import pps_api, pps_mirror
+from student.day3.impl.pps_mirror import PpsMirror, matches_filters
+
+WORDS = ["영상", "콘텐츠", "VFX", "AI", "교육", "시스템", "유지보수", "구축", "홍보", "제작", "용역", "물품", "공사", "플랫폼"]
+SYLLABLES = "가나다라마바사아자차카타파하강산수목금토일월화전기통신물류도로교량청사급식"
+AGENCIES = ["한국콘텐츠진흥원", "정보통신산업진흥원", "조달청", "서울특별시", "한국전력공사", "영화진흥위원회",
+            "부산광역시", "국토교통부", "한국도로공사", "교육부", "경기도교육청", "국방부"]
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=pps_api.KST)
+QUERIES: List[Dict[str, Any]] = [
+    {"keyword": "VFX 용역"},
+    {"keyword": "영상 제작", "agency": "콘텐츠"},
+    {"keyword": "AI 교육", "budget_min": 100_000_000},
+    {"keyword": "플랫폼 구축", "date_from": (NOW - timedelta(days=7)).strftime("%Y%m%d%H%M")},
+    {"keyword": None, "agency": "조달청", "budget_min": 50_000_000, "budget_max": 200_000_000},
+    {"keyword": "급식 물류"},
+]
+
+class _Fixture:
+    rtt = 0.15
+    bids: List[Dict[str, Any]] = []   # 공고일시 오름차순
+    keys: List[str] = []              # bids의 _dt12(bidNtceDt) (bisect용)
+    requests = 0
+    lock = threading.Lock()
+
+def _vocab(rng: random.Random, n: int) -> List[str]:
+    out = list(WORDS)
+    while len(out) < n:
+        w = "".join(rng.choice(SYLLABLES) for _ in range(rng.choice((2, 2, 3))))
+        if w not in out:
+            out.append(w)
+    return out
+
+def _synthetic(n: int, days: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    vocab = _vocab(rng, 600)
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    start, span = NOW - timedelta(days=days), days * 86400
+    out = []
+    for i in range(n):
+        ntce = start + timedelta(seconds=span * i // n)
+        out.append({"bidNtceNo": f"R26BK{i:08d}", "bidNtceOrd": "000",
+                    "bidNtceNm": " ".join(rng.choices(vocab, weights, k=4)), "dminsttNm": rng.choice(AGENCIES),
+                    "bidNtceDt": ntce.strftime("%Y-%m-%d %H:%M:%S"),
+                    "bidClseDt": (ntce + timedelta(days=14)).strftime("%Y-%m-%d %H:%M:%S"),
+                    "presmptPrce": str(rng.randrange(10, 500) * 1_000_000)})
+    return out
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with _Fixture.lock:
+            _Fixture.requests += 1
+        time.sleep(_Fixture.rtt)
+        q = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        lo = bisect.bisect_left(_Fixture.keys, q.get("inqryBgnDt", ""))
+        hi = bisect.bisect_right(_Fixture.keys, q.get("inqryEndDt", "9" * 12))
+        page, n = int(q.get("pageNo", 1)), int(q.get("numOfRows", 10))
+        items = _Fixture.bids[lo + (page - 1) * n: min(hi, lo + page * n)]
+        out = {"response": {"header": {"resultCode": "00"}, "body": {"items": items, "totalCount": hi - lo}}}
+        data = json.dumps(out, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def _scan(bids: List[Dict[str, Any]], keyword: Optional[str] = None, agency: Optional[str] = None,
+          date_from: Optional[str] = None, budget_min: Optional[int] = None, budget_max: Optional[int] = None,
+          limit: int = 300) -> List[Dict[str, Any]]:
+    """기존 방식: 받은 목록 전체를 파이썬으로 필터 → 최신순 상위 limit."""
+    out = [b for b in bids
+           if (not keyword or pps_api._keyword_match(b, keyword))
+           and matches_filters(b, agency, budget_min, budget_max)
+           and (not date_from or pps_mirror._dt12(b["bidNtceDt"]) >= date_from)]
+    out.sort(key=lambda b: (pps_mirror._dt12(b["bidNtceDt"]), b["bidNtceNo"], b["bidNtceOrd"]), reverse=True)
+    return out[:limit]
+
+def _pct(xs: List[float], p: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(math.ceil(p * len(xs))) - 1)] * 1000
+
+def main(argv: List[str] | None = None):
+    ap = argparse.ArgumentParser(description="PPS 로컬 미러 벤치마크 (동기화/질의)")
+    ap.add_argument("--bids", type=int, default=200_000)
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--new", type=int, default=2000)
+    ap.add_argument("--changed", type=int, default=200)
+    ap.add_argument("--rtt_ms", type=float, default=150)
+    ap.add_argument("--rounds", type=int, default=10)
+    ap.add_argument("--scan_rounds", type=int, default=3)
+    ap.add_argument("--limit", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    _Fixture.rtt = args.rtt_ms / 1000
+    path = os.path.join(tempfile.mkdtemp(), "pps_bids.sqlite")
+    mirror = PpsMirror(path)
+
+    t0 = time.perf_counter()
+    allbids = _synthetic(args.bids + args.new, args.days, args.seed)
+    base, fresh = allbids[:args.bids], allbids[args.bids:]
+    print(f"[BENCH] bids={args.bids} days={args.days} new={args.new} changed={args.changed} rtt={args.rtt_ms:g}ms "
+          f"(synthetic {time.perf_counter() - t0:.1f}s)")
+
+    # 1) 초기 적재 (워터마크 = 기존 공고의 마지막 공고일시)
+    last = datetime.strptime(base[-1]["bidNtceDt"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=pps_api.KST)
+    t0 = time.perf_counter()
+    out = mirror.sync(fetch=lambda w: base, now=last)
+    dt = time.perf_counter() - t0
+    print(f"  initial : {dt:6.1f}s  {args.bids / dt:8.0f} bids/s  inserted {out['inserted']}  "
+          f"db {os.path.getsize(path) / 2**20:.0f}MB")
+
+    # 2) 증분 동기화: 워터마크 근처 공고 정정 + 새 공고, 서버에는 전체 목록
+    rng = random.Random(args.seed)
+    cut = pps_mirror._dt12(base[-1]["bidNtceDt"])
+    near = list(itertools.takewhile(lambda i: pps_mirror._dt12(base[i]["bidNtceDt"]) >= cut[:10] + "00",
+                                    range(len(base) - 1, -1, -1)))
+    for i in rng.sample(near, min(args.changed, len(near))):
+        base[i] = dict(base[i], presmptPrce=str(int(base[i]["presmptPrce"]) + 1_000_000))
+    _Fixture.bids = base + fresh
+    _Fixture.keys = [pps_mirror._dt12(b["bidNtceDt"]) for b in _Fixture.bids]
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    pps_api.PPS_BASE = f"http://127.0.0.1:{srv.server_address[1]}/pps"
+    try:
+        now = datetime.strptime(fresh[-1]["bidNtceDt"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=pps_api.KST) if fresh else last
+        t0 = time.perf_counter()
+        out = mirror.sync(now=now)
+        dt = time.perf_counter() - t0
+        print(f"  incremental: {dt * 1000:6.0f}ms  requests {_Fixture.requests}  received {out['received']}  "
+              f"inserted {out['inserted']}  updated {out['updated']}  window {out['window'][0]}~{out['window'][1]}")
+        pages = math.ceil(len(_Fixture.bids) / pps_mirror.SYNC_ROWS)
+        lower = math.ceil((pages - 1) / pps_api.PPS_CONCURRENCY + 1) * _Fixture.rtt
+        print(f"  full refetch: requests {pages}  >= {lower:.1f}s (rtt x 순차 단계, 전송/파싱 제외)")
+        again = mirror.sync(now=now)
+        print(f"  repeat     : inserted {again['inserted']}  updated {again['updated']}")
+    finally:
+        srv.shutdown()
+
+    # 3) 질의: 미러 vs 파이썬 스캔
+    bids = _Fixture.bids
+    rare = _vocab(random.Random(args.seed), 600)[300]   # _synthetic과 같은 어휘, 드문 단어 (FTS 경로)
+    for q in QUERIES + [{"keyword": rare}]:
+        label = " ".join(f"{k}={v}" for k, v in q.items() if v is not None)
+        fts = []
+        for _ in range(args.rounds):
+            t0 = time.perf_counter()
+            got = mirror.search(**q, limit=args.limit)
+            fts.append(time.perf_counter() - t0)
+        scan = []
+        for _ in range(args.scan_rounds):
+            t0 = time.perf_counter()
+            want = _scan(bids, **q, limit=args.limit)
+            scan.append(time.perf_counter() - t0)
+        same = [pps_api._bid_key(b) for b in got] == [pps_api._bid_key(b) for b in want]
+        print(f"  query [{label}]: mirror p50 {_pct(fts, .5):7.1f}ms p95 {_pct(fts, .95):7.1f}ms | "
+              f"scan p50 {_pct(scan, .5):7.1f}ms | hits {len(got)} same={same}")
+
+if __name__ == "__main__":
+    main()
@@ -156,7 +156,7 @@ class Day3Agent:
         ADK에서도 스모크와 동일한 경로로 실행: pipeline.find_notices 사용
         """
         try:
-            return find_notices(query)  # ← 스모크와 같은 함수 호출 (PPS 병합 포함)
+            return find_notices(query, plan)  # ← 스모크와 같은 함수 호출 (PPS 병합 포함, 소스 동시 수집)
         except Exception as e:
             # 폴백: 기존 fetchers 흐름 (원래 구현이 있었다면 여기에 남겨도 OK)
             from .fetchers import fetch_nipa, fetch_bizinfo, fetch_web
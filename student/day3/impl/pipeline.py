@@ -4,20 +4,35 @@
 # - 기존: fetchers(NIPA/Bizinfo/Web) → normalize → rank
 # - 변경: PPS OpenAPI(선택) 결과도 함께 병합
 #   * .env USE_PPS=1 일 때 pps_fetch_bids(query) 실행
+# - 네 소스를 동시에 호출(소스별 마감 시간), 늦은 소스는 빼고 병합 → payload["sources"/"errors"]에 기록
 # """
 from __future__ import annotations
-from typing import Dict, Any, List
-import os
+from typing import Dict, Any, List, Optional, Tuple, Awaitable
+import os, time, asyncio
 
-from .fetchers import fetch_all             # NIPA/Bizinfo/Web (Tavily)
+from . import fetchers                      # NIPA/Bizinfo/Web (Tavily)
+from .fetchers import fetch_all             # 하위 호환 (동기, 세 소스 동시 호출)
 from .normalize import normalize_all
 from .rank import rank_items
 
 # 공용 스키마
-from student.common.schemas import GovNotices, GovNoticeItem
+from student.common.schemas import Day3Plan, GovNotices, GovNoticeItem
+from student.common.http_client import run_sync
 
 # ▶ 추가: PPS OpenAPI
-from student.day3.impl.pps_api import pps_fetch_bids, to_common_schema
+from student.day3.impl.pps_api import pps_fetch_bids, apps_fetch_bids, to_common_schema, _date_window_from_env
+from student.day3.impl.pps_mirror import local_bids
+
+# 소스별 마감 시간(초). DAY3_TIMEOUT_<SOURCE>로 덮어쓰기 (예: DAY3_TIMEOUT_PPS=20)
+SOURCE_TIMEOUTS: Dict[str, float] = {"nipa": 8.0, "bizinfo": 8.0, "web": 8.0, "pps": 12.0}
+SOURCE_ORDER = ("nipa", "bizinfo", "web", "pps")   # 병합 순서 (완료 순서와 무관하게 고정)
+
+
+def source_timeout(name: str) -> float:
+    try:
+        return float(os.environ[f"DAY3_TIMEOUT_{name.upper()}"])
+    except (KeyError, ValueError):
+        return SOURCE_TIMEOUTS.get(name, 10.0)
 
 
 def _merge_and_dedup(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -32,46 +47,117 @@ def _merge_and_dedup(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return out
 
 
-def find_notices(query: str) -> dict:
-    """
-    1) Tavily 기반 수집(fetch_all)
-    2) (옵션) PPS OpenAPI 수집(pps_fetch_bids) 추가 병합
-    3) normalize → rank → GovNotices 스키마 반환
-    """
-    # 1) 기존 소스 수집
-    raw_items = fetch_all(query)  # Day1형 스키마 리스트(title/url/snippet/...)
-    
-    # 2) PPS OpenAPI(선택)
+def _pps_as_raw(query: str) -> List[Dict[str, Any]]:
+    """PPS 목록 → normalize_all이 기대하는 Day1형 최소 필드."""
+    return _pps_rows(pps_fetch_bids(query))
+
+
+async def _apps_as_raw(query: str) -> List[Dict[str, Any]]:
+    # 로컬 미러가 최신이면 SQL 검색(ms), 아니면 PPS API (미러는 백그라운드에서 따라잡음)
+    # SQLite 조회는 스레드에서 (백그라운드 동기화가 락을 오래 잡아도 공용 이벤트 루프가 멈추지 않게)
+    local = await asyncio.to_thread(local_bids, query, *_date_window_from_env())
+    return _pps_rows(local if local is not None else await apps_fetch_bids(query))
+
+
+def _pps_rows(bids: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    converted = []
+    for it in to_common_schema(bids):
+        converted.append({
+            "title": it.get("title", ""),
+            "url": it.get("url", ""),
+            "source": "pps.data.go.kr",
+            "snippet": it.get("snippet", ""),
+            "date": it.get("announce_date", ""),
+        })
+    return converted
+
+
+def _source_jobs(query: str, plan: Day3Plan) -> Dict[str, Awaitable[List[Dict[str, Any]]]]:
+    jobs: Dict[str, Awaitable[List[Dict[str, Any]]]] = {
+        "nipa": fetchers.afetch_nipa(query, plan.nipa_topk),
+        "bizinfo": fetchers.afetch_bizinfo(query, plan.bizinfo_topk),
+    }
+    if plan.use_web_fallback and plan.web_topk > 0:
+        jobs["web"] = fetchers.afetch_web(query, plan.web_topk)
     use_pps = os.getenv("USE_PPS", "1")  # 기본 1(ON)으로 두는 게 데모에 유리
     if use_pps and use_pps != "0":
+        jobs["pps"] = _apps_as_raw(query)   # 페이지 동시 수집 (마감 시간 초과 시 남은 요청 취소)
+    return jobs
+
+
+async def acollect(query: str, plan: Optional[Day3Plan] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    모든 소스를 동시에 호출, 소스마다 마감 시간 적용.
+    반환: (시간 안에 끝난 소스의 raw 목록 — SOURCE_ORDER 순, 소스별 상태
+           {"status": "ok"|"timeout"|"error", "count", "elapsed_ms", "error"?})
+    """
+    plan = plan or Day3Plan(nipa_topk=fetchers.NIPA_TOPK, bizinfo_topk=fetchers.BIZINFO_TOPK, web_topk=fetchers.WEB_TOPK)
+    jobs = _source_jobs(query, plan)
+    t0 = time.perf_counter()
+
+    async def run(name: str, job: Awaitable[List[Dict[str, Any]]]) -> Tuple[Any, float]:
+        limit = source_timeout(name)
         try:
-            pps_items = pps_fetch_bids(query)   # 이미 GovNotice형에 가깝게 매핑됨
-            # 정규화 파이프라인에 태우기 위해 Day1형처럼 최소 필드 구성
-            # (normalize_all이 기대하는 최소 스키마를 맞추기 위해 변환)
-            converted = []
-            for it in pps_items:
-                converted.append({
-                    "title": it.get("title", ""),
-                    "url": it.get("url", ""),
-                    "source": "pps.data.go.kr",
-                    "snippet": it.get("snippet", ""),
-                    "date": it.get("announce_date", ""),
-                })
-            raw_items.extend(converted)
-        except Exception:
-            pass
-
-    # 3) normalize → rank
+            data = await asyncio.wait_for(job, limit)
+        except asyncio.TimeoutError:
+            data = TimeoutError(f"{limit:g}s 초과")
+        except Exception as e:
+            data = e
+        return data, (time.perf_counter() - t0) * 1000
+
+    done = await asyncio.gather(*(run(n, j) for n, j in jobs.items()))
+    got = dict(zip(jobs, done))
+    raw: List[Dict[str, Any]] = []
+    sources: Dict[str, Dict[str, Any]] = {}
+    for name in sorted(got, key=SOURCE_ORDER.index):
+        data, ms = got[name]
+        if isinstance(data, BaseException):
+            status = "timeout" if isinstance(data, TimeoutError) else "error"
+            sources[name] = {"status": status, "count": 0, "elapsed_ms": round(ms, 1),
+                             "error": f"{type(data).__name__}: {data}"}
+            continue
+        raw.extend(data or [])
+        sources[name] = {"status": "ok", "count": len(data or []), "elapsed_ms": round(ms, 1)}
+    return raw, sources
+
+
+def _items(ranked: List[Dict[str, Any]]) -> Tuple[List[GovNoticeItem], int]:
+    """스키마 검증을 통과한 항목만 (URL이 없거나 잘못된 항목은 건너뛰고 개수만 셈)."""
+    items, dropped = [], 0
+    for it in ranked:
+        try:
+            items.append(GovNoticeItem(**it))
+        except ValueError:
+            dropped += 1
+    return items, dropped
+
+
+async def afind_notices(query: str, plan: Optional[Day3Plan] = None) -> dict:
+    """
+    1) 수집: NIPA/Bizinfo/Web(Tavily) + (옵션) PPS OpenAPI를 동시에, 소스별 마감 시간
+       → 지연 = 가장 느린 소스(최대 그 소스의 마감 시간)
+    2) 시간 안에 끝난 소스만 normalize → rank → GovNotices 스키마
+    3) 시간 초과/실패한 소스는 payload["errors"]와 payload["sources"][이름]["status"]에 기록
+    """
+    raw_items, sources = await acollect(query, plan)
+
     norm = normalize_all(raw_items)         # Day1형 → GovNotice 표준 스키마
     norm = _merge_and_dedup(norm)           # URL+제목 중복 제거
     ranked = rank_items(norm, query)        # 점수 부여/정렬
+    items, dropped = _items(ranked)
 
-    model = GovNotices(
-        query=query,
-        items=[GovNoticeItem(**it) for it in ranked]
-    )
+    errors = [f"{name}: {s['error']}" for name, s in sources.items() if s["status"] != "ok"]
+    if dropped:
+        errors.append(f"schema: URL이 없거나 잘못된 항목 {dropped}건 제외")
+    model = GovNotices(query=query, items=items, sources=sources, errors=errors)
     return model.model_dump()
 
+
+def find_notices(query: str, plan: Optional[Day3Plan] = None) -> dict:
+    """동기 진입점: afind_notices를 공용 이벤트 루프에서 실행."""
+    deadline = max(source_timeout(n) for n in SOURCE_ORDER) + 5   # 소스별 마감이 먼저 걸리도록 여유
+    return run_sync(afind_notices(query, plan), timeout=deadline)
+
 # student/day3/impl/pipeline.py
 # from __future__ import annotations
 # from typing import Dict, Any, List
@@ -4,11 +4,20 @@ PPS OpenAPI 호출 유틸
 - 최신 공고만 보기 위해 inqryDiv + inqryBgnDt/inqryEndDt를 엄격히 설정
 - .env 없으면 최근 14일로 자동
 - 키워드 필터는 클라이언트에서 공고명에 포함 여부로 2차 필터
+- 페이지네이션: 1페이지의 totalCount로 필요한 페이지 수를 정하고 나머지 페이지는 동시에 (PPS_CONCURRENCY, 기본 4)
+    · aiter_bids(): 페이지가 도착하는 대로 항목을 하나씩 내보내는 비동기 스트림
+    · pps_fetch_bids(): 스트림을 모아 리스트로 (기존 동기 시그니처 그대로, 공용 이벤트 루프에서 실행)
+- 오퍼레이션: 결과를 준 오퍼레이션을 프로세스 안에서 기억해 다음 호출부터 먼저 시도 (실패하면 잊고 다음 후보)
+- 서버측 필터: 날짜 창(inqryBgnDt/inqryEndDt)은 항상, 키워드는 검색형 오퍼레이션일 때만 bidNtceNm/dminsttNm으로
+    · 키워드 단어마다 서버 질의 2개(공고명에 포함 / 수요기관명에 포함) → 공고번호로 중복 제거 → 클라이언트 필터 그대로 적용
+      (클라이언트 필터가 공고명·기관명을 모두 보므로 기관명만 맞는 공고도 빠지지 않음)
+    · PPS_SERVER_FILTER=0 이면 서버 필터 없이 전체 목록을 받아 클라이언트 필터
 """
 from __future__ import annotations
-import os, math, time, json
-import requests
-from typing import Dict, Any, List, Optional, Tuple
+import os, math, time, json, asyncio, threading
+
+from ...common import http_client
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 
 KST = timezone(timedelta(hours=9))
@@ -19,6 +28,14 @@ OPS_CANDIDATES = [
     "getBidPblancListInfoServcPPSSrch",  # 검색형
     "getBidPblancListInfoServc",         # 일반형
 ]
+# 공고명(bidNtceNm)/수요기관명(dminsttNm) 서버 필터를 받는 오퍼레이션
+SERVER_FILTER_OPS = {"getBidPblancListInfoServcPPSSrch"}
+# 단어마다 질의할 서버 필터 필드 (_keyword_match가 보는 공고명/기관명과 같게)
+SERVER_FILTER_FIELDS = ("bidNtceNm", "dminsttNm")
+PPS_CONCURRENCY = int(os.getenv("PPS_CONCURRENCY", "4"))
+
+_WORKING_OPS: Dict[str, str] = {}   # PPS_BASE → 마지막으로 결과를 준 오퍼레이션
+_WORKING_OPS_LOCK = threading.Lock()
 
 def _fmt_yyyymmddhm(dt: datetime) -> str:
     return dt.strftime("%Y%m%d%H%M")
@@ -37,8 +54,9 @@ def _date_window_from_env() -> Tuple[str, str]:
     finish = today.replace(hour=23, minute=59, second=0, microsecond=0)
     return _fmt_yyyymmddhm(start), _fmt_yyyymmddhm(finish)
 
-def _req_params(keyword: Optional[str], page: int, rows: int) -> Dict[str, Any]:
-    inqry_bgn, inqry_end = _date_window_from_env()
+def _req_params(keyword: Optional[str], page: int, rows: int, window: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
+    """window: (inqryBgnDt, inqryEndDt) YYYYMMDDHHMM — 없으면 .env/최근 14일."""
+    inqry_bgn, inqry_end = window or _date_window_from_env()
     params = {
         "type": "json",
         "inqryDiv": "1",           # 1=공고일자 기준(일반적으로 사용)
@@ -57,9 +75,18 @@ def _call_op(op: str, params: Dict[str, Any], timeout: int = 20) -> Dict[str, An
     # API 키 확인
     if not params.get("serviceKey"):
         raise ValueError("PPS_SERVICE_KEY 또는 PPS_API_KEY 환경변수가 설정되지 않았습니다.")
-    r = requests.get(url, params=params, timeout=timeout)
+    r = http_client.get(url, params=params, timeout=timeout)
     r.raise_for_status()
-    result = r.json()
+    return _check_result(r.json())
+
+async def _acall_op(op: str, params: Dict[str, Any], timeout: int = 20) -> Dict[str, Any]:
+    if not params.get("serviceKey"):
+        raise ValueError("PPS_SERVICE_KEY 또는 PPS_API_KEY 환경변수가 설정되지 않았습니다.")
+    r = await http_client.aget(f"{PPS_BASE}/{op}", params=params, timeout=timeout)
+    r.raise_for_status()
+    return _check_result(r.json())
+
+def _check_result(result: Dict[str, Any]) -> Dict[str, Any]:
     # API 오류 응답 확인
     if "response" in result and "header" in result["response"]:
         header = result["response"]["header"]
@@ -76,6 +103,112 @@ def _extract_items(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     except Exception:
         return []
 
+def _page_count(payload: Dict[str, Any], page_max: Optional[int], rows: int) -> int:
+    """1페이지 응답의 totalCount로 받을 페이지 수 (page_max=None이면 전부, totalCount가 없으면 page_max까지)."""
+    try:
+        total = int(payload["response"]["body"]["totalCount"])
+    except Exception:
+        return (page_max or 1) if _extract_items(payload) else 1
+    pages = math.ceil(total / max(rows, 1))
+    return max(1, pages if page_max is None else min(page_max, pages))
+
+def _op_order() -> List[str]:
+    with _WORKING_OPS_LOCK:
+        known = _WORKING_OPS.get(PPS_BASE)
+    return ([known] if known else []) + [op for op in OPS_CANDIDATES if op != known]
+
+def _remember_op(op: str):
+    with _WORKING_OPS_LOCK:
+        _WORKING_OPS[PPS_BASE] = op
+
+def _forget_op(op: str):
+    with _WORKING_OPS_LOCK:
+        if _WORKING_OPS.get(PPS_BASE) == op:
+            del _WORKING_OPS[PPS_BASE]
+
+def _keyword_terms(keyword: Optional[str]) -> List[str]:
+    # 키워드를 단어로 분리 (예: "VFX 용역" -> ["VFX", "용역"])
+    return [k.strip() for k in (keyword or "").split() if k.strip()]
+
+def _keyword_match(it: Dict[str, Any], keyword: str) -> bool:
+    """제목/기관에 전체 키워드 문자열이 포함되거나, 개별 키워드 중 하나라도 포함되면 True."""
+    title = str(it.get("bidNtceNm") or it.get("bidNm") or it.get("ntceNm") or "").lower()
+    agency = str(it.get("dminsttNm") or it.get("ntceInsttNm") or it.get("orgNm") or "").lower()
+    full_key = keyword.strip().lower()
+    terms = [k.lower() for k in _keyword_terms(keyword)]
+    return full_key in title or full_key in agency or any(kw in title or kw in agency for kw in terms)
+
+def _bid_key(it: Dict[str, Any]) -> Tuple[str, str]:
+    return (str(it.get("bidNtceNo") or it.get("bidno") or id(it)), str(it.get("bidNtceOrd") or it.get("bidseq") or ""))
+
+def _server_filter_on() -> bool:
+    return os.getenv("PPS_SERVER_FILTER", "1").lower() not in ("0", "false", "no", "n")
+
+async def _apages(op: str, param_sets: List[Dict[str, Any]], page_max: Optional[int], rows: int,
+                  concurrency: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """질의(param_set)마다 1페이지 → totalCount만큼 나머지 페이지를 동시에. 도착 순서대로 페이지 항목을 내보냄."""
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def page(params: Dict[str, Any], no: int) -> Tuple[Dict[str, Any], int, Dict[str, Any]]:
+        async with sem:
+            return params, no, await _acall_op(op, dict(params, pageNo=str(no)))
+
+    pending = {asyncio.ensure_future(page(ps, 1)) for ps in param_sets}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                params, no, data = task.result()
+                if no == 1:
+                    pending |= {asyncio.ensure_future(page(params, p))
+                                for p in range(2, _page_count(data, page_max, rows) + 1)}
+                yield _extract_items(data)
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def aiter_bids(keyword: Optional[str] = None, page_max: Optional[int] = 3, rows: int = 50,
+                     concurrency: Optional[int] = None,
+                     window: Optional[Tuple[str, str]] = None, strict: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """
+    pps_fetch_bids의 스트리밍 버전: 페이지가 도착하는 대로 (키워드 필터를 통과한) 항목을 하나씩 내보냄.
+    오퍼레이션이 처음부터 실패하면 다음 후보로, 항목을 내보낸 뒤 실패하면 받은 만큼으로 끝냄.
+    page_max=None이면 totalCount만큼 전부, window로 조회 기간 지정, strict면 중간 실패도 예외 (pps_mirror 동기화용).
+    """
+    params0 = _req_params(keyword=keyword, page=1, rows=rows, window=window)
+    key = (keyword or "").strip()
+    terms = _keyword_terms(key)
+    last_error: Optional[Exception] = None
+    for op in _op_order():
+        if terms and op in SERVER_FILTER_OPS and _server_filter_on():
+            param_sets = [dict(params0, **{field: t}) for t in dict.fromkeys(terms) for field in SERVER_FILTER_FIELDS]
+        else:
+            param_sets = [params0]
+        seen, received = set(), 0
+        try:
+            async for items in _apages(op, param_sets, page_max, rows, concurrency or PPS_CONCURRENCY):
+                for it in items:
+                    received += 1
+                    k = _bid_key(it)
+                    if k in seen or (key and not _keyword_match(it, key)):
+                        continue
+                    seen.add(k)
+                    yield it
+        except Exception as e:
+            last_error = e
+            if received:
+                if strict:
+                    raise
+                return
+            _forget_op(op)
+            continue
+        if received:
+            _remember_op(op)
+            return
+    # 모든 오퍼레이션이 실패한 경우
+    if last_error:
+        raise last_error
+
 def _link_from_ids(it: Dict[str, Any]) -> str:
     """
     응답에 상세 URL이 없으면 공고번호/차수로 기본 상세URL 조합 (G2B UI는 변동 가능)
@@ -110,52 +243,15 @@ def pps_fetch_bids(keyword: Optional[str] = None,
                    rows: int = 50) -> List[Dict[str, Any]]:
     """
     최근 기간(또는 .env 지정 기간)의 입찰공고 목록을 수집.
-    - 서버 파라미터로 날짜 필터 적용
+    - 서버 파라미터로 날짜 필터 적용 (검색형 오퍼레이션이면 공고명 키워드도)
     - 제목 키워드는 클라이언트에서 포함여부로 2차 필터
+    - 페이지는 동시에 받음 (aiter_bids를 공용 이벤트 루프에서 모음)
     """
-    params0 = _req_params(keyword=keyword, page=1, rows=rows)
-    all_items: List[Dict[str, Any]] = []
-    last_error = None
-    
-    for op in OPS_CANDIDATES:
-        try:
-            # 페이지네이션
-            for page in range(1, page_max + 1):
-                params = dict(params0, pageNo=str(page))
-                data = _call_op(op, params)
-                items = _extract_items(data)
-                if not items:
-                    break
-                all_items.extend(items)
-            if all_items:
-                break
-        except Exception as e:
-            last_error = e
-            continue
-    
-    # 모든 오퍼레이션이 실패한 경우
-    if not all_items and last_error:
-        raise last_error
+    return http_client.run_sync(apps_fetch_bids(keyword, page_max, rows))
 
-    # 클라이언트 키워드 필터(제목) - 더 유연한 필터링
-    if keyword:
-        key = keyword.strip()
-        if key:
-            # 키워드를 단어로 분리 (예: "VFX 용역" -> ["VFX", "용역"])
-            keywords = [k.strip().lower() for k in key.split() if k.strip()]
-            if keywords:
-                filtered = []
-                for it in all_items:
-                    title = str(it.get("bidNtceNm") or it.get("bidNm") or it.get("ntceNm") or "").lower()
-                    agency = str(it.get("dminsttNm") or it.get("ntceInsttNm") or it.get("orgNm") or "").lower()
-                    # 전체 키워드 문자열이 포함되거나, 개별 키워드 중 하나라도 포함되면 포함
-                    full_key = key.lower()
-                    if (full_key in title or full_key in agency or 
-                        any(kw in title or kw in agency for kw in keywords)):
-                        filtered.append(it)
-                all_items = filtered
-
-    return all_items
+async def apps_fetch_bids(keyword: Optional[str] = None, page_max: Optional[int] = 3, rows: int = 50,
+                          window: Optional[Tuple[str, str]] = None, strict: bool = False) -> List[Dict[str, Any]]:
+    return [it async for it in aiter_bids(keyword, page_max, rows, window=window, strict=strict)]
 
 def to_common_schema(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+나라장터 입찰공고 로컬 미러 (SQLite + FTS5)
+- 기존 pps_search / find_notices: 호출마다 최근 14~30일 공고 목록을 PPS API로 다시 받아 파이썬에서 키워드 필터
+- 여기서는 공고를 로컬에 보관하고 질의는 SQL로 (키워드 / 발주기관 / 공고일 / 예산 필터, ms 단위)
+- 동기화: 공고일시(bidNtceDt) 워터마크 이후만 요청 (늦게 올라온 공고·정정을 위해 OVERLAP_MIN분 겹쳐서)
+    · 첫 동기화는 최근 PPS_MIRROR_DAYS일(기본 30) 전체
+    · (bidNtceNo, bidNtceOrd)로 중복 제거 — 같은 공고는 내용이 바뀐 경우에만 갱신
+    · PPS_MIRROR_RETENTION_DAYS일(기본 90)보다 오래된 공고는 삭제
+    · 백그라운드 스레드가 PPS_MIRROR_INTERVAL초(기본 600)마다 동기화 (첫 조회 때 시작, 프로세스당 경로별 1개)
+- 검색: 공고명 + 발주기관을 글자 2-gram으로 나눠 FTS5에 색인 (한국어 2글자 단어도 색인으로 찾음)
+    · FTS로 후보를 좁힌 뒤 instr로 부분 문자열 일치를 다시 확인 → pps_api._keyword_match와 같은 의미
+      (전체 키워드 또는 단어 중 하나라도 공고명/발주기관에 포함)
+    · 1글자 단어가 섞이거나 일치가 sqrt(limit × 전체)건 이상(흔한 단어)이면 FTS 없이
+      공고일시 색인을 최신순으로 훑으며 instr 확인 (limit건 채우면 멈춤)
+- 신선도: 마지막 동기화가 PPS_MIRROR_MAX_AGE초(기본 1800) 안이고 요청 기간을 덮을 때만 로컬 결과 사용,
+  아니면 None → 호출 쪽에서 PPS API로 (그동안 백그라운드 동기화가 따라잡음)
+- 설정: PPS_MIRROR=0이면 끔, 경로는 PPS_MIRROR_PATH (기본 data/cache/pps_bids.sqlite),
+  PPS_MIRROR_BACKGROUND=0이면 백그라운드 동기화 없이 (--sync로 직접)
+
+사용 예:
+rows = local_bids("VFX 용역", date_from="202610010000", agency="콘텐츠", budget_min=100_000_000)   # None이면 API로
+python -m student.day3.impl.pps_mirror --sync             # 한 번 동기화
+python -m student.day3.impl.pps_mirror --loop             # 주기 동기화 (별도 프로세스로 돌릴 때)
+python -m student.day3.impl.pps_mirror --query "영상 제작" --budget_min 100000000
+python -m student.day3.bench_pps_mirror --bids 1000000    # 동기화/질의 벤치마크
+"""
+
+from __future__ import annotations
+import os, re, json, math, time, sqlite3, argparse, threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ...common.http_client import run_sync
+from . import pps_api
+
+DEFAULT_MIRROR_PATH = "data/cache/pps_bids.sqlite"
+MIRROR_DAYS = int(os.getenv("PPS_MIRROR_DAYS", "30"))
+RETENTION_DAYS = int(os.getenv("PPS_MIRROR_RETENTION_DAYS", "90"))
+OVERLAP_MIN = int(os.getenv("PPS_MIRROR_OVERLAP_MIN", "60"))
+SYNC_INTERVAL = float(os.getenv("PPS_MIRROR_INTERVAL", "600"))
+MAX_AGE = float(os.getenv("PPS_MIRROR_MAX_AGE", "1800"))
+SYNC_ROWS = int(os.getenv("PPS_MIRROR_ROWS", "999"))   # 동기화 요청의 numOfRows (API 상한 근처)
+
+_PARTS = re.compile(r"[^\W_]+")
+_DIGITS = re.compile(r"\D")
+
+Window = Tuple[str, str]   # (YYYYMMDDHHMM, YYYYMMDDHHMM)
+
+def _dt12(value: Any) -> str:
+    """'2026-10-10 10:00:00' / '202610101000' → '202610101000' (없으면 '')."""
+    digits = _DIGITS.sub("", str(value or ""))
+    return digits[:12].ljust(12, "0") if len(digits) >= 8 else ""
+
+def _budget(it: Dict[str, Any]) -> Optional[int]:
+    for k in ("presmptPrce", "asignBdgtAmt", "totPrdprc"):
+        try:
+            return int(float(str(it.get(k)).replace(",", "").strip()))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+def _title(it: Dict[str, Any]) -> str:
+    return str(it.get("bidNtceNm") or it.get("bidNm") or it.get("ntceNm") or "").strip()
+
+def _agency(it: Dict[str, Any]) -> str:
+    return str(it.get("dminsttNm") or it.get("ntceInsttNm") or it.get("orgNm") or "").strip()
+
+def matches_filters(it: Dict[str, Any], agency: Optional[str] = None,
+                    budget_min: Optional[int] = None, budget_max: Optional[int] = None) -> bool:
+    """PpsMirror.search의 발주기관/예산 필터를 원본 공고 1건에 (API로 받은 목록에 같은 조건을 걸 때)."""
+    if agency and agency.strip() and agency.strip().lower() not in _agency(it).lower():
+        return False
+    if budget_min is None and budget_max is None:
+        return True
+    b = _budget(it)
+    return b is not None and (budget_min is None or b >= budget_min) and (budget_max is None or b <= budget_max)
+
+def _grams(text: str) -> List[str]:
+    """소문자 → 글자/숫자 단위 조각 → 조각마다 2-gram (1글자 조각은 그대로)."""
+    out: List[str] = []
+    for part in _PARTS.findall(text.lower()):
+        out.extend([part] if len(part) == 1 else (part[i:i + 2] for i in range(len(part) - 1)))
+    return out
+
+def _phrase(term: str) -> Optional[str]:
+    """부분 문자열 term을 FTS 질의로 (조각마다 2-gram 구문, AND). 1글자 조각이 있으면 None."""
+    parts = _PARTS.findall(term.lower())
+    if not parts or any(len(p) < 2 for p in parts):
+        return None
+    return " AND ".join('"' + " ".join(p[i:i + 2] for i in range(len(p) - 1)) + '"' for p in parts)
+
+def _row(it: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    bid_no = str(it.get("bidNtceNo") or it.get("bidno") or "").strip()
+    if not bid_no:
+        return None
+    title, agency = _title(it), _agency(it)
+    return (bid_no, str(it.get("bidNtceOrd") or it.get("bidseq") or "").strip(),
+            _dt12(it.get("bidNtceDt") or it.get("ntceDt") or it.get("bidBeginDt")),
+            _dt12(it.get("bidClseDt") or it.get("opengDt") or it.get("bidEndDt")),
+            title, agency, _budget(it), " ".join(_grams(f"{title} {agency}")),
+            json.dumps(it, ensure_ascii=False, sort_keys=True))
+
+class PpsMirror:
+    def __init__(self, path: str):
+        self.path = path
+        self.last_error = ""
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS bids ("
+            " id INTEGER PRIMARY KEY, bid_no TEXT NOT NULL, bid_ord TEXT NOT NULL, ntce_dt TEXT NOT NULL,"
+            " close_dt TEXT NOT NULL, title TEXT NOT NULL, agency TEXT NOT NULL, budget INTEGER,"
+            " grams TEXT NOT NULL, raw TEXT NOT NULL, UNIQUE (bid_no, bid_ord));"
+            "CREATE INDEX IF NOT EXISTS bids_ntce ON bids(ntce_dt, bid_no, bid_ord);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS bids_fts USING fts5("
+            " grams, content='bids', content_rowid='id', tokenize='unicode61 remove_diacritics 0');"
+            "CREATE TRIGGER IF NOT EXISTS bids_ai AFTER INSERT ON bids BEGIN"
+            " INSERT INTO bids_fts(rowid, grams) VALUES (new.id, new.grams); END;"
+            "CREATE TRIGGER IF NOT EXISTS bids_ad AFTER DELETE ON bids BEGIN"
+            " INSERT INTO bids_fts(bids_fts, rowid, grams) VALUES ('delete', old.id, old.grams); END;"
+            "CREATE TRIGGER IF NOT EXISTS bids_au AFTER UPDATE ON bids BEGIN"
+            " INSERT INTO bids_fts(bids_fts, rowid, grams) VALUES ('delete', old.id, old.grams);"
+            " INSERT INTO bids_fts(rowid, grams) VALUES (new.id, new.grams); END;"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+
+    # ---------- 메타 ----------
+    def _meta(self) -> Dict[str, str]:
+        return dict(self._db.execute("SELECT key, value FROM meta").fetchall())
+
+    def _set_meta(self, **values: Any):
+        self._db.executemany("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                             [(k, str(v)) for k, v in values.items()])
+
+    # ---------- 쓰기 ----------
+    def upsert(self, items: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """원본 공고 목록을 (bidNtceNo, bidNtceOrd) 기준으로 넣거나 (내용이 바뀐 경우만) 갱신."""
+        rows = [r for r in (_row(it) for it in items) if r is not None]
+        with self._lock:
+            before = self._db.execute("SELECT COUNT(*) FROM bids").fetchone()[0]
+            self._db.execute("BEGIN")
+            try:
+                cur = self._db.executemany(
+                    "INSERT INTO bids(bid_no, bid_ord, ntce_dt, close_dt, title, agency, budget, grams, raw)"
+                    " VALUES (?,?,?,?,?,?,?,?,?) ON CONFLICT(bid_no, bid_ord) DO UPDATE SET"
+                    " ntce_dt = excluded.ntce_dt, close_dt = excluded.close_dt, title = excluded.title,"
+                    " agency = excluded.agency, budget = excluded.budget, grams = excluded.grams, raw = excluded.raw"
+                    " WHERE bids.raw != excluded.raw",
+                    rows,
+                )
+                changed = cur.rowcount
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            inserted = self._db.execute("SELECT COUNT(*) FROM bids").fetchone()[0] - before
+        return {"received": len(rows), "inserted": inserted, "updated": max(0, changed - inserted)}
+
+    def plan(self, now: Optional[datetime] = None) -> Window:
+        """다음 동기화의 조회 기간: 워터마크 - OVERLAP_MIN분 ~ 지금 (처음이면 최근 MIRROR_DAYS일)."""
+        now = now or datetime.now(pps_api.KST)
+        with self._lock:
+            wm = self._meta().get("watermark")
+        if wm:
+            start = datetime.strptime(wm, "%Y%m%d%H%M") - timedelta(minutes=OVERLAP_MIN)
+        else:
+            start = (now - timedelta(days=MIRROR_DAYS)).replace(hour=0, minute=0)
+        return start.strftime("%Y%m%d%H%M"), now.strftime("%Y%m%d%H%M")
+
+    def sync(self, fetch: Optional[Callable[[Window], List[Dict[str, Any]]]] = None,
+             now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        워터마크 이후 공고를 받아 반영. fetch(window) → 원본 목록 (기본: PPS API 전체 페이지 동시 수집).
+        페이지 하나라도 실패하면 예외 → 워터마크를 옮기지 않음 (빠진 페이지가 영영 안 들어오는 일 방지).
+        """
+        now = now or datetime.now(pps_api.KST)
+        window = self.plan(now)
+        t0 = time.perf_counter()
+        fetch = fetch or (lambda w: run_sync(pps_api.apps_fetch_bids(None, page_max=None, rows=SYNC_ROWS, window=w, strict=True)))
+        items = fetch(window)
+        out = self.upsert(items)
+        cutoff = (now - timedelta(days=RETENTION_DAYS)).strftime("%Y%m%d%H%M")
+        with self._lock:
+            meta = self._meta()
+            newest = max([meta.get("watermark", "")] + [_dt12(it.get("bidNtceDt") or it.get("ntceDt")) for it in items])
+            covered = min(x for x in (meta.get("covered_from"), window[0]) if x)
+            pruned = self._db.execute("DELETE FROM bids WHERE ntce_dt < ?", (cutoff,)).rowcount
+            self._set_meta(watermark=newest or window[0], covered_from=max(covered, cutoff),
+                           synced_at=time.time(), synced_until=window[1])
+        self.last_error = ""
+        out.update({"window": list(window), "pruned": pruned, "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1)})
+        return out
+
+    # ---------- 읽기 ----------
+    def fresh_for(self, date_from: str, max_age: Optional[float] = None) -> bool:
+        """마지막 동기화가 max_age초 안이고 date_from부터 보관 중인가."""
+        with self._lock:
+            meta = self._meta()
+        if not meta.get("synced_at") or not meta.get("covered_from"):
+            return False
+        age = time.time() - float(meta["synced_at"])
+        return age <= (MAX_AGE if max_age is None else max_age) and meta["covered_from"] <= (_dt12(date_from) or "0")
+
+    def _selective(self, expr: str, limit: int) -> bool:
+        """
+        FTS 일치 건수가 sqrt(limit × 전체)보다 적은가 (_lock 안에서 호출).
+        적으면 FTS 후보만 정렬, 많으면(흔한 단어) 공고일시 색인을 최신순으로 훑다가 limit에서 멈추는 쪽이 빠름.
+        """
+        lo, hi = self._db.execute("SELECT (SELECT min(id) FROM bids), (SELECT max(id) FROM bids)").fetchone()
+        probe = int(math.sqrt(max(1, limit) * ((hi - lo + 1) if hi else 1))) + 1
+        hits = self._db.execute("SELECT count(*) FROM (SELECT rowid FROM bids_fts WHERE bids_fts MATCH ? LIMIT ?)",
+                                (expr, probe)).fetchone()[0]
+        return hits < probe
+
+    def search(self, keyword: Optional[str] = None, agency: Optional[str] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               budget_min: Optional[int] = None, budget_max: Optional[int] = None,
+               limit: int = 200) -> List[Dict[str, Any]]:
+        """필터를 모두 만족하는 원본 공고 (공고일시 최신순). keyword는 pps_api._keyword_match와 같은 의미."""
+        where: List[str] = []
+        args: List[Any] = []
+        match: List[str] = []
+        terms = [t.lower() for t in pps_api._keyword_terms(keyword)]
+        if terms:
+            phrases = [_phrase(t) for t in terms]
+            if all(phrases):
+                match.append(" OR ".join(f"({p})" for p in phrases))
+            where.append("(" + " OR ".join("instr(lower(title), ?) > 0 OR instr(lower(agency), ?) > 0" for _ in terms) + ")")
+            args += [x for t in terms for x in (t, t)]
+        if agency and agency.strip():
+            a = agency.strip().lower()
+            if _phrase(a):
+                match.append(f"({_phrase(a)})")
+            where.append("instr(lower(agency), ?) > 0")
+            args.append(a)
+        if date_from:
+            where.append("ntce_dt >= ?")
+            args.append(_dt12(date_from))
+        if date_to:
+            where.append("ntce_dt <= ?")
+            args.append(_dt12(date_to))
+        if budget_min is not None:
+            where.append("budget >= ?")
+            args.append(int(budget_min))
+        if budget_max is not None:
+            where.append("budget <= ?")
+            args.append(int(budget_max))
+        with self._lock:
+            if match and self._selective(" AND ".join(match), limit):
+                where.insert(0, "id IN (SELECT rowid FROM bids_fts WHERE bids_fts MATCH ?)")
+                args.insert(0, " AND ".join(match))
+            sql = ("SELECT raw FROM bids" + (" WHERE " + " AND ".join(where) if where else "")
+                   + " ORDER BY ntce_dt DESC, bid_no DESC, bid_ord DESC LIMIT ?")
+            rows = self._db.execute(sql, (*args, int(limit))).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM bids")
+            self._db.execute("DELETE FROM meta")
+            self._db.execute("INSERT INTO bids_fts(bids_fts) VALUES ('rebuild')")
+            self._db.execute("VACUUM")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            bids = self._db.execute("SELECT COUNT(*) FROM bids").fetchone()[0]
+            meta = self._meta()
+        synced_at = float(meta["synced_at"]) if meta.get("synced_at") else None
+        return {"bids": bids, "watermark": meta.get("watermark"), "covered_from": meta.get("covered_from"),
+                "age_s": round(time.time() - synced_at, 1) if synced_at else None,
+                "last_error": self.last_error, "path": self.path}
+
+# ---------- 프로세스 공용 미러 + 백그라운드 동기화 ----------
+_MIRRORS: Dict[str, PpsMirror] = {}
+_SYNC_THREADS: Dict[str, threading.Thread] = {}
+_MIRRORS_LOCK = threading.Lock()
+
+def get_pps_mirror() -> Optional[PpsMirror]:
+    """PPS_MIRROR=0이면 None. 경로별로 1개."""
+    if os.getenv("PPS_MIRROR", "1").lower() in ("0", "false", "no", "n"):
+        return None
+    path = os.getenv("PPS_MIRROR_PATH", DEFAULT_MIRROR_PATH)
+    with _MIRRORS_LOCK:
+        mirror = _MIRRORS.get(path)
+        if mirror is None:
+            try:
+                mirror = PpsMirror(path)
+            except sqlite3.Error as e:
+                print(f"[WARN] PPS 미러를 열 수 없음 → API로 진행: {path} ({e})")
+                return None
+            _MIRRORS[path] = mirror
+        return mirror
+
+def _sync_loop(mirror: PpsMirror, interval: float):
+    while True:
+        try:
+            mirror.sync()
+        except Exception as e:
+            msg = f"{type(e).__name__}: {e}"
+            if msg != mirror.last_error:   # 같은 오류는 한 번만 출력
+                print(f"[WARN] PPS 미러 동기화 실패 (다음 주기에 재시도): {msg}")
+            mirror.last_error = msg
+        time.sleep(interval)
+
+def start_background_sync(mirror: PpsMirror, interval: Optional[float] = None) -> threading.Thread:
+    """미러 경로별 데몬 스레드 1개 (이미 돌고 있으면 그대로 반환)."""
+    with _MIRRORS_LOCK:
+        th = _SYNC_THREADS.get(mirror.path)
+        if th is None or not th.is_alive():
+            th = threading.Thread(target=_sync_loop, args=(mirror, interval or SYNC_INTERVAL),
+                                  name="pps-mirror-sync", daemon=True)
+            th.start()
+            _SYNC_THREADS[mirror.path] = th
+        return th
+
+def local_bids(keyword: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None,
+               agency: Optional[str] = None, budget_min: Optional[int] = None, budget_max: Optional[int] = None,
+               limit: int = 200) -> Optional[List[Dict[str, Any]]]:
+    """로컬 미러 검색. 미러가 꺼져 있거나 아직 요청 기간을 최신으로 덮지 못하면 None (→ PPS API 사용)."""
+    mirror = get_pps_mirror()
+    if mirror is None:
+        return None
+    if os.getenv("PPS_MIRROR_BACKGROUND", "1").lower() not in ("0", "false", "no", "n"):
+        start_background_sync(mirror)
+    date_from = date_from or pps_api._date_window_from_env()[0]
+    if not mirror.fresh_for(date_from):
+        return None
+    return mirror.search(keyword, agency=agency, date_from=date_from, date_to=date_to,
+                         budget_min=budget_min, budget_max=budget_max, limit=limit)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="나라장터 입찰공고 로컬 미러 (동기화/검색/현황)")
+    ap.add_argument("--sync", action="store_true", help="한 번 동기화")
+    ap.add_argument("--loop", action="store_true", help=f"PPS_MIRROR_INTERVAL({SYNC_INTERVAL:g}s)마다 동기화")
+    ap.add_argument("--clear", action="store_true")
+    ap.add_argument("--query", default=None)
+    ap.add_argument("--agency", default=None)
+    ap.add_argument("--date_from", default=None)
+    ap.add_argument("--date_to", default=None)
+    ap.add_argument("--budget_min", type=int, default=None)
+    ap.add_argument("--budget_max", type=int, default=None)
+    ap.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args()
+    mirror = get_pps_mirror()
+    if mirror is None:
+        print("[OK] PPS_MIRROR=0 (미러 꺼짐)")
+        raise SystemExit(0)
+    if args.clear:
+        mirror.clear()
+    if args.loop:
+        _sync_loop(mirror, SYNC_INTERVAL)
+    if args.sync:
+        print(json.dumps(mirror.sync(), ensure_ascii=False, indent=2))
+    if args.query or args.agency or args.date_from or args.budget_min is not None or args.budget_max is not None:
+        t0 = time.perf_counter()
+        rows = mirror.search(args.query, agency=args.agency, date_from=args.date_from, date_to=args.date_to,
+                             budget_min=args.budget_min, budget_max=args.budget_max, limit=args.limit)
+        print(f"[OK] {len(rows)}건 ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        for it in pps_api.to_common_schema(rows):
+            print(f"- {it['announce_date']} | {it['title']} | {it['agency']} | {it['budget']}")
+    print(json.dumps(mirror.stats(), ensure_ascii=False, indent=2))
@@ -4,6 +4,7 @@ impl 전용: PPS(나라장터) 검색 + 렌더 + 저장 유틸
 - writer.py / fs_utils.py에 의존하지 않도록 독립 저장 로직 포함
 - .env의 PPS_* 파라미터를 흡수하고, 없으면 최근 N일(기본 30일)로 자동
 - pps_api 함수명/시그니처 차이에 방어적으로 대응
+- 로컬 미러(pps_mirror)가 최신이면 API 대신 SQL 검색 (발주기관/예산 필터: PPS_AGENCY, PPS_BUDGET_MIN/MAX)
 """
 from __future__ import annotations
 import os, re
@@ -26,6 +27,11 @@ try:
 except Exception:
     _TO_COMMON = None  # type: ignore[assignment]
 
+try:
+    from student.day3.impl.pps_mirror import local_bids as _LOCAL, matches_filters as _MATCHES
+except Exception:  # pragma: no cover
+    _LOCAL = _MATCHES = None  # type: ignore[assignment]
+
 KST = timezone(timedelta(hours=9))
 
 # 경로/저장 유틸(독립 구현)
@@ -69,6 +75,13 @@ class PpsParams:
     rows: int
     page_max: int
     inqry_div: str  # 쿼리 구분(예: '1': 공고)
+    agency: Optional[str] = None      # 발주기관 부분 일치
+    budget_min: Optional[int] = None  # 추정가격(원) 하한/상한
+    budget_max: Optional[int] = None
+
+def _env_int(name: str) -> Optional[int]:
+    v = os.getenv(name, "").replace(",", "").strip()
+    return int(v) if v else None
 
 def resolve_params(user_query: str) -> PpsParams:
     # 날짜 기본: 최근 N일
@@ -88,7 +101,9 @@ def resolve_params(user_query: str) -> PpsParams:
     if not keyword:
         keyword = None
     return PpsParams(keyword=keyword, date_from=date_from, date_to=date_to,
-                     rows=rows, page_max=page_max, inqry_div=inqry_div)
+                     rows=rows, page_max=page_max, inqry_div=inqry_div,
+                     agency=os.getenv("PPS_AGENCY", "").strip() or None,
+                     budget_min=_env_int("PPS_BUDGET_MIN"), budget_max=_env_int("PPS_BUDGET_MAX"))
 
 # 데이터 렌더 & 저장
 def _render_table(items: List[Dict[str, Any]]) -> str:
@@ -166,15 +181,26 @@ def pps_search(query: str) -> str:
     except Exception as e:
         return f"⚠️ 파라미터 해석 오류: {e}"
 
+    # 로컬 미러 우선 (꺼져 있거나 최신이 아니면 None → API)
+    raw: Optional[List[Dict[str, Any]]] = None
+    if _LOCAL is not None:
+        try:
+            raw = _LOCAL(p.keyword, date_from=p.date_from, date_to=p.date_to, agency=p.agency,
+                         budget_min=p.budget_min, budget_max=p.budget_max, limit=p.rows * p.page_max)
+        except Exception:
+            raw = None
+
     # 호출: pps_fetch_bids는 keyword, page_max, rows만 받음
-    raw: List[Dict[str, Any]] = []
     try:
-        # pps_fetch_bids의 실제 시그니처에 맞게 호출
-        raw = _FETCH(
-            keyword=p.keyword if p.keyword else None,
-            page_max=p.page_max,
-            rows=p.rows,
-        )
+        if raw is None:
+            # pps_fetch_bids의 실제 시그니처에 맞게 호출
+            raw = _FETCH(
+                keyword=p.keyword if p.keyword else None,
+                page_max=p.page_max,
+                rows=p.rows,
+            )
+            if _MATCHES is not None and (p.agency or p.budget_min is not None or p.budget_max is not None):
+                raw = [r for r in raw if _MATCHES(r, p.agency, p.budget_min, p.budget_max)]
     except Exception as e:
         import traceback
         error_detail = traceback.format_exc()
@@ -7,11 +7,12 @@
 from __future__ import annotations
 import os
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
+from student.common.llm_cache import CachedLiteLlm
 from google.adk.tools.function_tool import FunctionTool
+from google.genai import types
 from student.day3.impl.pps_tool import pps_search 
 
-MODEL = LiteLlm(model=os.getenv("DAY4_INTENT_MODEL","gpt-4o-mini"))
+MODEL = CachedLiteLlm(model=os.getenv("DAY4_INTENT_MODEL","gpt-4o-mini"), cache_site="day3_pps")
 
 # FunctionTool — 필수 인자만!
 pps_tool = FunctionTool(func=pps_search)
@@ -46,6 +47,7 @@ day3_pps_agent = Agent(
     description="나라장터(G2B) 입찰·조달 공고 검색 에이전트. pps_search 도구를 사용하여 나라장터 입찰공고를 검색합니다.",
     instruction=INSTRUCTION,
     tools=[pps_tool],
+    generate_content_config=types.GenerateContentConfig(temperature=0),  # 결정적 응답 → 응답 캐시 대상
 )
 
 